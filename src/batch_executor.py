@@ -0,0 +1,747 @@
+# -*- coding: utf-8 -*-
+#
+# 画面(wx)を使わずに、コマンドラインから物理を設定する
+#
+# 1モデル:
+#   python batch_executor.py --model_path model.pmx --output_path out.pmx \
+#       --param skirt.json --material_name スカート --abb_name sk --parent_bone_name 下半身 --group 1
+#   (--param は ParamPanel でエクスポートした材質物理設定JSON。材質毎に指定する項目は、JSON内にも書ける)
+#
+# 複数モデル:
+#   python batch_executor.py --jobs jobs.json --max_jobs 4
+#   (先読み・計算・書き込みを重ねて実行する。同時にメモリ上に置くモデル数は --max_models で抑える)
+#   jobs.json: {"jobs": [{"model_path": ..., "output_path": ..., "settings": [{"material_name": ..., "abb_name": ..., "parent_bone_name": ..., "group": ..., "params": "skirt.json"}]}]}
+#
+# 1モデルを複数の設定(プリセット)で出力:
+#   python batch_executor.py --model_path model.pmx --presets presets.json --max_jobs 4
+#   presets.json: {"presets": [{"name": "light", "output_path": ..., "settings": [...]}, ...]} (jobs.json のジョブにも "presets" で指定できる)
+#   (モデルの読み込みと頂点マップの生成は1回だけ行い、プリセット毎にプロセスを複製(fork)して並列で出力する)
+#
+# 監視実行:
+#   python batch_executor.py --jobs jobs.json --watch --max_jobs 2
+#   (ジョブの入力(モデル・物理設定JSON・頂点CSV)のあるフォルダを監視し、変更されたジョブを再出力する)
+#   (入力内容は出力毎の入力マニフェストに保存し、再起動時も入力に変更がないジョブは出力し直さない)
+#
+import io
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import argparse
+import threading
+import traceback
+import numpy as np
+import multiprocessing
+import multiprocessing.connection
+import concurrent.futures
+
+from mmd.PmxReader import PmxReader
+from mmd.PmxWriter import PmxWriter
+from module.MExportManifest import get_manifest_path, get_input_manifest_path, load_manifest, save_manifest, save_output_manifest, get_buffer_digest, get_file_digest, \
+    get_value_digest, to_manifest_value
+from module.MFolderWatcher import FolderWatcher
+from module.MOptions import MExportOptions
+from module.MParamOptions import SETTING_DEFAULTS, SETTING_REQUIRED_KEYS, create_param_option, create_bone_grid, validate_setting, load_params
+from service.PmxTailorExportService import PmxTailorExportService
+from utils import MFileUtils
+from utils.MLogger import MLogger
+from utils.MProgress import ProgressCounter
+
+# executor.py と同じバージョン
+VERSION_NAME = "1.00.02"
+
+# 指数表記なし、有効小数点桁数6、30を超えると省略あり、一行の文字数200
+np.set_printoptions(suppress=True, precision=6, threshold=30, linewidth=200)
+
+logger = MLogger(__name__)
+
+# 材質毎の設定項目
+SETTING_KEYS = SETTING_REQUIRED_KEYS + list(SETTING_DEFAULTS.keys()) + ["bone_grid"]
+
+# forkしたジョブの結果・終了を確認する間隔(秒)
+FORKED_JOB_POLL_INTERVAL = 0.5
+# 結果を受け取った後、forkしたプロセスの終了を待つ時間(秒)
+FORKED_JOB_EXIT_TIMEOUT = 5
+
+
+def init_job_worker(verbose: int):
+    MLogger.initialize(level=verbose, is_file=False)
+
+
+# ジョブのモデルを読み込み、出力用のパラメーターを生成する
+def load_job(job: dict, buffer=None):
+    model = PmxReader(job["model_path"], is_check=False, is_sizing=False, prefetch_buffer=buffer).read_data()
+
+    param_options, error = create_job_param_options(job, model)
+
+    return model, param_options, error
+
+
+# 読み込み済みのモデルから、ジョブの出力用のパラメーターを生成する
+def create_job_param_options(job: dict, model):
+    param_options = []
+    for setting in job["settings"]:
+        params = load_params(setting["params"], job.get("base_dir", ""))
+        error = validate_setting(model, setting, params)
+        if error:
+            logger.error(error, translate=False, decoration=MLogger.DECORATION_BOX)
+            return None, error
+
+        param_option = create_param_option(model, setting, params)
+        param_option["bone_grid"], param_option["bone_grid_rows"], param_option["bone_grid_cols"] = \
+            create_bone_grid(setting["bone_grid"]) if setting.get("bone_grid") else ({}, 0, 0)
+        param_options.append(param_option)
+
+    return param_options, None
+
+
+def create_job_options(job: dict, model, param_options: list, verbose: int, max_workers: int, stage_cache_dir=None, progress=None):
+    return MExportOptions(
+        version_name=VERSION_NAME,
+        logging_level=verbose,
+        max_workers=max_workers,
+        pmx_model=model,
+        output_path=job["output_path"],
+        param_options=param_options,
+        monitor=None,
+        is_file=False,
+        outout_datetime=logger.outout_datetime,
+        stage_cache_dir=stage_cache_dir,
+        progress=progress)
+
+
+def create_job_result(job: dict):
+    return {"model_path": job["model_path"], "output_path": job["output_path"], "result": False, "elapsed_time": 0, "error": None}
+
+
+# 出力先が指定されていない場合、画面と同じく元モデルの場所に日時付きで出力する(プリセットの場合、プリセット名も付ける)
+def fill_output_path(job: dict):
+    if job.get("output_path"):
+        return job
+
+    output_path = MFileUtils.get_output_pmx_path(job["model_path"], "", is_force=True)
+    if job.get("preset_name"):
+        output_path = f"{os.path.splitext(output_path)[0]}_{job['preset_name']}.pmx"
+
+    return dict(job, output_path=output_path)
+
+
+# 1モデル分の出力(結果は辞書で返す)
+def run_job(job: dict, verbose: int, max_workers: int, stage_cache_dir=None, is_dry_run=False, progress=None):
+    start = time.time()
+    job = fill_output_path(job)
+    result = create_job_result(job)
+
+    try:
+        model, param_options, result["error"] = load_job(job)
+        if result["error"]:
+            return result
+
+        options = create_job_options(job, model, param_options, verbose, max_workers, stage_cache_dir, progress)
+
+        if is_dry_run:
+            result["reports"] = PmxTailorExportService(options).analyze()
+            result["result"] = result["reports"] is not None
+        else:
+            result["result"] = bool(PmxTailorExportService(options).execute())
+    except Exception:
+        result["error"] = traceback.format_exc()
+        logger.critical("PmxTailor変換処理が意図せぬエラーで終了しました。\n\n%s", result["error"], decoration=MLogger.DECORATION_BOX)
+    finally:
+        result["elapsed_time"] = time.time() - start
+        if progress:
+            progress.detach()
+
+    return result
+
+
+# ジョブ定義ファイルの読み込み(相対パスはジョブ定義ファイルの場所から)
+def load_jobs(jobs_path: str):
+    with open(jobs_path, "r", encoding="utf-8") as f:
+        jobs_data = json.load(f)
+
+    return normalize_jobs(jobs_data, os.path.dirname(os.path.abspath(jobs_path)))
+
+
+def normalize_jobs(jobs_data, base_dir: str):
+    jobs = []
+    for job in (jobs_data["jobs"] if isinstance(jobs_data, dict) else jobs_data):
+        job = dict(job, base_dir=base_dir)
+        job["model_path"] = os.path.join(base_dir, job["model_path"])
+        if job.get("presets"):
+            job["presets"] = [normalize_outputs(dict(preset), base_dir) for preset in job["presets"]]
+        else:
+            normalize_outputs(job, base_dir)
+        jobs.append(job)
+
+    return jobs
+
+
+# 出力先と材質毎の設定の相対パスを、基準ディレクトリからのパスにする
+def normalize_outputs(job: dict, base_dir: str):
+    if job.get("output_path"):
+        job["output_path"] = os.path.join(base_dir, job["output_path"])
+    job["settings"] = [dict(setting, vertices_csv=os.path.join(base_dir, setting["vertices_csv"])) if setting.get("vertices_csv") else setting \
+                       for setting in job["settings"]]
+
+    return job
+
+
+# コマンドライン引数から1モデル分のジョブを生成
+def create_args_job(args):
+    settings = []
+    for pidx, param_path in enumerate(args.param):
+        params = load_params(param_path)
+        # 材質毎の設定項目は、物理設定JSON内の値より引数を優先する
+        setting = {k: params[k] for k in SETTING_KEYS if k in params}
+        for k in SETTING_KEYS:
+            values = getattr(args, k, None)
+            if values and pidx < len(values):
+                setting[k] = values[pidx]
+        setting["params"] = params
+        settings.append(setting)
+
+    return {"model_path": args.model_path, "output_path": args.output_path, "settings": settings}
+
+
+# 複数ジョブをプロセスプールで実行
+def run_jobs(jobs: list, verbose: int, max_jobs: int, max_workers: int, stage_cache_dir=None, is_dry_run=False, is_progress=False):
+    jobs = [fill_output_path(job) for job in jobs]
+    progress_printer = ProgressPrinter(jobs, is_progress)
+
+    try:
+        if max_jobs <= 1 or len(jobs) <= 1:
+            return [run_job(job, verbose, max_workers, stage_cache_dir, is_dry_run, progress) for job, progress in zip(jobs, progress_printer.progresses)]
+
+        results = [None for _ in jobs]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_jobs, initializer=init_job_worker, initargs=(verbose,)) as executor:
+            futures = {executor.submit(run_job, job, verbose, max_workers, stage_cache_dir, is_dry_run, progress): jidx \
+                       for jidx, (job, progress) in enumerate(zip(jobs, progress_printer.progresses))}
+            for future in concurrent.futures.as_completed(futures):
+                jidx = futures[future]
+                try:
+                    results[jidx] = future.result()
+                except Exception:
+                    results[jidx] = dict(create_job_result(jobs[jidx]), error=traceback.format_exc())
+
+                log_job_result(results, jidx)
+
+        return results
+    finally:
+        progress_printer.close()
+
+
+# 各ジョブの進捗を一定間隔で表示する(表示しない場合、進捗も集計しない)
+class ProgressPrinter:
+
+    # 表示間隔(秒)
+    INTERVAL = 1.0
+    # バーの幅(文字数)
+    BAR_WIDTH = 20
+
+    def __init__(self, jobs: list, is_progress: bool):
+        self.jobs = jobs
+        self.progresses = [ProgressCounter(is_shared=True) if is_progress else None for _ in jobs]
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        if is_progress:
+            self.thread = threading.Thread(target=self.run, name="progress_printer", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stop_event.wait(self.INTERVAL):
+            for job, progress in zip(self.jobs, self.progresses):
+                ratio = progress.get()["ratio"]
+                if not progress.get_text() or ratio == 1:
+                    # 未開始・終了済みのジョブは表示しない
+                    continue
+
+                logger.info("%s %s %s", self.get_bar_text(ratio), os.path.basename(job["model_path"]), progress.get_text(), translate=False)
+
+    def get_bar_text(self, ratio):
+        if ratio is None:
+            return f"[{'?' * self.BAR_WIDTH}]"
+
+        filled = int(ratio * self.BAR_WIDTH)
+        return f"[{'#' * filled}{'-' * (self.BAR_WIDTH - filled)}]"
+
+    def close(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        for progress in self.progresses:
+            if progress:
+                progress.close()
+
+
+def log_job_result(results: list, jidx: int):
+    logger.info("ジョブ終了 (%s/%s): %s -> %s", len([r for r in results if r]), len(results), \
+                os.path.basename(results[jidx]["model_path"]), results[jidx]["result"])
+
+
+# 先読みステージ: モデルファイルの中身を読み込む
+def prefetch_job_stage(job: dict):
+    start = time.time()
+    with open(job["model_path"], "rb") as f:
+        buffer = f.read()
+
+    return buffer, time.time() - start
+
+
+# 計算ステージ: モデルの解析・物理生成・出力内容の生成(ファイルへの書き込みはしない)
+def tailor_job_stage(job: dict, buffer: bytes, verbose: int, max_workers: int, stage_cache_dir=None, progress=None):
+    start = time.time()
+    try:
+        model, param_options, error = load_job(job, buffer)
+        if error:
+            return False, None, None, error, time.time() - start
+
+        service = PmxTailorExportService(create_job_options(job, model, param_options, verbose, max_workers, stage_cache_dir, progress))
+        if not service.execute(is_write=False):
+            return False, None, None, None, time.time() - start
+
+        output_buffer = io.BytesIO()
+        PmxWriter().write(service.output_model, output_buffer, service.progress)
+        output_data = output_buffer.getvalue()
+
+        return True, output_data, service.create_export_manifest(get_buffer_digest(output_data)), None, time.time() - start
+    finally:
+        if progress:
+            progress.detach()
+
+
+# 書き込みステージ: 書き込みキューの出力内容を順にファイルに書き込む
+def write_job_stage(write_queue: queue.Queue, results: list, jobs: list, in_flight: threading.Semaphore, stage_cache_dir=None):
+    while True:
+        item = write_queue.get()
+        if item is None:
+            break
+
+        jidx, output_data, manifest = item
+        start = time.time()
+        try:
+            with open(jobs[jidx]["output_path"], "wb") as f:
+                f.write(output_data)
+
+            if manifest:
+                try:
+                    save_output_manifest(get_manifest_path(jobs[jidx]["model_path"], stage_cache_dir), manifest)
+                except Exception:
+                    logger.debug("マニフェスト保存失敗: %s", traceback.format_exc())
+
+            results[jidx]["result"] = True
+            logger.info("出力終了: %s", os.path.basename(jobs[jidx]["output_path"]), decoration=MLogger.DECORATION_BOX, title=logger.transtext("成功"))
+        except Exception:
+            results[jidx]["error"] = traceback.format_exc()
+            logger.critical("PmxTailor変換処理が意図せぬエラーで終了しました。\n\n%s", results[jidx]["error"], decoration=MLogger.DECORATION_BOX)
+        finally:
+            del output_data
+            results[jidx]["timings"]["write"] = time.time() - start
+            finish_job(results, jidx, in_flight)
+
+
+def finish_job(results: list, jidx: int, in_flight: threading.Semaphore):
+    results[jidx]["elapsed_time"] = time.time() - results[jidx].pop("start")
+    log_job_result(results, jidx)
+    # 終わったモデルの分だけ、次のモデルを先読みできる
+    in_flight.release()
+
+
+# 先読み・計算・書き込みを重ねて実行する
+# ファイルの読み書きはスレッド、計算はプロセスプールで行い、同時に扱うモデル数は max_models までに抑える
+# (解析済みモデルをプロセス間で受け渡すと解析し直すより遅いため、解析と出力内容の生成は計算ステージで行う)
+def run_jobs_pipelined(jobs: list, verbose: int, max_readers: int, max_jobs: int, max_models: int, max_workers: int, stage_cache_dir=None, \
+                       is_progress=False):
+    jobs = [fill_output_path(job) for job in jobs]
+    results = [dict(create_job_result(job), timings={}) for job in jobs]
+    progress_printer = ProgressPrinter(jobs, is_progress)
+
+    in_flight = threading.Semaphore(max(max_models, 1))
+    write_queue = queue.Queue()
+    writer = threading.Thread(target=write_job_stage, args=(write_queue, results, jobs, in_flight, stage_cache_dir))
+    writer.start()
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(max_readers, 1)) as prefetch_executor, \
+             concurrent.futures.ProcessPoolExecutor(max_workers=max(max_jobs, 1), initializer=init_job_worker, initargs=(verbose,)) as tailor_executor:
+            pending_jidxs = list(range(len(jobs)))
+            prefetch_futures = {}
+            tailor_futures = {}
+
+            while pending_jidxs or prefetch_futures or tailor_futures:
+                # 上限に達するまで、次のモデルを先読みする
+                while pending_jidxs and in_flight.acquire(blocking=False):
+                    jidx = pending_jidxs.pop(0)
+                    results[jidx]["start"] = time.time()
+                    prefetch_futures[prefetch_executor.submit(prefetch_job_stage, jobs[jidx])] = jidx
+
+                if not prefetch_futures and not tailor_futures:
+                    # 書き込み待ちのモデルが終わるまで待つ
+                    in_flight.acquire()
+                    in_flight.release()
+                    continue
+
+                # 書き込みでの空きも拾えるよう、一定間隔で確認する
+                done, _ = concurrent.futures.wait(list(prefetch_futures.keys()) + list(tailor_futures.keys()), timeout=0.5, \
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+                    if future in prefetch_futures:
+                        jidx = prefetch_futures.pop(future)
+                        try:
+                            buffer, results[jidx]["timings"]["read"] = future.result()
+                        except Exception:
+                            results[jidx]["error"] = traceback.format_exc()
+                            finish_job(results, jidx, in_flight)
+                            continue
+
+                        tailor_futures[tailor_executor.submit(tailor_job_stage, jobs[jidx], buffer, verbose, max_workers, stage_cache_dir, \
+                                                              progress_printer.progresses[jidx])] = jidx
+                        del buffer
+                    else:
+                        jidx = tailor_futures.pop(future)
+                        try:
+                            is_success, output_data, manifest, results[jidx]["error"], results[jidx]["timings"]["tailor"] = future.result()
+                        except Exception:
+                            is_success = False
+                            results[jidx]["error"] = traceback.format_exc()
+
+                        if not is_success:
+                            finish_job(results, jidx, in_flight)
+                            continue
+
+                        write_queue.put((jidx, output_data, manifest))
+                        del output_data
+    finally:
+        write_queue.put(None)
+        writer.join()
+        progress_printer.close()
+
+    return results
+
+
+def get_fork_context():
+    return multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+
+
+# 読み込み済みのモデルに、1ジョブ分の物理を設定して出力する(モデルは書き換わる)
+def tailor_job(job: dict, model, verbose: int, max_workers: int, stage_cache_dir=None):
+    result = {"result": False, "timings": {}, "error": None}
+
+    try:
+        start = time.time()
+        param_options, result["error"] = create_job_param_options(job, model)
+        if not result["error"]:
+            service = PmxTailorExportService(create_job_options(job, model, param_options, verbose, max_workers, stage_cache_dir))
+            if service.execute(is_write=False):
+                result["timings"]["tailor"] = time.time() - start
+
+                start = time.time()
+                service.write_output_model(service.output_model)
+                result["timings"]["write"] = time.time() - start
+                result["result"] = True
+    except Exception:
+        result["error"] = traceback.format_exc()
+        logger.critical("PmxTailor変換処理が意図せぬエラーで終了しました。\n\n%s", result["error"], decoration=MLogger.DECORATION_BOX)
+
+    return result
+
+
+def tailor_forked_job(job: dict, model, verbose: int, max_workers: int, stage_cache_dir, conn):
+    conn.send(tailor_job(job, model, verbose, max_workers, stage_cache_dir))
+    conn.close()
+
+
+# プロセスを複製(fork)して、複製先のモデルでジョブを処理する(元のモデルは変更されない)
+def start_forked_job(fork_context, job: dict, model, verbose: int, max_workers: int, stage_cache_dir=None):
+    result_conn, conn = fork_context.Pipe(duplex=False)
+    process = fork_context.Process(target=tailor_forked_job, args=(job, model, verbose, max_workers, stage_cache_dir, conn))
+    process.start()
+    conn.close()
+
+    return process, result_conn
+
+
+# forkしたジョブの結果を受け取る
+# 結果を返さずにプロセスが終了した場合・期限(時刻)を過ぎても終わらない場合は失敗とし、残っているプロセスは終了させる
+def finish_forked_job(process, result_conn, deadline=None):
+    result = {"result": False, "timings": {}, "error": None}
+
+    try:
+        while not result_conn.poll(min(FORKED_JOB_POLL_INTERVAL, max(0, deadline - time.time())) if deadline else FORKED_JOB_POLL_INTERVAL):
+            if not process.is_alive() and not result_conn.poll():
+                break
+            if deadline and time.time() >= deadline:
+                result["error"] = "timeout"
+                break
+        else:
+            result = result_conn.recv()
+    except EOFError:
+        pass
+    result_conn.close()
+    # 期限を過ぎた場合は終了を待たない
+    stop_forked_process(process, 0 if result["error"] == "timeout" else FORKED_JOB_EXIT_TIMEOUT)
+
+    if process.exitcode and not result["error"]:
+        result["error"] = f"exitcode: {process.exitcode}"
+
+    return result
+
+
+def stop_forked_process(process, timeout=FORKED_JOB_EXIT_TIMEOUT):
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join(FORKED_JOB_EXIT_TIMEOUT)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+# プリセット毎のジョブ
+def expand_preset_jobs(job: dict):
+    preset_jobs = []
+    for pidx, preset in enumerate(job["presets"]):
+        preset_job = {k: v for k, v in job.items() if k != "presets"}
+        preset_job.update(settings=preset["settings"], output_path=preset.get("output_path"), preset_name=preset.get("name", str(pidx + 1)))
+        preset_jobs.append(preset_job)
+
+    return preset_jobs
+
+
+# 1モデルを複数の設定(プリセット)で出力する
+# モデルの読み込みと、全プリセットの頂点マップ・ボーン間距離の生成は1回だけ行い、
+# プリセット毎にプロセスを複製(fork)して、生成済みのキャッシュを引き継いだまま残りの処理を並列で行う
+def run_preset_job(job: dict, verbose: int, max_jobs: int, max_workers: int, stage_cache_dir=None):
+    preset_jobs = [fill_output_path(preset_job) for preset_job in expand_preset_jobs(job)]
+    results = [dict(create_job_result(preset_job), timings={}) for preset_job in preset_jobs]
+    start = time.time()
+
+    try:
+        model = PmxReader(job["model_path"], is_check=False, is_sizing=False).read_data()
+        read_time = time.time() - start
+
+        start = time.time()
+        all_param_options = []
+        for preset_job, result in zip(preset_jobs, results):
+            param_options, result["error"] = create_job_param_options(preset_job, model)
+            all_param_options.extend(param_options or [])
+
+        # 出力はしないので、出力先は先頭のプリセットのもの
+        PmxTailorExportService(create_job_options(preset_jobs[0], model, all_param_options, verbose, max_workers, stage_cache_dir)).prepare_vertex_map_stages()
+        prepare_time = time.time() - start
+    except Exception:
+        error = traceback.format_exc()
+        logger.critical("PmxTailor変換処理が意図せぬエラーで終了しました。\n\n%s", error, decoration=MLogger.DECORATION_BOX)
+        for result in results:
+            result["error"] = error
+        return results
+
+    fork_context = get_fork_context()
+    pending_jidxs = [jidx for jidx, result in enumerate(results) if not result["error"]]
+    # キー：結果受け取り用の接続、値：(ジョブINDEX, プロセス, 開始時間)
+    running_jobs = {}
+
+    while pending_jidxs or running_jobs:
+        while pending_jidxs and len(running_jobs) < max(max_jobs, 1):
+            jidx = pending_jidxs.pop(0)
+            results[jidx]["timings"].update({"read": read_time, "prepare": prepare_time})
+            if fork_context:
+                process, result_conn = start_forked_job(fork_context, preset_jobs[jidx], model, verbose, 1, stage_cache_dir)
+                running_jobs[result_conn] = (jidx, process, time.time())
+            else:
+                # forkできない場合、モデルを複製して順に処理する(キャッシュは同じプロセス内で使える)
+                job_start = time.time()
+                result = tailor_job(preset_jobs[jidx], copy.deepcopy(model), verbose, 1, stage_cache_dir)
+                results[jidx].update(result=result["result"], error=result["error"], elapsed_time=time.time() - job_start)
+                results[jidx]["timings"].update(result["timings"])
+                log_job_result(results, jidx)
+
+        for result_conn in multiprocessing.connection.wait(list(running_jobs.keys())):
+            jidx, process, job_start = running_jobs.pop(result_conn)
+            result = finish_forked_job(process, result_conn)
+            results[jidx].update(result=result["result"], error=result["error"], elapsed_time=time.time() - job_start)
+            results[jidx]["timings"].update(result["timings"])
+            log_job_result(results, jidx)
+
+    return results
+
+
+# ジョブの入力ファイル(モデル・物理設定JSON・頂点CSV)
+def get_job_input_paths(job: dict):
+    input_paths = [os.path.abspath(job["model_path"])]
+    for setting in job["settings"]:
+        if isinstance(setting["params"], str):
+            input_paths.append(os.path.abspath(os.path.join(job.get("base_dir", ""), setting["params"])))
+        if setting.get("vertices_csv"):
+            input_paths.append(os.path.abspath(setting["vertices_csv"]))
+
+    return input_paths
+
+
+# ジョブの入力内容のハッシュ値(入力ファイルの中身と材質毎の設定値)
+def get_job_input_digest(job: dict):
+    return get_value_digest({"version": VERSION_NAME, "files": [get_file_digest(input_path) for input_path in get_job_input_paths(job)], \
+                             "settings": to_manifest_value(job["settings"])})
+
+
+# 前回出力時から入力が変わっておらず、出力もそのまま残っているか
+def is_job_processed(job: dict, input_digest: str):
+    manifest = load_manifest(get_input_manifest_path(job["output_path"]))
+    if not manifest or manifest.get("input_digest") != input_digest or not os.path.exists(job["output_path"]):
+        return False
+
+    return get_file_digest(job["output_path"]) == manifest.get("output_digest")
+
+
+def save_job_input_manifest(job: dict, input_digest: str):
+    try:
+        save_manifest(get_input_manifest_path(job["output_path"]), {"input_digest": input_digest, "output_digest": get_file_digest(job["output_path"])})
+    except Exception:
+        logger.debug("入力マニフェスト保存失敗: %s", traceback.format_exc())
+
+
+# 入力フォルダを監視し、入力が変更されたジョブを出力する(中断されるまで続ける)
+# 同じジョブへの変更は debounce 秒静かになるまでまとめ、処理中のジョブへの変更は終了後に改めて処理する
+def watch_jobs(jobs: list, verbose: int, max_jobs: int, max_workers: int, stage_cache_dir=None, debounce=2.0, is_polling=False):
+    # キー：入力ファイルパス、値：ジョブINDEXリスト
+    input_jidxs = {}
+    for jidx, job in enumerate(jobs):
+        for input_path in get_job_input_paths(job):
+            input_jidxs.setdefault(input_path, []).append(jidx)
+
+    watcher = FolderWatcher([os.path.dirname(input_path) for input_path in input_jidxs.keys()], is_polling)
+    logger.info("フォルダ監視開始: %s (%s)", ", ".join(watcher.dir_paths), "polling" if watcher.is_polling() else "inotify", decoration=MLogger.DECORATION_BOX)
+
+    # キー：ジョブINDEX、値：最後に変更された時間 (起動時は全ジョブを確認する)
+    changed_times = {jidx: 0 for jidx in range(len(jobs))}
+    # キー：処理中のFuture、値：(ジョブINDEX, 入力のハッシュ値)
+    running_futures = {}
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max(max_jobs, 1), initializer=init_job_worker, initargs=(verbose,)) as executor:
+            while True:
+                for changed_path in watcher.wait(0.5):
+                    for jidx in input_jidxs.get(changed_path, []):
+                        changed_times[jidx] = time.time()
+
+                for future in [future for future in running_futures.keys() if future.done()]:
+                    jidx, input_digest = running_futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception:
+                        result = dict(create_job_result(jobs[jidx]), error=traceback.format_exc())
+
+                    if result["result"]:
+                        save_job_input_manifest(jobs[jidx], input_digest)
+                    logger.info("ジョブ終了 (%s): %s -> %s", jidx + 1, os.path.basename(jobs[jidx]["model_path"]), result["result"])
+
+                running_jidxs = [jidx for jidx, _ in running_futures.values()]
+                for jidx, changed_time in sorted(changed_times.items(), key=lambda x: x[1]):
+                    if len(running_futures) >= max(max_jobs, 1):
+                        break
+                    if jidx in running_jidxs or time.time() - changed_time < debounce:
+                        continue
+
+                    try:
+                        input_digest = get_job_input_digest(jobs[jidx])
+                    except OSError:
+                        # 書き込み途中等で読めない場合、次の変更を待つ
+                        del changed_times[jidx]
+                        continue
+
+                    del changed_times[jidx]
+                    if is_job_processed(jobs[jidx], input_digest):
+                        logger.info("入力に変更がないため、スキップします: %s", os.path.basename(jobs[jidx]["output_path"]))
+                        continue
+
+                    running_futures[executor.submit(run_job, jobs[jidx], verbose, max_workers, stage_cache_dir)] = (jidx, input_digest)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+# Windowsマルチプロセス対策
+multiprocessing.freeze_support()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model_path", type=str)
+    parser.add_argument("--output_path", type=str)
+    parser.add_argument("--param", action="append", default=[], help="ParamPanel でエクスポートした材質物理設定JSON (材質毎に指定)")
+    parser.add_argument("--material_name", action="append")
+    parser.add_argument("--abb_name", action="append")
+    parser.add_argument("--parent_bone_name", action="append")
+    parser.add_argument("--group", action="append")
+    parser.add_argument("--direction", action="append")
+    parser.add_argument("--exist_physics_clear", action="append")
+    parser.add_argument("--back_material_name", action="append")
+    parser.add_argument("--edge_material_name", action="append")
+    parser.add_argument("--vertices_csv", action="append")
+    parser.add_argument("--presets", type=str, help="--model_path を複数の設定で出力するプリセット定義JSON")
+    parser.add_argument("--jobs", type=str, help="複数モデル分のジョブ定義JSON")
+    parser.add_argument("--max_jobs", default=1, type=int, help="同時に処理するモデル数")
+    parser.add_argument("--max_workers", default=0, type=int, help="1モデル内の並列数 (0の場合、同時処理モデル数から決める)")
+    parser.add_argument("--max_readers", default=1, type=int, help="先読みするスレッド数")
+    parser.add_argument("--max_models", default=0, type=int, help="同時にメモリ上に置くモデル数の上限 (0の場合、読み込み数 + 同時処理モデル数 + 1)")
+    parser.add_argument("--stage_cache_dir", type=str, help="頂点マップ等のキャッシュ保存先 (物理のみの再出力に使う出力マニフェストも保存する。指定がない場合は保存しない)")
+    parser.add_argument("--watch", action="store_true", help="入力フォルダを監視して、変更されたジョブを出力し続ける")
+    parser.add_argument("--debounce", default=2.0, type=float, help="監視実行時、入力の変更が止まってから出力するまでの秒数")
+    parser.add_argument("--polling", action="store_true", help="監視実行時、inotify を使わずに一定間隔で確認する")
+    parser.add_argument("--dry_run", action="store_true", help="頂点マップ・ボーン配置までの見積もりのみ行う")
+    parser.add_argument("--report", type=str, help="結果を保存するJSONパス")
+    parser.add_argument("--progress", action="store_true", help="各ジョブの処理段階毎の進捗と残り時間を一定間隔で表示する")
+    parser.add_argument("--verbose", default=20, type=int)
+    args = parser.parse_args()
+
+    MLogger.initialize(level=args.verbose, is_file=False)
+
+    if args.jobs:
+        jobs = load_jobs(args.jobs)
+    elif args.model_path and args.presets:
+        with open(args.presets, "r", encoding="utf-8") as f:
+            jobs = normalize_jobs([{"model_path": os.path.abspath(args.model_path), "presets": json.load(f)["presets"]}], \
+                                  os.path.dirname(os.path.abspath(args.presets)))
+    elif args.model_path and args.param:
+        jobs = [create_args_job(args)]
+    else:
+        parser.error("--jobs か、--model_path と --param(もしくは --presets) を指定してください")
+
+    # モデル単位で並列にする場合、モデル内は並列にしない
+    max_workers = args.max_workers or (1 if args.max_jobs > 1 else min(5, 32, os.cpu_count() + 4))
+
+    if args.watch or args.dry_run:
+        # 監視実行・見積もりでは、プリセットは個別のジョブとして扱う
+        jobs = [preset_job for job in jobs for preset_job in (expand_preset_jobs(job) if job.get("presets") else [job])]
+
+    if args.watch:
+        # 監視実行では、入力毎に出力を上書きするため出力先が必要
+        for job in [job for job in jobs if not job.get("output_path")]:
+            logger.warning("監視実行では出力先を指定してください: %s", os.path.basename(job["model_path"]))
+        watch_jobs([job for job in jobs if job.get("output_path")], args.verbose, args.max_jobs, max_workers, args.stage_cache_dir, args.debounce, args.polling)
+        sys.exit(0)
+
+    results = []
+    for job in [job for job in jobs if job.get("presets")]:
+        # 複数プリセットは、モデル毎にまとめて出力する
+        results.extend(run_preset_job(job, args.verbose, args.max_jobs, max_workers, args.stage_cache_dir))
+    jobs = [job for job in jobs if not job.get("presets")]
+
+    if len(jobs) > 1 and not args.dry_run:
+        # 複数モデルを出力する場合、先読み・計算・書き込みを重ねる
+        results.extend(run_jobs_pipelined(jobs, args.verbose, args.max_readers, args.max_jobs, args.max_models or (args.max_readers + args.max_jobs + 1), \
+                                          max_workers, args.stage_cache_dir, args.progress))
+    elif jobs:
+        results.extend(run_jobs(jobs, args.verbose, args.max_jobs, max_workers, args.stage_cache_dir, args.dry_run, args.progress))
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+    logger.info("全ジョブ終了: 成功 %s / %s", len([r for r in results if r["result"]]), len(results), decoration=MLogger.DECORATION_BOX)
+
+    sys.exit(0 if all([r["result"] for r in results]) else 1)
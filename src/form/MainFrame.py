@@ -13,6 +13,7 @@ from utils import MFormUtils, MFileUtils # noqa
 from utils.MLogger import MLogger # noqa
 from form.worker.ExportWorkerThread import ExportWorkerThread
 from form.worker.LoadWorkerThread import LoadWorkerThread
+from form.worker.PrecomputeWorker import PrecomputeWorker
 
 if os.name == "nt":
     import winsound     # Windows版のみインポート
@@ -38,6 +39,8 @@ class MainFrame(wx.Frame):
         
         self.worker = None
         self.load_worker = None
+        # 材質選択時の頂点マップ事前生成
+        self.precompute_worker = PrecomputeWorker(self.logging_level)
 
         self.my_program = 'PmxTailor'
 
@@ -105,6 +108,7 @@ class MainFrame(wx.Frame):
         # イベントバインド
         self.Bind(EVT_TAILOR_THREAD, self.on_exec_result)
         self.Bind(EVT_LOAD_THREAD, self.on_load_result)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
 
         # ---------------------------------------------
 
@@ -121,6 +125,11 @@ class MainFrame(wx.Frame):
     def on_idle(self, event: wx.Event):
         pass
 
+    def on_close(self, event: wx.Event):
+        # 事前生成プロセスを止めて、キャッシュディレクトリを削除する
+        self.precompute_worker.close()
+        event.Skip()
+
     def on_tab_change(self, event: wx.Event):
 
         if self.file_panel_ctrl.is_fix_tab:
@@ -308,6 +317,9 @@ class MainFrame(wx.Frame):
                 self.file_panel_ctrl.export_btn_ctrl.SetLabel(self.file_panel_ctrl.txt_stop)
                 self.file_panel_ctrl.export_btn_ctrl.Enable()
 
+                # 事前生成の入力を画面の最新の設定に合わせる(同じであれば生成中のものをそのまま使う)
+                self.simple_param_panel_ctrl.request_precompute()
+
                 # 別スレッドで実行
                 self.worker = ExportWorkerThread(self, TailorThreadEvent, self.is_saving, self.is_out_log)
                 self.worker.start()
@@ -361,6 +373,7 @@ class MainFrame(wx.Frame):
         self.enable()
         # プログレス非表示
         self.file_panel_ctrl.gauge_ctrl.SetValue(0)
+        self.file_panel_ctrl.progress_txt_ctrl.SetLabel("")
 
     def sound_finish(self):
         threading.Thread(target=self.sound_finish_thread).start()
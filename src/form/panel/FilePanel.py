@@ -72,6 +72,10 @@ class FilePanel(BasePanel):
         self.gauge_ctrl.SetValue(0)
         self.sizer.Add(self.gauge_ctrl, 0, wx.ALL | wx.EXPAND, 5)
 
+        # 処理段階と残り時間
+        self.progress_txt_ctrl = wx.StaticText(self, wx.ID_ANY, "", wx.DefaultPosition, wx.DefaultSize, 0)
+        self.sizer.Add(self.progress_txt_ctrl, 0, wx.LEFT | wx.RIGHT | wx.EXPAND, 5)
+
         self.Layout()
         self.fit()
 
@@ -13,8 +13,9 @@ import csv
 from form.panel.BasePanel import BasePanel
 from form.parts.FloatSliderCtrl import FloatSliderCtrl
 from form.parts.HistoryFilePickerCtrl import HistoryFilePickerCtrl
-from mmd.PmxData import RigidBody, Joint, Bdef1, Bdef2, Bdef4, Sdef
+from mmd.PmxData import Bdef1, Bdef2, Bdef4, Sdef
 from module.MMath import MRect, MVector2D, MVector3D, MVector4D, MQuaternion, MMatrix4x4 # noqa
+from module.MParamOptions import create_param_option
 from utils import MFileUtils
 from utils.MLogger import MLogger # noqa
 
@@ -186,6 +187,21 @@ class ParamPanel(BasePanel):
 
         return params
 
+    # 頂点マップの入力が揃っている設定について、出力前に頂点マップを生成しておく
+    def request_precompute(self):
+        model = self.frame.file_panel_ctrl.org_model_file_ctrl.data
+        if not model or self.org_model_digest != model.digest:
+            self.frame.precompute_worker.request(None, [])
+            return
+
+        param_options = []
+        for physics_param in self.physics_list:
+            param_option = physics_param.get_precompute_param_option()
+            if param_option:
+                param_options.append(param_option)
+
+        self.frame.precompute_worker.request(model, param_options)
+
 
 class PhysicsParam():
     def __init__(self, main_frame: wx.Frame, frame: wx.Frame, simple_window: wx.Panel, advance_window: wx.Panel, bone_window: wx.Panel, param_no: int):
@@ -239,6 +255,7 @@ class PhysicsParam():
 
         self.simple_parent_bone_ctrl = wx.Choice(self.simple_window, id=wx.ID_ANY, choices=self.frame.bone_list)
         self.simple_parent_bone_ctrl.SetToolTip(logger.transtext("材質物理の起点となる親ボーン\nボーン追従剛体を持っているボーンのみが対象となります。\n（指定された親ボーンの子に「○○中心」ボーンを追加して、それを起点に物理を設定します）"))
+        self.simple_parent_bone_ctrl.Bind(wx.EVT_CHOICE, self.set_vertex_map_setting)
         self.simple_parent_bone_sizer.Add(self.simple_parent_bone_ctrl, 0, wx.ALL, 5)
 
         self.simple_param_sizer.Add(self.simple_parent_bone_sizer, 0, wx.ALL | wx.EXPAND, 0)
@@ -273,7 +290,7 @@ class PhysicsParam():
 
         self.simple_direction_ctrl = wx.Choice(self.simple_window, id=wx.ID_ANY, choices=[logger.transtext("下"), logger.transtext("右"), logger.transtext("左")])
         self.simple_direction_ctrl.SetToolTip(logger.transtext("物理材質の向き(例：左腕側の物理を設定したい場合に「左」を設定して、物理が流れる方向を左方向に伸ばす)"))
-        self.simple_direction_ctrl.Bind(wx.EVT_CHOICE, self.main_frame.file_panel_ctrl.on_change_file)
+        self.simple_direction_ctrl.Bind(wx.EVT_CHOICE, self.set_vertex_map_setting)
         self.simple_header_grid_sizer.Add(self.simple_direction_ctrl, 0, wx.ALL, 5)
 
         self.simple_exist_physics_clear_txt = wx.StaticText(self.simple_window, wx.ID_ANY, logger.transtext("既存設定"), wx.DefaultPosition, wx.DefaultSize, 0)
@@ -285,7 +302,7 @@ class PhysicsParam():
         self.simple_exist_physics_clear_ctrl = wx.Choice(self.simple_window, id=wx.ID_ANY, choices=[logger.transtext("そのまま"), logger.transtext("再利用"), logger.transtext("上書き")])
         self.simple_exist_physics_clear_ctrl.SetToolTip(logger.transtext("指定された材質に割り当てられている既存物理（ボーン・剛体・ジョイント）がある場合の挙動\nそのまま：処理しない\n") \
                                                         + logger.transtext("再利用：ボーンとウェイトは既存のものを利用し、剛体とジョイントだけ作り直す\n上書き：ボーン・剛体・ジョイントを削除して作り直す"))
-        self.simple_exist_physics_clear_ctrl.Bind(wx.EVT_CHOICE, self.main_frame.file_panel_ctrl.on_change_file)
+        self.simple_exist_physics_clear_ctrl.Bind(wx.EVT_CHOICE, self.set_vertex_map_setting)
         self.simple_header_grid_sizer.Add(self.simple_exist_physics_clear_ctrl, 0, wx.ALL, 5)
 
         self.simple_primitive_txt = wx.StaticText(self.simple_window, wx.ID_ANY, logger.transtext("プリセット"), wx.DefaultPosition, wx.DefaultSize, 0)
@@ -357,6 +374,7 @@ class PhysicsParam():
 
         self.simple_similarity_slider = \
             FloatSliderCtrl(self.simple_window, wx.ID_ANY, 0.75, 0.4, 1, 0.01, self.simple_similarity_label, wx.DefaultPosition, (350, 30), wx.SL_HORIZONTAL)
+        self.simple_similarity_slider.Bind(wx.EVT_SCROLL_CHANGED, self.set_vertex_map_setting)
         self.simple_grid_sizer.Add(self.simple_similarity_slider, 1, wx.ALL | wx.EXPAND, 5)
 
         self.simple_similarity_max_label = wx.StaticText(self.simple_window, wx.ID_ANY, logger.transtext("1"), wx.DefaultPosition, wx.DefaultSize, 0)
@@ -1527,94 +1545,18 @@ class PhysicsParam():
             }
             MFileUtils.save_history(self.main_frame.mydir_path, self.main_frame.file_hitories)
 
-            # 簡易版オプションデータ -------------
-            params["material_name"] = self.simple_material_ctrl.GetStringSelection()
-            params["back_material_name"] = self.simple_back_material_ctrl.GetStringSelection()
-            params["edge_material_name"] = self.simple_edge_material_ctrl.GetStringSelection()
-            params["parent_bone_name"] = self.simple_parent_bone_ctrl.GetStringSelection()
-            params["abb_name"] = self.simple_abb_ctrl.GetValue()
-            params["direction"] = self.simple_direction_ctrl.GetStringSelection()
-            params["exist_physics_clear"] = self.simple_exist_physics_clear_ctrl.GetStringSelection()
-            params["vertices_csv"] = self.vertices_csv_file_ctrl.path()
-            params["similarity"] = self.simple_similarity_slider.GetValue()
-            params["fineness"] = self.simple_fineness_slider.GetValue()
-            params["mass"] = self.simple_mass_slider.GetValue()
-            params["air_resistance"] = self.simple_air_resistance_slider.GetValue()
-            params["shape_maintenance"] = self.simple_shape_maintenance_slider.GetValue()
-
-            # 詳細版オプションデータ -------------
-            params["vertical_bone_density"] = int(self.vertical_bone_density_spin.GetValue())
-            params["horizonal_bone_density"] = int(self.horizonal_bone_density_spin.GetValue())
-            # params["bone_thinning_out"] = self.bone_thinning_out_check.GetValue()
-            params["bone_thinning_out"] = False
-            params["physics_type"] = self.physics_type_ctrl.GetStringSelection()
-            params["density_type"] = self.density_type_ctrl.GetStringSelection()
-            
-            # 自身を非衝突対象
-            no_collision_group = 0
-            for nc in range(16):
-                if nc not in [int(self.simple_group_ctrl.GetStringSelection()) - 1]:
-                    no_collision_group |= 1 << nc
-
-            params["rigidbody"] = RigidBody("", "", self.main_frame.file_panel_ctrl.org_model_file_ctrl.data.bones[self.simple_parent_bone_ctrl.GetStringSelection()].index, \
-                                            int(self.simple_group_ctrl.GetStringSelection()) - 1, no_collision_group, self.advance_rigidbody_shape_type_ctrl.GetSelection(), MVector3D(), MVector3D(), \
-                                            MVector3D(), self.rigidbody_mass_spin.GetValue(), self.rigidbody_linear_damping_spin.GetValue(), self.rigidbody_angular_damping_spin.GetValue(), \
-                                            self.rigidbody_restitution_spin.GetValue(), self.rigidbody_friction_spin.GetValue(), 0)
-            params["rigidbody_coefficient"] = self.rigidbody_coefficient_spin.GetValue()
-            params["rigidbody_shape_type"] = self.advance_rigidbody_shape_type_ctrl.GetSelection()
-            params["rigidbody_balancer"] = self.advance_rigidbody_balancer_ctrl.GetValue()
-
-            params["vertical_joint"] = None
-            if self.advance_vertical_joint_valid_check.GetValue():
-                params["vertical_joint"] = \
-                    Joint("", "", -1, -1, -1, MVector3D(), MVector3D(), \
-                          MVector3D(self.vertical_joint_mov_x_min_spin.GetValue(), self.vertical_joint_mov_y_min_spin.GetValue(), self.vertical_joint_mov_z_min_spin.GetValue()), \
-                          MVector3D(self.vertical_joint_mov_x_max_spin.GetValue(), self.vertical_joint_mov_y_max_spin.GetValue(), self.vertical_joint_mov_z_max_spin.GetValue()), \
-                          MVector3D(self.vertical_joint_rot_x_min_spin.GetValue(), self.vertical_joint_rot_y_min_spin.GetValue(), self.vertical_joint_rot_z_min_spin.GetValue()), \
-                          MVector3D(self.vertical_joint_rot_x_max_spin.GetValue(), self.vertical_joint_rot_y_max_spin.GetValue(), self.vertical_joint_rot_z_max_spin.GetValue()), \
-                          MVector3D(self.vertical_joint_spring_mov_x_spin.GetValue(), self.vertical_joint_spring_mov_y_spin.GetValue(), self.vertical_joint_spring_mov_z_spin.GetValue()), \
-                          MVector3D(self.vertical_joint_spring_rot_x_spin.GetValue(), self.vertical_joint_spring_rot_y_spin.GetValue(), self.vertical_joint_spring_rot_z_spin.GetValue())
-                          )
-            params['vertical_joint_coefficient'] = self.advance_vertical_joint_coefficient_spin.GetValue()
-
-            params["horizonal_joint"] = None
-            if self.advance_horizonal_joint_valid_check.GetValue():
-                params["horizonal_joint"] = \
-                    Joint("", "", -1, -1, -1, MVector3D(), MVector3D(), \
-                          MVector3D(self.horizonal_joint_mov_x_min_spin.GetValue(), self.horizonal_joint_mov_y_min_spin.GetValue(), self.horizonal_joint_mov_z_min_spin.GetValue()), \
-                          MVector3D(self.horizonal_joint_mov_x_max_spin.GetValue(), self.horizonal_joint_mov_y_max_spin.GetValue(), self.horizonal_joint_mov_z_max_spin.GetValue()), \
-                          MVector3D(self.horizonal_joint_rot_x_min_spin.GetValue(), self.horizonal_joint_rot_y_min_spin.GetValue(), self.horizonal_joint_rot_z_min_spin.GetValue()), \
-                          MVector3D(self.horizonal_joint_rot_x_max_spin.GetValue(), self.horizonal_joint_rot_y_max_spin.GetValue(), self.horizonal_joint_rot_z_max_spin.GetValue()), \
-                          MVector3D(self.horizonal_joint_spring_mov_x_spin.GetValue(), self.horizonal_joint_spring_mov_y_spin.GetValue(), self.horizonal_joint_spring_mov_z_spin.GetValue()), \
-                          MVector3D(self.horizonal_joint_spring_rot_x_spin.GetValue(), self.horizonal_joint_spring_rot_y_spin.GetValue(), self.horizonal_joint_spring_rot_z_spin.GetValue())
-                          )
-            params['horizonal_joint_coefficient'] = self.advance_horizonal_joint_coefficient_spin.GetValue()
-
-            params["diagonal_joint"] = None
-            if self.advance_diagonal_joint_valid_check.GetValue():
-                params["diagonal_joint"] = \
-                    Joint("", "", -1, -1, -1, MVector3D(), MVector3D(), \
-                          MVector3D(self.diagonal_joint_mov_x_min_spin.GetValue(), self.diagonal_joint_mov_y_min_spin.GetValue(), self.diagonal_joint_mov_z_min_spin.GetValue()), \
-                          MVector3D(self.diagonal_joint_mov_x_max_spin.GetValue(), self.diagonal_joint_mov_y_max_spin.GetValue(), self.diagonal_joint_mov_z_max_spin.GetValue()), \
-                          MVector3D(self.diagonal_joint_rot_x_min_spin.GetValue(), self.diagonal_joint_rot_y_min_spin.GetValue(), self.diagonal_joint_rot_z_min_spin.GetValue()), \
-                          MVector3D(self.diagonal_joint_rot_x_max_spin.GetValue(), self.diagonal_joint_rot_y_max_spin.GetValue(), self.diagonal_joint_rot_z_max_spin.GetValue()), \
-                          MVector3D(self.diagonal_joint_spring_mov_x_spin.GetValue(), self.diagonal_joint_spring_mov_y_spin.GetValue(), self.diagonal_joint_spring_mov_z_spin.GetValue()), \
-                          MVector3D(self.diagonal_joint_spring_rot_x_spin.GetValue(), self.diagonal_joint_spring_rot_y_spin.GetValue(), self.diagonal_joint_spring_rot_z_spin.GetValue())
-                          )
-            params['diagonal_joint_coefficient'] = self.advance_diagonal_joint_coefficient_spin.GetValue()
-
-            params["reverse_joint"] = None
-            if self.advance_reverse_joint_valid_check.GetValue():
-                params["reverse_joint"] = \
-                    Joint("", "", -1, -1, -1, MVector3D(), MVector3D(), \
-                          MVector3D(self.reverse_joint_mov_x_min_spin.GetValue(), self.reverse_joint_mov_y_min_spin.GetValue(), self.reverse_joint_mov_z_min_spin.GetValue()), \
-                          MVector3D(self.reverse_joint_mov_x_max_spin.GetValue(), self.reverse_joint_mov_y_max_spin.GetValue(), self.reverse_joint_mov_z_max_spin.GetValue()), \
-                          MVector3D(self.reverse_joint_rot_x_min_spin.GetValue(), self.reverse_joint_rot_y_min_spin.GetValue(), self.reverse_joint_rot_z_min_spin.GetValue()), \
-                          MVector3D(self.reverse_joint_rot_x_max_spin.GetValue(), self.reverse_joint_rot_y_max_spin.GetValue(), self.reverse_joint_rot_z_max_spin.GetValue()), \
-                          MVector3D(self.reverse_joint_spring_mov_x_spin.GetValue(), self.reverse_joint_spring_mov_y_spin.GetValue(), self.reverse_joint_spring_mov_z_spin.GetValue()), \
-                          MVector3D(self.reverse_joint_spring_rot_x_spin.GetValue(), self.reverse_joint_spring_rot_y_spin.GetValue(), self.reverse_joint_spring_rot_z_spin.GetValue())
-                          )
-            params['reverse_joint_coefficient'] = self.advance_reverse_joint_coefficient_spin.GetValue()
+            setting = {
+                "material_name": self.simple_material_ctrl.GetStringSelection(),
+                "back_material_name": self.simple_back_material_ctrl.GetStringSelection(),
+                "edge_material_name": self.simple_edge_material_ctrl.GetStringSelection(),
+                "parent_bone_name": self.simple_parent_bone_ctrl.GetStringSelection(),
+                "abb_name": self.simple_abb_ctrl.GetValue(),
+                "direction": self.simple_direction_ctrl.GetStringSelection(),
+                "exist_physics_clear": self.simple_exist_physics_clear_ctrl.GetStringSelection(),
+                "vertices_csv": self.vertices_csv_file_ctrl.path(),
+                "group": self.simple_group_ctrl.GetStringSelection(),
+            }
+            params.update(create_param_option(self.main_frame.file_panel_ctrl.org_model_file_ctrl.data, setting, self.get_param_export_data()))
         else:
             if is_show_error:
                 empty_param_list = []
@@ -1633,8 +1575,25 @@ class PhysicsParam():
 
         return params, True
     
+    # 頂点マップ生成に必要な値のみの設定(値が揃っていない場合、None)
+    def get_precompute_param_option(self):
+        if not self.simple_material_ctrl.GetStringSelection() or not self.simple_parent_bone_ctrl.GetStringSelection() \
+           or self.simple_exist_physics_clear_ctrl.GetStringSelection() == logger.transtext('再利用') \
+           or (self.vertices_csv_file_ctrl.path() and not os.path.exists(self.vertices_csv_file_ctrl.path())):
+            return None
+
+        return {
+            "material_name": self.simple_material_ctrl.GetStringSelection(),
+            "parent_bone_name": self.simple_parent_bone_ctrl.GetStringSelection(),
+            "direction": logger.transtext(self.simple_direction_ctrl.GetStringSelection()),
+            "exist_physics_clear": logger.transtext(self.simple_exist_physics_clear_ctrl.GetStringSelection()),
+            "vertices_csv": self.vertices_csv_file_ctrl.path(),
+            "similarity": self.simple_similarity_slider.GetValue(),
+        }
+
     def on_change_vertices_csv(self, event: wx.Event):
         self.main_frame.file_panel_ctrl.on_change_file(event)
+        self.frame.request_precompute()
 
     def on_param_import(self, event: wx.Event):
         with wx.FileDialog(self.frame, logger.transtext("材質物理設定JSONを読み込む"), wildcard="JSONファイル (*.json)|*.json|すべてのファイル (*.*)|*.*",
@@ -1771,6 +1730,9 @@ class PhysicsParam():
         self.reverse_joint_spring_rot_z_spin.SetValue(params["reverse_joint_spring_rot_z"])
         self.advance_reverse_joint_coefficient_spin.SetValue(params['reverse_joint_coefficient'])
 
+        # 検出度・親ボーン等が変わっている場合があるので、事前生成の入力を合わせる
+        self.frame.request_precompute()
+
     def on_param_export(self, event: wx.Event):
         params = self.get_param_export_data()
 
@@ -2069,6 +2031,13 @@ class PhysicsParam():
 
         # 設定ボーンパネル初期化
         self.initialize_bone_param(event)
+
+        self.frame.request_precompute()
+
+    # 頂点マップの入力(親ボーン・方向・既存設定・検出度)
+    def set_vertex_map_setting(self, event: wx.Event):
+        self.main_frame.file_panel_ctrl.on_change_file(event)
+        self.frame.request_precompute()
     
     def set_abb_name(self, event: wx.Event):
         # バイト長を加味してスライス
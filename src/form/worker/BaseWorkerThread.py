@@ -6,9 +6,9 @@ from abc import ABCMeta, abstractmethod
 from threading import Thread
 from functools import wraps
 import time
-import threading
 
 from utils import MFormUtils # noqa
+from utils.MCancellation import CancellationToken
 from utils.MLogger import MLogger # noqa
 
 logger = MLogger(__name__)
@@ -63,9 +63,12 @@ class SimpleThread(Thread):
         self.base_thread = base_thread
         self.acallable = acallable
         self._result = None
-        super(SimpleThread, self).__init__(name="simple_thread", kwargs={"is_killed": False})
+        # 呼び出し元から停止命令が出た場合、このスレッドのログ出力時に中断する
+        self.cancel_token = CancellationToken()
+        super(SimpleThread, self).__init__(name="simple_thread")
     
     def run(self):
+        MLogger.set_cancel_token(self.cancel_token)
         self._result = self.acallable(self.base_thread)
     
     def result(self):
@@ -89,10 +92,8 @@ def task_takes_time(acallable):
             time.sleep(0.01)
 
             if base_thread.is_killed:
-                # 呼び出し元から停止命令が出ている場合、自分以外の全部のスレッドに終了命令
-                for th in threading.enumerate():
-                    if th.ident != threading.current_thread().ident:
-                        th._kwargs["is_killed"] = True
+                # 呼び出し元から停止命令が出ている場合、実行中のスレッドに中断要求
+                t.cancel_token.cancel()
                 break
         
         return t.result()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# 画面(wx)とは別プロセスで物理を設定して出力する
+# (画面側は ExportWorkerThread から起動し、ログと結果は接続を通じて受け取る)
+#
+import os
+import sys
+import time
+import traceback
+
+from mmd.PmxReader import PmxReader
+from module.MOptions import MExportOptions
+from service.PmxTailorExportService import PmxTailorExportService
+from utils.MCancellation import CancellationToken
+from utils.MProgress import ProgressCounter
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+
+# 標準出力の代わりに、出力内容を画面側に送る
+class ConnectionStdout:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, text, stack=False):
+        try:
+            self.conn.send(("log", text, stack))
+        except Exception:
+            pass
+
+    def flush(self):
+        pass
+
+
+# 出力プロセスの本体(モデルはパスから読み直し、画面で読み込んだものと同じか確認する)
+def run_export_process(conn, version_name: str, logging_level: int, model_path: str, model_digest: str, output_path: str, \
+                       param_options: list, max_workers: int, outout_datetime: str, cancel_token: CancellationToken, \
+                       progress: ProgressCounter, stage_cache_dir=None):
+    sys.stdout = ConnectionStdout(conn)
+    MLogger.initialize(level=logging_level, is_file=False)
+    MLogger.set_cancel_token(cancel_token)
+
+    result = {"result": False, "output_path": output_path, "elapsed_time": 0}
+    start = time.time()
+
+    try:
+        model = PmxReader(model_path, is_check=False, is_sizing=False).read_data()
+
+        if model_digest and model.digest != model_digest:
+            logger.error("読み込み後にモデルファイルが変更されています。もう一度読み込んでください。", decoration=MLogger.DECORATION_BOX)
+        else:
+            options = MExportOptions(
+                version_name=version_name,
+                logging_level=logging_level,
+                max_workers=max_workers,
+                pmx_model=model,
+                output_path=output_path,
+                param_options=param_options,
+                monitor=sys.stdout,
+                is_file=False,
+                outout_datetime=outout_datetime,
+                stage_cache_dir=stage_cache_dir,
+                cancel_token=cancel_token,
+                progress=progress)
+
+            result["result"] = bool(PmxTailorExportService(options).execute())
+    except Exception:
+        logger.critical("PmxTailor変換処理が意図せぬエラーで終了しました。\n\n%s", traceback.format_exc(), decoration=MLogger.DECORATION_BOX)
+    finally:
+        result["elapsed_time"] = time.time() - start
+        progress.detach()
+        conn.send(("result", result))
+        conn.close()
+
+
+# 頂点マップ事前生成プロセスの本体(結果はキャッシュディレクトリに置くだけで、ログは画面に出さない)
+def run_precompute_process(logging_level: int, model_path: str, model_digest: str, param_options: list, stage_cache_dir: str, \
+                           cancel_token: CancellationToken):
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    MLogger.initialize(level=logging_level, is_file=False)
+    MLogger.set_cancel_token(cancel_token)
+
+    try:
+        model = PmxReader(model_path, is_check=False, is_sizing=False).read_data()
+
+        if model_digest and model.digest != model_digest:
+            return
+
+        options = MExportOptions(
+            version_name="",
+            logging_level=logging_level,
+            max_workers=1,
+            pmx_model=model,
+            output_path="",
+            param_options=param_options,
+            monitor=sys.stdout,
+            is_file=False,
+            outout_datetime="",
+            stage_cache_dir=stage_cache_dir,
+            cancel_token=cancel_token)
+
+        PmxTailorExportService(options).prepare_vertex_map_stages()
+    except Exception:
+        # 中断・失敗した場合は、出力時に改めて生成する(エラーもその時に出す)
+        pass
+    finally:
+        sys.stdout.close()
@@ -6,11 +6,13 @@ import re
 import os
 import wx
 import time
-import gc
+import threading
+import multiprocessing
 
-from form.worker.BaseWorkerThread import BaseWorkerThread, task_takes_time
-from service.PmxTailorExportService import PmxTailorExportService
-from module.MOptions import MExportOptions
+from form.worker.BaseWorkerThread import BaseWorkerThread
+from form.worker.ExportWorkerProcess import run_export_process
+from utils.MCancellation import CancellationToken
+from utils.MProgress import ProgressCounter
 from utils.MLogger import MLogger # noqa
 
 logger = MLogger(__name__)
@@ -18,6 +20,11 @@ logger = MLogger(__name__)
 
 class ExportWorkerThread(BaseWorkerThread):
 
+    # 中断要求を出してから、出力プロセスを強制終了するまでの待ち時間(秒)
+    STOP_TIMEOUT = 3
+    # 進捗の表示間隔(秒)
+    PROGRESS_INTERVAL = 0.1
+
     def __init__(self, frame: wx.Frame, result_event: wx.Event, is_exec_saving: bool, is_out_log: bool):
         self.elapsed_time = 0
         self.frame = frame
@@ -25,35 +32,68 @@ class ExportWorkerThread(BaseWorkerThread):
         self.gauge_ctrl = frame.file_panel_ctrl.gauge_ctrl
         self.is_exec_saving = is_exec_saving
         self.is_out_log = is_out_log
-        self.options = None
+        self.process = None
+        self.output_path = None
+        # 出力プロセスへの中断要求
+        self.cancel_token = CancellationToken()
+        self.stop_time = None
+        # 出力プロセスの進捗(共有メモリで受け取る)
+        self.progress = ProgressCounter(is_shared=True)
 
         super().__init__(frame, self.result_event, frame.file_panel_ctrl.console_ctrl)
 
-    @task_takes_time
+    def start(self):
+        # 出力は別プロセスで行い、画面を止めないよう結果の待ち受けはスレッドで行う
+        threading.Thread(target=self.run, name="export_worker", daemon=True).start()
+
+    def stop(self):
+        super().stop()
+
+        # 出力プロセスには中断要求を出し、プールや共有メモリを片付けてから終了させる
+        self.cancel_token.cancel()
+        self.stop_time = time.time()
+
     def thread_event(self):
         try:
             start = time.time()
 
             self.result = self.frame.file_panel_ctrl.org_model_file_ctrl.load() and self.result
 
-            if self.result:
-                self.options = MExportOptions(\
-                    version_name=self.frame.version_name, \
-                    logging_level=self.frame.logging_level, \
-                    pmx_model=self.frame.file_panel_ctrl.org_model_file_ctrl.data.copy(), \
-                    output_path=self.frame.file_panel_ctrl.output_pmx_file_ctrl.file_ctrl.GetPath(), \
-                    param_options=self.frame.simple_param_panel_ctrl.get_param_options(), \
-                    monitor=self.frame.file_panel_ctrl.console_ctrl, \
-                    is_file=False, \
-                    outout_datetime=logger.outout_datetime, \
-                    max_workers=(1 if self.is_exec_saving else min(5, 32, os.cpu_count() + 4)))
+            # 材質選択時から生成中の頂点マップがある場合、出力プロセスで最初から生成し直さずに終わるのを待つ
+            while self.result and not self.is_killed and self.frame.precompute_worker.is_alive():
+                wx.CallAfter(self.show_precompute_progress)
+                self.frame.precompute_worker.join(self.PROGRESS_INTERVAL)
+
+            if self.result and not self.is_killed:
+                model = self.frame.file_panel_ctrl.org_model_file_ctrl.data
+                result_conn, conn = multiprocessing.Pipe(duplex=False)
 
-                self.result = PmxTailorExportService(self.options).execute() and self.result
+                # モデルは複製して渡さず、出力プロセスでパスから読み直す(出力に使ったメモリはプロセス終了時に全部解放される)
+                self.process = multiprocessing.Process(target=run_export_process, name="export_process", args=(\
+                    conn, \
+                    self.frame.version_name, \
+                    self.frame.logging_level, \
+                    model.path, \
+                    model.digest, \
+                    self.frame.file_panel_ctrl.output_pmx_file_ctrl.file_ctrl.GetPath(), \
+                    self.frame.simple_param_panel_ctrl.get_param_options(), \
+                    (1 if self.is_exec_saving else min(5, 32, os.cpu_count() + 4)), \
+                    logger.outout_datetime, \
+                    self.cancel_token, \
+                    self.progress, \
+                    self.frame.precompute_worker.cache_dir))
+                self.process.start()
+                conn.close()
+
+                self.result = self.receive_process_result(result_conn) and self.result
+                self.process.join()
 
             self.elapsed_time = time.time() - start
         except Exception as e:
             logger.critical("PmxTailor変換処理が意図せぬエラーで終了しました。", e, decoration=MLogger.DECORATION_BOX)
         finally:
+            self.progress.close()
+
             try:
                 logger.debug("★★★result: %s, is_killed: %s", self.result, self.is_killed)
                 if self.is_out_log or (not self.result and not self.is_killed):
@@ -68,9 +108,54 @@ class ExportWorkerThread(BaseWorkerThread):
 
             logging.shutdown()
 
+    # 出力プロセスから送られてくるログをコンソールに出力し、結果を受け取る
+    def receive_process_result(self, result_conn):
+        result = False
+        shown_time = 0
+
+        while True:
+            if time.time() - shown_time >= self.PROGRESS_INTERVAL:
+                # ログの受信有無に関わらず、一定間隔で進捗を表示する
+                wx.CallAfter(self.show_progress)
+                shown_time = time.time()
+
+            try:
+                if not result_conn.poll(self.PROGRESS_INTERVAL):
+                    if self.stop_time and time.time() - self.stop_time > self.STOP_TIMEOUT and self.process.is_alive():
+                        # 中断要求に応じない場合、出力プロセスごと終了する
+                        self.process.terminate()
+                    continue
+
+                message = result_conn.recv()
+            except (EOFError, OSError):
+                # 停止された(異常終了した)場合
+                break
+
+            if message[0] == "log":
+                self.frame.file_panel_ctrl.console_ctrl.write(message[1], message[2])
+            elif message[0] == "result":
+                result = message[1]["result"]
+                self.output_path = message[1]["output_path"]
+
+        result_conn.close()
+
+        return result
+
+    # 進捗を一定間隔で読み取ってゲージに反映する(全体数不明の段階は Pulse)
+    def show_progress(self):
+        progress = self.progress.get()
+        if progress["ratio"] is None:
+            self.gauge_ctrl.Pulse()
+        else:
+            self.gauge_ctrl.SetValue(int(progress["ratio"] * 100))
+        self.frame.file_panel_ctrl.progress_txt_ctrl.SetLabel(self.progress.get_text())
+
+    def show_precompute_progress(self):
+        self.gauge_ctrl.Pulse()
+        self.frame.file_panel_ctrl.progress_txt_ctrl.SetLabel(logger.transtext("頂点マップ"))
+
     def thread_delete(self):
-        del self.options
-        gc.collect()
-        
+        self.process = None
+
     def post_event(self):
         wx.PostEvent(self.frame, self.result_event(result=self.result and not self.is_killed, elapsed_time=self.elapsed_time))
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+import shutil
+import tempfile
+import multiprocessing
+
+from form.worker.ExportWorkerProcess import run_precompute_process
+from mmd.PmxData import PmxModel
+from utils.MCancellation import CancellationToken
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+
+# 材質等を選択した時点で、出力で使う頂点マップとボーン間距離を別プロセスで先に生成しておく
+# 結果は画面毎のキャッシュディレクトリに置き、出力プロセスは入力(キャッシュキー)が一致するものだけを使う
+class PrecomputeWorker:
+
+    # 終了時に事前生成プロセスの終了を待つ時間(秒)
+    CLOSE_TIMEOUT = 3
+
+    def __init__(self, logging_level: int):
+        self.logging_level = logging_level
+        self.cache_dir = tempfile.mkdtemp(prefix="pmx_tailor_stage_")
+        self.process = None
+        self.cancel_token = None
+        # 生成中(生成済み)の入力
+        self.request_args = None
+        # 中断要求を出したプロセスと中断要求(プロセスが終了するまで要求を参照できるよう保持する)
+        self.stopping_processes = []
+
+    # 入力が前回と同じ場合は何もしない(生成済みの結果はキャッシュディレクトリに残っている)
+    def request(self, model: PmxModel, param_options: list):
+        request_args = (model.path, model.digest, param_options) if model and param_options else None
+        if request_args == self.request_args:
+            return
+
+        self.cancel()
+        self.request_args = request_args
+
+        if not request_args:
+            return
+
+        self.cancel_token = CancellationToken()
+        self.process = multiprocessing.Process(target=run_precompute_process, name="precompute_process", args=(\
+            self.logging_level, \
+            model.path, \
+            model.digest, \
+            param_options, \
+            self.cache_dir, \
+            self.cancel_token), daemon=True)
+        self.process.start()
+
+    # 出力スレッドからも参照するので、プロセスは一旦取り出してから見る
+    def is_alive(self):
+        process = self.process
+        return process is not None and process.is_alive()
+
+    def join(self, timeout=None):
+        process = self.process
+        if process:
+            process.join(timeout)
+
+    # 中断要求だけ出して、終了は待たない
+    def cancel(self):
+        self.stopping_processes = [(process, cancel_token) for process, cancel_token in self.stopping_processes if process.is_alive()]
+
+        if self.is_alive():
+            self.cancel_token.cancel()
+            self.stopping_processes.append((self.process, self.cancel_token))
+
+        self.process = None
+        self.cancel_token = None
+        self.request_args = None
+
+    def close(self):
+        self.cancel()
+
+        for process, _ in self.stopping_processes:
+            process.join(self.CLOSE_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self.stopping_processes = []
+
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 #
+import io
 import struct
 import hashlib
 
@@ -12,8 +13,10 @@ logger = MLogger(__name__, level=1)
 
 
 class PmxReader:
-    def __init__(self, file_path, is_check=True, is_sizing=True):
+    # prefetch_buffer: 先に読み込んでおいたファイルの中身(指定された場合、ファイルを開かずにこちらを使う)
+    def __init__(self, file_path, is_check=True, is_sizing=True, prefetch_buffer=None):
         self.file_path = file_path
+        self.prefetch_buffer = prefetch_buffer
         self.is_check = is_check
         self.is_sizing = is_sizing
         self.offset = 0
@@ -102,7 +105,7 @@ class PmxReader:
 
         try:
             # PMXファイルをバイナリ読み込み
-            with open(self.file_path, "rb") as f:
+            with self.open_file() as f:
                 self.buffer = f.read()
                 # logger.test("hashlib.algorithms_available: %s", hashlib.algorithms_available)
 
@@ -986,10 +989,16 @@ class PmxReader:
         else:
             return index, pmx.bones[tmp_bone_indexes[parent_index]].index
 
+    def open_file(self):
+        if self.prefetch_buffer is not None:
+            return io.BytesIO(self.prefetch_buffer)
+
+        return open(self.file_path, "rb")
+
     def hexdigest(self):
         sha1 = hashlib.sha1()
 
-        with open(self.file_path, 'rb') as f:
+        with self.open_file() as f:
             for chunk in iter(lambda: f.read(2048 * sha1.block_size), b''):
                 sha1.update(chunk)
 
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 #
 import struct
+import contextlib
 from mmd.PmxData import PmxModel, Bone, RigidBody, Vertex, Material, Morph, DisplaySlot, RigidBody, Joint, Ik, IkLink, Bdef1, Bdef2, Bdef4, Sdef, Qdef, VertexMorphOffset, GroupMorphData, BoneMorphData, UVMorphData, MaterialMorphData    # noqa
 from module.MMath import MVector3D, get_effective_value # noqa
 from utils.MLogger import MLogger # noqa
+from utils.MProgress import ProgressCounter
 
 logger = MLogger(__name__, level=1)
 
@@ -23,8 +25,14 @@ class PmxWriter:
     def __init__(self):
         pass
     
-    def write(self, pmx: PmxModel, output_path: str):
-        with open(output_path, "wb") as fout:
+    # output_path にはファイルオブジェクト(BytesIO等)も指定できる
+    # 進捗は頂点・面・ボーン・モーフ・剛体・ジョイントの要素数で数える
+    def write(self, pmx: PmxModel, output_path, progress=None):
+        progress = progress or ProgressCounter()
+        progress.start_stage(ProgressCounter.STAGE_WRITE, len(pmx.vertex_dict) + len(pmx.indices) + len(pmx.bones) + len(pmx.org_morphs) \
+                             + len(pmx.rigidbodies) + len(pmx.joints))
+
+        with open(output_path, "wb") if isinstance(output_path, str) else contextlib.nullcontext(output_path) as fout:
             # シグニチャ
             fout.write(b'PMX ')
             fout.write(struct.pack(TYPE_FLOAT, float(2)))
@@ -126,6 +134,7 @@ class PmxWriter:
 
                 if vidx > 0 and vidx % 50000 == 0:
                     logger.debug(f"-- 頂点データ出力終了({round(vidx / len(pmx.vertex_dict.keys()) * 100, 2)}％)")
+                progress.add()
 
             logger.info("-- 頂点データ出力終了(%s)", len(pmx.vertex_dict.keys()))
 
@@ -138,6 +147,7 @@ class PmxWriter:
                     fout.write(struct.pack(vertex_idx_type, index))
 
             logger.info("-- 面データ出力終了(%s)", len(pmx.indices))
+            progress.add(len(pmx.indices))
 
             # テクスチャの数
             fout.write(struct.pack(TYPE_INT, len(pmx.textures)))
@@ -279,6 +289,7 @@ class PmxWriter:
                             self.write_number(fout, TYPE_FLOAT, float(link.limit_max.z()))
             
             logger.info("-- ボーンデータ出力終了(%s)", len(list(pmx.bones.values())))
+            progress.add(len(pmx.bones))
 
             # モーフの数
             self.write_number(fout, TYPE_INT, len(list(pmx.org_morphs.values())))
@@ -356,6 +367,7 @@ class PmxWriter:
                         self.write_number(fout, TYPE_FLOAT, float(offset.value))
 
             logger.info("-- モーフデータ出力終了(%s)", len(list(pmx.org_morphs.values())))
+            progress.add(len(pmx.org_morphs))
 
             # 表示枠の数
             self.write_number(fout, TYPE_INT, len(list(pmx.display_slots.values())))
@@ -422,6 +434,7 @@ class PmxWriter:
                 fout.write(struct.pack(TYPE_BYTE, rigidbody.mode))
 
             logger.info("-- 剛体データ出力終了(%s)", len(list(pmx.rigidbodies.values())))
+            progress.add(len(pmx.rigidbodies))
             
             # ジョイントの数
             self.write_number(fout, TYPE_INT, len(list(pmx.joints.values())))
@@ -470,6 +483,7 @@ class PmxWriter:
                 self.write_number(fout, TYPE_FLOAT, float(joint.spring_constant_rotation.z()))
 
             logger.info("-- ジョイントデータ出力終了(%s)", len(list(pmx.joints.values())))
+            progress.add(len(pmx.joints))
 
     def define_index_size(self, size: int):
         if 32768 <= size:
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# MVector3D / MQuaternion の計算を (N, 3) / (N, 4) の配列でまとめて行う
+# クォータニオンは (w, x, y, z) の順
+import numpy as np
+
+# MMath.is_almost_null と同じ閾値
+ALMOST_NULL = 0.0000001
+
+
+def normalize_vectors(vectors: np.ndarray):
+    l2 = np.linalg.norm(vectors, ord=2, axis=-1, keepdims=True)
+    l2[l2 == 0] = 1
+    return vectors / l2
+
+
+# MVector3D.length (内積の平方根で各ベクトルの長さを求める)
+def calc_lengths(vectors: np.ndarray):
+    return np.sqrt((vectors[..., np.newaxis, :] @ vectors[..., :, np.newaxis])[..., 0, 0])
+
+
+# MQuaternion.normalized (不正値は0, スカラーが0の場合は1にしてから正規化)
+def normalize_quaternions(qs: np.ndarray):
+    qs = np.where(np.isfinite(qs), qs, 0)
+    qs[:, 0] = np.where(qs[:, 0] == 0, 1, qs[:, 0])
+    lengths = np.linalg.norm(qs, ord=2, axis=-1, keepdims=True)
+    lengths[lengths == 0] = 1
+    return qs / lengths
+
+
+# MQuaternion * MQuaternion
+def multiply_quaternions(q1s: np.ndarray, q2s: np.ndarray):
+    q1s, q2s = np.broadcast_arrays(q1s, q2s)
+    w1, x1, y1, z1 = q1s[..., 0], q1s[..., 1], q1s[..., 2], q1s[..., 3]
+    w2, x2, y2, z2 = q2s[..., 0], q2s[..., 1], q2s[..., 2], q2s[..., 3]
+
+    return np.stack([w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+                     w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                     w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                     w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2], axis=-1)
+
+
+# MQuaternion.fromRotationMatrix
+def from_rotation_matrices(mats: np.ndarray):
+    qs = np.zeros((len(mats), 4), dtype=np.float64)
+    traces = mats[:, 0, 0] + mats[:, 1, 1] + mats[:, 2, 2]
+
+    is_trace = traces > 0.00000001
+    if np.any(is_trace):
+        ms = mats[is_trace]
+        ss = 2.0 * np.sqrt(traces[is_trace] + 1.0)
+        qs[is_trace, 0] = 0.25 * ss
+        qs[is_trace, 1] = (ms[:, 2, 1] - ms[:, 1, 2]) / ss
+        qs[is_trace, 2] = (ms[:, 0, 2] - ms[:, 2, 0]) / ss
+        qs[is_trace, 3] = (ms[:, 1, 0] - ms[:, 0, 1]) / ss
+
+    # 対角成分の最大の軸を基準にする
+    diagonals = np.stack([mats[:, 0, 0], mats[:, 1, 1], mats[:, 2, 2]], axis=1)
+    max_idxs = np.where(diagonals[:, 1] > diagonals[:, 0], 1, 0)
+    max_idxs = np.where(diagonals[:, 2] > diagonals[np.arange(len(mats)), max_idxs], 2, max_idxs)
+    for i, j, k in [(0, 1, 2), (1, 2, 0), (2, 0, 1)]:
+        is_axis = ~is_trace & (max_idxs == i)
+        if not np.any(is_axis):
+            continue
+        ms = mats[is_axis]
+        ss = 2.0 * np.sqrt(ms[:, i, i] - ms[:, j, j] - ms[:, k, k] + 1.0)
+        qs[is_axis, 1 + i] = 0.25 * ss
+        qs[is_axis, 0] = (ms[:, k, j] - ms[:, j, k]) / ss
+        qs[is_axis, 1 + j] = (ms[:, j, i] + ms[:, i, j]) / ss
+        qs[is_axis, 1 + k] = (ms[:, k, i] + ms[:, i, k]) / ss
+
+    return qs
+
+
+# MQuaternion.rotationTo(MVector3D(0, 0, 1), tov)
+def rotation_from_z(tovs: np.ndarray):
+    v1s = normalize_vectors(tovs)
+    ds = v1s[:, 2] + 1.0
+    qs = np.zeros((len(tovs), 4), dtype=np.float64)
+
+    # 真逆の場合、任意の軸で180度回転 (X軸 × Z軸 = -Y軸)
+    is_inverse = np.abs(ds) < ALMOST_NULL
+    qs[is_inverse] = [0, 0, -1, 0]
+
+    ds = np.sqrt(2.0 * np.where(is_inverse, 1, ds))
+    axes = np.cross(np.array([0, 0, 1], dtype=np.float64), v1s) / ds[:, np.newaxis]
+    qs[~is_inverse, 0] = (ds * 0.5)[~is_inverse]
+    qs[~is_inverse, 1:] = axes[~is_inverse]
+
+    return normalize_quaternions(qs)
+
+
+# MQuaternion.fromDirection
+def from_directions(directions: np.ndarray, ups: np.ndarray):
+    qs = np.tile(np.array([1, 0, 0, 0], dtype=np.float64), (len(directions), 1))
+    is_direction = ~np.all(np.abs(directions) < ALMOST_NULL, axis=1)
+
+    z_axes = normalize_vectors(directions)
+    x_axes = np.cross(ups, z_axes)
+    is_collinear = is_direction & (np.linalg.norm(x_axes, ord=2, axis=1) ** 2 < ALMOST_NULL)
+    is_axes = is_direction & ~is_collinear
+
+    if np.any(is_axes):
+        x_axes = normalize_vectors(x_axes[is_axes])
+        y_axes = np.cross(z_axes[is_axes], x_axes)
+        qs[is_axes] = from_rotation_matrices(np.stack([x_axes, y_axes, z_axes[is_axes]], axis=2))
+
+    if np.any(is_collinear):
+        # 平行の場合、最短回転
+        qs[is_collinear] = rotation_from_z(z_axes[is_collinear])
+
+    return qs
+
+
+# MQuaternion.toEulerAngles (度)
+def to_euler_angles(qs: np.ndarray):
+    wp, xp, yp, zp = qs[:, 0], qs[:, 1], qs[:, 2], qs[:, 3]
+
+    xx = xp * xp
+    xy = xp * yp
+    xz = xp * zp
+    xw = xp * wp
+    yy = yp * yp
+    yz = yp * zp
+    yw = yp * wp
+    zz = zp * zp
+    zw = zp * wp
+    length_squared = xx + yy + zz + wp * wp
+
+    is_scale = ~(np.abs(length_squared - 1.0) < ALMOST_NULL) & ~(np.abs(length_squared) < ALMOST_NULL)
+    scales = np.where(is_scale, length_squared, 1)
+    xx, xy, xz, xw, yy, yz, yw, zz, zw = [v / scales for v in (xx, xy, xz, xw, yy, yz, yw, zz, zw)]
+
+    pitches = np.arcsin(np.clip(-2.0 * (yz - xw), -1, 1))
+
+    # 一意に決まらない場合はロールを0とする
+    is_unique = (pitches < (np.pi / 2)) & (pitches > -(np.pi / 2))
+    gimbal_yaws = np.arctan2(-2.0 * (xy - zw), 1.0 - 2.0 * (yy + zz))
+    yaws = np.where(is_unique, np.arctan2(2.0 * (xz + yw), 1.0 - 2.0 * (xx + yy)), np.where(pitches < (np.pi / 2), -gimbal_yaws, gimbal_yaws))
+    rolls = np.where(is_unique, np.arctan2(2.0 * (xy + zw), 1.0 - 2.0 * (xx + zz)), 0.0)
+
+    return np.degrees(np.stack([pitches, yaws, rolls], axis=1))
+
+
+# MQuaternion.toMatrix4x4 の回転部分
+def to_rotation_matrices(qs: np.ndarray):
+    w, x, y, z = qs[:, 0], qs[:, 1], qs[:, 2], qs[:, 3]
+    mats = np.stack([np.stack([w * w + x * x - y * y - z * z, 2.0 * x * y - 2.0 * w * z, 2.0 * x * z + 2.0 * w * y], axis=1),
+                     np.stack([2.0 * x * y + 2.0 * w * z, w * w - x * x + y * y - z * z, 2.0 * y * z - 2.0 * w * x], axis=1),
+                     np.stack([2.0 * x * z - 2.0 * w * y, 2.0 * y * z + 2.0 * w * x, w * w - x * x - y * y + z * z], axis=1)], axis=1)
+    return mats / (w * w + x * x + y * y + z * z)[:, np.newaxis, np.newaxis]
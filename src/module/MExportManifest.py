@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+import numpy as np
+
+from mmd.PmxData import RigidBody, Joint, Bone
+from module.MMath import MVector3D
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+MANIFEST_VERSION = 2
+# 元モデル毎のマニフェストに残す出力数
+MAX_MANIFEST_OUTPUTS = 8
+
+# 剛体・ジョイントの生成にのみ使う設定値(これ以外が変わった場合はボーン・ウェイトから作り直す)
+PHYSICS_PARAM_KEYS = ["mass", "air_resistance", "shape_maintenance", "rigidbody", "rigidbody_coefficient", "rigidbody_shape_type", \
+                      "vertical_joint", "vertical_joint_coefficient", "horizonal_joint", "horizonal_joint_coefficient", \
+                      "diagonal_joint", "diagonal_joint_coefficient", "reverse_joint", "reverse_joint_coefficient"]
+
+
+# 出力マニフェストはキャッシュ保存先に、元モデル毎に保存する(出力ファイル名は毎回変わるため、元モデルのパスから決める)
+# 元モデルのフォルダは書き込めない・共有されている場合があるので使わない。保存先がない場合は保存しない(物理のみの再出力もしない)
+# 同じ元モデルから複数の出力先に出力できるよう、出力毎の結果を持つ
+def get_manifest_path(model_path: str, cache_dir: str):
+    if not model_path or not cache_dir:
+        return None
+
+    model_path = os.path.abspath(model_path)
+    return os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(model_path))[0]}.{get_value_digest(model_path)[:16]}.pmxtailor.json")
+
+
+# 監視実行時の入力マニフェストは出力と同じ場所に保存する(出力毎に、どの入力から作ったかを持つ)
+def get_input_manifest_path(output_path: str):
+    if not output_path:
+        return None
+
+    return f"{os.path.splitext(output_path)[0]}.pmxtailor.input.json"
+
+
+def load_manifest(manifest_path: str):
+    if not manifest_path or not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        logger.debug("マニフェスト読み込み失敗: %s", e)
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    return manifest
+
+
+def save_manifest(manifest_path: str, manifest: dict):
+    manifest["version"] = MANIFEST_VERSION
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+
+    # 書きかけのファイルを読まないよう、一時ファイルから置き換える(同時に保存する場合も一時ファイルは別)
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(manifest_path)}.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(manifest_path)))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# 出力毎の結果を元モデル毎のマニフェストに追加する(他の出力先の結果は上書きしない)
+def save_output_manifest(manifest_path: str, output_manifest: dict):
+    manifest = load_manifest(manifest_path) or {"outputs": {}}
+
+    # 出力ファイルが残っているものだけ、新しいものから一定数残す
+    outputs = {output_path: m for output_path, m in manifest["outputs"].items() if output_path != output_manifest["output_path"] and os.path.exists(output_path)}
+    outputs[output_manifest["output_path"]] = dict(output_manifest, saved_time=time.time())
+    manifest["outputs"] = dict(sorted(outputs.items(), key=lambda item: item[1]["saved_time"])[-MAX_MANIFEST_OUTPUTS:])
+
+    save_manifest(manifest_path, manifest)
+
+
+# 出力先の前回の結果。ない場合は最後に出力した結果(どちらもない場合、None)
+def get_output_manifest(manifest: dict, output_path: str):
+    if not manifest or not manifest.get("outputs"):
+        return None
+
+    output_path = os.path.abspath(output_path)
+    if output_path in manifest["outputs"]:
+        return manifest["outputs"][output_path]
+
+    return max(manifest["outputs"].values(), key=lambda m: m["saved_time"])
+
+
+def get_file_digest(file_path: str):
+    sha1 = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha1.update(chunk)
+
+    return sha1.hexdigest()
+
+
+# 書き込み前の出力内容のハッシュ値(get_file_digest と同じ値)
+def get_buffer_digest(buffer: bytes):
+    return hashlib.sha1(buffer).hexdigest()
+
+
+# 設定値のハッシュ (ボーン・ウェイトに関わる設定, 剛体・ジョイントにのみ関わる設定)
+def get_param_hashes(param_option: dict, target_vertices: list):
+    structure_values = {k: to_manifest_value(v) for k, v in sorted(param_option.items()) if k not in PHYSICS_PARAM_KEYS}
+    # 頂点CSVは中身が変わっている可能性があるので、対象頂点で比較する
+    structure_values["target_vertices"] = to_manifest_value(target_vertices)
+    physics_values = {k: to_manifest_value(param_option.get(k)) for k in PHYSICS_PARAM_KEYS}
+
+    return get_value_digest(structure_values), get_value_digest(physics_values)
+
+
+def get_value_digest(values):
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def to_manifest_value(value):
+    if isinstance(value, RigidBody):
+        return [value.bone_index, value.collision_group, value.no_collision_group, value.shape_type, value.param.mass, value.param.linear_damping, \
+                value.param.angular_damping, value.param.restitution, value.param.friction, value.mode]
+    if isinstance(value, Joint):
+        return [to_manifest_value(v) for v in [value.translation_limit_min, value.translation_limit_max, value.rotation_limit_min, value.rotation_limit_max, \
+                                               value.spring_constant_translation, value.spring_constant_rotation]]
+    if isinstance(value, MVector3D):
+        return value.data().tolist()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): to_manifest_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_manifest_value(v) for v in value]
+
+    return value
+
+
+# 剛体・ジョイントを作り直すために必要な、ボーン生成結果
+def encode_physics_state(root_bone: Bone, tmp_all_bones: dict, map_states: list, rigidbody_names: list, joint_names: list):
+    return {
+        "root_bone_name": root_bone.name,
+        # ボーン名: (親ボーン名, 本登録有無, 位置)
+        "tmp_bones": {bone_name: [tmp_bone["parent"], tmp_bone["regist"], tmp_bone["bone"].position.data().tolist()] for bone_name, tmp_bone in tmp_all_bones.items()},
+        # 頂点マップ毎の (左右の連続有無, 登録ボーンINDEX[縦INDEX, [[横INDEX, 全体横INDEX], ...]])
+        "maps": [{"vertex_connected": [bool(c) for c in vertex_connected], \
+                  "registed_bone_indexs": [[int(v_yidx), [[int(v_xidx), int(total_v_xidx)] for v_xidx, total_v_xidx in v_xidxs.items()]] for v_yidx, v_xidxs in registed_bone_indexs.items()]} \
+                 for vertex_connected, registed_bone_indexs in map_states],
+        "rigidbodies": rigidbody_names,
+        "joints": joint_names,
+    }
+
+
+def decode_tmp_all_bones(physics_state: dict, bones: dict, root_bone: Bone):
+    tmp_all_bones = {}
+    for bone_name, (parent_name, is_regist, position) in physics_state["tmp_bones"].items():
+        if is_regist:
+            bone = bones[bone_name]
+        else:
+            bone = Bone(bone_name, bone_name, MVector3D(*position), root_bone.index, 0, 0x0000 | 0x0002)
+        tmp_all_bones[bone_name] = {"bone": bone, "parent": parent_name, "regist": is_regist}
+
+    return tmp_all_bones
+
+
+def decode_map_states(physics_state: dict):
+    return [(map_state["vertex_connected"], {v_yidx: {v_xidx: total_v_xidx for v_xidx, total_v_xidx in v_xidxs} for v_yidx, v_xidxs in map_state["registed_bone_indexs"]}) \
+            for map_state in physics_state["maps"]]
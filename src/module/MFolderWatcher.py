@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import sys
+import time
+import struct
+import select
+import ctypes
+import ctypes.util
+
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+# inotify のイベント種別 (書き込み終了・移動して来た・作成・変更)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+# inotify_event 構造体のヘッダ (wd, mask, cookie, len)
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+
+# フォルダ内のファイル変更を監視する
+# Linux では inotify、それ以外の環境(もしくは inotify が使えない場合)は、一定間隔でファイルの状態を比較する
+class FolderWatcher:
+
+    def __init__(self, dir_paths, is_polling=False):
+        self.dir_paths = sorted(set([os.path.abspath(dir_path) for dir_path in dir_paths]))
+        # キー：監視ID、値：フォルダパス
+        self.watch_dirs = {}
+        self.inotify_fd = None if is_polling else self.init_inotify()
+        # キー：ファイルパス、値：(更新日時, サイズ)
+        self.file_states = {} if self.inotify_fd is not None else self.scan()
+
+    def init_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return None
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK)
+            if fd < 0:
+                return None
+
+            for dir_path in self.dir_paths:
+                wd = libc.inotify_add_watch(fd, os.fsencode(dir_path), IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+                if wd < 0:
+                    os.close(fd)
+                    return None
+                self.watch_dirs[wd] = dir_path
+        except Exception as e:
+            logger.debug("inotify 初期化失敗: %s", e)
+            return None
+
+        return fd
+
+    def is_polling(self):
+        return self.inotify_fd is None
+
+    def scan(self):
+        file_states = {}
+        for dir_path in self.dir_paths:
+            if not os.path.isdir(dir_path):
+                continue
+            for entry in os.scandir(dir_path):
+                if entry.is_file():
+                    stat = entry.stat()
+                    file_states[os.path.join(dir_path, entry.name)] = (stat.st_mtime_ns, stat.st_size)
+
+        return file_states
+
+    # 変更されたファイルパスの集合 (変更がない場合、timeout秒まで待つ)
+    def wait(self, timeout: float):
+        if self.is_polling():
+            time.sleep(timeout)
+            file_states = self.scan()
+            changed_paths = set([file_path for file_path, file_state in file_states.items() if self.file_states.get(file_path) != file_state])
+            self.file_states = file_states
+            return changed_paths
+
+        changed_paths = set()
+        readable, _, _ = select.select([self.inotify_fd], [], [], timeout)
+        if not readable:
+            return changed_paths
+
+        try:
+            data = os.read(self.inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return changed_paths
+
+        offset = 0
+        while offset + INOTIFY_EVENT_HEADER.size <= len(data):
+            wd, _, _, name_len = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b"\0")
+            offset += name_len
+            if wd in self.watch_dirs and name:
+                changed_paths.add(os.path.join(self.watch_dirs[wd], os.fsdecode(name)))
+
+        return changed_paths
+
+    def close(self):
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+import math
+
+import numpy as np
+
+from mmd.PmxData import Joint
+from module.MMath import MVector3D
+from module.MBatchMath import normalize_vectors, from_directions, to_euler_angles
+
+# バランサー剛体とのジョイント制限値 (項目, xyz)
+BALANCER_JOINT_LIMITS = np.array([[0, 0, 0], [0, 0, 0], [0, 0, 0], [0, 0, 0], [100000, 100000, 100000], [100000, 100000, 100000]], dtype=np.float64)
+# バランサー補助剛体同士のジョイント制限値
+BALANCER_SUB_JOINT_LIMITS = np.array([[-50, -50, -50], [50, 50, 50], [math.radians(1), math.radians(1), math.radians(1)], [0, 0, 0], [0, 0, 0], [0, 0, 0]], dtype=np.float64)
+
+
+# ジョイントの位置・回転・制限値を行として溜めておき、まとめて計算して生成する
+class JointBatch:
+
+    def __init__(self):
+        # 位置の元になる点(最大4点の平均)
+        self.position_points = []
+        self.position_counts = []
+        # 回転の元になる点(軸の始点・終点, 上方向の始点・終点)
+        self.rotation_points = []
+        # 制限値テーブル (段, 項目, xyz)
+        self.limit_tables = []
+        # (名前, 剛体INDEX A, 剛体INDEX B, 位置行, 回転行, 制限値テーブル, 制限値行, 移動制限値テーブル, 移動制限値行)
+        self.joints = []
+
+    # 位置行を追加(指定点の平均)
+    def add_position(self, *positions: MVector3D):
+        self.position_points.append([p.data() for p in positions] + [np.zeros(3)] * (4 - len(positions)))
+        self.position_counts.append(len(positions))
+        return len(self.position_counts) - 1
+
+    # 回転行を追加(軸方向と上方向から求めた向き)
+    def add_rotation(self, axis_from: MVector3D, axis_to: MVector3D, up_from: MVector3D, up_to: MVector3D):
+        self.rotation_points.append([axis_from.data(), axis_to.data(), up_from.data(), up_to.data()])
+        return len(self.rotation_points) - 1
+
+    # 制限値テーブルを追加 (段, 項目, xyz)
+    def add_limit_table(self, limits: np.ndarray):
+        self.limit_tables.append(np.asarray(limits, dtype=np.float64).reshape(-1, 6, 3))
+        return len(self.limit_tables) - 1
+
+    # ジョイント行を追加
+    # 移動制限値テーブルを指定した場合、移動制限のみそちらの値を使う
+    # 回転行がNoneの場合は回転なし
+    def add_joint(self, name: str, rigidbody_index_a: int, rigidbody_index_b: int, position_row: int, rotation_row, \
+                  limit_table: int, limit_row: int, mov_limit_table=None, mov_limit_row=None):
+        self.joints.append((name, rigidbody_index_a, rigidbody_index_b, position_row, -1 if rotation_row is None else rotation_row, \
+                            limit_table, limit_row, limit_table if mov_limit_table is None else mov_limit_table, limit_row if mov_limit_row is None else mov_limit_row))
+        return len(self.joints) - 1
+
+    # 指定行のジョイントを生成
+    def create_joints(self, joint_rows: list):
+        if len(joint_rows) == 0:
+            return []
+
+        names, rigidbody_idxs_a, rigidbody_idxs_b, position_rows, rotation_rows, limit_tables, limit_rows, mov_limit_tables, mov_limit_rows = \
+            zip(*[self.joints[jidx] for jidx in joint_rows])
+
+        # 位置
+        position_points = np.array(self.position_points, dtype=np.float64)
+        position_counts = np.array(self.position_counts, dtype=np.float64)
+        positions = np.sum(position_points, axis=1) / position_counts[:, np.newaxis]
+
+        # 回転量
+        radians = np.zeros((len(self.rotation_points) + 1, 3), dtype=np.float64)
+        if len(self.rotation_points) > 0:
+            rotation_points = np.array(self.rotation_points, dtype=np.float64)
+            joint_axises = normalize_vectors(rotation_points[:, 1] - rotation_points[:, 0])
+            joint_axis_ups = normalize_vectors(rotation_points[:, 3] - rotation_points[:, 2])
+            joint_axis_crosses = normalize_vectors(np.cross(joint_axises, joint_axis_ups))
+            radians[:-1] = np.radians(to_euler_angles(from_directions(joint_axises, joint_axis_crosses)))
+
+        # 制限値
+        all_limits = np.concatenate(self.limit_tables, axis=0)
+        limits = all_limits[self.get_limit_indexes(limit_tables, limit_rows)]
+        limits[:, :2] = all_limits[self.get_limit_indexes(mov_limit_tables, mov_limit_rows), :2]
+
+        positions = positions[np.array(position_rows)]
+        radians = radians[np.array(rotation_rows)]
+
+        joints = []
+        for name, rigidbody_index_a, rigidbody_index_b, position, radian, limit in zip(names, rigidbody_idxs_a, rigidbody_idxs_b, positions, radians, limits):
+            joints.append(Joint(name, name, 0, rigidbody_index_a, rigidbody_index_b, MVector3D(position), MVector3D(radian), \
+                                MVector3D(limit[0]), MVector3D(limit[1]), MVector3D(limit[2]), MVector3D(limit[3]), MVector3D(limit[4]), MVector3D(limit[5])))
+
+        return joints
+
+    # 制限値テーブルを連結した配列でのINDEX(段INDEXは配列と同じく負数は後ろから)
+    def get_limit_indexes(self, limit_tables: tuple, limit_rows: tuple):
+        table_lengths = np.array([len(limits) for limits in self.limit_tables], dtype=np.int64)
+        table_offsets = np.cumsum(table_lengths) - table_lengths
+
+        lengths = table_lengths[np.array(limit_tables, dtype=np.int64)]
+        rows = np.array(limit_rows, dtype=np.int64)
+        if np.any((rows >= lengths) | (rows < -lengths)):
+            raise IndexError(f"joint limit row out of range: {rows[(rows >= lengths) | (rows < -lengths)].tolist()}")
+
+        return table_offsets[np.array(limit_tables, dtype=np.int64)] + np.where(rows < 0, rows + lengths, rows)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+from functools import lru_cache
+
+import numpy as np
+
+from mmd.PmxData import Joint
+
+# ジョイントの制限・ばね値の項目
+JOINT_LIMIT_CHANNELS = ['translation_limit_min', 'translation_limit_max', 'rotation_limit_min', 'rotation_limit_max', \
+                        'spring_constant_translation', 'spring_constant_rotation']
+
+
+# 段ごとのジョイント制限値
+# 根元は値/係数、末端は値となる曲線(直線: 2点ベジェ, 曲線: 3点ベジェ)を段INDEX毎に評価したもの
+class JointLimitProfile:
+
+    def __init__(self, values: tuple, coefficient: float, min_vy: float, middle_vy: float, max_vy: float):
+        xs = np.arange(min_vy, max_vy, step=1)
+
+        # (項目, xyz)
+        end_values = np.array(values, dtype=np.float64).reshape(len(JOINT_LIMIT_CHANNELS), 3)
+        start_values = end_values / coefficient
+
+        # 直線 [[min_vy, max_vy], [値/係数, 値]]
+        ts = (xs - min_vy) / (max_vy - min_vy) if max_vy != min_vy else np.zeros(len(xs))
+        self.linears = start_values[..., np.newaxis] + (end_values - start_values)[..., np.newaxis] * ts
+        # キャッシュして使い回すので書き換え不可
+        self.linears.setflags(write=False)
+
+        self.curves = None
+        if middle_vy is not None:
+            # 曲線 [[min_vy, middle_vy, max_vy], [値/係数, 値/係数, 値]]
+            # x(t) = min_vy + b * t + a * t^2 を t について解く
+            a = min_vy - 2 * middle_vy + max_vy
+            b = 2 * (middle_vy - min_vy)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ts = np.nan_to_num(2 * (xs - min_vy) / (b + np.sqrt(b * b + 4 * a * (xs - min_vy))))
+            self.curves = start_values[..., np.newaxis] * ((1 - ts) ** 2 + 2 * ts * (1 - ts)) + end_values[..., np.newaxis] * (ts ** 2)
+            self.curves.setflags(write=False)
+
+    # ジョイントに設定する段ごとの値 (段, 項目, xyz)
+    # 移動制限は直線、回転制限(ラジアン)とばねは曲線で補間したもの
+    def joint_limits(self):
+        return np.concatenate([self.linears[:2], np.radians(self.curves[2:4]), self.curves[4:]], axis=0).transpose(2, 0, 1)
+
+    # 直線補間の段ごとの値 (xs, ys, zs)
+    def linear(self, channel: str):
+        return self.linears[JOINT_LIMIT_CHANNELS.index(channel)]
+
+    # 曲線補間の段ごとの値 (xs, ys, zs)
+    def curve(self, channel: str):
+        return self.curves[JOINT_LIMIT_CHANNELS.index(channel)]
+
+
+@lru_cache(maxsize=128)
+def c_get_joint_limit_profile(values: tuple, coefficient: float, min_vy: float, middle_vy: float, max_vy: float):
+    return JointLimitProfile(values, coefficient, min_vy, middle_vy, max_vy)
+
+
+# ジョイント設定・係数・段数が同じならば使い回す
+def get_joint_limit_profile(joint: Joint, coefficient: float, min_vy: float, max_vy: float, middle_vy=None):
+    values = tuple(v for channel in JOINT_LIMIT_CHANNELS for v in getattr(joint, channel).data().tolist())
+    return c_get_joint_limit_profile(values, coefficient, min_vy, middle_vy, max_vy)
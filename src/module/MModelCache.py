@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import threading
+from collections import OrderedDict
+
+from mmd.PmxReader import PmxReader
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+
+# 読み込み済みモデルのキャッシュ
+# ファイルパス毎にLRUで保持し、ファイルが更新されている場合は読み込み直す
+class ModelCache:
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        # キー：ファイルパス、値：(ファイル状態, モデル)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    # モデルとキャッシュから取得できたか
+    def get(self, model_path: str):
+        model_path = os.path.abspath(model_path)
+        file_state = self.get_file_state(model_path)
+
+        with self.lock:
+            if model_path in self.entries and self.entries[model_path][0] == file_state:
+                self.entries.move_to_end(model_path)
+                return self.entries[model_path][1], True
+
+        model = PmxReader(model_path, is_check=False, is_sizing=False).read_data()
+
+        with self.lock:
+            self.entries[model_path] = (file_state, model)
+            self.entries.move_to_end(model_path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        return model, False
+
+    def get_file_state(self, model_path: str):
+        stat = os.stat(model_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get_model_paths(self):
+        with self.lock:
+            return list(self.entries.keys())
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
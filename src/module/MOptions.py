@@ -2,6 +2,8 @@
 #
 
 from mmd.PmxData import PmxModel
+from utils.MCancellation import CancellationToken
+from utils.MProgress import ProgressCounter
 from utils.MLogger import MLogger # noqa
 
 logger = MLogger(__name__)
@@ -10,7 +12,8 @@ logger = MLogger(__name__)
 class MExportOptions:
 
     def __init__(self, version_name: str, logging_level: int, max_workers: int, pmx_model: PmxModel, output_path: str, \
-                 param_options: dict, monitor, is_file: bool, outout_datetime: str):
+                 param_options: dict, monitor, is_file: bool, outout_datetime: str, stage_cache_dir=None, \
+                 cancel_token=None, progress=None):
         self.version_name = version_name
         self.logging_level = logging_level
         self.pmx_model = pmx_model
@@ -20,6 +23,12 @@ class MExportOptions:
         self.is_file = is_file
         self.outout_datetime = outout_datetime
         self.max_workers = max_workers
+        # 頂点マップ等・出力マニフェストのキャッシュ保存先(Noneの場合、メモリ上のみ。出力マニフェストは保存しない)
+        self.stage_cache_dir = stage_cache_dir
+        # 処理の中断要求(指定がない場合、中断されないトークン)
+        self.cancel_token = cancel_token or CancellationToken()
+        # 処理段階毎の進捗(指定がない場合、どこからも参照しない)
+        self.progress = progress or ProgressCounter()
 
 
 class MOptionsDataSet:
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import json
+
+from mmd.PmxData import PmxModel, RigidBody, Joint
+from module.MMath import MVector3D
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+# 材質毎の設定項目(画面の簡易版ヘッダで指定する値)の初期値
+SETTING_DEFAULTS = {"direction": "下", "exist_physics_clear": "そのまま", "back_material_name": "", "edge_material_name": "", "vertices_csv": ""}
+# 材質毎の必須設定項目
+SETTING_REQUIRED_KEYS = ["material_name", "parent_bone_name", "group", "abb_name"]
+# ジョイント種別
+JOINT_TYPES = ["vertical", "horizonal", "diagonal", "reverse"]
+
+
+# 材質毎の設定と物理設定JSON(ParamPanel.get_param_export_data の形式)から、出力用のパラメーターを生成する
+def create_param_option(model: PmxModel, setting: dict, params: dict):
+    param_option = {}
+
+    # 簡易版オプションデータ -------------
+    param_option["material_name"] = setting["material_name"]
+    param_option["back_material_name"] = setting.get("back_material_name", "")
+    param_option["edge_material_name"] = setting.get("edge_material_name", "")
+    param_option["parent_bone_name"] = setting["parent_bone_name"]
+    param_option["abb_name"] = setting["abb_name"]
+    param_option["direction"] = logger.transtext(setting.get("direction", SETTING_DEFAULTS["direction"]))
+    param_option["exist_physics_clear"] = logger.transtext(setting.get("exist_physics_clear", SETTING_DEFAULTS["exist_physics_clear"]))
+    param_option["vertices_csv"] = setting.get("vertices_csv", "")
+    param_option["similarity"] = params["similarity"]
+    param_option["fineness"] = params["fineness"]
+    param_option["mass"] = params["mass"]
+    param_option["air_resistance"] = params["air_resistance"]
+    param_option["shape_maintenance"] = params["shape_maintenance"]
+
+    # 詳細版オプションデータ -------------
+    param_option["vertical_bone_density"] = int(params["vertical_bone_density"])
+    param_option["horizonal_bone_density"] = int(params["horizonal_bone_density"])
+    param_option["bone_thinning_out"] = False
+    param_option["physics_type"] = logger.transtext(params["physics_type"])
+    param_option["density_type"] = logger.transtext(params.get("density_type", "頂点"))
+
+    # 自身を非衝突対象
+    group = int(setting["group"]) - 1
+    no_collision_group = 0
+    for nc in range(16):
+        if nc not in [group]:
+            no_collision_group |= 1 << nc
+
+    param_option["rigidbody"] = RigidBody("", "", model.bones[setting["parent_bone_name"]].index, group, no_collision_group, params["rigidbody_shape_type"], \
+                                          MVector3D(), MVector3D(), MVector3D(), params["rigidbody_mass"], params["rigidbody_linear_damping"], \
+                                          params["rigidbody_angular_damping"], params["rigidbody_restitution"], params["rigidbody_friction"], 0)
+    param_option["rigidbody_coefficient"] = params["rigidbody_coefficient"]
+    param_option["rigidbody_shape_type"] = params["rigidbody_shape_type"]
+    param_option["rigidbody_balancer"] = params["rigidbody_balancer"]
+
+    for joint_type in JOINT_TYPES:
+        param_option[f"{joint_type}_joint"] = None
+        if params[f"{joint_type}_joint_valid"]:
+            param_option[f"{joint_type}_joint"] = \
+                Joint("", "", -1, -1, -1, MVector3D(), MVector3D(), \
+                      MVector3D(*[params[f"{joint_type}_joint_mov_{axis}_min"] for axis in "xyz"]), \
+                      MVector3D(*[params[f"{joint_type}_joint_mov_{axis}_max"] for axis in "xyz"]), \
+                      MVector3D(*[params[f"{joint_type}_joint_rot_{axis}_min"] for axis in "xyz"]), \
+                      MVector3D(*[params[f"{joint_type}_joint_rot_{axis}_max"] for axis in "xyz"]), \
+                      MVector3D(*[params[f"{joint_type}_joint_spring_mov_{axis}"] for axis in "xyz"]), \
+                      MVector3D(*[params[f"{joint_type}_joint_spring_rot_{axis}"] for axis in "xyz"]))
+        param_option[f"{joint_type}_joint_coefficient"] = params[f"{joint_type}_joint_coefficient"]
+
+    return param_option
+
+
+# ボーン並び順(行毎のボーン名リスト)から、ボーングリッドと行数・列数を生成する
+def create_bone_grid(bone_rows: list):
+    bone_grid = {}
+    max_r = 0
+    max_c = 0
+    for r, bone_names in enumerate(bone_rows):
+        bone_grid[r] = {}
+        for c, bone_name in enumerate(bone_names):
+            bone_grid[r][c] = bone_name or ""
+            max_r = r if r > max_r and bone_name else max_r
+            max_c = c if c > max_c and bone_name else max_c
+
+    return bone_grid, max_r + 1, max_c + 1
+
+
+# 画面を介さずに設定を読み込む場合の、材質毎の設定チェック(問題がある場合、エラーメッセージ)
+def validate_setting(model: PmxModel, setting: dict, params: dict):
+    empty_keys = [k for k in SETTING_REQUIRED_KEYS if not setting.get(k)]
+    if empty_keys:
+        return logger.transtext("設定に値が指定されていません: %s") % ", ".join(empty_keys)
+
+    if setting["material_name"] not in model.material_vertices:
+        return logger.transtext("指定された材質がモデルに存在しません: %s") % setting["material_name"]
+
+    if setting["parent_bone_name"] not in model.bones:
+        return logger.transtext("指定された親ボーンがモデルに存在しません: %s") % setting["parent_bone_name"]
+
+    if setting["material_name"] == setting.get("back_material_name"):
+        return logger.transtext("物理材質と同じ材質が裏面に指定されています。")
+
+    is_reuse = logger.transtext(setting.get("exist_physics_clear", SETTING_DEFAULTS["exist_physics_clear"])) == logger.transtext('再利用')
+    if logger.transtext(params["physics_type"]) == logger.transtext('髪') and not is_reuse:
+        return logger.transtext("髪物理を設定する時には、既存設定は「再利用」を指定してください。")
+
+    if logger.transtext(params["physics_type"]) == logger.transtext('単一揺') and not is_reuse:
+        return logger.transtext("単一揺れ物物理を設定する時には、既存設定は「再利用」を指定してください。")
+
+    if is_reuse and not any([bone_name for bone_names in setting.get("bone_grid", []) for bone_name in bone_names]):
+        return logger.transtext("既存設定を再利用する場合、「パラ調整(ボーン)」画面で有効なボーン並び順を指定してください。")
+
+    if setting.get("vertices_csv") and not os.path.exists(setting["vertices_csv"]):
+        return logger.transtext("頂点CSVファイルが存在しません")
+
+    return None
+
+
+# 物理設定JSONの読み込み(設定内に直接書かれている場合はそのまま)
+def load_params(params, base_dir=""):
+    if isinstance(params, dict):
+        return params
+
+    with open(os.path.join(base_dir, params), "rb") as f:
+        data = f.read()
+
+    try:
+        return json.loads(data.decode("utf-8"))
+    except UnicodeDecodeError:
+        # 画面からエクスポートしたJSONは実行環境の文字コードで保存されている
+        return json.loads(data.decode("cp932"))
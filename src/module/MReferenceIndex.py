@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+import numpy as np
+
+from mmd.PmxData import PmxModel, BoneMorphData
+
+
+# モデル内の逆参照(ボーン → 参照元, 剛体 → ジョイント)
+class ModelReferenceIndex:
+
+    def __init__(self, model: PmxModel):
+        # ボーンINDEX → 子ボーンINDEXリスト
+        self.bone_children = {}
+        # ボーンINDEX → 付与子ボーンINDEXリスト
+        self.bone_effect_children = {}
+        # ボーンINDEX → IKターゲットとしているIKボーンINDEXリスト
+        self.bone_ik_targets = {}
+        # ボーンINDEX → IKリンクとしているIKボーンINDEXリスト
+        self.bone_ik_links = {}
+        # ボーンINDEX → ボーンモーフ名リスト
+        self.bone_morphs = {}
+        # ボーンINDEX → 剛体名リスト
+        self.bone_rigidbodies = {}
+        # 剛体INDEX → ジョイント名リスト
+        self.rigidbody_joints = {}
+        # ボーン・ジョイントのモデル内順序
+        self.bone_orders = {}
+        self.joint_orders = {}
+
+        for bidx, bone in enumerate(model.bones.values()):
+            self.bone_orders[bone.index] = bidx
+            self.bone_children.setdefault(bone.parent_index, []).append(bone.index)
+
+            if bone.getExternalRotationFlag() or bone.getExternalTranslationFlag():
+                self.bone_effect_children.setdefault(bone.effect_index, []).append(bone.index)
+
+            if bone.getIkFlag():
+                self.bone_ik_targets.setdefault(bone.ik.target_index, []).append(bone.index)
+                for link in bone.ik.link:
+                    self.bone_ik_links.setdefault(link.bone_index, []).append(bone.index)
+
+        for morph in model.org_morphs.values():
+            if morph.morph_type == 2:
+                for offset in morph.offsets:
+                    if type(offset) is BoneMorphData:
+                        self.bone_morphs.setdefault(offset.bone_index, []).append(morph.name)
+
+        for rigidbody in model.rigidbodies.values():
+            self.bone_rigidbodies.setdefault(rigidbody.bone_index, []).append(rigidbody.name)
+
+        for jidx, joint in enumerate(model.joints.values()):
+            self.joint_orders[joint.name] = jidx
+            self.rigidbody_joints.setdefault(joint.rigidbody_index_a, []).append(joint.name)
+            self.rigidbody_joints.setdefault(joint.rigidbody_index_b, []).append(joint.name)
+
+    # 指定ボーンを参照しているボーンINDEXリスト(モデル内順序)
+    def get_referring_bones(self, bone_index: int):
+        bone_idxs = set(self.bone_children.get(bone_index, [])) | set(self.bone_effect_children.get(bone_index, [])) \
+            | set(self.bone_ik_targets.get(bone_index, [])) | set(self.bone_ik_links.get(bone_index, []))
+        return sorted(bone_idxs, key=lambda bidx: self.bone_orders[bidx])
+
+    # 指定ボーンをボーンモーフとしているモーフ名リスト
+    def get_bone_morphs(self, bone_index: int):
+        return self.bone_morphs.get(bone_index, [])
+
+    # 指定ボーン群に紐付く剛体名リスト
+    def get_rigidbodies(self, bone_idxs: list):
+        rigidbody_names = []
+        for bone_index in bone_idxs:
+            rigidbody_names.extend(self.bone_rigidbodies.get(bone_index, []))
+        return rigidbody_names
+
+    # 指定剛体群に紐付くジョイント名リスト(モデル内順序)
+    def get_joints(self, rigidbody_idxs: list):
+        joint_names = set()
+        for rigidbody_index in rigidbody_idxs:
+            joint_names |= set(self.rigidbody_joints.get(rigidbody_index, []))
+        return sorted(joint_names, key=lambda joint_name: self.joint_orders[joint_name])
+
+
+# ボーン × 頂点のウェイト利用状況(CSR)
+class BoneWeightUsage:
+
+    def __init__(self, model: PmxModel):
+        # 行 = ウェイトボーン(model.vertices の順), 列 = 頂点INDEX
+        self.bone_idxs = list(model.vertices.keys())
+        lengths = np.array([len(vertices) for vertices in model.vertices.values()], dtype=np.int64)
+        self.indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(lengths)
+        self.indices = np.array([vertex.index for vertices in model.vertices.values() for vertex in vertices], dtype=np.int64)
+        # 各行のINDEX
+        self.rows = np.repeat(np.arange(len(lengths)), lengths)
+
+        # 頂点INDEX → 所属材質INDEX(最初に見つかった材質。見つからない場合は最後の材質)
+        self.material_names = list(model.material_vertices.keys())
+        self.vertex_count = len(model.vertex_dict)
+        self.vertex_materials = np.full(self.vertex_count, len(self.material_names) - 1, dtype=np.int64)
+        for midx in reversed(range(len(self.material_names))):
+            self.vertex_materials[np.array(model.material_vertices[self.material_names[midx]], dtype=np.int64)] = midx
+
+    # 対象頂点以外にウェイトが乗っている最初の頂点INDEX(ボーンINDEX → 頂点INDEX)
+    def get_outside_vertices(self, target_vertices: list):
+        is_target = np.zeros(self.vertex_count, dtype=np.bool_)
+        is_target[np.array(list(target_vertices), dtype=np.int64)] = True
+
+        outside_pos = np.where(~is_target[self.indices])[0]
+        rows, first_pos = np.unique(self.rows[outside_pos], return_index=True)
+
+        return dict([(self.bone_idxs[row], int(vidx)) for row, vidx in zip(rows.tolist(), self.indices[outside_pos[first_pos]].tolist())])
+
+    # 頂点の所属材質名
+    def get_material_name(self, vertex_idx: int):
+        return self.material_names[self.vertex_materials[vertex_idx]]
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from mmd.PmxData import PmxModel, Vertex, Bone
+from module.MMath import MVector3D
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+
+# モデルの頂点・面の配列を共有メモリに置く
+# プロセスプールのワーカーにはモデルを渡さず、参照情報(handle)だけを渡して名前から参照させる
+class SharedModelArrays:
+
+    def __init__(self, model: PmxModel):
+        vertices = [model.vertex_dict[vidx] for vidx in range(len(model.vertex_dict))]
+        arrays = {
+            "positions": np.array([vertex.position.data() for vertex in vertices], dtype=np.float64).reshape(-1, 3),
+            "normals": np.array([vertex.normal.data() for vertex in vertices], dtype=np.float64).reshape(-1, 3),
+            "indices": np.array([model.indices[iidx] for iidx in range(len(model.indices))], dtype=np.int32).reshape(-1, 3),
+        }
+
+        # キー：配列名、値：共有メモリ
+        self.blocks = {}
+        # 頂点マップ生成では親ボーンの位置を参照するので、ボーンは名前・INDEX・位置だけ渡す
+        self.handle = {"material_ranges": get_material_ranges(model), "arrays": {}, \
+                       "bones": {bone.name: (bone.index, bone.position.data().tolist()) for bone in model.bones.values()}}
+
+        try:
+            for name, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+                self.blocks[name] = block
+                self.handle["arrays"][name] = (block.name, array.shape, array.dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+
+# 材質毎の面INDEXの範囲リスト (開始, 終了)
+def get_material_ranges(model: PmxModel):
+    material_ranges = {}
+    for material_name, iidxs in model.material_indices.items():
+        if not isinstance(material_name, str):
+            # 材質INDEXから材質名への対比
+            continue
+
+        ranges = []
+        for iidx in iidxs:
+            if ranges and ranges[-1][1] == iidx:
+                ranges[-1][1] = iidx + 1
+            else:
+                ranges.append([iidx, iidx + 1])
+        material_ranges[material_name] = ranges
+
+    return material_ranges
+
+
+# ワーカー側: 共有メモリの配列を複製せずに参照し、必要な材質分だけのモデルを作る
+class SharedModelView:
+
+    def __init__(self, handle: dict):
+        self.material_ranges = handle["material_ranges"]
+        self.bones = handle["bones"]
+        self.blocks = {}
+        self.arrays = {}
+        for name, (block_name, shape, dtype) in handle["arrays"].items():
+            self.blocks[name] = shared_memory.SharedMemory(name=block_name)
+            self.arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.blocks[name].buf)
+        # キー：材質名、値：材質モデル
+        self.material_models = {}
+
+    # 指定材質の面と、その面の頂点・全ボーンの位置だけを持つモデル(頂点INDEX・面INDEX・ボーンINDEXは元モデルと同じ)
+    def get_material_model(self, material_name: str):
+        if material_name in self.material_models:
+            return self.material_models[material_name]
+
+        model = PmxModel()
+        model.material_indices[material_name] = [iidx for start, end in self.material_ranges[material_name] for iidx in range(start, end)]
+        model.material_vertices[material_name] = []
+        for iidx in model.material_indices[material_name]:
+            model.indices[iidx] = self.arrays["indices"][iidx].tolist()
+            model.material_vertices[material_name].extend(model.indices[iidx])
+
+        for vidx in sorted(set(model.material_vertices[material_name])):
+            model.vertex_dict[vidx] = Vertex(vidx, MVector3D(self.arrays["positions"][vidx]), MVector3D(self.arrays["normals"][vidx]), None, [], None, 0)
+
+        for bone_name, (bone_index, position) in self.bones.items():
+            bone = Bone(bone_name, "", MVector3D(*position), -1, 0, 0)
+            bone.index = bone_index
+            model.bones[bone_name] = bone
+            model.bone_indexes[bone_index] = bone_name
+
+        self.material_models[material_name] = model
+
+        return model
+
+    def close(self):
+        self.material_models = {}
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+        self.blocks = {}
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import json
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from mmd.PmxData import PmxModel
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+# 頂点マップ生成が参照する設定値(親ボーンは、最初の面の縦方向判定に位置を使う)
+STAGE_PARAM_KEYS = ["material_name", "parent_bone_name", "direction", "similarity"]
+
+# ndarrayのリストで持つ項目
+ARRAY_LIST_FIELDS = ["vertex_maps", "vertex_connecteds", "vertex_display_maps"]
+# ndarrayの辞書(キー：頂点マップINDEX)で持つ項目
+ARRAY_DICT_FIELDS = ["bone_horizonal_distances", "bone_vertical_distances"]
+# リスト値の辞書で持つ項目
+LIST_DICT_FIELDS = ["duplicate_vertices", "duplicate_indices", "index_combs_by_vpos"]
+# INDEXリストで持つ項目
+INDEX_LIST_FIELDS = ["registed_iidxs"]
+
+
+# 頂点マップ生成の入力(モデル・材質・対象頂点・設定値)から求めるキャッシュキー
+# モデルのハッシュ値がない場合、None
+def get_stage_key(model: PmxModel, param_option: dict, target_vertices: list):
+    if not model.digest:
+        return None
+
+    key_data = [model.digest, [param_option[k] for k in STAGE_PARAM_KEYS], [int(v) for v in target_vertices]]
+    return hashlib.sha1(json.dumps(key_data, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# 設定毎の頂点マップとボーン間距離のキャッシュ
+# メモリ上はLRUで保持し、ディレクトリが指定された場合は .npz でも保存する
+class StageCache:
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key: str, cache_dir=None):
+        if not key:
+            return None
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        if cache_dir and os.path.exists(self.get_path(key, cache_dir)):
+            try:
+                with np.load(self.get_path(key, cache_dir)) as data:
+                    stage = decode_stage(data)
+            except Exception as e:
+                # 読めないキャッシュは無視して作り直す
+                logger.debug("ステージキャッシュ読み込み失敗: %s", e)
+                return None
+
+            self.put_memory(key, stage)
+            return stage
+
+        return None
+
+    def put(self, key: str, stage: dict, cache_dir=None):
+        if not key:
+            return
+
+        self.put_memory(key, stage)
+
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # 書きかけのファイルを読まないよう、一時ファイルから置き換える
+                tmp_path = f"{self.get_path(key, cache_dir)}.tmp.npz"
+                np.savez_compressed(tmp_path, **encode_stage(stage))
+                os.replace(tmp_path, self.get_path(key, cache_dir))
+            except Exception as e:
+                logger.debug("ステージキャッシュ保存失敗: %s", e)
+
+    def put_memory(self, key: str, stage: dict):
+        self.entries[key] = stage
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_path(self, key: str, cache_dir: str):
+        return os.path.join(cache_dir, f"{key}.npz")
+
+
+# 同一プロセス内の出力で共有するキャッシュ
+stage_cache = StageCache()
+
+
+def encode_stage(stage: dict):
+    arrays = {}
+
+    for name in ARRAY_LIST_FIELDS:
+        arrays[f"{name}_count"] = np.array(len(stage[name]))
+        for n, values in enumerate(stage[name]):
+            arrays[f"{name}_{n}"] = np.asarray(values)
+
+    for name in ARRAY_DICT_FIELDS:
+        arrays[f"{name}_keys"] = np.array(list(stage[name].keys()), dtype=np.int64)
+        for n, values in enumerate(stage[name].values()):
+            arrays[f"{name}_{n}"] = np.asarray(values)
+
+    for name in LIST_DICT_FIELDS:
+        # キー, 各値リストの開始位置, 全値を連結したもの
+        values = [v for vs in stage[name].values() for v in vs]
+        arrays[f"{name}_keys"] = np.array(list(stage[name].keys()))
+        arrays[f"{name}_offsets"] = np.cumsum([0] + [len(vs) for vs in stage[name].values()])
+        arrays[f"{name}_values"] = np.array(values, dtype=np.int64)
+
+    for name in INDEX_LIST_FIELDS:
+        arrays[name] = np.array(stage[name], dtype=np.int64)
+
+    return arrays
+
+
+def decode_stage(arrays):
+    stage = {}
+
+    for name in ARRAY_LIST_FIELDS:
+        stage[name] = [arrays[f"{name}_{n}"] for n in range(int(arrays[f"{name}_count"]))]
+    # 左右の連続有無はboolのリスト
+    stage["vertex_connecteds"] = [values.tolist() for values in stage["vertex_connecteds"]]
+
+    for name in ARRAY_DICT_FIELDS:
+        stage[name] = {k: arrays[f"{name}_{n}"] for n, k in enumerate(arrays[f"{name}_keys"].tolist())}
+
+    for name in LIST_DICT_FIELDS:
+        keys = arrays[f"{name}_keys"].tolist()
+        offsets = arrays[f"{name}_offsets"].tolist()
+        values = arrays[f"{name}_values"].tolist()
+        # 2次元の場合、キー・値はタプル
+        keys = [tuple(k) if isinstance(k, list) else k for k in keys]
+        values = [tuple(v) if isinstance(v, list) else v for v in values]
+        stage[name] = {k: values[start:end] for k, start, end in zip(keys, offsets[:-1], offsets[1:])}
+
+    for name in INDEX_LIST_FIELDS:
+        stage[name] = arrays[name].tolist()
+
+    return stage
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+#
+from collections import deque
+
+import numpy as np
+
+
+# 頂点マップ生成時の登録済み面管理
+class FaceFrontier:
+
+    def __init__(self, face_count: int, index_idxs: list):
+        # 面INDEX毎の登録済みフラグ
+        self.registed = np.zeros(face_count, dtype=np.bool_)
+        # 対象材質の面INDEX(昇順)
+        self.index_idxs = np.array(sorted(index_idxs), dtype=np.int64)
+        self.count = 0
+        # 走査待ちの面INDEX
+        self.queue = deque()
+
+    # 登録済みか
+    def __contains__(self, index_idx: int):
+        return bool(self.registed[index_idx])
+
+    # 登録済み件数
+    def __len__(self):
+        return self.count
+
+    # 登録
+    def mark(self, index_idx: int):
+        if self.registed[index_idx]:
+            return False
+
+        self.registed[index_idx] = True
+        self.count += 1
+        return True
+
+    # 一括登録
+    def mark_all(self, index_idxs: list):
+        for index_idx in index_idxs:
+            self.mark(index_idx)
+
+    # 未登録の面INDEXリスト
+    def remaining(self):
+        return self.index_idxs[~self.registed[self.index_idxs]].tolist()
+
+    # 登録済みの面INDEXリスト
+    def indexes(self):
+        return np.where(self.registed)[0].tolist()
+
+    # 走査待ちに追加
+    def push(self, index_idx: int):
+        self.queue.append(index_idx)
+
+    # 走査待ちから取り出し
+    def pop(self):
+        return self.queue.popleft()
+
+    # 走査待ちがあるか
+    def has_queue(self):
+        return len(self.queue) > 0
+
+
+# 頂点INDEX → マップ上のXY
+class VertexAxisMap:
+
+    def __init__(self, vertex_count: int):
+        self.xs = np.zeros(vertex_count, dtype=np.int32)
+        self.ys = np.zeros(vertex_count, dtype=np.int32)
+        self.assigned = np.zeros(vertex_count, dtype=np.bool_)
+        # 登録順
+        self.orders = np.zeros(vertex_count, dtype=np.int32)
+        self.count = 0
+
+    def __contains__(self, vidx: int):
+        return bool(self.assigned[vidx])
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, vidx: int):
+        return {'vidx': vidx, 'x': self.x(vidx), 'y': self.y(vidx)}
+
+    def x(self, vidx: int):
+        return int(self.xs[vidx])
+
+    def y(self, vidx: int):
+        return int(self.ys[vidx])
+
+    # 登録
+    def set(self, vidx: int, x: int, y: int):
+        if not self.assigned[vidx]:
+            self.assigned[vidx] = True
+            self.orders[vidx] = self.count
+            self.count += 1
+
+        self.xs[vidx] = x
+        self.ys[vidx] = y
+
+    # 登録済み頂点INDEX(登録順)
+    def keys(self):
+        vidxs = np.where(self.assigned)[0]
+        return vidxs[np.argsort(self.orders[vidxs], kind='stable')].tolist()
+
+    # 面の縦・横・斜めの辺を抽出
+    def judge_edge(self, vidxs: list):
+        v0_idx, v1_idx, v2_idx = vidxs
+        is_v0 = v0_idx in self
+        is_v1 = v1_idx in self
+        is_v2 = v2_idx in self
+        v0_x = self.x(v0_idx) if is_v0 else 0
+        v0_y = self.y(v0_idx) if is_v0 else 0
+        v1_x = self.x(v1_idx) if is_v1 else 0
+        v1_y = self.y(v1_idx) if is_v1 else 0
+        v2_x = self.x(v2_idx) if is_v2 else 0
+        v2_y = self.y(v2_idx) if is_v2 else 0
+
+        # 縦の辺を抽出
+        vertical_vs = (v0_idx, v1_idx, v0_y, v1_y) if is_v0 and is_v1 and v0_x == v1_x \
+            else (v0_idx, v2_idx, v0_y, v2_y) if is_v0 and is_v2 and v0_x == v2_x \
+            else (v1_idx, v2_idx, v1_y, v2_y) if is_v1 and is_v2 and v1_x == v2_x else None
+        if vertical_vs:
+            vertical_vs = (vertical_vs[0], vertical_vs[1]) if vertical_vs[2] < vertical_vs[3] else (vertical_vs[1], vertical_vs[0])
+
+        # 横の辺を抽出
+        horizonal_vs = (v0_idx, v1_idx, v0_x, v1_x) if is_v0 and is_v1 and v0_y == v1_y \
+            else (v0_idx, v2_idx, v0_x, v2_x) if is_v0 and is_v2 and v0_y == v2_y \
+            else (v1_idx, v2_idx, v1_x, v2_x) if is_v1 and is_v2 and v1_y == v2_y else None
+        if horizonal_vs:
+            horizonal_vs = (horizonal_vs[0], horizonal_vs[1]) if horizonal_vs[2] < horizonal_vs[3] else (horizonal_vs[1], horizonal_vs[0])
+
+        # 斜めの辺を抽出
+        diagonal_vs = (v0_idx, v1_idx) if is_v0 and is_v1 and v0_x != v1_x and v0_y != v1_y \
+            else (v0_idx, v2_idx) if is_v0 and is_v2 and v0_x != v2_x and v0_y != v2_y \
+            else (v1_idx, v2_idx) if is_v1 and is_v2 and v1_x != v2_x and v1_y != v2_y else None
+        if diagonal_vs:
+            diagonal_vs = (min(diagonal_vs[0], diagonal_vs[1]), max(diagonal_vs[0], diagonal_vs[1]))
+
+        return vertical_vs, horizonal_vs, diagonal_vs
+
+    # 複数面の縦・横・斜めの辺をまとめて抽出
+    def judge_edges(self, faces: np.ndarray):
+        faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+        rows = np.arange(len(faces))
+
+        # 辺の組み合わせ (v0, v1), (v0, v2), (v1, v2)
+        edge_as = faces[:, [0, 0, 1]]
+        edge_bs = faces[:, [1, 2, 2]]
+        is_edges = self.assigned[edge_as] & self.assigned[edge_bs]
+        edge_axs = self.xs[edge_as]
+        edge_ays = self.ys[edge_as]
+        edge_bxs = self.xs[edge_bs]
+        edge_bys = self.ys[edge_bs]
+
+        def first_edges(is_target: np.ndarray):
+            is_exist = np.any(is_target, axis=1)
+            eidxs = np.argmax(is_target, axis=1)
+            return is_exist, edge_as[rows, eidxs], edge_bs[rows, eidxs]
+
+        # 縦の辺(上が先)
+        is_vertical, vertical_as, vertical_bs = first_edges(is_edges & (edge_axs == edge_bxs))
+        is_vertical_order = self.ys[vertical_as] < self.ys[vertical_bs]
+        vertical_v0s = np.where(is_vertical_order, vertical_as, vertical_bs)
+        vertical_v1s = np.where(is_vertical_order, vertical_bs, vertical_as)
+
+        # 横の辺(左が先)
+        is_horizonal, horizonal_as, horizonal_bs = first_edges(is_edges & (edge_ays == edge_bys))
+        is_horizonal_order = self.xs[horizonal_as] < self.xs[horizonal_bs]
+        horizonal_v0s = np.where(is_horizonal_order, horizonal_as, horizonal_bs)
+        horizonal_v1s = np.where(is_horizonal_order, horizonal_bs, horizonal_as)
+
+        # 斜めの辺(INDEXの小さい方が先)
+        is_diagonal, diagonal_as, diagonal_bs = first_edges(is_edges & (edge_axs != edge_bxs) & (edge_ays != edge_bys))
+        diagonal_v0s = np.minimum(diagonal_as, diagonal_bs)
+        diagonal_v1s = np.maximum(diagonal_as, diagonal_bs)
+
+        results = []
+        for is_v, v0, v1, is_h, h0, h1, is_d, d0, d1 in zip(is_vertical.tolist(), vertical_v0s.tolist(), vertical_v1s.tolist(), \
+                                                           is_horizonal.tolist(), horizonal_v0s.tolist(), horizonal_v1s.tolist(), \
+                                                           is_diagonal.tolist(), diagonal_v0s.tolist(), diagonal_v1s.tolist()):
+            results.append(((v0, v1) if is_v else None, (h0, h1) if is_h else None, (d0, d1) if is_d else None))
+
+        return results
+
+
+# マップ上のXY → 重複頂点INDEXリスト
+class VertexCoordinateMap:
+
+    def __init__(self):
+        self.cells = {}
+        self.min_x = 0
+        self.min_y = 0
+        self.max_x = 0
+        self.max_y = 0
+
+    def __contains__(self, xy: tuple):
+        return self.key(xy[0], xy[1]) in self.cells
+
+    def __getitem__(self, xy: tuple):
+        return self.cells[self.key(xy[0], xy[1])]
+
+    def __setitem__(self, xy: tuple, vidxs: list):
+        x, y = xy
+        if not self.cells:
+            self.min_x = self.max_x = x
+            self.min_y = self.max_y = y
+        else:
+            self.min_x = min(self.min_x, x)
+            self.max_x = max(self.max_x, x)
+            self.min_y = min(self.min_y, y)
+            self.max_y = max(self.max_y, y)
+        self.cells[self.key(x, y)] = vidxs
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __repr__(self):
+        return repr(dict(zip(self.keys(), self.cells.values())))
+
+    # XYを1つの整数キーにまとめる
+    def key(self, x: int, y: int):
+        return (x << 32) | (y & 0xFFFFFFFF)
+
+    def keys(self):
+        return [(k >> 32, (k & 0xFFFFFFFF) - 0x100000000 if k & 0x80000000 else k & 0xFFFFFFFF) for k in self.cells.keys()]
+
+    # XYの範囲
+    def axis_range(self):
+        return self.min_x, self.min_y, self.max_x, self.max_y
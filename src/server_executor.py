@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+#
+# 常駐してジョブを受け付け、物理を設定する (ローカル専用HTTPサーバー)
+#
+#   python server_executor.py --port 50080 --max_jobs 2 --max_models 4 --job_timeout 600
+#
+# 読み込み済みのモデルを最近使った順に保持し、ジョブ毎にプロセスを複製(fork)して、複製先のモデルに物理を設定する
+# (モデルの保持とforkは、HTTPサーバーのスレッドを起動する前に分けた単一スレッドのプロセスで行う)
+# (forkできない環境では、モデルを複製してスレッドで実行する)
+#
+#   POST /jobs      batch_executor.py のジョブ定義と同じ形式 (1ジョブ or {"jobs": [...]}、相対パスは "base_dir" から)
+#   GET  /jobs      全ジョブの状態
+#   GET  /jobs/<ID> ジョブの状態 (status: queued / running / success / failure, timings: 段階毎の所要時間)
+#   GET  /models    保持しているモデル
+#
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import argparse
+import threading
+import traceback
+import numpy as np
+import multiprocessing
+import multiprocessing.connection
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from batch_executor import VERSION_NAME, fill_output_path, normalize_jobs, tailor_job, start_forked_job, finish_forked_job, stop_forked_process, get_fork_context, \
+    FORKED_JOB_POLL_INTERVAL # noqa
+from module.MModelCache import ModelCache
+from utils.MLogger import MLogger
+
+# 指数表記なし、有効小数点桁数6、30を超えると省略あり、一行の文字数200
+np.set_printoptions(suppress=True, precision=6, threshold=30, linewidth=200)
+
+logger = MLogger(__name__)
+
+# 終了したジョブの状態を保持する件数
+MAX_FINISHED_JOBS = 1000
+
+
+# モデルを保持し、ジョブ毎にforkする単一スレッドのプロセス
+# スレッドが動いているプロセスからforkすると、他のスレッドが持っていたロックが複製先で解放されずに止まる場合があるため、
+# forkはスレッドを持たないこのプロセスからだけ行う
+class JobDispatcher:
+
+    def __init__(self, request_conn, event_conn, max_jobs: int, max_models: int, verbose: int, max_workers: int, stage_cache_dir=None, job_timeout=0):
+        self.request_conn = request_conn
+        self.event_conn = event_conn
+        self.max_jobs = max(max_jobs, 1)
+        self.verbose = verbose
+        self.max_workers = max_workers
+        self.stage_cache_dir = stage_cache_dir
+        self.job_timeout = job_timeout
+        self.model_cache = ModelCache(max_models)
+        self.fork_context = get_fork_context()
+        # (ジョブID, ジョブ, 受付時間)
+        self.pending_jobs = []
+        # キー：結果受け取り用の接続、値：(ジョブID, プロセス, 開始時間, 所要時間)
+        self.running_jobs = {}
+
+    def run(self):
+        try:
+            while True:
+                while self.pending_jobs and len(self.running_jobs) < self.max_jobs:
+                    self.start_job(*self.pending_jobs.pop(0))
+
+                for conn in multiprocessing.connection.wait([self.request_conn] + list(self.running_jobs.keys()), FORKED_JOB_POLL_INTERVAL):
+                    if conn is not self.request_conn:
+                        self.finish_job(conn)
+                        continue
+
+                    try:
+                        request = conn.recv()
+                    except EOFError:
+                        request = None
+                    if request is None:
+                        return
+                    self.pending_jobs.append(request)
+
+                # 制限時間を過ぎたジョブは止める
+                for conn, (_, _, start, _) in list(self.running_jobs.items()):
+                    if self.job_timeout and time.time() - start >= self.job_timeout:
+                        self.finish_job(conn)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for conn, (_, process, _, _) in self.running_jobs.items():
+                conn.close()
+                stop_forked_process(process, 0)
+
+    def start_job(self, job_id: str, job: dict, submitted: float):
+        start = time.time()
+        timings = {"queue": start - submitted}
+        self.event_conn.send(("running", job_id, {"timings": timings}))
+
+        try:
+            model, is_hit = self.model_cache.get(job["model_path"])
+            timings["model"] = time.time() - start
+            self.event_conn.send(("models", None, self.model_cache.get_model_paths()))
+
+            fork_start = time.time()
+            process, result_conn = start_forked_job(self.fork_context, job, model, self.verbose, self.max_workers, self.stage_cache_dir)
+            timings["fork"] = time.time() - fork_start
+        except Exception:
+            self.event_conn.send(("finished", job_id, {"status": "failure", "error": traceback.format_exc(), "timings": timings, "elapsed_time": time.time() - start}))
+            return
+
+        self.event_conn.send(("running", job_id, {"model_cache_hit": is_hit, "timings": timings}))
+        self.running_jobs[result_conn] = (job_id, process, start, timings)
+
+    def finish_job(self, result_conn):
+        job_id, process, start, timings = self.running_jobs.pop(result_conn)
+        result = finish_forked_job(process, result_conn, start + self.job_timeout if self.job_timeout else None)
+        timings.update(result["timings"])
+        self.event_conn.send(("finished", job_id, {"status": "success" if result["result"] else "failure", "error": result["error"], "timings": timings, \
+                                                   "elapsed_time": time.time() - start}))
+
+
+# 親プロセスとの接続のうち、こちらで使わない方は閉じておく(親が終了した時に、受信側で終了を検知できるよう)
+def run_dispatcher(request_conn, event_conn, server_conns: list, *args):
+    for conn in server_conns:
+        conn.close()
+    JobDispatcher(request_conn, event_conn, *args).run()
+
+
+class JobServer:
+
+    def __init__(self, verbose: int, max_jobs: int, max_models: int, max_workers: int, stage_cache_dir=None, job_timeout=0):
+        self.verbose = verbose
+        self.max_workers = max_workers
+        self.stage_cache_dir = stage_cache_dir
+        self.model_cache = ModelCache(max_models)
+        # キー：ジョブID、値：ジョブの状態
+        self.jobs = OrderedDict()
+        self.job_queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.job_count = 0
+        # forkできる場合、モデルの保持とforkはスレッドを起動する前に分けたプロセスで行う
+        self.fork_context = get_fork_context()
+        self.dispatcher = None
+        self.model_paths = []
+
+        if self.fork_context:
+            dispatcher_request_conn, self.request_conn = self.fork_context.Pipe(duplex=False)
+            self.event_conn, dispatcher_event_conn = self.fork_context.Pipe(duplex=False)
+            self.dispatcher = self.fork_context.Process(target=run_dispatcher, name="job_dispatcher", args=(\
+                dispatcher_request_conn, \
+                dispatcher_event_conn, \
+                [self.request_conn, self.event_conn], \
+                max_jobs, \
+                max_models, \
+                verbose, \
+                max_workers, \
+                stage_cache_dir, \
+                job_timeout))
+            self.dispatcher.start()
+            dispatcher_request_conn.close()
+            dispatcher_event_conn.close()
+
+            self.workers = [threading.Thread(target=self.receive_events, daemon=True)]
+        else:
+            self.workers = [threading.Thread(target=self.run_worker, daemon=True) for _ in range(max(max_jobs, 1))]
+
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, jobs_data, base_dir: str):
+        if isinstance(jobs_data, dict) and "jobs" not in jobs_data:
+            jobs_data = [jobs_data]
+
+        job_ids = []
+        for job in normalize_jobs(jobs_data, base_dir):
+            job = fill_output_path(job)
+            with self.lock:
+                self.job_count += 1
+                job_id = str(self.job_count)
+                self.jobs[job_id] = {"job_id": job_id, "status": "queued", "model_path": job["model_path"], "output_path": job["output_path"], \
+                                     "model_cache_hit": None, "timings": {}, "elapsed_time": 0, "error": None, "submitted": time.time()}
+                self.trim_jobs()
+                if self.dispatcher:
+                    self.request_conn.send((job_id, job, self.jobs[job_id]["submitted"]))
+                else:
+                    self.job_queue.put((job_id, job))
+            job_ids.append(job_id)
+
+        return job_ids
+
+    # 終了したジョブを古い順に捨てる
+    def trim_jobs(self):
+        finished_job_ids = [job_id for job_id, status in self.jobs.items() if status["status"] in ["success", "failure"]]
+        for job_id in finished_job_ids[:max(0, len(finished_job_ids) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def get_status(self, job_id=None):
+        with self.lock:
+            if job_id is None:
+                return [copy.deepcopy(status) for status in self.jobs.values()]
+            return copy.deepcopy(self.jobs.get(job_id))
+
+    def update_status(self, job_id: str, **kwargs):
+        with self.lock:
+            self.jobs[job_id].update(kwargs)
+
+    def get_model_paths(self):
+        if self.dispatcher:
+            with self.lock:
+                return list(self.model_paths)
+        return self.model_cache.get_model_paths()
+
+    # 振り分けプロセスからのジョブの状態を反映する
+    def receive_events(self):
+        while True:
+            try:
+                event, job_id, values = self.event_conn.recv()
+            except EOFError:
+                break
+
+            if event == "models":
+                with self.lock:
+                    self.model_paths = values
+                continue
+
+            self.update_status(job_id, status=values.pop("status", "running"), **values)
+            if event == "finished":
+                self.log_job_result(job_id)
+
+        # 振り分けプロセスが終了した場合、残っているジョブは失敗とする
+        with self.lock:
+            for status in self.jobs.values():
+                if status["status"] in ["queued", "running"]:
+                    status.update(status="failure", error=f"dispatcher exitcode: {self.dispatcher.exitcode}")
+
+    def log_job_result(self, job_id: str):
+        status = self.get_status(job_id)
+        logger.info("ジョブ終了 (%s): %s -> %s", job_id, os.path.basename(status["model_path"]), status["status"])
+
+    def close(self):
+        if self.dispatcher:
+            self.request_conn.send(None)
+            self.dispatcher.join()
+
+    def run_worker(self):
+        while True:
+            job_id, job = self.job_queue.get()
+            start = time.time()
+            timings = {"queue": start - self.get_status(job_id)["submitted"]}
+            self.update_status(job_id, status="running", timings=timings)
+
+            try:
+                model, is_hit = self.model_cache.get(job["model_path"])
+                timings["model"] = time.time() - start
+                self.update_status(job_id, model_cache_hit=is_hit, timings=timings)
+
+                result = self.run_job(job, model)
+                timings.update(result["timings"])
+                self.update_status(job_id, status="success" if result["result"] else "failure", error=result["error"], timings=timings)
+            except Exception:
+                self.update_status(job_id, status="failure", error=traceback.format_exc(), timings=timings)
+            finally:
+                self.update_status(job_id, elapsed_time=time.time() - start)
+                self.log_job_result(job_id)
+
+    # forkできない場合、保持しているモデルは書き換えないよう、複製して処理する
+    def run_job(self, job: dict, model):
+        start = time.time()
+        model = copy.deepcopy(model)
+        copy_time = time.time() - start
+
+        result = tailor_job(job, model, self.verbose, self.max_workers, self.stage_cache_dir)
+        result["timings"]["copy"] = copy_time
+        return result
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        paths = self.path.strip("/").split("/")
+        if paths == ["jobs"]:
+            return self.send_json(200, self.server.job_server.get_status())
+        if len(paths) == 2 and paths[0] == "jobs":
+            status = self.server.job_server.get_status(paths[1])
+            return self.send_json(200 if status else 404, status)
+        if paths == ["models"]:
+            return self.send_json(200, self.server.job_server.get_model_paths())
+
+        self.send_json(404, None)
+
+    def do_POST(self):
+        if self.path.strip("/") != "jobs":
+            return self.send_json(404, None)
+
+        try:
+            jobs_data = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8"))
+            base_dir = jobs_data.pop("base_dir", os.getcwd()) if isinstance(jobs_data, dict) else os.getcwd()
+            job_ids = self.server.job_server.submit(jobs_data, base_dir)
+        except Exception:
+            return self.send_json(400, {"error": traceback.format_exc()})
+
+        self.send_json(202, {"job_ids": job_ids})
+
+    def send_json(self, code: int, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+# Windowsマルチプロセス対策
+multiprocessing.freeze_support()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", default=50080, type=int)
+    parser.add_argument("--max_jobs", default=1, type=int, help="同時に処理するジョブ数")
+    parser.add_argument("--max_models", default=4, type=int, help="保持するモデル数")
+    parser.add_argument("--max_workers", default=0, type=int, help="1モデル内の並列数 (0の場合、同時処理ジョブ数から決める)")
+    parser.add_argument("--stage_cache_dir", type=str, help="頂点マップ等のキャッシュ保存先 (ジョブ毎のプロセスを跨いで再利用する。物理のみの再出力に使う出力マニフェストも保存する)")
+    parser.add_argument("--job_timeout", default=600, type=int, help="1ジョブの制限時間(秒) (超えた場合はジョブのプロセスを終了して失敗とする、0の場合は制限なし)")
+    parser.add_argument("--verbose", default=20, type=int)
+    args = parser.parse_args()
+
+    MLogger.initialize(level=args.verbose, is_file=False)
+
+    max_workers = args.max_workers or (1 if args.max_jobs > 1 else min(5, 32, os.cpu_count() + 4))
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), JobRequestHandler)
+    # 振り分けプロセスはスレッドを起動する前(サーバー開始前)に分ける
+    server.job_server = JobServer(args.verbose, args.max_jobs, args.max_models, max_workers, args.stage_cache_dir, args.job_timeout)
+
+    logger.info("PmxTailor ジョブサーバー開始: http://127.0.0.1:%s (%s)", args.port, VERSION_NAME, decoration=MLogger.DECORATION_BOX)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.job_server.close()
+
+    sys.exit(0)
@@ -2,32 +2,50 @@
 #
 import logging
 import os
+import time
 import traceback
 import numpy as np
 import itertools
 import math
 import copy
-import bezier
 import csv
 import random
 import string
+import concurrent.futures
 
 from module.MOptions import MExportOptions
 from mmd.PmxData import PmxModel, Vertex, Material, Bone, Morph, DisplaySlot, RigidBody, Joint, Bdef1, Bdef2, Bdef4, Sdef, RigidBodyParam, IkLink, Ik, BoneMorphData # noqa
+from mmd.PmxReader import PmxReader
 from mmd.PmxWriter import PmxWriter
 from module.MMath import MVector2D, MVector3D, MVector4D, MQuaternion, MMatrix4x4 # noqa
+from module.MVertexMap import FaceFrontier, VertexAxisMap, VertexCoordinateMap
+from module.MReferenceIndex import ModelReferenceIndex, BoneWeightUsage
+from module.MJointLimit import get_joint_limit_profile
+from module.MJointBatch import JointBatch, BALANCER_JOINT_LIMITS, BALANCER_SUB_JOINT_LIMITS
+from module.MStageCache import stage_cache, get_stage_key
+from module.MSharedModel import SharedModelArrays, SharedModelView
+from module.MExportManifest import get_manifest_path, load_manifest, get_output_manifest, save_output_manifest, get_file_digest, get_param_hashes, \
+    encode_physics_state, decode_tmp_all_bones, decode_map_states
+from module.MBatchMath import normalize_vectors, calc_lengths, from_directions, multiply_quaternions, to_euler_angles, to_rotation_matrices
 from utils.MLogger import MLogger # noqa
 from utils.MException import SizingException, MKilledException
-import utils.MBezierUtils as MBezierUtils
+from utils.MCancellation import CancellationToken
+from utils.MProgress import ProgressCounter
 
 logger = MLogger(__name__, level=1)
 
 
 class PmxTailorExportService():
-    def __init__(self, options: MExportOptions):
+    def __init__(self, options: MExportOptions, cancel_token=None):
         self.options = options
-
-    def execute(self):
+        self.output_model = None
+        # 中断要求(ワーカープロセスでは、呼び出し元から受け取ったものを使う)
+        self.cancel_token = options.cancel_token if options else (cancel_token or CancellationToken())
+        # 処理段階毎の進捗(ワーカープロセスでは集計しない)
+        self.progress = options.progress if options else ProgressCounter()
+
+    # is_write=False の場合、出力せずに生成したモデルを output_model に保持する
+    def execute(self, is_write=True):
         logging.basicConfig(level=self.options.logging_level, format="%(message)s [%(module_name)s]")
 
         try:
@@ -46,22 +64,33 @@ class PmxTailorExportService():
 
             logger.info(service_data_txt, translate=False, decoration=MLogger.DECORATION_BOX)
 
-            model = self.options.pmx_model
-            model.comment += f"\r\n\r\n{logger.transtext('物理')}: PmxTailor"
+            # 設定毎の剛体・ジョイント再生成用の情報(マニフェストに保存)
+            self.physics_states = []
 
-            # 保持ボーンは全設定を確認する
-            saved_bone_names = self.get_saved_bone_names(model)
+            # 前回出力から剛体・ジョイントの設定のみ変わっている場合、そこだけ作り直す
+            model = self.reexport_physics()
 
-            for pidx, param_option in enumerate(self.options.param_options):
-                if not self.create_physics(model, param_option, saved_bone_names):
-                    return False
+            if not model:
+                model = self.options.pmx_model
+                model.comment += f"\r\n\r\n{logger.transtext('物理')}: PmxTailor"
 
-            # 最後に出力
-            logger.info("PMX出力開始", decoration=MLogger.DECORATION_LINE)
+                # 保持ボーンは全設定を確認する
+                saved_bone_names = self.get_saved_bone_names(model)
+
+                # 頂点マップは形状のみから求まるので、先に設定毎に並列で生成しておく
+                vertex_map_results = self.create_vertex_maps_parallel(model)
 
-            PmxWriter().write(model, self.options.output_path)
+                for pidx, param_option in enumerate(self.options.param_options):
+                    self.progress.start_setting(pidx + 1, len(self.options.param_options))
+                    if not self.create_physics(model, param_option, saved_bone_names, vertex_map_results.get(pidx)):
+                        return False
 
-            logger.info("出力終了: %s", os.path.basename(self.options.output_path), decoration=MLogger.DECORATION_BOX, title=logger.transtext("成功"))
+            if not is_write:
+                self.output_model = model
+                return True
+
+            # 最後に出力
+            self.write_output_model(model)
 
             return True
         except MKilledException:
@@ -73,15 +102,362 @@ class PmxTailorExportService():
         finally:
             logging.shutdown()
 
-    def create_physics(self, model: PmxModel, param_option: dict, saved_bone_names: list):
-        model.comment += f"\r\n{logger.transtext('材質')}: {param_option['material_name']} --------------"    # noqa
-        model.comment += f"\r\n　　{logger.transtext('剛体グループ')}: {param_option['rigidbody'].collision_group + 1}"    # noqa
-        model.comment += f", {logger.transtext('細かさ')}: {param_option['fineness']}"    # noqa
-        model.comment += f", {logger.transtext('質量')}: {param_option['mass']}"    # noqa
-        model.comment += f", {logger.transtext('柔らかさ')}: {param_option['air_resistance']}"    # noqa
-        model.comment += f", {logger.transtext('張り')}: {param_option['shape_maintenance']}"    # noqa
+    def write_output_model(self, model: PmxModel):
+        logger.info("PMX出力開始", decoration=MLogger.DECORATION_LINE)
 
-        # 頂点CSVが指定されている場合、対象頂点リスト生成
+        PmxWriter().write(model, self.options.output_path, self.progress)
+
+        self.save_export_manifest()
+
+        logger.info("出力終了: %s", os.path.basename(self.options.output_path), decoration=MLogger.DECORATION_BOX, title=logger.transtext("成功"))
+
+    def reexport_physics(self):
+        org_model = self.options.pmx_model
+        manifest = get_output_manifest(load_manifest(get_manifest_path(org_model.path, self.options.stage_cache_dir)), self.options.output_path)
+
+        if not manifest or manifest["model_digest"] != org_model.digest or len(manifest["settings"]) != len(self.options.param_options) \
+           or not os.path.exists(manifest["output_path"]) or get_file_digest(manifest["output_path"]) != manifest["output_digest"]:
+            # 前回出力がそのまま残っていない場合、通常出力
+            return None
+
+        # 剛体・ジョイントの設定のみ変わっている設定
+        changed_pidxs = []
+        for pidx, (param_option, setting) in enumerate(zip(self.options.param_options, manifest["settings"])):
+            structure_hash, physics_hash = get_param_hashes(param_option, self.get_target_vertices(org_model, param_option))
+            if structure_hash != setting["structure_hash"]:
+                return None
+            if physics_hash != setting["physics_hash"]:
+                if not setting["physics_state"]:
+                    # 剛体・ジョイントだけでは作り直せない設定
+                    return None
+                changed_pidxs.append(pidx)
+
+        if not changed_pidxs:
+            return None
+
+        model = PmxReader(manifest["output_path"], is_check=False, is_sizing=False).read_data()
+
+        for pidx in changed_pidxs:
+            physics_state = manifest["settings"][pidx]["physics_state"]
+            if self.get_physics_block_start(list(model.rigidbodies.keys()), physics_state["rigidbodies"]) < 0 \
+               or self.get_physics_block_start(list(model.joints.keys()), physics_state["joints"]) < 0:
+                # 前回生成した剛体・ジョイントがまとまって残っていない場合、通常出力
+                return None
+
+        logger.info("物理のみ再出力: %s", os.path.basename(manifest["output_path"]), decoration=MLogger.DECORATION_LINE)
+
+        # コメントは今回の設定で付け直す
+        model.comment = org_model.comment + f"\r\n\r\n{logger.transtext('物理')}: PmxTailor"
+        for param_option in self.options.param_options:
+            self.add_physics_comment(model, param_option)
+
+        self.physics_states = [setting["physics_state"] for setting in manifest["settings"]]
+
+        for pidx in changed_pidxs:
+            param_option = self.options.param_options[pidx]
+            logger.info("【%s】剛体・ジョイント再生成", param_option['material_name'], decoration=MLogger.DECORATION_LINE)
+
+            self.physics_states[pidx] = self.recreate_physics(model, param_option, self.physics_states[pidx])
+
+        return model
+
+    # 前回生成分の剛体(ジョイント)の開始位置(連続して残っていない場合、-1)
+    def get_physics_block_start(self, names: list, block_names: list):
+        if not block_names:
+            return 0 if not names else len(names)
+
+        if block_names[0] not in names:
+            return -1
+
+        start = names.index(block_names[0])
+        if names[start:(start + len(block_names))] != block_names:
+            return -1
+
+        return start
+
+    def recreate_physics(self, model: PmxModel, param_option: dict, physics_state: dict):
+        rigidbodies = list(model.rigidbodies.values())
+        joints = list(model.joints.values())
+
+        rigidbody_start = self.get_physics_block_start(list(model.rigidbodies.keys()), physics_state["rigidbodies"])
+        rigidbody_end = rigidbody_start + len(physics_state["rigidbodies"])
+        if physics_state["joints"]:
+            joint_start = self.get_physics_block_start(list(model.joints.keys()), physics_state["joints"])
+        else:
+            # ジョイントがなかった場合、後の剛体を参照している最初のジョイントの前に入れる
+            joint_start = next((jidx for jidx, joint in enumerate(joints) \
+                                if joint.rigidbody_index_a >= rigidbody_end or joint.rigidbody_index_b >= rigidbody_end), len(joints))
+        joint_end = joint_start + len(physics_state["joints"])
+
+        # 前回生成分を除いた状態で末尾に作り直す
+        self.reset_physics_orders(model, rigidbodies[:rigidbody_start] + rigidbodies[rigidbody_end:], joints[:joint_start] + joints[joint_end:])
+
+        root_bone = model.bones[physics_state["root_bone_name"]]
+        tmp_all_bones = decode_tmp_all_bones(physics_state, model.bones, root_bone)
+
+        for vertex_connected, registed_bone_indexs in decode_map_states(physics_state):
+            root_rigidbody, registed_rigidbodies = self.create_rigidbody(model, param_option, vertex_connected, tmp_all_bones, registed_bone_indexs, root_bone)
+            self.create_joint(model, param_option, vertex_connected, tmp_all_bones, registed_bone_indexs, root_rigidbody, registed_rigidbodies)
+
+        created_rigidbodies = list(model.rigidbodies.values())[(len(rigidbodies) - (rigidbody_end - rigidbody_start)):]
+        created_joints = list(model.joints.values())[(len(joints) - (joint_end - joint_start)):]
+
+        # 元の位置に戻す
+        self.reset_physics_orders(model, rigidbodies[:rigidbody_start] + created_rigidbodies + rigidbodies[rigidbody_end:], \
+                                  joints[:joint_start] + created_joints + joints[joint_end:])
+
+        return dict(physics_state, rigidbodies=[rigidbody.name for rigidbody in created_rigidbodies], joints=[joint.name for joint in created_joints])
+
+    # 剛体・ジョイントを指定順に並べ直して、INDEXを振り直す
+    def reset_physics_orders(self, model: PmxModel, rigidbodies: list, joints: list):
+        reset_rigidbodies = {}
+        model.rigidbodies = {}
+        model.rigidbody_indexes = {}
+        for ridx, rigidbody in enumerate(rigidbodies):
+            reset_rigidbodies[rigidbody.index] = ridx
+            rigidbody.index = ridx
+            model.rigidbodies[rigidbody.name] = rigidbody
+            model.rigidbody_indexes[ridx] = rigidbody.name
+
+        model.joints = {}
+        for joint in joints:
+            joint.rigidbody_index_a = reset_rigidbodies.get(joint.rigidbody_index_a, -1)
+            joint.rigidbody_index_b = reset_rigidbodies.get(joint.rigidbody_index_b, -1)
+            model.joints[joint.name] = joint
+
+    def save_export_manifest(self):
+        manifest = self.create_export_manifest(get_file_digest(self.options.output_path))
+        if not manifest:
+            return
+
+        try:
+            save_output_manifest(get_manifest_path(self.options.pmx_model.path, self.options.stage_cache_dir), manifest)
+        except Exception:
+            # マニフェストが保存できなくても出力自体は成功
+            logger.debug("マニフェスト保存失敗: %s", traceback.format_exc())
+
+    # 出力マニフェスト(保存できない場合、None)
+    def create_export_manifest(self, output_digest: str):
+        org_model = self.options.pmx_model
+        if not get_manifest_path(org_model.path, self.options.stage_cache_dir) or not org_model.digest or len(self.physics_states) != len(self.options.param_options):
+            return None
+
+        settings = []
+        for param_option, physics_state in zip(self.options.param_options, self.physics_states):
+            structure_hash, physics_hash = get_param_hashes(param_option, self.get_target_vertices(org_model, param_option))
+            settings.append({"structure_hash": structure_hash, "physics_hash": physics_hash, "physics_state": physics_state})
+
+        return {"model_digest": org_model.digest, "output_path": os.path.abspath(self.options.output_path), "output_digest": output_digest, "settings": settings}
+
+    # 頂点マップ生成とボーン配置までを行い、設定毎の見積もりを返す(ウェイト・出力は行わず、元モデルも変更しない)
+    def analyze(self):
+        logging.basicConfig(level=self.options.logging_level, format="%(message)s [%(module_name)s]")
+
+        try:
+            org_model = self.options.pmx_model
+            logger.info("PmxTailor事前解析開始: %s", os.path.basename(org_model.path), decoration=MLogger.DECORATION_LINE)
+
+            model = self.create_analyze_model(org_model)
+
+            vertex_map_results = self.create_vertex_maps_parallel(org_model)
+
+            reports = []
+            for pidx, param_option in enumerate(self.options.param_options):
+                report = self.analyze_physics(model, param_option, vertex_map_results.get(pidx))
+                reports.append(report)
+
+                if report["error"]:
+                    logger.warning(report["error"], translate=False, decoration=MLogger.DECORATION_BOX)
+                else:
+                    logger.info("【%s】事前解析結果\n　頂点マップ: %s (%s)\n　未割当面: %s, 未割当頂点: %s\n　ボーン: %s, 剛体: %s, ジョイント: %s\n　処理時間: %s", \
+                                param_option['material_name'], report["map_count"], ", ".join([f"{m['size'][0]}x{m['size'][1]}" for m in report["maps"]]), \
+                                report["unmapped_face_count"], report["unmapped_vertex_count"], report["bone_count"], report["rigidbody_count"], \
+                                report["joint_count"], ", ".join([f"{k}: {v:.2f}s" for k, v in report["timings"].items()]), decoration=MLogger.DECORATION_BOX)
+
+            return reports
+        except MKilledException:
+            return None
+        except SizingException as se:
+            logger.error("PmxTailor変換処理が処理できないデータで終了しました。\n\n%s", se.message, decoration=MLogger.DECORATION_BOX)
+        except Exception:
+            logger.critical("PmxTailor変換処理が意図せぬエラーで終了しました。\n\n%s", traceback.format_exc(), decoration=MLogger.DECORATION_BOX)
+        finally:
+            logging.shutdown()
+
+    # 全設定の頂点マップとボーン間距離を生成してキャッシュに置く(元モデルは変更しない)
+    # 同じモデルを複数の設定で出力する場合に、先に1回だけ求めておく
+    def prepare_vertex_map_stages(self):
+        org_model = self.options.pmx_model
+        model = self.create_analyze_model(org_model)
+
+        vertex_map_results = self.create_vertex_maps_parallel(org_model)
+
+        for pidx, param_option in enumerate(self.options.param_options):
+            if param_option['exist_physics_clear'] == logger.transtext('再利用'):
+                continue
+            target_vertices = self.get_target_vertices(model, param_option)
+            if target_vertices is None:
+                continue
+            self.get_vertex_map_stage(model, param_option, target_vertices, vertex_map_results.get(pidx))
+
+    # 元モデルの頂点・面を参照し、ボーン・剛体・ジョイント等の追加先だけを別に持つモデル
+    def create_analyze_model(self, org_model: PmxModel):
+        model = PmxModel()
+        model.path = org_model.path
+        model.digest = org_model.digest
+        model.vertex_dict = org_model.vertex_dict
+        model.indices = org_model.indices
+        model.materials = org_model.materials
+        model.material_indices = org_model.material_indices
+        model.material_vertices = org_model.material_vertices
+        model.bones = dict(org_model.bones)
+        model.bone_indexes = dict(org_model.bone_indexes)
+        model.display_slots = dict(org_model.display_slots)
+        model.rigidbodies = dict(org_model.rigidbodies)
+        model.rigidbody_indexes = dict(org_model.rigidbody_indexes)
+        model.joints = dict(org_model.joints)
+
+        return model
+
+    def analyze_physics(self, model: PmxModel, param_option: dict, vertex_map_result=None):
+        report = {"material_name": param_option['material_name'], "abb_name": param_option['abb_name'], "map_count": 0, "maps": [], \
+                  "unmapped_face_count": 0, "unmapped_vertex_count": 0, "bone_count": 0, "rigidbody_count": 0, "joint_count": 0, "timings": {}, "error": None}
+
+        target_vertices = self.get_target_vertices(model, param_option)
+        if target_vertices is None:
+            report["error"] = logger.transtext("頂点CSVが正常に読み込めなかったため、処理を終了します")
+            return report
+
+        if param_option['exist_physics_clear'] == logger.transtext('再利用'):
+            # 既存ボーンから作る場合は既存物理の削除が前提になるため、見積もらない
+            report["error"] = logger.transtext("【%s】既存ボーン再利用のため、事前解析の対象外です") % param_option['material_name']
+            return report
+
+        start = time.time()
+        stage = self.get_vertex_map_stage(model, param_option, target_vertices, vertex_map_result)
+        report["timings"]["vertex_map"] = time.time() - start
+
+        vertex_map_orders = self.get_vertex_map_orders(stage["vertex_maps"]) if stage else None
+        if vertex_map_orders is None:
+            report["error"] = logger.transtext("有効な頂点マップが生成できなかった為、処理を終了します")
+            return report
+
+        vertex_maps = stage["vertex_maps"]
+        vertex_connecteds = stage["vertex_connecteds"]
+        prev_bone_cnt = len(model.bones)
+        prev_rigidbody_cnt = len(model.rigidbodies)
+        prev_joint_cnt = len(model.joints)
+
+        start = time.time()
+        root_bone, tmp_all_bones, all_registed_bone_indexs, _, _ \
+            = self.create_bone(model, param_option, vertex_map_orders, vertex_maps, vertex_connecteds, stage["bone_horizonal_distances"], stage["bone_vertical_distances"])
+        report["timings"]["bone"] = time.time() - start
+
+        # 剛体・ジョイントは生成してみて数える
+        report["timings"]["rigidbody"] = 0
+        report["timings"]["joint"] = 0
+        for base_map_idx in vertex_map_orders:
+            start = time.time()
+            root_rigidbody, registed_rigidbodies = self.create_rigidbody(model, param_option, vertex_connecteds[base_map_idx], tmp_all_bones, all_registed_bone_indexs[base_map_idx], root_bone)
+            report["timings"]["rigidbody"] += time.time() - start
+
+            start = time.time()
+            self.create_joint(model, param_option, vertex_connecteds[base_map_idx], tmp_all_bones, all_registed_bone_indexs[base_map_idx], root_rigidbody, registed_rigidbodies)
+            report["timings"]["joint"] += time.time() - start
+
+        report["map_count"] = len(vertex_map_orders)
+        for midx, vertex_map in enumerate(vertex_maps):
+            registed_bone_indexs = all_registed_bone_indexs.get(midx, {})
+            report["maps"].append({"size": list(vertex_map.shape), "vertex_count": int(np.count_nonzero(vertex_map >= 0)), "is_used": midx in vertex_map_orders, \
+                                   "bone_grid": [len([v_xidxs for v_xidxs in registed_bone_indexs.values() if v_xidxs]), \
+                                                 max([len(v_xidxs) for v_xidxs in registed_bone_indexs.values()] + [0])]})
+
+        report["unmapped_face_count"], report["unmapped_vertex_count"] = \
+            self.count_unmapped(model, param_option, target_vertices, [vertex_maps[base_map_idx] for base_map_idx in vertex_map_orders], stage["duplicate_vertices"])
+
+        report["bone_count"] = len(model.bones) - prev_bone_cnt
+        report["rigidbody_count"] = len(model.rigidbodies) - prev_rigidbody_cnt
+        report["joint_count"] = len(model.joints) - prev_joint_cnt
+
+        return report
+
+    # 頂点マップに含まれない対象面・対象頂点の数(残ウェイト分布の対象)
+    def count_unmapped(self, model: PmxModel, param_option: dict, target_vertices: list, vertex_maps: list, duplicate_vertices: dict):
+        mapped_vertices = set()
+        for vertex_map in vertex_maps:
+            mapped_vertices |= set(vertex_map[vertex_map >= 0].tolist())
+
+        # 同じ位置の頂点はマップ上の頂点と同じウェイトになる
+        for vidxs in duplicate_vertices.values():
+            if not mapped_vertices.isdisjoint(vidxs):
+                mapped_vertices.update(vidxs)
+
+        target_vertex_set = set(target_vertices)
+        unmapped_face_cnt = 0
+        for index_idx in model.material_indices[param_option['material_name']]:
+            vidxs = model.indices[index_idx]
+            if target_vertex_set.issuperset(vidxs) and not mapped_vertices.issuperset(vidxs):
+                unmapped_face_cnt += 1
+
+        return unmapped_face_cnt, len(target_vertex_set - mapped_vertices)
+
+    def create_vertex_maps_parallel(self, model: PmxModel):
+        # 頂点マップ生成対象の設定
+        target_pidxs = []
+        target_args = []
+        target_stage_keys = set()
+        for pidx, param_option in enumerate(self.options.param_options):
+            if param_option['exist_physics_clear'] == logger.transtext('再利用'):
+                continue
+            target_vertices = self.get_target_vertices(model, param_option)
+            if target_vertices is None:
+                continue
+            stage_key = get_stage_key(model, param_option, target_vertices)
+            if stage_cache.get(stage_key, self.options.stage_cache_dir) or (stage_key and stage_key in target_stage_keys):
+                # キャッシュがある(同じ入力の設定を生成する)場合、生成不要
+                continue
+            target_stage_keys.add(stage_key)
+            target_pidxs.append(pidx)
+            target_args.append((param_option, target_vertices))
+
+        max_workers = min(self.options.max_workers or 1, len(target_pidxs))
+        if max_workers <= 1:
+            # 並列にしない場合は各設定の処理中に生成する
+            return {}
+
+        logger.info("頂点マップ並列生成", decoration=MLogger.DECORATION_LINE)
+
+        face_cnts = [len(model.material_indices[param_option['material_name']]) for param_option, _ in target_args]
+        self.progress.start_stage(ProgressCounter.STAGE_VERTEX_MAP, sum(face_cnts))
+
+        vertex_map_results = {}
+        # ワーカーにはモデルを渡さず、頂点・面の配列を共有メモリから参照させる
+        shared_model = SharedModelArrays(model)
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=init_shared_worker, \
+                                                        initargs=(shared_model.handle, self.cancel_token)) as executor:
+                futures = {executor.submit(create_vertex_map_worker, param_option, target_vertices): pidx \
+                           for pidx, (param_option, target_vertices) in zip(target_pidxs, target_args)}
+                for future in concurrent.futures.as_completed(futures):
+                    self.progress.add(face_cnts[target_pidxs.index(futures[future])])
+                    try:
+                        vertex_map_results[futures[future]] = future.result()
+                    except Exception as e:
+                        if self.cancel_token.is_cancelled():
+                            # 中断された場合、残りのワーカーも中断要求を見て終了する
+                            raise MKilledException()
+                        # 失敗した設定は、各設定の処理中に改めて生成してエラーを出す
+                        if not isinstance(e, SizingException):
+                            logger.warning("%s: 頂点マップの並列生成に失敗したため、設定毎に生成し直します\n\n%s", \
+                                           target_args[target_pidxs.index(futures[future])][0]['material_name'], traceback.format_exc(), \
+                                           decoration=MLogger.DECORATION_BOX)
+        finally:
+            shared_model.close()
+
+        return vertex_map_results
+
+    # 頂点CSVが指定されている場合、対象頂点リスト生成(読み込めなかった場合、None)
+    def get_target_vertices(self, model: PmxModel, param_option: dict):
         if param_option['vertices_csv']:
             target_vertices = []
             try:
@@ -92,11 +468,32 @@ class PmxTailorExportService():
                         if len(row) > 1 and int(row[1]) in model.material_vertices[param_option['material_name']]:
                             target_vertices.append(int(row[1]))
             except Exception:
-                logger.warning("頂点CSVが正常に読み込めなかったため、処理を終了します", decoration=MLogger.DECORATION_BOX)
-                return False
+                return None
         else:
             target_vertices = list(model.material_vertices[param_option['material_name']])
 
+        return target_vertices
+
+    def add_physics_comment(self, model: PmxModel, param_option: dict):
+        model.comment += f"\r\n{logger.transtext('材質')}: {param_option['material_name']} --------------"    # noqa
+        model.comment += f"\r\n　　{logger.transtext('剛体グループ')}: {param_option['rigidbody'].collision_group + 1}"    # noqa
+        model.comment += f", {logger.transtext('細かさ')}: {param_option['fineness']}"    # noqa
+        model.comment += f", {logger.transtext('質量')}: {param_option['mass']}"    # noqa
+        model.comment += f", {logger.transtext('柔らかさ')}: {param_option['air_resistance']}"    # noqa
+        model.comment += f", {logger.transtext('張り')}: {param_option['shape_maintenance']}"    # noqa
+
+    def create_physics(self, model: PmxModel, param_option: dict, saved_bone_names: list, vertex_map_result=None):
+        self.add_physics_comment(model, param_option)
+
+        # 剛体・ジョイントのみ再生成できる場合の情報
+        physics_state = None
+
+        # 頂点CSVが指定されている場合、対象頂点リスト生成
+        target_vertices = self.get_target_vertices(model, param_option)
+        if target_vertices is None:
+            logger.warning("頂点CSVが正常に読み込めなかったため、処理を終了します", decoration=MLogger.DECORATION_BOX)
+            return False
+
         if param_option['exist_physics_clear'] in [logger.transtext('上書き'), logger.transtext('再利用')]:
             # 既存材質削除フラグONの場合
             logger.info("【%s】既存材質削除", param_option['material_name'], decoration=MLogger.DECORATION_LINE)
@@ -137,36 +534,50 @@ class PmxTailorExportService():
         else:
             logger.info("【%s】頂点マップ生成", param_option['material_name'], decoration=MLogger.DECORATION_LINE)
 
-            vertex_maps, vertex_connecteds, duplicate_vertices, registed_iidxs, duplicate_indices, index_combs_by_vpos \
-                = self.create_vertex_map(model, param_option, param_option['material_name'], target_vertices)
-            
-            if not vertex_maps:
+            # 一旦ルートボーンにウェイトを一括置換
+            parent_bone_index = model.bones[param_option['parent_bone_name']].index
+            for vertex_idx in target_vertices:
+                model.vertex_dict[vertex_idx].deform = Bdef1(parent_bone_index)
+
+            stage = self.get_vertex_map_stage(model, param_option, target_vertices, vertex_map_result)
+            if not stage:
                 return False
+
+            vertex_maps = stage["vertex_maps"]
+            vertex_connecteds = stage["vertex_connecteds"]
+            duplicate_vertices = stage["duplicate_vertices"]
+            vertex_display_maps = stage["vertex_display_maps"]
+
+            for midx, vertex_display_map in enumerate(vertex_display_maps):
+                logger.info("-- 絶対頂点マップ: %s個目: ---------", midx + 1)
+                logger.info('\n'.join([', '.join(vertex_display_map[vx, :]) for vx in range(vertex_display_map.shape[0])]), translate=False)
             
-            # 各頂点の有効INDEX数が最も多いものをベースとする
-            map_cnt = []
-            for vertex_map in vertex_maps:
-                map_cnt.append(np.count_nonzero(vertex_map >= 0))
-            
-            if len(map_cnt) == 0:
+            vertex_map_orders = self.get_vertex_map_orders(vertex_maps)
+            if vertex_map_orders is None:
                 logger.warning("有効な頂点マップが生成できなかった為、処理を終了します", decoration=MLogger.DECORATION_BOX)
                 return False
             
-            vertex_map_orders = [k for k in np.argsort(-np.array(map_cnt)) if map_cnt[k] > np.max(map_cnt) * 0.5]
-            
             logger.info("【%s】ボーン生成", param_option['material_name'], decoration=MLogger.DECORATION_LINE)
 
             root_bone, tmp_all_bones, all_registed_bone_indexs, all_bone_horizonal_distances, all_bone_vertical_distances \
-                = self.create_bone(model, param_option, vertex_map_orders, vertex_maps, vertex_connecteds)
+                = self.create_bone(model, param_option, vertex_map_orders, vertex_maps, vertex_connecteds, stage["bone_horizonal_distances"], stage["bone_vertical_distances"])
 
             vertex_remaining_set = set(target_vertices)
+            self.progress.start_stage(ProgressCounter.STAGE_WEIGHT, len(vertex_remaining_set))
+
+            # 頂点マップ毎のウェイト値は並列で求めておき、割り当てはマップの優先順に行う
+            all_weight_rows = self.calc_weight_rows_parallel(model, param_option, vertex_map_orders, vertex_maps, vertex_connecteds, all_registed_bone_indexs, \
+                                                             all_bone_horizonal_distances, all_bone_vertical_distances, target_vertices)
 
             for base_map_idx in vertex_map_orders:
                 logger.info("【%s(No.%s)】ウェイト分布", param_option['material_name'], base_map_idx + 1, decoration=MLogger.DECORATION_LINE)
 
-                self.create_weight(model, param_option, vertex_maps[base_map_idx], vertex_connecteds[base_map_idx], duplicate_vertices, \
-                                   all_registed_bone_indexs[base_map_idx], all_bone_horizonal_distances[base_map_idx], all_bone_vertical_distances[base_map_idx], \
-                                   vertex_remaining_set, target_vertices)
+                if base_map_idx in all_weight_rows:
+                    self.apply_weight_rows(model, param_option, all_weight_rows[base_map_idx], duplicate_vertices, vertex_remaining_set)
+                else:
+                    self.create_weight(model, param_option, vertex_maps[base_map_idx], vertex_connecteds[base_map_idx], duplicate_vertices, \
+                                       all_registed_bone_indexs[base_map_idx], all_bone_horizonal_distances[base_map_idx], all_bone_vertical_distances[base_map_idx], \
+                                       vertex_remaining_set, target_vertices)
 
             if len(list(vertex_remaining_set)) > 0:
                 logger.info("【%s】残ウェイト分布", param_option['material_name'], decoration=MLogger.DECORATION_LINE)
@@ -177,13 +588,18 @@ class PmxTailorExportService():
                 logger.info("【%s】裾ウェイト分布", param_option['edge_material_name'], decoration=MLogger.DECORATION_LINE)
 
                 edge_vertices = set(model.material_vertices[param_option['edge_material_name']])
+                self.progress.start_stage(ProgressCounter.STAGE_WEIGHT, len(edge_vertices))
                 self.create_remaining_weight(model, param_option, vertex_maps, edge_vertices, vertex_map_orders, edge_vertices)
         
             if param_option['back_material_name']:
                 logger.info("【%s】裏面ウェイト分布", param_option['back_material_name'], decoration=MLogger.DECORATION_LINE)
+                self.progress.start_stage(ProgressCounter.STAGE_WEIGHT, len(model.material_vertices[param_option['back_material_name']]))
 
                 self.create_back_weight(model, param_option)
     
+            prev_rigidbody_cnt = len(model.rigidbodies)
+            prev_joint_cnt = len(model.joints)
+
             for base_map_idx in vertex_map_orders:
                 logger.info("【%s(No.%s)】剛体生成", param_option['material_name'], base_map_idx + 1, decoration=MLogger.DECORATION_LINE)
 
@@ -193,8 +609,51 @@ class PmxTailorExportService():
 
                 self.create_joint(model, param_option, vertex_connecteds[base_map_idx], tmp_all_bones, all_registed_bone_indexs[base_map_idx], root_rigidbody, registed_rigidbodies)
 
+            if not param_option["rigidbody_balancer"] and len(model.rigidbodies) > prev_rigidbody_cnt:
+                # バランサー剛体はボーンも追加するので、剛体・ジョイントのみの再生成対象外
+                physics_state = encode_physics_state(root_bone, tmp_all_bones, \
+                                                     [(vertex_connecteds[base_map_idx], all_registed_bone_indexs[base_map_idx]) for base_map_idx in vertex_map_orders], \
+                                                     list(model.rigidbodies.keys())[prev_rigidbody_cnt:], list(model.joints.keys())[prev_joint_cnt:])
+
+        self.physics_states.append(physics_state)
+
         return True
 
+    # 頂点マップとボーン間距離(入力が同じであればキャッシュを使う)
+    def get_vertex_map_stage(self, model: PmxModel, param_option: dict, target_vertices: list, vertex_map_result=None):
+        stage_key = get_stage_key(model, param_option, target_vertices)
+        stage = stage_cache.get(stage_key, self.options.stage_cache_dir)
+
+        if stage:
+            logger.info("%s: 頂点マップキャッシュ利用", param_option['material_name'])
+            return stage
+
+        if not vertex_map_result or not vertex_map_result[0]:
+            # 並列生成していない(失敗した)場合、ここで生成
+            vertex_map_result = self.create_vertex_map(model, param_option, param_option['material_name'], target_vertices)
+
+        if not vertex_map_result[0]:
+            return None
+
+        stage = dict(zip(["vertex_maps", "vertex_connecteds", "duplicate_vertices", "registed_iidxs", "duplicate_indices", "index_combs_by_vpos", \
+                          "vertex_display_maps"], vertex_map_result))
+        stage["bone_horizonal_distances"], stage["bone_vertical_distances"] = self.get_all_bone_distances(model, stage["vertex_maps"])
+
+        stage_cache.put(stage_key, stage, self.options.stage_cache_dir)
+
+        return stage
+
+    # 各頂点の有効INDEX数が最も多いものをベースとした、頂点マップの処理順(頂点マップがない場合、None)
+    def get_vertex_map_orders(self, vertex_maps: list):
+        map_cnt = []
+        for vertex_map in vertex_maps:
+            map_cnt.append(np.count_nonzero(vertex_map >= 0))
+
+        if len(map_cnt) == 0:
+            return None
+
+        return [k for k in np.argsort(-np.array(map_cnt)) if map_cnt[k] > np.max(map_cnt) * 0.5]
+
     def create_bone_blocks(self, model: PmxModel, param_option: dict, material_name: str):
         bone_grid = param_option["bone_grid"]
         bone_grid_cols = param_option["bone_grid_cols"]
@@ -377,7 +836,10 @@ class PmxTailorExportService():
 
         prev_joint_cnt = 0
 
+        self.progress.start_stage(ProgressCounter.STAGE_JOINT, bone_grid_cols)
+
         for pac in range(bone_grid_cols):
+            self.progress.update(pac)
             # ジョイント生成
             created_joints = {}
 
@@ -387,52 +849,22 @@ class PmxTailorExportService():
             
             max_vy = valid_rows[-1]
             min_vy = 0
-            xs = np.arange(min_vy, max_vy, step=1)
         
             if param_vertical_joint:
                 coefficient = param_option['vertical_joint_coefficient']
+                vertical_limit_profile = get_joint_limit_profile(param_vertical_joint, coefficient, min_vy, max_vy)
 
-                vertical_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.translation_limit_min.x() / coefficient, param_vertical_joint.translation_limit_min.x()]])), xs)             # noqa
-                vertical_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.translation_limit_min.y() / coefficient, param_vertical_joint.translation_limit_min.y()]])), xs)             # noqa
-                vertical_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.translation_limit_min.z() / coefficient, param_vertical_joint.translation_limit_min.z()]])), xs)             # noqa
-
-                vertical_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.translation_limit_max.x() / coefficient, param_vertical_joint.translation_limit_max.x()]])), xs)             # noqa
-                vertical_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.translation_limit_max.y() / coefficient, param_vertical_joint.translation_limit_max.y()]])), xs)             # noqa
-                vertical_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.translation_limit_max.z() / coefficient, param_vertical_joint.translation_limit_max.z()]])), xs)             # noqa
-
-                vertical_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.rotation_limit_min.x() / coefficient, param_vertical_joint.rotation_limit_min.x()]])), xs)             # noqa
-                vertical_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.rotation_limit_min.y() / coefficient, param_vertical_joint.rotation_limit_min.y()]])), xs)             # noqa
-                vertical_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.rotation_limit_min.z() / coefficient, param_vertical_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-                vertical_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.rotation_limit_max.x() / coefficient, param_vertical_joint.rotation_limit_max.x()]])), xs)             # noqa
-                vertical_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.rotation_limit_max.y() / coefficient, param_vertical_joint.rotation_limit_max.y()]])), xs)             # noqa
-                vertical_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.rotation_limit_max.z() / coefficient, param_vertical_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-                vertical_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.spring_constant_translation.x() / coefficient, param_vertical_joint.spring_constant_translation.x()]])), xs)             # noqa
-                vertical_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.spring_constant_translation.y() / coefficient, param_vertical_joint.spring_constant_translation.y()]])), xs)             # noqa
-                vertical_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.spring_constant_translation.z() / coefficient, param_vertical_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-                vertical_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.spring_constant_rotation.x() / coefficient, param_vertical_joint.spring_constant_rotation.x()]])), xs)             # noqa
-                vertical_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.spring_constant_rotation.y() / coefficient, param_vertical_joint.spring_constant_rotation.y()]])), xs)             # noqa
-                vertical_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_vertical_joint.spring_constant_rotation.z() / coefficient, param_vertical_joint.spring_constant_rotation.z()]])), xs)             # noqa
+                vertical_limit_min_mov_xs, vertical_limit_min_mov_ys, vertical_limit_min_mov_zs = vertical_limit_profile.linear('translation_limit_min')
+
+                vertical_limit_max_mov_xs, vertical_limit_max_mov_ys, vertical_limit_max_mov_zs = vertical_limit_profile.linear('translation_limit_max')
+
+                vertical_limit_min_rot_xs, vertical_limit_min_rot_ys, vertical_limit_min_rot_zs = vertical_limit_profile.linear('rotation_limit_min')
+
+                vertical_limit_max_rot_xs, vertical_limit_max_rot_ys, vertical_limit_max_rot_zs = vertical_limit_profile.linear('rotation_limit_max')
+
+                vertical_spring_constant_mov_xs, vertical_spring_constant_mov_ys, vertical_spring_constant_mov_zs = vertical_limit_profile.linear('spring_constant_translation')
+
+                vertical_spring_constant_rot_xs, vertical_spring_constant_rot_ys, vertical_spring_constant_rot_zs = vertical_limit_profile.linear('spring_constant_rotation')
             
             prev_above_bone_name = None
             prev_above_bone_position = None
@@ -605,8 +1037,10 @@ class PmxTailorExportService():
         bone_grid_rows = param_option["bone_grid_rows"]
         # bone_grid_cols = param_option["bone_grid_cols"]
 
-        # ジョイント生成
+        # ジョイント生成(ジョイントキー → ジョイント行)
         created_joints = {}
+        # 位置・回転・制限値は行として溜めて最後にまとめて計算する
+        joint_batch = JointBatch()
 
         # # 略称
         # abb_name = param_option['abb_name']
@@ -619,194 +1053,33 @@ class PmxTailorExportService():
         # 逆ジョイント情報
         param_reverse_joint = param_option['reverse_joint']
 
-        prev_joint_cnt = 0
-
         max_vy = bone_grid_rows
         middle_vy = (bone_grid_rows) * 0.3
         min_vy = 0
-        xs = np.arange(min_vy, max_vy, step=1)
-    
+
+        balancer_limit_table = joint_batch.add_limit_table(BALANCER_JOINT_LIMITS)
+        balancer_sub_limit_table = joint_batch.add_limit_table(BALANCER_SUB_JOINT_LIMITS)
+
         if param_vertical_joint:
             coefficient = param_option['vertical_joint_coefficient']
-
-            vertical_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_min.x() / coefficient, param_vertical_joint.translation_limit_min.x()]])), xs)             # noqa
-            vertical_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_min.y() / coefficient, param_vertical_joint.translation_limit_min.y()]])), xs)             # noqa
-            vertical_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_min.z() / coefficient, param_vertical_joint.translation_limit_min.z()]])), xs)             # noqa
-
-            vertical_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_max.x() / coefficient, param_vertical_joint.translation_limit_max.x()]])), xs)             # noqa
-            vertical_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_max.y() / coefficient, param_vertical_joint.translation_limit_max.y()]])), xs)             # noqa
-            vertical_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_max.z() / coefficient, param_vertical_joint.translation_limit_max.z()]])), xs)             # noqa
-
-            vertical_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_min.x() / coefficient, param_vertical_joint.rotation_limit_min.x() / coefficient, param_vertical_joint.rotation_limit_min.x()]])), xs)             # noqa
-            vertical_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_min.y() / coefficient, param_vertical_joint.rotation_limit_min.y() / coefficient, param_vertical_joint.rotation_limit_min.y()]])), xs)             # noqa
-            vertical_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_min.z() / coefficient, param_vertical_joint.rotation_limit_min.z() / coefficient, param_vertical_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-            vertical_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_max.x() / coefficient, param_vertical_joint.rotation_limit_max.x() / coefficient, param_vertical_joint.rotation_limit_max.x()]])), xs)             # noqa
-            vertical_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_max.y() / coefficient, param_vertical_joint.rotation_limit_max.y() / coefficient, param_vertical_joint.rotation_limit_max.y()]])), xs)             # noqa
-            vertical_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_max.z() / coefficient, param_vertical_joint.rotation_limit_max.z() / coefficient, param_vertical_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-            vertical_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_translation.x() / coefficient, param_vertical_joint.spring_constant_translation.x() / coefficient, param_vertical_joint.spring_constant_translation.x()]])), xs)             # noqa
-            vertical_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_translation.y() / coefficient, param_vertical_joint.spring_constant_translation.y() / coefficient, param_vertical_joint.spring_constant_translation.y()]])), xs)             # noqa
-            vertical_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_translation.z() / coefficient, param_vertical_joint.spring_constant_translation.z() / coefficient, param_vertical_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-            vertical_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_rotation.x() / coefficient, param_vertical_joint.spring_constant_rotation.x() / coefficient, param_vertical_joint.spring_constant_rotation.x()]])), xs)             # noqa
-            vertical_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_rotation.y() / coefficient, param_vertical_joint.spring_constant_rotation.y() / coefficient, param_vertical_joint.spring_constant_rotation.y()]])), xs)             # noqa
-            vertical_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_rotation.z() / coefficient, param_vertical_joint.spring_constant_rotation.z() / coefficient, param_vertical_joint.spring_constant_rotation.z()]])), xs)             # noqa
+            vertical_limit_table = joint_batch.add_limit_table(get_joint_limit_profile(param_vertical_joint, coefficient, min_vy, max_vy, middle_vy).joint_limits())
 
         if param_horizonal_joint:
             coefficient = param_option['horizonal_joint_coefficient']
-            
-            horizonal_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_horizonal_joint.translation_limit_min.x() / coefficient, param_horizonal_joint.translation_limit_min.x()]])), xs)             # noqa
-            horizonal_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_horizonal_joint.translation_limit_min.y() / coefficient, param_horizonal_joint.translation_limit_min.y()]])), xs)             # noqa
-            horizonal_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_horizonal_joint.translation_limit_min.z() / coefficient, param_horizonal_joint.translation_limit_min.z()]])), xs)             # noqa
-
-            horizonal_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_horizonal_joint.translation_limit_max.x() / coefficient, param_horizonal_joint.translation_limit_max.x()]])), xs)             # noqa
-            horizonal_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_horizonal_joint.translation_limit_max.y() / coefficient, param_horizonal_joint.translation_limit_max.y()]])), xs)             # noqa
-            horizonal_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_horizonal_joint.translation_limit_max.z() / coefficient, param_horizonal_joint.translation_limit_max.z()]])), xs)             # noqa
-
-            horizonal_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_min.x() / coefficient, param_horizonal_joint.rotation_limit_min.x() / coefficient, param_horizonal_joint.rotation_limit_min.x()]])), xs)             # noqa
-            horizonal_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_min.y() / coefficient, param_horizonal_joint.rotation_limit_min.y() / coefficient, param_horizonal_joint.rotation_limit_min.y()]])), xs)             # noqa
-            horizonal_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_min.z() / coefficient, param_horizonal_joint.rotation_limit_min.z() / coefficient, param_horizonal_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-            horizonal_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_max.x() / coefficient, param_horizonal_joint.rotation_limit_max.x() / coefficient, param_horizonal_joint.rotation_limit_max.x()]])), xs)             # noqa
-            horizonal_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_max.y() / coefficient, param_horizonal_joint.rotation_limit_max.y() / coefficient, param_horizonal_joint.rotation_limit_max.y()]])), xs)             # noqa
-            horizonal_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_max.z() / coefficient, param_horizonal_joint.rotation_limit_max.z() / coefficient, param_horizonal_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-            horizonal_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_translation.x() / coefficient, param_horizonal_joint.spring_constant_translation.x() / coefficient, param_horizonal_joint.spring_constant_translation.x()]])), xs)             # noqa
-            horizonal_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_translation.y() / coefficient, param_horizonal_joint.spring_constant_translation.y() / coefficient, param_horizonal_joint.spring_constant_translation.y()]])), xs)             # noqa
-            horizonal_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_translation.z() / coefficient, param_horizonal_joint.spring_constant_translation.z() / coefficient, param_horizonal_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-            horizonal_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_rotation.x() / coefficient, param_horizonal_joint.spring_constant_rotation.x() / coefficient, param_horizonal_joint.spring_constant_rotation.x()]])), xs)             # noqa
-            horizonal_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_rotation.y() / coefficient, param_horizonal_joint.spring_constant_rotation.y() / coefficient, param_horizonal_joint.spring_constant_rotation.y()]])), xs)             # noqa
-            horizonal_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_rotation.z() / coefficient, param_horizonal_joint.spring_constant_rotation.z() / coefficient, param_horizonal_joint.spring_constant_rotation.z()]])), xs)             # noqa
+            horizonal_limit_table = joint_batch.add_limit_table(get_joint_limit_profile(param_horizonal_joint, coefficient, min_vy, max_vy, middle_vy).joint_limits())
 
         if param_diagonal_joint:
             coefficient = param_option['diagonal_joint_coefficient']
-
-            diagonal_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_min.x() / coefficient, param_diagonal_joint.translation_limit_min.x()]])), xs)             # noqa
-            diagonal_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_min.y() / coefficient, param_diagonal_joint.translation_limit_min.y()]])), xs)             # noqa
-            diagonal_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_min.z() / coefficient, param_diagonal_joint.translation_limit_min.z()]])), xs)             # noqa
-
-            diagonal_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_max.x() / coefficient, param_diagonal_joint.translation_limit_max.x()]])), xs)             # noqa
-            diagonal_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_max.y() / coefficient, param_diagonal_joint.translation_limit_max.y()]])), xs)             # noqa
-            diagonal_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_max.z() / coefficient, param_diagonal_joint.translation_limit_max.z()]])), xs)             # noqa
-
-            diagonal_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_min.x() / coefficient, param_diagonal_joint.rotation_limit_min.x() / coefficient, param_diagonal_joint.rotation_limit_min.x()]])), xs)             # noqa
-            diagonal_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_min.y() / coefficient, param_diagonal_joint.rotation_limit_min.y() / coefficient, param_diagonal_joint.rotation_limit_min.y()]])), xs)             # noqa
-            diagonal_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_min.z() / coefficient, param_diagonal_joint.rotation_limit_min.z() / coefficient, param_diagonal_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-            diagonal_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_max.x() / coefficient, param_diagonal_joint.rotation_limit_max.x() / coefficient, param_diagonal_joint.rotation_limit_max.x()]])), xs)             # noqa
-            diagonal_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_max.y() / coefficient, param_diagonal_joint.rotation_limit_max.y() / coefficient, param_diagonal_joint.rotation_limit_max.y()]])), xs)             # noqa
-            diagonal_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_max.z() / coefficient, param_diagonal_joint.rotation_limit_max.z() / coefficient, param_diagonal_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-            diagonal_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_translation.x() / coefficient, param_diagonal_joint.spring_constant_translation.x() / coefficient, param_diagonal_joint.spring_constant_translation.x()]])), xs)             # noqa
-            diagonal_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_translation.y() / coefficient, param_diagonal_joint.spring_constant_translation.y() / coefficient, param_diagonal_joint.spring_constant_translation.y()]])), xs)             # noqa
-            diagonal_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_translation.z() / coefficient, param_diagonal_joint.spring_constant_translation.z() / coefficient, param_diagonal_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-            diagonal_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_rotation.x() / coefficient, param_diagonal_joint.spring_constant_rotation.x() / coefficient, param_diagonal_joint.spring_constant_rotation.x()]])), xs)             # noqa
-            diagonal_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_rotation.y() / coefficient, param_diagonal_joint.spring_constant_rotation.y() / coefficient, param_diagonal_joint.spring_constant_rotation.y()]])), xs)             # noqa
-            diagonal_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_rotation.z() / coefficient, param_diagonal_joint.spring_constant_rotation.z() / coefficient, param_diagonal_joint.spring_constant_rotation.z()]])), xs)             # noqa
+            diagonal_limit_table = joint_batch.add_limit_table(get_joint_limit_profile(param_diagonal_joint, coefficient, min_vy, max_vy, middle_vy).joint_limits())
 
         if param_reverse_joint:
             coefficient = param_option['reverse_joint_coefficient']
+            reverse_limit_table = joint_batch.add_limit_table(get_joint_limit_profile(param_reverse_joint, coefficient, min_vy, max_vy, middle_vy).joint_limits())
 
-            reverse_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_min.x() / coefficient, param_reverse_joint.translation_limit_min.x()]])), xs)             # noqa
-            reverse_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_min.y() / coefficient, param_reverse_joint.translation_limit_min.y()]])), xs)             # noqa
-            reverse_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_min.z() / coefficient, param_reverse_joint.translation_limit_min.z()]])), xs)             # noqa
-
-            reverse_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_max.x() / coefficient, param_reverse_joint.translation_limit_max.x()]])), xs)             # noqa
-            reverse_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_max.y() / coefficient, param_reverse_joint.translation_limit_max.y()]])), xs)             # noqa
-            reverse_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_max.z() / coefficient, param_reverse_joint.translation_limit_max.z()]])), xs)             # noqa
-
-            reverse_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_min.x() / coefficient, param_reverse_joint.rotation_limit_min.x() / coefficient, param_reverse_joint.rotation_limit_min.x()]])), xs)             # noqa
-            reverse_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_min.y() / coefficient, param_reverse_joint.rotation_limit_min.y() / coefficient, param_reverse_joint.rotation_limit_min.y()]])), xs)             # noqa
-            reverse_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_min.z() / coefficient, param_reverse_joint.rotation_limit_min.z() / coefficient, param_reverse_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-            reverse_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_max.x() / coefficient, param_reverse_joint.rotation_limit_max.x() / coefficient, param_reverse_joint.rotation_limit_max.x()]])), xs)             # noqa
-            reverse_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_max.y() / coefficient, param_reverse_joint.rotation_limit_max.y() / coefficient, param_reverse_joint.rotation_limit_max.y()]])), xs)             # noqa
-            reverse_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_max.z() / coefficient, param_reverse_joint.rotation_limit_max.z() / coefficient, param_reverse_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-            reverse_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_translation.x() / coefficient, param_reverse_joint.spring_constant_translation.x() / coefficient, param_reverse_joint.spring_constant_translation.x()]])), xs)             # noqa
-            reverse_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_translation.y() / coefficient, param_reverse_joint.spring_constant_translation.y() / coefficient, param_reverse_joint.spring_constant_translation.y()]])), xs)             # noqa
-            reverse_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_translation.z() / coefficient, param_reverse_joint.spring_constant_translation.z() / coefficient, param_reverse_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-            reverse_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_rotation.x() / coefficient, param_reverse_joint.spring_constant_rotation.x() / coefficient, param_reverse_joint.spring_constant_rotation.x()]])), xs)             # noqa
-            reverse_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_rotation.y() / coefficient, param_reverse_joint.spring_constant_rotation.y() / coefficient, param_reverse_joint.spring_constant_rotation.y()]])), xs)             # noqa
-            reverse_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_rotation.z() / coefficient, param_reverse_joint.spring_constant_rotation.z() / coefficient, param_reverse_joint.spring_constant_rotation.z()]])), xs)             # noqa
-        
-        for bone_block in bone_blocks.values():
+        self.progress.start_stage(ProgressCounter.STAGE_JOINT, len(bone_blocks))
+
+        for block_idx, bone_block in enumerate(bone_blocks.values()):
+            self.progress.update(block_idx)
             prev_above_bone_name = bone_block['prev_above']
             prev_above_bone_position = bone_block['prev_above_pos']
             prev_below_bone_name = bone_block['prev_below']
@@ -823,24 +1096,14 @@ class PmxTailorExportService():
                 joint_name = f'↓|{root_rigidbody.name}|{registed_rigidbodies[prev_above_bone_name]}'
 
                 # 縦ジョイント
-                joint_vec = prev_above_bone_position
+                joint_vec = joint_batch.add_position(prev_above_bone_position)
 
                 # 回転量
-                joint_axis_up = (prev_below_bone_position - prev_above_bone_position).normalized()
-                joint_axis = (root_rigidbody.shape_position - prev_above_bone_position).normalized()
-                joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                joint_euler = joint_rotation_qq.toEulerAngles()
-                joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
-
-                joint = Joint(joint_name, joint_name, 0, root_rigidbody.index, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index,
-                              joint_vec, joint_radians, MVector3D(vertical_limit_min_mov_xs[yi], vertical_limit_min_mov_ys[yi], vertical_limit_min_mov_zs[yi]), \
-                              MVector3D(vertical_limit_max_mov_xs[yi], vertical_limit_max_mov_ys[yi], vertical_limit_max_mov_zs[yi]),
-                              MVector3D(math.radians(vertical_limit_min_rot_xs[yi]), math.radians(vertical_limit_min_rot_ys[yi]), math.radians(vertical_limit_min_rot_zs[yi])),
-                              MVector3D(math.radians(vertical_limit_max_rot_xs[yi]), math.radians(vertical_limit_max_rot_ys[yi]), math.radians(vertical_limit_max_rot_zs[yi])),
-                              MVector3D(vertical_spring_constant_mov_xs[yi], vertical_spring_constant_mov_ys[yi], vertical_spring_constant_mov_zs[yi]), \
-                              MVector3D(vertical_spring_constant_rot_xs[yi], vertical_spring_constant_rot_ys[yi], vertical_spring_constant_rot_zs[yi]))   # noqa
-                created_joints[f'0:{root_rigidbody.index:05d}:{model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index:05d}'] = joint
+                joint_rotation = joint_batch.add_rotation(prev_above_bone_position, root_rigidbody.shape_position, prev_above_bone_position, prev_below_bone_position)
+
+                created_joints[f'0:{root_rigidbody.index:05d}:{model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index:05d}'] = \
+                    joint_batch.add_joint(joint_name, root_rigidbody.index, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                          joint_vec, joint_rotation, vertical_limit_table, yi)
 
                 # バランサー剛体が必要な場合
                 if param_option["rigidbody_balancer"]:
@@ -848,21 +1111,15 @@ class PmxTailorExportService():
                     joint_name = f'B|{prev_above_bone_name}|{balancer_prev_above_bone_name}'
                     joint_key = f'8:{model.rigidbodies[prev_above_bone_name].index:05d}:{model.rigidbodies[balancer_prev_above_bone_name].index:05d}'
 
-                    joint_vec = model.rigidbodies[prev_above_bone_name].shape_position
+                    joint_vec = joint_batch.add_position(model.rigidbodies[prev_above_bone_name].shape_position)
 
                     # 回転量
-                    joint_axis_up = (prev_below_bone_position - prev_above_bone_position).normalized()
-                    joint_axis = (model.rigidbodies[balancer_prev_above_bone_name].shape_position - prev_above_bone_position).normalized()
-                    joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                    joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                    joint_euler = joint_rotation_qq.toEulerAngles()
-                    joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
-
-                    joint = Joint(joint_name, joint_name, 0, model.rigidbodies[prev_above_bone_name].index, model.rigidbodies[balancer_prev_above_bone_name].index,
-                                  joint_vec, joint_radians, MVector3D(), MVector3D(), MVector3D(), MVector3D(),
-                                  MVector3D(100000, 100000, 100000), MVector3D(100000, 100000, 100000))   # noqa
-                    created_joints[joint_key] = joint
-    
+                    joint_rotation = joint_batch.add_rotation(prev_above_bone_position, model.rigidbodies[balancer_prev_above_bone_name].shape_position, \
+                                                              prev_above_bone_position, prev_below_bone_position)
+
+                    created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[prev_above_bone_name].index, model.rigidbodies[balancer_prev_above_bone_name].index, \
+                                                                      joint_vec, joint_rotation, balancer_limit_table, 0)
+
             if param_vertical_joint and prev_above_bone_name != prev_below_bone_name and prev_above_bone_name in registed_rigidbodies and prev_below_bone_name in registed_rigidbodies:
                 # 縦ジョイント
                 joint_name = f'↓|{registed_rigidbodies[prev_above_bone_name]}|{registed_rigidbodies[prev_below_bone_name]}'
@@ -870,32 +1127,17 @@ class PmxTailorExportService():
 
                 if joint_key not in created_joints:
                     # 未登録のみ追加
-                    
+
                     # 縦ジョイント
-                    joint_vec = prev_below_bone_position
+                    joint_vec = joint_batch.add_position(prev_below_bone_position)
 
                     # 回転量
-                    joint_axis_up = (prev_below_bone_position - prev_above_bone_position).normalized()
-                    joint_axis = (next_above_bone_position - prev_above_bone_position).normalized()
-                    joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                    joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                    joint_euler = joint_rotation_qq.toEulerAngles()
-                    joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
-
-                    joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
-                                  model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index,
-                                  joint_vec, joint_radians, MVector3D(vertical_limit_min_mov_xs[yi], vertical_limit_min_mov_ys[yi], vertical_limit_min_mov_zs[yi]), \
-                                  MVector3D(vertical_limit_max_mov_xs[yi], vertical_limit_max_mov_ys[yi], vertical_limit_max_mov_zs[yi]),
-                                  MVector3D(math.radians(vertical_limit_min_rot_xs[yi]), math.radians(vertical_limit_min_rot_ys[yi]), math.radians(vertical_limit_min_rot_zs[yi])),
-                                  MVector3D(math.radians(vertical_limit_max_rot_xs[yi]), math.radians(vertical_limit_max_rot_ys[yi]), math.radians(vertical_limit_max_rot_zs[yi])),
-                                  MVector3D(vertical_spring_constant_mov_xs[yi], vertical_spring_constant_mov_ys[yi], vertical_spring_constant_mov_zs[yi]), \
-                                  MVector3D(vertical_spring_constant_rot_xs[yi], vertical_spring_constant_rot_ys[yi], vertical_spring_constant_rot_zs[yi]))   # noqa
-                    created_joints[joint_key] = joint
-
-                    if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                        logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                        prev_joint_cnt = len(created_joints) // 200
-                    
+                    joint_rotation = joint_batch.add_rotation(prev_above_bone_position, next_above_bone_position, prev_above_bone_position, prev_below_bone_position)
+
+                    created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                      model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
+                                                                      joint_vec, joint_rotation, vertical_limit_table, yi)
+
                     if param_reverse_joint and prev_below_bone_name in registed_rigidbodies and prev_above_bone_name in registed_rigidbodies:
                         # 逆ジョイント
                         joint_name = f'↑|{registed_rigidbodies[prev_below_bone_name]}|{registed_rigidbodies[prev_above_bone_name]}'
@@ -903,19 +1145,9 @@ class PmxTailorExportService():
 
                         if joint_key not in created_joints:
                             # 未登録のみ追加
-                            joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
-                                          model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index,
-                                          joint_vec, joint_radians, MVector3D(reverse_limit_min_mov_xs[yi], reverse_limit_min_mov_ys[yi], reverse_limit_min_mov_zs[yi]), \
-                                          MVector3D(reverse_limit_max_mov_xs[yi], reverse_limit_max_mov_ys[yi], reverse_limit_max_mov_zs[yi]),
-                                          MVector3D(math.radians(reverse_limit_min_rot_xs[yi]), math.radians(reverse_limit_min_rot_ys[yi]), math.radians(reverse_limit_min_rot_zs[yi])),
-                                          MVector3D(math.radians(reverse_limit_max_rot_xs[yi]), math.radians(reverse_limit_max_rot_ys[yi]), math.radians(reverse_limit_max_rot_zs[yi])),
-                                          MVector3D(reverse_spring_constant_mov_xs[yi], reverse_spring_constant_mov_ys[yi], reverse_spring_constant_mov_zs[yi]), \
-                                          MVector3D(reverse_spring_constant_rot_xs[yi], reverse_spring_constant_rot_ys[yi], reverse_spring_constant_rot_zs[yi]))
-                            created_joints[joint_key] = joint
-
-                            if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                                logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                                prev_joint_cnt = len(created_joints) // 200
+                            created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
+                                                                              model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                              joint_vec, joint_rotation, reverse_limit_table, yi)
 
                     # バランサー剛体が必要な場合
                     if param_option["rigidbody_balancer"]:
@@ -923,32 +1155,24 @@ class PmxTailorExportService():
                         joint_name = f'B|{prev_below_bone_name}|{balancer_prev_below_bone_name}'
                         joint_key = f'8:{model.rigidbodies[prev_below_bone_name].index:05d}:{model.rigidbodies[balancer_prev_below_bone_name].index:05d}'
 
-                        joint_vec = model.rigidbodies[prev_below_bone_name].shape_position
+                        joint_vec = joint_batch.add_position(model.rigidbodies[prev_below_bone_name].shape_position)
 
                         # 回転量
-                        joint_axis_up = (prev_below_bone_position - prev_above_bone_position).normalized()
-                        joint_axis = (model.rigidbodies[balancer_prev_below_bone_name].shape_position - prev_above_bone_position).normalized()
-                        joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                        joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                        joint_euler = joint_rotation_qq.toEulerAngles()
-                        joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                        joint_rotation = joint_batch.add_rotation(prev_above_bone_position, model.rigidbodies[balancer_prev_below_bone_name].shape_position, \
+                                                                  prev_above_bone_position, prev_below_bone_position)
 
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[prev_below_bone_name].index, \
-                                      model.rigidbodies[balancer_prev_below_bone_name].index,
-                                      joint_vec, joint_radians, MVector3D(), MVector3D(), MVector3D(), MVector3D(),
-                                      MVector3D(100000, 100000, 100000), MVector3D(100000, 100000, 100000))
-                        created_joints[joint_key] = joint
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[prev_below_bone_name].index, \
+                                                                          model.rigidbodies[balancer_prev_below_bone_name].index, \
+                                                                          joint_vec, joint_rotation, balancer_limit_table, 0)
 
                         # バランサー補助剛体
                         balancer_prev_above_bone_name = f'B-{prev_above_bone_name}'
                         joint_name = f'BS|{balancer_prev_above_bone_name}|{balancer_prev_below_bone_name}'
                         joint_key = f'9:{model.rigidbodies[balancer_prev_above_bone_name].index:05d}:{model.rigidbodies[balancer_prev_below_bone_name].index:05d}'
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[balancer_prev_above_bone_name].index, \
-                                      model.rigidbodies[balancer_prev_below_bone_name].index,
-                                      MVector3D(), MVector3D(), MVector3D(-50, -50, -50), MVector3D(50, 50, 50), MVector3D(math.radians(1), math.radians(1), math.radians(1)), \
-                                      MVector3D(), MVector3D(), MVector3D())
-                        created_joints[joint_key] = joint
-                                                    
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[balancer_prev_above_bone_name].index, \
+                                                                          model.rigidbodies[balancer_prev_below_bone_name].index, \
+                                                                          joint_batch.add_position(MVector3D()), None, balancer_sub_limit_table, 0)
+
             if param_horizonal_joint and prev_above_bone_name in registed_rigidbodies and next_above_bone_name in registed_rigidbodies:
                 # 横ジョイント
                 if prev_above_bone_name != next_above_bone_name:
@@ -957,32 +1181,17 @@ class PmxTailorExportService():
 
                     if joint_key not in created_joints:
                         # 未登録のみ追加
-                        
-                        joint_vec = np.mean([prev_above_bone_position, prev_below_bone_position, \
-                                             next_above_bone_position, next_below_bone_position])
+
+                        joint_vec = joint_batch.add_position(prev_above_bone_position, prev_below_bone_position, \
+                                                             next_above_bone_position, next_below_bone_position)
 
                         # 回転量
-                        joint_axis_up = (next_above_bone_position - prev_above_bone_position).normalized()
-                        joint_axis = (prev_below_bone_position - prev_above_bone_position).normalized()
-                        joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                        joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                        joint_euler = joint_rotation_qq.toEulerAngles()
-                        joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                        joint_rotation = joint_batch.add_rotation(prev_above_bone_position, prev_below_bone_position, prev_above_bone_position, next_above_bone_position)
+
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                          model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index, \
+                                                                          joint_vec, joint_rotation, horizonal_limit_table, yi)
 
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
-                                      model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index,
-                                      joint_vec, joint_radians, MVector3D(horizonal_limit_min_mov_xs[yi], horizonal_limit_min_mov_ys[yi], horizonal_limit_min_mov_zs[yi]), \
-                                      MVector3D(horizonal_limit_max_mov_xs[yi], horizonal_limit_max_mov_ys[yi], horizonal_limit_max_mov_zs[yi]),
-                                      MVector3D(math.radians(horizonal_limit_min_rot_xs[yi]), math.radians(horizonal_limit_min_rot_ys[yi]), math.radians(horizonal_limit_min_rot_zs[yi])),
-                                      MVector3D(math.radians(horizonal_limit_max_rot_xs[yi]), math.radians(horizonal_limit_max_rot_ys[yi]), math.radians(horizonal_limit_max_rot_zs[yi])),
-                                      MVector3D(horizonal_spring_constant_mov_xs[yi], horizonal_spring_constant_mov_ys[yi], horizonal_spring_constant_mov_zs[yi]), \
-                                      MVector3D(horizonal_spring_constant_rot_xs[yi], horizonal_spring_constant_rot_ys[yi], horizonal_spring_constant_rot_zs[yi]))    # noqa
-                        created_joints[joint_key] = joint
-
-                        if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                            logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                            prev_joint_cnt = len(created_joints) // 200
-                        
                     if param_reverse_joint and prev_above_bone_name in registed_rigidbodies and next_above_bone_name in registed_rigidbodies:
                         # 横逆ジョイント
                         joint_name = f'←|{registed_rigidbodies[next_above_bone_name]}|{registed_rigidbodies[prev_above_bone_name]}'
@@ -990,21 +1199,10 @@ class PmxTailorExportService():
 
                         if joint_key not in created_joints:
                             # 未登録のみ追加
-                            
-                            joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index, \
-                                          model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index,
-                                          joint_vec, joint_radians, MVector3D(reverse_limit_min_mov_xs[yi], reverse_limit_min_mov_ys[yi], reverse_limit_min_mov_zs[yi]), \
-                                          MVector3D(reverse_limit_max_mov_xs[yi], reverse_limit_max_mov_ys[yi], reverse_limit_max_mov_zs[yi]),
-                                          MVector3D(math.radians(reverse_limit_min_rot_xs[yi]), math.radians(reverse_limit_min_rot_ys[yi]), math.radians(reverse_limit_min_rot_zs[yi])),
-                                          MVector3D(math.radians(reverse_limit_max_rot_xs[yi]), math.radians(reverse_limit_max_rot_ys[yi]), math.radians(reverse_limit_max_rot_zs[yi])),
-                                          MVector3D(reverse_spring_constant_mov_xs[yi], reverse_spring_constant_mov_ys[yi], reverse_spring_constant_mov_zs[yi]), \
-                                          MVector3D(reverse_spring_constant_rot_xs[yi], reverse_spring_constant_rot_ys[yi], reverse_spring_constant_rot_zs[yi]))      # noqa
-                            created_joints[joint_key] = joint
+                            created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index, \
+                                                                              model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                              joint_vec, joint_rotation, reverse_limit_table, yi)
 
-                            if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                                logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                                prev_joint_cnt = len(created_joints) // 200
-                            
             if param_diagonal_joint and prev_above_bone_name in registed_rigidbodies and next_below_bone_name in registed_rigidbodies and \
                     prev_below_bone_name in registed_rigidbodies and next_below_bone_name in registed_rigidbodies:                                # noqa
                 # ＼ジョイント
@@ -1013,68 +1211,38 @@ class PmxTailorExportService():
 
                 if joint_key not in created_joints:
                     # 未登録のみ追加
-                    
+
                     # ＼ジョイント
-                    joint_vec = np.mean([prev_below_bone_position, next_below_bone_position])
+                    joint_vec = joint_batch.add_position(prev_below_bone_position, next_below_bone_position)
 
                     # 回転量
-                    joint_axis_up = (next_below_bone_position - prev_above_bone_position).normalized()
-                    joint_axis = (prev_below_bone_position - next_above_bone_position).normalized()
-                    joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                    joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                    joint_euler = joint_rotation_qq.toEulerAngles()
-                    joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
-
-                    joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
-                                  model.rigidbodies[registed_rigidbodies[next_below_bone_name]].index,
-                                  joint_vec, joint_radians, MVector3D(diagonal_limit_min_mov_xs[yi], diagonal_limit_min_mov_ys[yi], diagonal_limit_min_mov_zs[yi]), \
-                                  MVector3D(diagonal_limit_max_mov_xs[yi], diagonal_limit_max_mov_ys[yi], diagonal_limit_max_mov_zs[yi]),
-                                  MVector3D(math.radians(diagonal_limit_min_rot_xs[yi]), math.radians(diagonal_limit_min_rot_ys[yi]), math.radians(diagonal_limit_min_rot_zs[yi])),
-                                  MVector3D(math.radians(diagonal_limit_max_rot_xs[yi]), math.radians(diagonal_limit_max_rot_ys[yi]), math.radians(diagonal_limit_max_rot_zs[yi])),
-                                  MVector3D(diagonal_spring_constant_mov_xs[yi], diagonal_spring_constant_mov_ys[yi], diagonal_spring_constant_mov_zs[yi]), \
-                                  MVector3D(diagonal_spring_constant_rot_xs[yi], diagonal_spring_constant_rot_ys[yi], diagonal_spring_constant_rot_zs[yi]))   # noqa
-                    created_joints[joint_key] = joint
-
-                    if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                        logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                        prev_joint_cnt = len(created_joints) // 200
-                    
+                    joint_rotation = joint_batch.add_rotation(next_above_bone_position, prev_below_bone_position, prev_above_bone_position, next_below_bone_position)
+
+                    created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                      model.rigidbodies[registed_rigidbodies[next_below_bone_name]].index, \
+                                                                      joint_vec, joint_rotation, diagonal_limit_table, yi)
+
                 # ／ジョイント ---------------
                 joint_name = f'／|{registed_rigidbodies[prev_below_bone_name]}|{registed_rigidbodies[next_above_bone_name]}'
                 joint_key = f'5:{model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index:05d}:{model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index:05d}'
 
                 if joint_key not in created_joints:
                     # 未登録のみ追加
-                
+
                     # ／ジョイント
 
                     # 回転量
-                    joint_axis_up = (prev_below_bone_position - next_above_bone_position).normalized()
-                    joint_axis = (next_below_bone_position - prev_above_bone_position).normalized()
-                    joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                    joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                    joint_euler = joint_rotation_qq.toEulerAngles()
-                    joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
-
-                    joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
-                                  model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index,
-                                  joint_vec, joint_radians, MVector3D(diagonal_limit_min_mov_xs[yi], diagonal_limit_min_mov_ys[yi], diagonal_limit_min_mov_zs[yi]), \
-                                  MVector3D(diagonal_limit_max_mov_xs[yi], diagonal_limit_max_mov_ys[yi], diagonal_limit_max_mov_zs[yi]),
-                                  MVector3D(math.radians(diagonal_limit_min_rot_xs[yi]), math.radians(diagonal_limit_min_rot_ys[yi]), math.radians(diagonal_limit_min_rot_zs[yi])),
-                                  MVector3D(math.radians(diagonal_limit_max_rot_xs[yi]), math.radians(diagonal_limit_max_rot_ys[yi]), math.radians(diagonal_limit_max_rot_zs[yi])),
-                                  MVector3D(diagonal_spring_constant_mov_xs[yi], diagonal_spring_constant_mov_ys[yi], diagonal_spring_constant_mov_zs[yi]), \
-                                  MVector3D(diagonal_spring_constant_rot_xs[yi], diagonal_spring_constant_rot_ys[yi], diagonal_spring_constant_rot_zs[yi]))   # noqa
-                    created_joints[joint_key] = joint
-
-                    if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                        logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                        prev_joint_cnt = len(created_joints) // 200
-                    
+                    joint_rotation = joint_batch.add_rotation(prev_above_bone_position, next_below_bone_position, next_above_bone_position, prev_below_bone_position)
+
+                    created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
+                                                                      model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index, \
+                                                                      joint_vec, joint_rotation, diagonal_limit_table, yi)
+
         logger.info("-- ジョイント: %s個目:終了", len(created_joints))
 
-        for joint_key in sorted(created_joints.keys()):
+        joint_keys = sorted(created_joints.keys())
+        for joint in joint_batch.create_joints([created_joints[joint_key] for joint_key in joint_keys]):
             # ジョイントを登録
-            joint = created_joints[joint_key]
             joint.index = len(model.joints)
 
             if joint.name in model.joints:
@@ -1084,8 +1252,10 @@ class PmxTailorExportService():
             model.joints[joint.name] = joint
 
     def create_joint(self, model: PmxModel, param_option: dict, vertex_connected: dict, tmp_all_bones: dict, registed_bone_indexs: dict, root_rigidbody: RigidBody, registed_rigidbodies: dict):
-        # ジョイント生成
+        # ジョイント生成(ジョイントキー → ジョイント行)
         created_joints = {}
+        # 位置・回転・制限値は行として溜めて最後にまとめて計算する
+        joint_batch = JointBatch()
 
         # 略称
         abb_name = param_option['abb_name']
@@ -1099,76 +1269,29 @@ class PmxTailorExportService():
         param_reverse_joint = param_option['reverse_joint']
 
         v_yidxs = list(reversed(list(registed_bone_indexs.keys())))
-        prev_joint_cnt = 0
 
         max_vy = max(v_yidxs)
         middle_vy = (max(v_yidxs)) * 0.3
         min_vy = 0
-        xs = np.arange(min_vy, max_vy, step=1)
-    
+
+        balancer_limit_table = joint_batch.add_limit_table(BALANCER_JOINT_LIMITS)
+        balancer_sub_limit_table = joint_batch.add_limit_table(BALANCER_SUB_JOINT_LIMITS)
+
         if param_vertical_joint:
             coefficient = param_option['vertical_joint_coefficient']
-
-            vertical_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_min.x() / coefficient, param_vertical_joint.translation_limit_min.x()]])), xs)             # noqa
-            vertical_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_min.y() / coefficient, param_vertical_joint.translation_limit_min.y()]])), xs)             # noqa
-            vertical_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_min.z() / coefficient, param_vertical_joint.translation_limit_min.z()]])), xs)             # noqa
-
-            vertical_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_max.x() / coefficient, param_vertical_joint.translation_limit_max.x()]])), xs)             # noqa
-            vertical_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_max.y() / coefficient, param_vertical_joint.translation_limit_max.y()]])), xs)             # noqa
-            vertical_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_vertical_joint.translation_limit_max.z() / coefficient, param_vertical_joint.translation_limit_max.z()]])), xs)             # noqa
-
-            vertical_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_min.x() / coefficient, param_vertical_joint.rotation_limit_min.x() / coefficient, param_vertical_joint.rotation_limit_min.x()]])), xs)             # noqa
-            vertical_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_min.y() / coefficient, param_vertical_joint.rotation_limit_min.y() / coefficient, param_vertical_joint.rotation_limit_min.y()]])), xs)             # noqa
-            vertical_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_min.z() / coefficient, param_vertical_joint.rotation_limit_min.z() / coefficient, param_vertical_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-            vertical_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_max.x() / coefficient, param_vertical_joint.rotation_limit_max.x() / coefficient, param_vertical_joint.rotation_limit_max.x()]])), xs)             # noqa
-            vertical_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_max.y() / coefficient, param_vertical_joint.rotation_limit_max.y() / coefficient, param_vertical_joint.rotation_limit_max.y()]])), xs)             # noqa
-            vertical_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.rotation_limit_max.z() / coefficient, param_vertical_joint.rotation_limit_max.z() / coefficient, param_vertical_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-            vertical_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_translation.x() / coefficient, param_vertical_joint.spring_constant_translation.x() / coefficient, param_vertical_joint.spring_constant_translation.x()]])), xs)             # noqa
-            vertical_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_translation.y() / coefficient, param_vertical_joint.spring_constant_translation.y() / coefficient, param_vertical_joint.spring_constant_translation.y()]])), xs)             # noqa
-            vertical_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_translation.z() / coefficient, param_vertical_joint.spring_constant_translation.z() / coefficient, param_vertical_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-            vertical_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_rotation.x() / coefficient, param_vertical_joint.spring_constant_rotation.x() / coefficient, param_vertical_joint.spring_constant_rotation.x()]])), xs)             # noqa
-            vertical_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_rotation.y() / coefficient, param_vertical_joint.spring_constant_rotation.y() / coefficient, param_vertical_joint.spring_constant_rotation.y()]])), xs)             # noqa
-            vertical_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_vertical_joint.spring_constant_rotation.z() / coefficient, param_vertical_joint.spring_constant_rotation.z() / coefficient, param_vertical_joint.spring_constant_rotation.z()]])), xs)             # noqa
+            vertical_limits = get_joint_limit_profile(param_vertical_joint, coefficient, min_vy, max_vy, middle_vy).joint_limits()
+            vertical_limit_table = joint_batch.add_limit_table(vertical_limits)
 
         if param_horizonal_joint:
             coefficient = param_option['horizonal_joint_coefficient']
-
-            if param_option['bone_thinning_out']:
-                horizonal_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_horizonal_joint.translation_limit_min.x() / coefficient, param_horizonal_joint.translation_limit_min.x()]])), xs)             # noqa
-                horizonal_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_horizonal_joint.translation_limit_min.y() / coefficient, param_horizonal_joint.translation_limit_min.y()]])), xs)             # noqa
-                horizonal_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_horizonal_joint.translation_limit_min.z() / coefficient, param_horizonal_joint.translation_limit_min.z()]])), xs)             # noqa
-
-                horizonal_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_horizonal_joint.translation_limit_max.x() / coefficient, param_horizonal_joint.translation_limit_max.x()]])), xs)             # noqa
-                horizonal_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_horizonal_joint.translation_limit_max.y() / coefficient, param_horizonal_joint.translation_limit_max.y()]])), xs)             # noqa
-                horizonal_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                    [param_horizonal_joint.translation_limit_max.z() / coefficient, param_horizonal_joint.translation_limit_max.z()]])), xs)             # noqa
-            else:
+            horizonal_limits = get_joint_limit_profile(param_horizonal_joint, coefficient, min_vy, max_vy, middle_vy).joint_limits()
+            horizonal_limit_table = joint_batch.add_limit_table(horizonal_limits)
+            # 段INDEXの上限
+            horizonal_limit_cnt = len(horizonal_limits)
+
+            # 間引きの場合、移動制限も段ごとの値
+            horizonal_mov_limit_table = None
+            if not param_option['bone_thinning_out']:
                 max_x = 0
                 for yi, v_yidx in enumerate(v_yidxs):
                     v_xidxs = list(registed_bone_indexs[v_yidx].keys())
@@ -1192,135 +1315,27 @@ class PmxTailorExportService():
                         next_v_xidx_diff = np.abs(np.array(list(registed_bone_indexs[v_yidx].values())) - registed_bone_indexs[v_yidx][next_v_xidx])
                         next_v_xidx = list(registed_bone_indexs[v_yidx].values())[(0 if next_v_xidx == 0 else np.argmin(next_v_xidx_diff))]
                         next_bone_name = self.get_bone_name(abb_name, v_yidx + 1, next_v_xidx + 1)
-                        
+
                         x_distances[yi, xi] = tmp_all_bones[prev_bone_name]["bone"].position.distanceToPoint(tmp_all_bones[next_bone_name]["bone"].position)
                 x_ratio_distances = np.array(x_distances) / (np.min(x_distances, axis=0) * 2)
 
-                horizonal_limit_min_mov_xs = np.nan_to_num(x_ratio_distances * param_horizonal_joint.translation_limit_min.x())
-                horizonal_limit_min_mov_ys = np.nan_to_num(x_ratio_distances * param_horizonal_joint.translation_limit_min.y())
-                horizonal_limit_min_mov_zs = np.nan_to_num(x_ratio_distances * param_horizonal_joint.translation_limit_min.z())
-
-                horizonal_limit_max_mov_xs = np.nan_to_num(x_ratio_distances * param_horizonal_joint.translation_limit_max.x())
-                horizonal_limit_max_mov_ys = np.nan_to_num(x_ratio_distances * param_horizonal_joint.translation_limit_max.y())
-                horizonal_limit_max_mov_zs = np.nan_to_num(x_ratio_distances * param_horizonal_joint.translation_limit_max.z())
-
-            horizonal_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_min.x() / coefficient, param_horizonal_joint.rotation_limit_min.x() / coefficient, param_horizonal_joint.rotation_limit_min.x()]])), xs)             # noqa
-            horizonal_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_min.y() / coefficient, param_horizonal_joint.rotation_limit_min.y() / coefficient, param_horizonal_joint.rotation_limit_min.y()]])), xs)             # noqa
-            horizonal_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_min.z() / coefficient, param_horizonal_joint.rotation_limit_min.z() / coefficient, param_horizonal_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-            horizonal_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_max.x() / coefficient, param_horizonal_joint.rotation_limit_max.x() / coefficient, param_horizonal_joint.rotation_limit_max.x()]])), xs)             # noqa
-            horizonal_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_max.y() / coefficient, param_horizonal_joint.rotation_limit_max.y() / coefficient, param_horizonal_joint.rotation_limit_max.y()]])), xs)             # noqa
-            horizonal_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.rotation_limit_max.z() / coefficient, param_horizonal_joint.rotation_limit_max.z() / coefficient, param_horizonal_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-            horizonal_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_translation.x() / coefficient, param_horizonal_joint.spring_constant_translation.x() / coefficient, param_horizonal_joint.spring_constant_translation.x()]])), xs)             # noqa
-            horizonal_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_translation.y() / coefficient, param_horizonal_joint.spring_constant_translation.y() / coefficient, param_horizonal_joint.spring_constant_translation.y()]])), xs)             # noqa
-            horizonal_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_translation.z() / coefficient, param_horizonal_joint.spring_constant_translation.z() / coefficient, param_horizonal_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-            horizonal_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_rotation.x() / coefficient, param_horizonal_joint.spring_constant_rotation.x() / coefficient, param_horizonal_joint.spring_constant_rotation.x()]])), xs)             # noqa
-            horizonal_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_rotation.y() / coefficient, param_horizonal_joint.spring_constant_rotation.y() / coefficient, param_horizonal_joint.spring_constant_rotation.y()]])), xs)             # noqa
-            horizonal_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_horizonal_joint.spring_constant_rotation.z() / coefficient, param_horizonal_joint.spring_constant_rotation.z() / coefficient, param_horizonal_joint.spring_constant_rotation.z()]])), xs)             # noqa
+                # 横方向の距離の比率に応じた移動制限 (段 * 列)
+                horizonal_mov_limits = np.zeros((x_ratio_distances.size, 6, 3))
+                horizonal_mov_limits[:, 0] = np.nan_to_num(x_ratio_distances.reshape(-1, 1) * param_horizonal_joint.translation_limit_min.data())
+                horizonal_mov_limits[:, 1] = np.nan_to_num(x_ratio_distances.reshape(-1, 1) * param_horizonal_joint.translation_limit_max.data())
+                horizonal_mov_limit_table = joint_batch.add_limit_table(horizonal_mov_limits)
+                horizonal_mov_limit_cols = x_ratio_distances.shape[1]
+                horizonal_limit_cnt = x_ratio_distances.shape[0]
 
         if param_diagonal_joint:
             coefficient = param_option['diagonal_joint_coefficient']
-
-            diagonal_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_min.x() / coefficient, param_diagonal_joint.translation_limit_min.x()]])), xs)             # noqa
-            diagonal_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_min.y() / coefficient, param_diagonal_joint.translation_limit_min.y()]])), xs)             # noqa
-            diagonal_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_min.z() / coefficient, param_diagonal_joint.translation_limit_min.z()]])), xs)             # noqa
-
-            diagonal_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_max.x() / coefficient, param_diagonal_joint.translation_limit_max.x()]])), xs)             # noqa
-            diagonal_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_max.y() / coefficient, param_diagonal_joint.translation_limit_max.y()]])), xs)             # noqa
-            diagonal_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_diagonal_joint.translation_limit_max.z() / coefficient, param_diagonal_joint.translation_limit_max.z()]])), xs)             # noqa
-
-            diagonal_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_min.x() / coefficient, param_diagonal_joint.rotation_limit_min.x() / coefficient, param_diagonal_joint.rotation_limit_min.x()]])), xs)             # noqa
-            diagonal_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_min.y() / coefficient, param_diagonal_joint.rotation_limit_min.y() / coefficient, param_diagonal_joint.rotation_limit_min.y()]])), xs)             # noqa
-            diagonal_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_min.z() / coefficient, param_diagonal_joint.rotation_limit_min.z() / coefficient, param_diagonal_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-            diagonal_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_max.x() / coefficient, param_diagonal_joint.rotation_limit_max.x() / coefficient, param_diagonal_joint.rotation_limit_max.x()]])), xs)             # noqa
-            diagonal_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_max.y() / coefficient, param_diagonal_joint.rotation_limit_max.y() / coefficient, param_diagonal_joint.rotation_limit_max.y()]])), xs)             # noqa
-            diagonal_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.rotation_limit_max.z() / coefficient, param_diagonal_joint.rotation_limit_max.z() / coefficient, param_diagonal_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-            diagonal_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_translation.x() / coefficient, param_diagonal_joint.spring_constant_translation.x() / coefficient, param_diagonal_joint.spring_constant_translation.x()]])), xs)             # noqa
-            diagonal_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_translation.y() / coefficient, param_diagonal_joint.spring_constant_translation.y() / coefficient, param_diagonal_joint.spring_constant_translation.y()]])), xs)             # noqa
-            diagonal_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_translation.z() / coefficient, param_diagonal_joint.spring_constant_translation.z() / coefficient, param_diagonal_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-            diagonal_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_rotation.x() / coefficient, param_diagonal_joint.spring_constant_rotation.x() / coefficient, param_diagonal_joint.spring_constant_rotation.x()]])), xs)             # noqa
-            diagonal_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_rotation.y() / coefficient, param_diagonal_joint.spring_constant_rotation.y() / coefficient, param_diagonal_joint.spring_constant_rotation.y()]])), xs)             # noqa
-            diagonal_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_diagonal_joint.spring_constant_rotation.z() / coefficient, param_diagonal_joint.spring_constant_rotation.z() / coefficient, param_diagonal_joint.spring_constant_rotation.z()]])), xs)             # noqa
+            diagonal_limits = get_joint_limit_profile(param_diagonal_joint, coefficient, min_vy, max_vy, middle_vy).joint_limits()
+            diagonal_limit_table = joint_batch.add_limit_table(diagonal_limits)
 
         if param_reverse_joint:
             coefficient = param_option['reverse_joint_coefficient']
-
-            reverse_limit_min_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_min.x() / coefficient, param_reverse_joint.translation_limit_min.x()]])), xs)             # noqa
-            reverse_limit_min_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_min.y() / coefficient, param_reverse_joint.translation_limit_min.y()]])), xs)             # noqa
-            reverse_limit_min_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_min.z() / coefficient, param_reverse_joint.translation_limit_min.z()]])), xs)             # noqa
-
-            reverse_limit_max_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_max.x() / coefficient, param_reverse_joint.translation_limit_max.x()]])), xs)             # noqa
-            reverse_limit_max_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_max.y() / coefficient, param_reverse_joint.translation_limit_max.y()]])), xs)             # noqa
-            reverse_limit_max_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, max_vy],
-                [param_reverse_joint.translation_limit_max.z() / coefficient, param_reverse_joint.translation_limit_max.z()]])), xs)             # noqa
-
-            reverse_limit_min_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_min.x() / coefficient, param_reverse_joint.rotation_limit_min.x() / coefficient, param_reverse_joint.rotation_limit_min.x()]])), xs)             # noqa
-            reverse_limit_min_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_min.y() / coefficient, param_reverse_joint.rotation_limit_min.y() / coefficient, param_reverse_joint.rotation_limit_min.y()]])), xs)             # noqa
-            reverse_limit_min_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_min.z() / coefficient, param_reverse_joint.rotation_limit_min.z() / coefficient, param_reverse_joint.rotation_limit_min.z()]])), xs)             # noqa
-
-            reverse_limit_max_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_max.x() / coefficient, param_reverse_joint.rotation_limit_max.x() / coefficient, param_reverse_joint.rotation_limit_max.x()]])), xs)             # noqa
-            reverse_limit_max_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_max.y() / coefficient, param_reverse_joint.rotation_limit_max.y() / coefficient, param_reverse_joint.rotation_limit_max.y()]])), xs)             # noqa
-            reverse_limit_max_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.rotation_limit_max.z() / coefficient, param_reverse_joint.rotation_limit_max.z() / coefficient, param_reverse_joint.rotation_limit_max.z()]])), xs)             # noqa
-
-            reverse_spring_constant_mov_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_translation.x() / coefficient, param_reverse_joint.spring_constant_translation.x() / coefficient, param_reverse_joint.spring_constant_translation.x()]])), xs)             # noqa
-            reverse_spring_constant_mov_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_translation.y() / coefficient, param_reverse_joint.spring_constant_translation.y() / coefficient, param_reverse_joint.spring_constant_translation.y()]])), xs)             # noqa
-            reverse_spring_constant_mov_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_translation.z() / coefficient, param_reverse_joint.spring_constant_translation.z() / coefficient, param_reverse_joint.spring_constant_translation.z()]])), xs)             # noqa
-
-            reverse_spring_constant_rot_xs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_rotation.x() / coefficient, param_reverse_joint.spring_constant_rotation.x() / coefficient, param_reverse_joint.spring_constant_rotation.x()]])), xs)             # noqa
-            reverse_spring_constant_rot_ys = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_rotation.y() / coefficient, param_reverse_joint.spring_constant_rotation.y() / coefficient, param_reverse_joint.spring_constant_rotation.y()]])), xs)             # noqa
-            reverse_spring_constant_rot_zs = MBezierUtils.intersect_by_x(bezier.Curve.from_nodes(np.asfortranarray([[min_vy, middle_vy, max_vy],
-                [param_reverse_joint.spring_constant_rotation.z() / coefficient, param_reverse_joint.spring_constant_rotation.z() / coefficient, param_reverse_joint.spring_constant_rotation.z()]])), xs)             # noqa
+            reverse_limits = get_joint_limit_profile(param_reverse_joint, coefficient, min_vy, max_vy, middle_vy).joint_limits()
+            reverse_limit_table = joint_batch.add_limit_table(reverse_limits)
 
         for yi, (below_below_v_yidx, below_v_yidx) in enumerate(zip(v_yidxs[-2:-1], v_yidxs[-1:])):
             # ルート剛体と先頭剛体を繋ぐジョイント
@@ -1349,7 +1364,7 @@ class PmxTailorExportService():
                 prev_below_below_v_xidx = list(registed_bone_indexs[below_below_v_yidx].values())[(0 if prev_below_v_xidx == 0 else np.argmin(prev_below_below_v_xidx_diff))]
                 prev_below_below_bone_name = self.get_bone_name(abb_name, below_below_v_yidx + 1, prev_below_below_v_xidx + 1)
                 prev_below_below_bone_position = tmp_all_bones[prev_below_below_bone_name]["bone"].position
-                
+
                 next_below_below_v_xidx_diff = np.abs(np.array(list(registed_bone_indexs[below_below_v_yidx].values())) - registed_bone_indexs[below_v_yidx][next_below_v_xidx])
                 next_below_below_v_xidx = list(registed_bone_indexs[below_below_v_yidx].values())[(0 if next_below_v_xidx == 0 else np.argmin(next_below_below_v_xidx_diff))]
                 next_below_below_bone_name = self.get_bone_name(abb_name, below_below_v_yidx + 1, next_below_below_v_xidx + 1)
@@ -1361,28 +1376,17 @@ class PmxTailorExportService():
 
                     if joint_key not in created_joints:
                         # 未登録のみ追加
-                        
+
                         # 縦ジョイント
-                        joint_vec = prev_below_bone_position
+                        joint_vec = joint_batch.add_position(prev_below_bone_position)
 
                         # 回転量
-                        joint_axis_up = (prev_below_bone_position - prev_above_bone_position).normalized()
-                        joint_axis = (next_below_bone_position - prev_below_bone_position).normalized()
-                        joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                        joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                        joint_euler = joint_rotation_qq.toEulerAngles()
-                        joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                        joint_rotation = joint_batch.add_rotation(prev_below_bone_position, next_below_bone_position, prev_above_bone_position, prev_below_bone_position)
 
                         yidx = 0
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[prev_above_bone_name].index, \
-                                      model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index,
-                                      joint_vec, joint_radians, MVector3D(vertical_limit_min_mov_xs[yidx], vertical_limit_min_mov_ys[yidx], vertical_limit_min_mov_zs[yidx]), \
-                                      MVector3D(vertical_limit_max_mov_xs[yidx], vertical_limit_max_mov_ys[yidx], vertical_limit_max_mov_zs[yidx]),
-                                      MVector3D(math.radians(vertical_limit_min_rot_xs[yidx]), math.radians(vertical_limit_min_rot_ys[yidx]), math.radians(vertical_limit_min_rot_zs[yidx])),
-                                      MVector3D(math.radians(vertical_limit_max_rot_xs[yidx]), math.radians(vertical_limit_max_rot_ys[yidx]), math.radians(vertical_limit_max_rot_zs[yidx])),
-                                      MVector3D(vertical_spring_constant_mov_xs[yidx], vertical_spring_constant_mov_ys[yidx], vertical_spring_constant_mov_zs[yidx]), \
-                                      MVector3D(vertical_spring_constant_rot_xs[yidx], vertical_spring_constant_rot_ys[yidx], vertical_spring_constant_rot_zs[yidx]))   # noqa
-                        created_joints[joint_key] = joint
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[prev_above_bone_name].index, \
+                                                                          model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
+                                                                          joint_vec, joint_rotation, vertical_limit_table, yidx)
 
                     # バランサー剛体が必要な場合
                     if param_option["rigidbody_balancer"]:
@@ -1390,21 +1394,15 @@ class PmxTailorExportService():
                         joint_name = f'B|{prev_below_bone_name}|{balancer_prev_below_bone_name}'
                         joint_key = f'8:{model.rigidbodies[prev_below_bone_name].index:05d}:{model.rigidbodies[balancer_prev_below_bone_name].index:05d}'
 
-                        joint_vec = model.rigidbodies[prev_below_bone_name].shape_position
+                        joint_vec = joint_batch.add_position(model.rigidbodies[prev_below_bone_name].shape_position)
 
                         # 回転量
-                        joint_axis_up = (prev_below_bone_position - prev_above_bone_position).normalized()
-                        joint_axis = (model.rigidbodies[balancer_prev_below_bone_name].shape_position - prev_above_bone_position).normalized()
-                        joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                        joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                        joint_euler = joint_rotation_qq.toEulerAngles()
-                        joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                        joint_rotation = joint_batch.add_rotation(prev_above_bone_position, model.rigidbodies[balancer_prev_below_bone_name].shape_position, \
+                                                                  prev_above_bone_position, prev_below_bone_position)
 
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[prev_below_bone_name].index, \
-                                      model.rigidbodies[balancer_prev_below_bone_name].index,
-                                      joint_vec, joint_radians, MVector3D(), MVector3D(), MVector3D(), MVector3D(),
-                                      MVector3D(100000, 100000, 100000), MVector3D(100000, 100000, 100000))   # noqa
-                        created_joints[joint_key] = joint
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[prev_below_bone_name].index, \
+                                                                          model.rigidbodies[balancer_prev_below_bone_name].index, \
+                                                                          joint_vec, joint_rotation, balancer_limit_table, 0)
 
                 # 横ジョイント
                 if prev_below_bone_name in registed_rigidbodies and next_below_bone_name in registed_rigidbodies:
@@ -1413,30 +1411,24 @@ class PmxTailorExportService():
 
                     if joint_key not in created_joints:
                         # 未登録のみ追加
-                        
-                        joint_vec = np.mean([prev_below_below_bone_position, prev_below_bone_position, \
-                                             next_below_below_bone_position, next_below_bone_position])
+
+                        joint_vec = joint_batch.add_position(prev_below_below_bone_position, prev_below_bone_position, \
+                                                             next_below_below_bone_position, next_below_bone_position)
 
                         # 回転量
-                        joint_axis_up = (next_below_bone_position - prev_below_bone_position).normalized()
-                        joint_axis = (prev_below_below_bone_position - prev_below_bone_position).normalized()
-                        joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                        joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                        joint_euler = joint_rotation_qq.toEulerAngles()
-                        joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                        joint_rotation = joint_batch.add_rotation(prev_below_bone_position, prev_below_below_bone_position, prev_below_bone_position, next_below_bone_position)
 
                         yidx = 0
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
-                                      model.rigidbodies[registed_rigidbodies[next_below_bone_name]].index,
-                                      joint_vec, joint_radians, MVector3D(horizonal_limit_min_mov_xs[yi, xi], horizonal_limit_min_mov_ys[yi, xi], horizonal_limit_min_mov_zs[yi, xi]), \
-                                      MVector3D(horizonal_limit_max_mov_xs[yi, xi], horizonal_limit_max_mov_ys[yi, xi], horizonal_limit_max_mov_zs[yi, xi]),
-                                      MVector3D(math.radians(horizonal_limit_min_rot_xs[yidx]), math.radians(horizonal_limit_min_rot_ys[yidx]), math.radians(horizonal_limit_min_rot_zs[yidx])),
-                                      MVector3D(math.radians(horizonal_limit_max_rot_xs[yidx]), math.radians(horizonal_limit_max_rot_ys[yidx]), math.radians(horizonal_limit_max_rot_zs[yidx])),
-                                      MVector3D(horizonal_spring_constant_mov_xs[yidx], horizonal_spring_constant_mov_ys[yidx], horizonal_spring_constant_mov_zs[yidx]), \
-                                      MVector3D(horizonal_spring_constant_rot_xs[yidx], horizonal_spring_constant_rot_ys[yidx], horizonal_spring_constant_rot_zs[yidx]))    # noqa
-                        created_joints[joint_key] = joint
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
+                                                                          model.rigidbodies[registed_rigidbodies[next_below_bone_name]].index, \
+                                                                          joint_vec, joint_rotation, horizonal_limit_table, yidx, \
+                                                                          horizonal_mov_limit_table, (yi * horizonal_mov_limit_cols + xi) if horizonal_mov_limit_table is not None else None)
+
+        self.progress.start_stage(ProgressCounter.STAGE_JOINT, len(v_yidxs) - 1)
 
         for yi, (above_v_yidx, below_v_yidx) in enumerate(zip(v_yidxs[1:], v_yidxs[:-1])):
+            self.cancel_token.check()
+            self.progress.update(yi)
             below_v_xidxs = list(registed_bone_indexs[below_v_yidx].keys())
             logger.debug(f"before yi: {yi}, below_v_xidxs: {below_v_xidxs}")
 
@@ -1460,10 +1452,10 @@ class PmxTailorExportService():
 
                 prev_above_bone_name = tmp_all_bones[prev_below_bone_name]["parent"]
                 prev_above_bone_position = tmp_all_bones[prev_above_bone_name]["bone"].position
-                
+
                 next_above_bone_name = tmp_all_bones[next_below_bone_name]["parent"]
                 next_above_bone_position = tmp_all_bones[next_above_bone_name]["bone"].position
-                
+
                 # next_above_v_xidx_diff = np.abs(np.array(list(registed_bone_indexs[v_yidxs[yi + 1]].values())) - registed_bone_indexs[below_v_yidx][next_below_v_xidx])
                 # next_above_v_xidx = list(registed_bone_indexs[v_yidxs[yi + 1]].values())[(0 if next_below_v_xidx == 0 else np.argmin(next_above_v_xidx_diff))]
                 # next_above_bone_name = self.get_bone_name(abb_name, prev_above_v_yidx + 1, next_above_v_xidx + 1)
@@ -1476,35 +1468,20 @@ class PmxTailorExportService():
 
                     if joint_key not in created_joints:
                         # 未登録のみ追加
-                        
+
                         # 縦ジョイント
-                        joint_vec = prev_below_bone_position
+                        joint_vec = joint_batch.add_position(prev_below_bone_position)
 
                         # 回転量
-                        joint_axis_up = (prev_below_bone_position - prev_above_bone_position).normalized()
-                        joint_axis = (next_above_bone_position - prev_above_bone_position).normalized()
-                        joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                        joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                        joint_euler = joint_rotation_qq.toEulerAngles()
-                        joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                        joint_rotation = joint_batch.add_rotation(prev_above_bone_position, next_above_bone_position, prev_above_bone_position, prev_below_bone_position)
 
                         yidx, _ = self.disassemble_bone_name(prev_above_bone_name)
-                        yidx = min(len(vertical_limit_min_mov_xs) - 1, yidx)
-
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
-                                      model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index,
-                                      joint_vec, joint_radians, MVector3D(vertical_limit_min_mov_xs[yidx], vertical_limit_min_mov_ys[yidx], vertical_limit_min_mov_zs[yidx]), \
-                                      MVector3D(vertical_limit_max_mov_xs[yidx], vertical_limit_max_mov_ys[yidx], vertical_limit_max_mov_zs[yidx]),
-                                      MVector3D(math.radians(vertical_limit_min_rot_xs[yidx]), math.radians(vertical_limit_min_rot_ys[yidx]), math.radians(vertical_limit_min_rot_zs[yidx])),
-                                      MVector3D(math.radians(vertical_limit_max_rot_xs[yidx]), math.radians(vertical_limit_max_rot_ys[yidx]), math.radians(vertical_limit_max_rot_zs[yidx])),
-                                      MVector3D(vertical_spring_constant_mov_xs[yidx], vertical_spring_constant_mov_ys[yidx], vertical_spring_constant_mov_zs[yidx]), \
-                                      MVector3D(vertical_spring_constant_rot_xs[yidx], vertical_spring_constant_rot_ys[yidx], vertical_spring_constant_rot_zs[yidx]))   # noqa
-                        created_joints[joint_key] = joint
-
-                        if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                            logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                            prev_joint_cnt = len(created_joints) // 200
-                        
+                        yidx = min(len(vertical_limits) - 1, yidx)
+
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                          model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
+                                                                          joint_vec, joint_rotation, vertical_limit_table, yidx)
+
                         if param_reverse_joint:
                             # 逆ジョイント
                             joint_name = f'↑|{registed_rigidbodies[prev_below_bone_name]}|{registed_rigidbodies[prev_above_bone_name]}'
@@ -1512,19 +1489,9 @@ class PmxTailorExportService():
 
                             if not (joint_key in created_joints or prev_below_bone_name not in registed_rigidbodies or prev_above_bone_name not in registed_rigidbodies):
                                 # 未登録のみ追加
-                                joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
-                                              model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index,
-                                              joint_vec, joint_radians, MVector3D(reverse_limit_min_mov_xs[yidx], reverse_limit_min_mov_ys[yidx], reverse_limit_min_mov_zs[yidx]), \
-                                              MVector3D(reverse_limit_max_mov_xs[yidx], reverse_limit_max_mov_ys[yidx], reverse_limit_max_mov_zs[yidx]),
-                                              MVector3D(math.radians(reverse_limit_min_rot_xs[yidx]), math.radians(reverse_limit_min_rot_ys[yidx]), math.radians(reverse_limit_min_rot_zs[yidx])),
-                                              MVector3D(math.radians(reverse_limit_max_rot_xs[yidx]), math.radians(reverse_limit_max_rot_ys[yidx]), math.radians(reverse_limit_max_rot_zs[yidx])),
-                                              MVector3D(reverse_spring_constant_mov_xs[yidx], reverse_spring_constant_mov_ys[yidx], reverse_spring_constant_mov_zs[yidx]), \
-                                              MVector3D(reverse_spring_constant_rot_xs[yidx], reverse_spring_constant_rot_ys[yidx], reverse_spring_constant_rot_zs[yidx]))  # noqa
-                                created_joints[joint_key] = joint
-
-                                if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                                    logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                                    prev_joint_cnt = len(created_joints) // 200
+                                created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
+                                                                                  model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                                  joint_vec, joint_rotation, reverse_limit_table, yidx)
 
                         # バランサー剛体が必要な場合
                         if param_option["rigidbody_balancer"]:
@@ -1532,32 +1499,24 @@ class PmxTailorExportService():
                             joint_name = f'B|{prev_below_bone_name}|{balancer_prev_below_bone_name}'
                             joint_key = f'8:{model.rigidbodies[prev_below_bone_name].index:05d}:{model.rigidbodies[balancer_prev_below_bone_name].index:05d}'   # noqa
 
-                            joint_vec = model.rigidbodies[prev_below_bone_name].shape_position
+                            joint_vec = joint_batch.add_position(model.rigidbodies[prev_below_bone_name].shape_position)
 
                             # 回転量
-                            joint_axis_up = (prev_below_bone_position - prev_above_bone_position).normalized()
-                            joint_axis = (model.rigidbodies[balancer_prev_below_bone_name].shape_position - prev_above_bone_position).normalized()
-                            joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                            joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                            joint_euler = joint_rotation_qq.toEulerAngles()
-                            joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                            joint_rotation = joint_batch.add_rotation(prev_above_bone_position, model.rigidbodies[balancer_prev_below_bone_name].shape_position, \
+                                                                      prev_above_bone_position, prev_below_bone_position)
 
-                            joint = Joint(joint_name, joint_name, 0, model.rigidbodies[prev_below_bone_name].index, \
-                                          model.rigidbodies[balancer_prev_below_bone_name].index,
-                                          joint_vec, joint_radians, MVector3D(), MVector3D(), MVector3D(), MVector3D(),
-                                          MVector3D(100000, 100000, 100000), MVector3D(100000, 100000, 100000))
-                            created_joints[joint_key] = joint
+                            created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[prev_below_bone_name].index, \
+                                                                              model.rigidbodies[balancer_prev_below_bone_name].index, \
+                                                                              joint_vec, joint_rotation, balancer_limit_table, 0)
 
                             # バランサー補助剛体
                             balancer_prev_above_bone_name = f'B-{prev_above_bone_name}'
                             joint_name = f'BS|{balancer_prev_above_bone_name}|{balancer_prev_below_bone_name}'
                             joint_key = f'9:{model.rigidbodies[balancer_prev_above_bone_name].index:05d}:{model.rigidbodies[balancer_prev_below_bone_name].index:05d}'
-                            joint = Joint(joint_name, joint_name, 0, model.rigidbodies[balancer_prev_above_bone_name].index, \
-                                          model.rigidbodies[balancer_prev_below_bone_name].index,
-                                          MVector3D(), MVector3D(), MVector3D(-50, -50, -50), MVector3D(50, 50, 50), MVector3D(math.radians(1), math.radians(1), math.radians(1)), \
-                                          MVector3D(), MVector3D(), MVector3D())
-                            created_joints[joint_key] = joint
-                                                                            
+                            created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[balancer_prev_above_bone_name].index, \
+                                                                              model.rigidbodies[balancer_prev_below_bone_name].index, \
+                                                                              joint_batch.add_position(MVector3D()), None, balancer_sub_limit_table, 0)
+
                 if param_horizonal_joint and prev_above_bone_name in registed_rigidbodies and next_above_bone_name in registed_rigidbodies:
                     # 横ジョイント
                     if xi < len(below_v_xidxs) - 1 and prev_above_bone_name != next_above_bone_name:
@@ -1566,35 +1525,21 @@ class PmxTailorExportService():
 
                         if joint_key not in created_joints:
                             # 未登録のみ追加
-                            
-                            joint_vec = np.mean([prev_above_bone_position, prev_below_bone_position, \
-                                                 next_above_bone_position, next_below_bone_position])
+
+                            joint_vec = joint_batch.add_position(prev_above_bone_position, prev_below_bone_position, \
+                                                                 next_above_bone_position, next_below_bone_position)
 
                             # 回転量
-                            joint_axis_up = (next_above_bone_position - prev_above_bone_position).normalized()
-                            joint_axis = (prev_below_bone_position - prev_above_bone_position).normalized()
-                            joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                            joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                            joint_euler = joint_rotation_qq.toEulerAngles()
-                            joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                            joint_rotation = joint_batch.add_rotation(prev_above_bone_position, prev_below_bone_position, prev_above_bone_position, next_above_bone_position)
 
                             yidx, _ = self.disassemble_bone_name(prev_above_bone_name)
-                            yidx = min(len(horizonal_limit_min_mov_xs) - 1, yidx)
+                            yidx = min(horizonal_limit_cnt - 1, yidx)
 
-                            joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
-                                          model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index,
-                                          joint_vec, joint_radians, MVector3D(horizonal_limit_min_mov_xs[yi, xi], horizonal_limit_min_mov_ys[yi, xi], horizonal_limit_min_mov_zs[yi, xi]), \
-                                          MVector3D(horizonal_limit_max_mov_xs[yi, xi], horizonal_limit_max_mov_ys[yi, xi], horizonal_limit_max_mov_zs[yi, xi]),
-                                          MVector3D(math.radians(horizonal_limit_min_rot_xs[yidx]), math.radians(horizonal_limit_min_rot_ys[yidx]), math.radians(horizonal_limit_min_rot_zs[yidx])),
-                                          MVector3D(math.radians(horizonal_limit_max_rot_xs[yidx]), math.radians(horizonal_limit_max_rot_ys[yidx]), math.radians(horizonal_limit_max_rot_zs[yidx])),
-                                          MVector3D(horizonal_spring_constant_mov_xs[yidx], horizonal_spring_constant_mov_ys[yidx], horizonal_spring_constant_mov_zs[yidx]), \
-                                          MVector3D(horizonal_spring_constant_rot_xs[yidx], horizonal_spring_constant_rot_ys[yidx], horizonal_spring_constant_rot_zs[yidx]))
-                            created_joints[joint_key] = joint
+                            created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                              model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index, \
+                                                                              joint_vec, joint_rotation, horizonal_limit_table, yidx, \
+                                                                              horizonal_mov_limit_table, (yi * horizonal_mov_limit_cols + xi) if horizonal_mov_limit_table is not None else None)
 
-                            if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                                logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                                prev_joint_cnt = len(created_joints) // 200
-                            
                         if param_reverse_joint:
                             # 横逆ジョイント
                             joint_name = f'←|{registed_rigidbodies[next_above_bone_name]}|{registed_rigidbodies[prev_above_bone_name]}'
@@ -1602,21 +1547,10 @@ class PmxTailorExportService():
 
                             if not (joint_key in created_joints or prev_above_bone_name not in registed_rigidbodies or next_above_bone_name not in registed_rigidbodies):
                                 # 未登録のみ追加
-                                
-                                joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index, \
-                                              model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index,
-                                              joint_vec, joint_radians, MVector3D(reverse_limit_min_mov_xs[yidx], reverse_limit_min_mov_ys[yidx], reverse_limit_min_mov_zs[yidx]), \
-                                              MVector3D(reverse_limit_max_mov_xs[yidx], reverse_limit_max_mov_ys[yidx], reverse_limit_max_mov_zs[yidx]),
-                                              MVector3D(math.radians(reverse_limit_min_rot_xs[yidx]), math.radians(reverse_limit_min_rot_ys[yidx]), math.radians(reverse_limit_min_rot_zs[yidx])),
-                                              MVector3D(math.radians(reverse_limit_max_rot_xs[yidx]), math.radians(reverse_limit_max_rot_ys[yidx]), math.radians(reverse_limit_max_rot_zs[yidx])),
-                                              MVector3D(reverse_spring_constant_mov_xs[yidx], reverse_spring_constant_mov_ys[yidx], reverse_spring_constant_mov_zs[yidx]), \
-                                              MVector3D(reverse_spring_constant_rot_xs[yidx], reverse_spring_constant_rot_ys[yidx], reverse_spring_constant_rot_zs[yidx]))      # noqa
-                                created_joints[joint_key] = joint
+                                created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index, \
+                                                                                  model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                                  joint_vec, joint_rotation, reverse_limit_table, yidx)
 
-                                if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                                    logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                                    prev_joint_cnt = len(created_joints) // 200
-                                
                 if param_diagonal_joint and prev_above_bone_name in registed_rigidbodies and next_below_bone_name in registed_rigidbodies:
                     # ＼ジョイント
                     joint_name = f'＼|{registed_rigidbodies[prev_above_bone_name]}|{registed_rigidbodies[next_below_bone_name]}'
@@ -1624,35 +1558,20 @@ class PmxTailorExportService():
 
                     if joint_key not in created_joints:
                         # 未登録のみ追加
-                        
+
                         # ＼ジョイント
-                        joint_vec = np.mean([prev_below_bone_position, next_below_bone_position])
+                        joint_vec = joint_batch.add_position(prev_below_bone_position, next_below_bone_position)
 
                         # 回転量
-                        joint_axis_up = (next_below_bone_position - prev_above_bone_position).normalized()
-                        joint_axis = (prev_below_bone_position - next_above_bone_position).normalized()
-                        joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                        joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                        joint_euler = joint_rotation_qq.toEulerAngles()
-                        joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                        joint_rotation = joint_batch.add_rotation(next_above_bone_position, prev_below_bone_position, prev_above_bone_position, next_below_bone_position)
 
                         yidx, _ = self.disassemble_bone_name(prev_above_bone_name)
-                        yidx = min(len(diagonal_limit_min_mov_xs) - 1, yidx)
-
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
-                                      model.rigidbodies[registed_rigidbodies[next_below_bone_name]].index,
-                                      joint_vec, joint_radians, MVector3D(diagonal_limit_min_mov_xs[yidx], diagonal_limit_min_mov_ys[yidx], diagonal_limit_min_mov_zs[yidx]), \
-                                      MVector3D(diagonal_limit_max_mov_xs[yidx], diagonal_limit_max_mov_ys[yidx], diagonal_limit_max_mov_zs[yidx]),
-                                      MVector3D(math.radians(diagonal_limit_min_rot_xs[yidx]), math.radians(diagonal_limit_min_rot_ys[yidx]), math.radians(diagonal_limit_min_rot_zs[yidx])),
-                                      MVector3D(math.radians(diagonal_limit_max_rot_xs[yidx]), math.radians(diagonal_limit_max_rot_ys[yidx]), math.radians(diagonal_limit_max_rot_zs[yidx])),
-                                      MVector3D(diagonal_spring_constant_mov_xs[yidx], diagonal_spring_constant_mov_ys[yidx], diagonal_spring_constant_mov_zs[yidx]), \
-                                      MVector3D(diagonal_spring_constant_rot_xs[yidx], diagonal_spring_constant_rot_ys[yidx], diagonal_spring_constant_rot_zs[yidx]))   # noqa
-                        created_joints[joint_key] = joint
-
-                        if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                            logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                            prev_joint_cnt = len(created_joints) // 200
-                        
+                        yidx = min(len(diagonal_limits) - 1, yidx)
+
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_above_bone_name]].index, \
+                                                                          model.rigidbodies[registed_rigidbodies[next_below_bone_name]].index, \
+                                                                          joint_vec, joint_rotation, diagonal_limit_table, yidx)
+
                 if param_diagonal_joint and prev_below_bone_name in registed_rigidbodies and next_above_bone_name in registed_rigidbodies:    # noqa
                     # ／ジョイント ---------------
                     joint_name = f'／|{registed_rigidbodies[prev_below_bone_name]}|{registed_rigidbodies[next_above_bone_name]}'
@@ -1660,39 +1579,24 @@ class PmxTailorExportService():
 
                     if joint_key not in created_joints:
                         # 未登録のみ追加
-                    
+
                         # ／ジョイント
 
                         # 回転量
-                        joint_axis_up = (prev_below_bone_position - next_above_bone_position).normalized()
-                        joint_axis = (next_below_bone_position - prev_above_bone_position).normalized()
-                        joint_axis_cross = MVector3D.crossProduct(joint_axis, joint_axis_up).normalized()
-                        joint_rotation_qq = MQuaternion.fromDirection(joint_axis, joint_axis_cross)
-                        joint_euler = joint_rotation_qq.toEulerAngles()
-                        joint_radians = MVector3D(math.radians(joint_euler.x()), math.radians(joint_euler.y()), math.radians(joint_euler.z()))
+                        joint_rotation = joint_batch.add_rotation(prev_above_bone_position, next_below_bone_position, next_above_bone_position, prev_below_bone_position)
 
                         yidx, _ = self.disassemble_bone_name(prev_below_bone_name)
-                        yidx = min(len(diagonal_limit_min_mov_xs) - 1, yidx)
-
-                        joint = Joint(joint_name, joint_name, 0, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
-                                      model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index,
-                                      joint_vec, joint_radians, MVector3D(diagonal_limit_min_mov_xs[yidx], diagonal_limit_min_mov_ys[yidx], diagonal_limit_min_mov_zs[yidx]), \
-                                      MVector3D(diagonal_limit_max_mov_xs[yidx], diagonal_limit_max_mov_ys[yidx], diagonal_limit_max_mov_zs[yidx]),
-                                      MVector3D(math.radians(diagonal_limit_min_rot_xs[yidx]), math.radians(diagonal_limit_min_rot_ys[yidx]), math.radians(diagonal_limit_min_rot_zs[yidx])),
-                                      MVector3D(math.radians(diagonal_limit_max_rot_xs[yidx]), math.radians(diagonal_limit_max_rot_ys[yidx]), math.radians(diagonal_limit_max_rot_zs[yidx])),
-                                      MVector3D(diagonal_spring_constant_mov_xs[yidx], diagonal_spring_constant_mov_ys[yidx], diagonal_spring_constant_mov_zs[yidx]), \
-                                      MVector3D(diagonal_spring_constant_rot_xs[yidx], diagonal_spring_constant_rot_ys[yidx], diagonal_spring_constant_rot_zs[yidx]))   # noqa
-                        created_joints[joint_key] = joint
-
-                        if len(created_joints) > 0 and len(created_joints) // 200 > prev_joint_cnt:
-                            logger.info("-- ジョイント: %s個目:終了", len(created_joints))
-                            prev_joint_cnt = len(created_joints) // 200
+                        yidx = min(len(diagonal_limits) - 1, yidx)
+
+                        created_joints[joint_key] = joint_batch.add_joint(joint_name, model.rigidbodies[registed_rigidbodies[prev_below_bone_name]].index, \
+                                                                          model.rigidbodies[registed_rigidbodies[next_above_bone_name]].index, \
+                                                                          joint_vec, joint_rotation, diagonal_limit_table, yidx)
 
         logger.info("-- ジョイント: %s個目:終了", len(created_joints))
 
-        for joint_key in sorted(created_joints.keys()):
+        joint_keys = sorted(created_joints.keys())
+        for joint in joint_batch.create_joints([created_joints[joint_key] for joint_key in joint_keys]):
             # ジョイントを登録
-            joint = created_joints[joint_key]
             joint.index = len(model.joints)
 
             if joint.name in model.joints:
@@ -1735,8 +1639,11 @@ class PmxTailorExportService():
 
             model.rigidbodies[parent_bone.name] = parent_bone_rigidbody
 
+        self.progress.start_stage(ProgressCounter.STAGE_RIGIDBODY, bone_grid_cols)
+
         target_rigidbodies = {}
         for pac in range(bone_grid_cols):
+            self.progress.update(pac)
             target_rigidbodies[pac] = []
             # 剛体生成
             created_rigidbodies = {}
@@ -1991,7 +1898,6 @@ class PmxTailorExportService():
         created_rigidbody_masses = {}
         created_rigidbody_linear_dampinges = {}
         created_rigidbody_angular_dampinges = {}
-        prev_rigidbody_cnt = 0
 
         # 剛体情報
         param_rigidbody = param_option['rigidbody']
@@ -2036,8 +1942,11 @@ class PmxTailorExportService():
         # 登録したボーン名と剛体の対比表を保持
         registed_rigidbodies[model.bone_indexes[parent_bone.index]] = root_rigidbody.name
 
+        self.progress.start_stage(ProgressCounter.STAGE_RIGIDBODY, len(bone_blocks))
+
         target_rigidbodies = {}
-        for bone_block in bone_blocks.values():
+        for block_idx, bone_block in enumerate(bone_blocks.values()):
+            self.progress.update(block_idx)
             prev_above_bone_name = bone_block['prev_above']
             prev_above_bone_position = bone_block['prev_above_pos']
             # prev_below_bone_name = bone_block['prev_below']
@@ -2141,10 +2050,6 @@ class PmxTailorExportService():
             created_rigidbody_linear_dampinges[rigidbody.name] = linear_damping
             created_rigidbody_angular_dampinges[rigidbody.name] = angular_damping
 
-            if len(created_rigidbodies) > 0 and len(created_rigidbodies) // 200 > prev_rigidbody_cnt:
-                logger.info("-- 剛体: %s個目:終了", len(created_rigidbodies))
-                prev_rigidbody_cnt = len(created_rigidbodies) // 200
-
         min_mass = 0
         min_linear_damping = 0
         min_angular_damping = 0
@@ -2312,6 +2217,56 @@ class PmxTailorExportService():
 
         return root_rigidbody, registed_rigidbodies
 
+    # 剛体の大きさ・位置・回転(ラジアン)をまとめて求める
+    # positions: (剛体数, 5, 3) 前上, 次上, 前下, 次下, 前々上 ボーン位置
+    def calc_rigidbody_shapes(self, positions: np.ndarray, is_flat_ys: np.ndarray, is_same_ys: np.ndarray, limit_thicks: np.ndarray, \
+                              is_outsides: np.ndarray, rigidbody_shape_type: int, physics_type: str):
+        prev_above_positions = positions[:, 0]
+        next_above_positions = positions[:, 1]
+        prev_below_positions = positions[:, 2]
+        next_below_positions = positions[:, 3]
+        prev_prev_above_positions = positions[:, 4]
+
+        # 剛体の傾き
+        shape_axises = normalize_vectors(np.round(prev_below_positions - prev_above_positions, 5))
+        shape_axis_ups = normalize_vectors(np.round(next_above_positions - prev_prev_above_positions, 5))
+        shape_axis_crosses = normalize_vectors(np.round(np.cross(shape_axises, shape_axis_ups), 5))
+
+        shape_rotation_qqs = from_directions(shape_axises, shape_axis_crosses)
+        for pitch, yaw, roll in [(0, 0, -90), (-90, 0, 0), (0, -90, 0)]:
+            qq = MQuaternion.fromEulerAngles(pitch, yaw, roll)
+            shape_rotation_qqs[~is_flat_ys] = multiply_quaternions(shape_rotation_qqs[~is_flat_ys], np.array([qq.scalar(), qq.x(), qq.y(), qq.z()]))
+
+        shape_rotation_eulers = to_euler_angles(shape_rotation_qqs)
+        shape_rotation_eulers[is_flat_ys, 0] = 90
+        shape_rotation_radians = np.radians(shape_rotation_eulers)
+
+        # 剛体の大きさ
+        x_sizes = np.max([calc_lengths(prev_below_positions - next_below_positions), calc_lengths(prev_above_positions - next_above_positions)], axis=0)
+        y_sizes = np.max([calc_lengths(prev_below_positions - prev_above_positions), calc_lengths(next_below_positions - next_above_positions)], axis=0)
+        if rigidbody_shape_type == 0:
+            x_sizes = np.max([x_sizes, y_sizes], axis=0)
+            ball_sizes = np.maximum(0.25, x_sizes * 0.5)
+            shape_sizes = np.stack([ball_sizes, ball_sizes, ball_sizes], axis=1)
+        elif rigidbody_shape_type == 2:
+            x_ratio = 0.4 if physics_type == logger.transtext('袖') else 0.5
+            shape_sizes = np.stack([x_sizes * x_ratio, np.maximum(0.25, y_sizes * 0.5), limit_thicks], axis=1)
+        else:
+            shape_sizes = np.stack([np.maximum(0.25, x_sizes * 0.5), np.maximum(0.25, y_sizes * 0.5), limit_thicks], axis=1)
+
+        ball_sizes = np.max([np.full(len(positions), 0.25), x_sizes * 0.5, y_sizes * 0.5], axis=0)
+        shape_sizes[is_outsides] = np.stack([ball_sizes, ball_sizes, ball_sizes], axis=1)[is_outsides]
+
+        # 剛体の位置
+        # 高さがある場合、ローカルY軸方向にボーンの長さの半分を上げる
+        rotated_positions = prev_above_positions + to_rotation_matrices(shape_rotation_qqs)[:, :, 1] \
+            * (-calc_lengths(prev_below_positions - prev_above_positions) / 2)[:, np.newaxis]
+        flat_positions = prev_above_positions + ((prev_below_positions - prev_above_positions) / 2) \
+            + np.stack([np.zeros(len(positions)), limit_thicks / 2, np.zeros(len(positions))], axis=1)
+        shape_positions = np.where(is_same_ys[:, np.newaxis], flat_positions, rotated_positions)
+
+        return shape_sizes, shape_positions, shape_rotation_radians
+
     def create_rigidbody(self, model: PmxModel, param_option: dict, vertex_connected: dict, tmp_all_bones: dict, registed_bone_indexs: dict, root_bone: Bone):
         # 剛体生成
         registed_rigidbodies = {}
@@ -2320,7 +2275,6 @@ class PmxTailorExportService():
         created_rigidbody_masses = {}
         created_rigidbody_linear_dampinges = {}
         created_rigidbody_angular_dampinges = {}
-        prev_rigidbody_cnt = 0
 
         # 略称
         abb_name = param_option['abb_name']
@@ -2367,8 +2321,20 @@ class PmxTailorExportService():
         v_yidxs = list(reversed(list(registed_bone_indexs.keys())))
         rigidbody_limit_thicks = np.linspace(0.3, 0.1, len(v_yidxs))
 
+        # 剛体名 → 行INDEX
+        rigidbody_rows = {}
+        rigidbody_bone_indexes = []
+        rigidbody_yis = []
+        # (前上, 次上, 前下, 次下, 前々上)
+        rigidbody_positions = []
+        rigidbody_flat_flags = []
+
+        self.progress.start_stage(ProgressCounter.STAGE_RIGIDBODY, len(v_yidxs) - 1)
+
         target_rigidbodies = {}
         for yi, (above_v_yidx, below_v_yidx) in enumerate(zip(v_yidxs[1:], v_yidxs[:-1])):
+            self.cancel_token.check()
+            self.progress.update(yi)
             above_v_xidxs = list(registed_bone_indexs[above_v_yidx].keys())
             logger.debug(f"yi: {yi}, above_v_xidxs: {above_v_xidxs}")
 
@@ -2432,7 +2398,7 @@ class PmxTailorExportService():
                     if prev_prev_above_bone_name in tmp_all_bones:
                         prev_prev_above_bone_position = tmp_all_bones[prev_prev_above_bone_name]["bone"].position
                 
-                if prev_above_bone_name in created_rigidbodies or (prev_above_bone_name in model.bones and not model.bones[prev_above_bone_name].getVisibleFlag()):
+                if prev_above_bone_name in rigidbody_rows or (prev_above_bone_name in model.bones and not model.bones[prev_above_bone_name].getVisibleFlag()):
                     continue
 
                 prev_above_bone_index = -1
@@ -2441,82 +2407,43 @@ class PmxTailorExportService():
 
                 target_rigidbodies[yi].append(prev_above_bone_name)
 
-                # 剛体の傾き
-                shape_axis = (prev_below_bone_position - prev_above_bone_position).round(5).normalized()
-                if prev_prev_above_bone_position:
-                    shape_axis_up = (next_above_bone_position - prev_prev_above_bone_position).round(5).normalized()
-                else:
-                    shape_axis_up = (next_above_bone_position - prev_above_bone_position).round(5).normalized()
-                shape_axis_cross = MVector3D.crossProduct(shape_axis, shape_axis_up).round(5).normalized()
-
-                shape_rotation_qq = MQuaternion.fromDirection(shape_axis, shape_axis_cross)
-                if round(prev_below_bone_position.y(), 2) != round(prev_above_bone_position.y(), 2):
-                    shape_rotation_qq *= MQuaternion.fromEulerAngles(0, 0, -90)
-                    shape_rotation_qq *= MQuaternion.fromEulerAngles(-90, 0, 0)
-                    shape_rotation_qq *= MQuaternion.fromEulerAngles(0, -90, 0)
-
-                shape_rotation_euler = shape_rotation_qq.toEulerAngles()
-
-                if round(prev_below_bone_position.y(), 2) == round(prev_above_bone_position.y(), 2):
-                    shape_rotation_euler.setX(90)
-                    
-                shape_rotation_radians = MVector3D(math.radians(shape_rotation_euler.x()), math.radians(shape_rotation_euler.y()), math.radians(shape_rotation_euler.z()))
-
-                # 剛体の大きさ
-                if rigidbody_shape_type == 0:
-                    x_size = np.max([prev_below_bone_position.distanceToPoint(next_below_bone_position), prev_above_bone_position.distanceToPoint(next_above_bone_position), \
-                                     prev_below_bone_position.distanceToPoint(prev_above_bone_position), next_below_bone_position.distanceToPoint(next_above_bone_position)])
-                    ball_size = max(0.25, x_size * 0.5)
-                    shape_size = MVector3D(ball_size, ball_size, ball_size)
-                elif rigidbody_shape_type == 2:
-                    x_size = np.max([prev_below_bone_position.distanceToPoint(next_below_bone_position), prev_above_bone_position.distanceToPoint(next_above_bone_position)])
-                    y_size = np.max([prev_below_bone_position.distanceToPoint(prev_above_bone_position), next_below_bone_position.distanceToPoint(next_above_bone_position)])
-                    if physics_type == logger.transtext('袖'):
-                        shape_size = MVector3D(x_size * 0.4, max(0.25, y_size * 0.5), rigidbody_limit_thicks[yi])
-                    else:
-                        shape_size = MVector3D(x_size * 0.5, max(0.25, y_size * 0.5), rigidbody_limit_thicks[yi])
-                else:
-                    x_size = np.max([prev_below_bone_position.distanceToPoint(next_below_bone_position), prev_above_bone_position.distanceToPoint(next_above_bone_position)])
-                    y_size = np.max([prev_below_bone_position.distanceToPoint(prev_above_bone_position), next_below_bone_position.distanceToPoint(next_above_bone_position)])
-                    shape_size = MVector3D(max(0.25, x_size * 0.5), max(0.25, y_size * 0.5), rigidbody_limit_thicks[yi])
-
-                # 剛体の位置
-                rigidbody_vertical_vec = ((prev_below_bone_position - prev_above_bone_position) / 2)
-                if round(prev_below_bone_position.y(), 3) != round(prev_above_bone_position.y(), 3):
-                    mat = MMatrix4x4()
-                    mat.setToIdentity()
-                    mat.translate(prev_above_bone_position)
-                    mat.rotate(shape_rotation_qq)
-                    # ローカルY軸方向にボーンの長さの半分を上げる
-                    mat.translate(MVector3D(0, -prev_below_bone_position.distanceToPoint(prev_above_bone_position) / 2, 0))
-                    shape_position = mat * MVector3D()
-                else:
-                    shape_position = prev_above_bone_position + rigidbody_vertical_vec + MVector3D(0, rigidbody_limit_thicks[yi] / 2, 0)
-
+                # 剛体の形状は全段まとめて計算する
+                rigidbody_rows[prev_above_bone_name] = len(rigidbody_rows)
+                rigidbody_bone_indexes.append(prev_above_bone_index)
+                rigidbody_yis.append(yi)
+                rigidbody_positions.append([prev_above_bone_position.data(), next_above_bone_position.data(), prev_below_bone_position.data(), \
+                                            next_below_bone_position.data(), (prev_prev_above_bone_position or prev_above_bone_position).data()])
+                # 上下のボーンの高さが同じか
+                rigidbody_flat_flags.append([round(prev_below_bone_position.y(), 2) == round(prev_above_bone_position.y(), 2), \
+                                             round(prev_below_bone_position.y(), 3) == round(prev_above_bone_position.y(), 3)])
+
+        if len(rigidbody_rows) > 0:
+            rigidbody_flat_flags = np.array(rigidbody_flat_flags, dtype=np.bool_)
+            # 登録ボーンの対象外である場合、余っているので球にしておく
+            is_outsides = np.array([rigidbody_name not in model.bones for rigidbody_name in rigidbody_rows.keys()], dtype=np.bool_)
+
+            shape_sizes, shape_positions, shape_rotations = \
+                self.calc_rigidbody_shapes(np.array(rigidbody_positions, dtype=np.float64), rigidbody_flat_flags[:, 0], rigidbody_flat_flags[:, 1], \
+                                           rigidbody_limit_thicks[rigidbody_yis], is_outsides, rigidbody_shape_type, physics_type)
+
+            # 質量と減衰は体積に比例
+            masses = (param_rigidbody.param.mass * shape_sizes[:, 0] * shape_sizes[:, 1] * shape_sizes[:, 2]).tolist()
+            linear_dampinges = (param_rigidbody.param.linear_damping * shape_sizes[:, 0] * shape_sizes[:, 1] * shape_sizes[:, 2]).tolist()
+            angular_dampinges = (param_rigidbody.param.angular_damping * shape_sizes[:, 0] * shape_sizes[:, 1] * shape_sizes[:, 2]).tolist()
+
+            for rigidbody_name, ri in rigidbody_rows.items():
                 # 根元は物理演算 + Bone位置合わせ、それ以降は物理剛体
-                mode = 2 if yi == len(v_yidxs) - 2 else 1
-                shape_type = param_rigidbody.shape_type
-                if prev_above_bone_name not in model.bones:
-                    # 登録ボーンの対象外である場合、余っているので球にしておく
-                    ball_size = np.max([0.25, x_size * 0.5, y_size * 0.5])
-                    shape_size = MVector3D(ball_size, ball_size, ball_size)
-                    shape_type = 0
-                mass = param_rigidbody.param.mass * shape_size.x() * shape_size.y() * shape_size.z()
-                linear_damping = param_rigidbody.param.linear_damping * shape_size.x() * shape_size.y() * shape_size.z()
-                angular_damping = param_rigidbody.param.angular_damping * shape_size.x() * shape_size.y() * shape_size.z()
-                rigidbody = RigidBody(prev_above_bone_name, prev_above_bone_name, prev_above_bone_index, param_rigidbody.collision_group, param_rigidbody.no_collision_group, \
-                                      shape_type, shape_size, shape_position, shape_rotation_radians, \
-                                      mass, linear_damping, angular_damping, param_rigidbody.param.restitution, param_rigidbody.param.friction, mode)
+                mode = 2 if rigidbody_yis[ri] == len(v_yidxs) - 2 else 1
+                shape_type = 0 if is_outsides[ri] else param_rigidbody.shape_type
+                rigidbody = RigidBody(rigidbody_name, rigidbody_name, rigidbody_bone_indexes[ri], param_rigidbody.collision_group, param_rigidbody.no_collision_group, \
+                                      shape_type, MVector3D(shape_sizes[ri]), MVector3D(shape_positions[ri]), MVector3D(shape_rotations[ri]), \
+                                      masses[ri], linear_dampinges[ri], angular_dampinges[ri], param_rigidbody.param.restitution, param_rigidbody.param.friction, mode)
                 # 別途保持しておく
                 created_rigidbodies[rigidbody.name] = rigidbody
-                created_rigidbody_masses[rigidbody.name] = mass
-                created_rigidbody_linear_dampinges[rigidbody.name] = linear_damping
-                created_rigidbody_angular_dampinges[rigidbody.name] = angular_damping
+                created_rigidbody_masses[rigidbody.name] = masses[ri]
+                created_rigidbody_linear_dampinges[rigidbody.name] = linear_dampinges[ri]
+                created_rigidbody_angular_dampinges[rigidbody.name] = angular_dampinges[ri]
 
-                if len(created_rigidbodies) > 0 and len(created_rigidbodies) // 200 > prev_rigidbody_cnt:
-                    logger.info("-- 剛体: %s個目:終了", len(created_rigidbodies))
-                    prev_rigidbody_cnt = len(created_rigidbodies) // 200
-        
         min_mass = 0
         min_linear_damping = 0
         min_angular_damping = 0
@@ -2686,17 +2613,57 @@ class PmxTailorExportService():
 
         return root_rigidbody, registed_rigidbodies
 
+    def calc_weight_rows_parallel(self, model: PmxModel, param_option: dict, vertex_map_orders: list, vertex_maps: dict, vertex_connecteds: dict, \
+                                  all_registed_bone_indexs: dict, all_bone_horizonal_distances: dict, all_bone_vertical_distances: dict, target_vertices: list):
+        max_workers = min(self.options.max_workers or 1, len(vertex_map_orders))
+        if max_workers <= 1:
+            # 並列にしない場合は各マップの処理中に求める
+            return {}
+
+        # ウェイト値の計算にはボーンだけあれば良い
+        bone_model = PmxModel()
+        bone_model.bones = model.bones
+        bone_model.bone_indexes = model.bone_indexes
+
+        all_weight_rows = {}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(bone_model, self.cancel_token)) as executor:
+            futures = {executor.submit(calc_weight_rows_worker, param_option, vertex_maps[base_map_idx], vertex_connecteds[base_map_idx], \
+                                       all_registed_bone_indexs[base_map_idx], all_bone_horizonal_distances[base_map_idx], all_bone_vertical_distances[base_map_idx], \
+                                       target_vertices): base_map_idx for base_map_idx in vertex_map_orders}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    all_weight_rows[futures[future]] = future.result()
+                except Exception:
+                    if self.cancel_token.is_cancelled():
+                        # 中断された場合、残りのワーカーも中断要求を見て終了する
+                        raise MKilledException()
+                    # 失敗したマップは、各マップの処理中に改めて求める
+                    logger.debug("ウェイト並列計算失敗: %s", traceback.format_exc())
+
+        return all_weight_rows
+
     def create_weight(self, model: PmxModel, param_option: dict, vertex_map: np.ndarray, vertex_connected: dict, duplicate_vertices: dict, \
                       registed_bone_indexs: dict, bone_horizonal_distances: dict, bone_vertical_distances: dict, vertex_remaining_set: set, target_vertices: list):
-        # ウェイト分布
-        prev_weight_cnt = 0
-        weight_cnt = 0
+        weight_rows = self.calc_weight_rows(model, param_option, vertex_map, vertex_connected, registed_bone_indexs, bone_horizonal_distances, bone_vertical_distances, target_vertices)
+
+        return self.apply_weight_rows(model, param_option, weight_rows, duplicate_vertices, vertex_remaining_set)
+
+    # ウェイト値の計算(モデルは変更しない)
+    # 頂点INDEX, ウェイトの数, ボーンINDEX(ウェイト降順), ウェイト を走査順に返す
+    def calc_weight_rows(self, model: PmxModel, param_option: dict, vertex_map: np.ndarray, vertex_connected: dict, \
+                         registed_bone_indexs: dict, bone_horizonal_distances: dict, bone_vertical_distances: dict, target_vertices: list):
+        vertex_idxs = []
+        deform_counts = []
+        deform_bone_idxs = []
+        deform_weights = []
 
         # 略称
         abb_name = param_option['abb_name']
+        target_vertex_set = set(target_vertices)
 
         v_yidxs = list(reversed(list(registed_bone_indexs.keys())))
         for above_v_yidx, below_v_yidx in zip(v_yidxs[1:], v_yidxs[:-1]):
+            self.cancel_token.check()
             above_v_xidxs = list(registed_bone_indexs[above_v_yidx].keys())
             below_v_xidxs = list(registed_bone_indexs[below_v_yidx].keys())
             # 繋がってる場合、最後に最初のボーンを追加する
@@ -2731,7 +2698,7 @@ class PmxTailorExportService():
                 
                 for vi, v_vertices in enumerate(v_map):
                     for vhi, vertex_idx in enumerate(v_vertices):
-                        if vertex_idx < 0 or vertex_idx not in target_vertices:
+                        if vertex_idx < 0 or vertex_idx not in target_vertex_set:
                             continue
 
                         horizonal_distance = np.sum(b_h_distances[vi, :])
@@ -2774,29 +2741,46 @@ class PmxTailorExportService():
                         if len(np.nonzero(total_weights)[0]) > 0:
                             weights = total_weights / total_weights.sum(axis=0, keepdims=1)
                             weight_idxs = np.argsort(weights)
-                            v = model.vertex_dict[vertex_idx]
-                            vertex_remaining_set -= set(duplicate_vertices[v.position.to_log()])
-
-                            for vvidx in duplicate_vertices[v.position.to_log()]:
-                                vv = model.vertex_dict[vvidx]
-
-                                logger.debug(f'vertex_idx: {vvidx}, weight_names: [{weight_names}], total_weights: [{total_weights}]')
-
-                                if vv.deform.index0 == model.bones[param_option['parent_bone_name']].index:
-                                    # 重複頂点にも同じウェイトを割り当てる
-                                    if np.count_nonzero(weights) == 1:
-                                        vv.deform = Bdef1(model.bones[weight_names[weight_idxs[-1]]].index)
-                                    elif np.count_nonzero(weights) == 2:
-                                        vv.deform = Bdef2(model.bones[weight_names[weight_idxs[-1]]].index, model.bones[weight_names[weight_idxs[-2]]].index, weights[weight_idxs[-1]])
-                                    else:
-                                        vv.deform = Bdef4(model.bones[weight_names[weight_idxs[-1]]].index, model.bones[weight_names[weight_idxs[-2]]].index, \
-                                                          model.bones[weight_names[weight_idxs[-3]]].index, model.bones[weight_names[weight_idxs[-4]]].index, \
-                                                          weights[weight_idxs[-1]], weights[weight_idxs[-2]], weights[weight_idxs[-3]], weights[weight_idxs[-4]])
-
-                                weight_cnt += 1
-                                if weight_cnt > 0 and weight_cnt // 1000 > prev_weight_cnt:
-                                    logger.info("-- 頂点ウェイト: %s個目:終了", weight_cnt)
-                                    prev_weight_cnt = weight_cnt // 1000
+                            deform_cnt = np.count_nonzero(weights)
+                            # Bdef4の場合は上位4つ
+                            row_weight_idxs = weight_idxs[-1:-3:-1] if deform_cnt <= 2 else weight_idxs[[-1, -2, -3, -4]]
+
+                            vertex_idxs.append(vertex_idx)
+                            deform_counts.append(deform_cnt)
+                            deform_bone_idxs.append([model.bones[weight_names[wi]].index for wi in row_weight_idxs] + [-1] * (4 - len(row_weight_idxs)))
+                            deform_weights.append(weights[row_weight_idxs].tolist() + [0] * (4 - len(row_weight_idxs)))
+
+        return np.array(vertex_idxs, dtype=np.int64), np.array(deform_counts, dtype=np.int64), \
+            np.array(deform_bone_idxs, dtype=np.int64).reshape(-1, 4), np.array(deform_weights, dtype=np.float64).reshape(-1, 4)
+
+    # 計算済みのウェイト値を走査順に割り当てる(先に割り当てられた頂点は上書きしない)
+    def apply_weight_rows(self, model: PmxModel, param_option: dict, weight_rows: tuple, duplicate_vertices: dict, vertex_remaining_set: set):
+        # ウェイト分布
+        weight_cnt = 0
+
+        parent_bone_index = model.bones[param_option['parent_bone_name']].index
+
+        for vertex_idx, deform_cnt, bone_idxs, weights in zip(*[rows.tolist() for rows in weight_rows]):
+            self.cancel_token.check()
+            v = model.vertex_dict[vertex_idx]
+            vertex_remaining_set -= set(duplicate_vertices[v.position.to_log()])
+            self.progress.update_remaining(len(vertex_remaining_set))
+
+            for vvidx in duplicate_vertices[v.position.to_log()]:
+                vv = model.vertex_dict[vvidx]
+
+                logger.debug(f'vertex_idx: {vvidx}, bone_idxs: [{bone_idxs}], weights: [{weights}]')
+
+                if vv.deform.index0 == parent_bone_index:
+                    # 重複頂点にも同じウェイトを割り当てる
+                    if deform_cnt == 1:
+                        vv.deform = Bdef1(bone_idxs[0])
+                    elif deform_cnt == 2:
+                        vv.deform = Bdef2(bone_idxs[0], bone_idxs[1], weights[0])
+                    else:
+                        vv.deform = Bdef4(bone_idxs[0], bone_idxs[1], bone_idxs[2], bone_idxs[3], weights[0], weights[1], weights[2], weights[3])
+
+                weight_cnt += 1
 
         logger.info("-- 頂点ウェイト: %s個目:終了", weight_cnt)
         
@@ -2805,7 +2789,6 @@ class PmxTailorExportService():
     def create_remaining_weight(self, model: PmxModel, param_option: dict, vertex_maps: dict, \
                                 vertex_remaining_set: set, boned_base_map_idxs: list, target_vertices: list):
         # ウェイト分布
-        prev_weight_cnt = 0
         weight_cnt = 0
 
         vertex_distances = {}
@@ -2820,6 +2803,7 @@ class PmxTailorExportService():
 
         # 基準頂点マップ以外の頂点が残っていたら、それも割り当てる
         for vertex_idx in list(vertex_remaining_set):
+            self.cancel_token.check()
             v = model.vertex_dict[vertex_idx]
             if vertex_idx < 0 or vertex_idx not in target_vertices:
                 continue
@@ -2902,15 +2886,12 @@ class PmxTailorExportService():
                                      weights[weight_idxs[-1]], weights[weight_idxs[-2]], weights[weight_idxs[-3]], weights[weight_idxs[-4]])
             
             weight_cnt += 1
-            if weight_cnt > 0 and weight_cnt // 100 > prev_weight_cnt:
-                logger.info("-- 残頂点ウェイト: %s個目:終了", weight_cnt)
-                prev_weight_cnt = weight_cnt // 100
+            self.progress.add()
 
         logger.info("-- 残頂点ウェイト: %s個目:終了", weight_cnt)
 
     def create_back_weight(self, model: PmxModel, param_option: dict):
         # ウェイト分布
-        prev_weight_cnt = 0
         weight_cnt = 0
 
         front_vertex_keys = []
@@ -2930,9 +2911,7 @@ class PmxTailorExportService():
             bv.deform = copy.deepcopy(model.vertex_dict[copy_front_vertex_idx].deform)
 
             weight_cnt += 1
-            if weight_cnt > 0 and weight_cnt // 200 > prev_weight_cnt:
-                logger.info("-- 裏頂点ウェイト: %s個目:終了", weight_cnt)
-                prev_weight_cnt = weight_cnt // 200
+            self.progress.add()
 
         logger.info("-- 裏頂点ウェイト: %s個目:終了", weight_cnt)
 
@@ -2950,7 +2929,21 @@ class PmxTailorExportService():
 
         return root_bone
 
-    def create_bone(self, model: PmxModel, param_option: dict, vertex_map_orders: list, vertex_maps: dict, vertex_connecteds: dict):
+    def get_all_bone_distances(self, model: PmxModel, vertex_maps: dict):
+        all_bone_horizonal_distances = {}
+        all_bone_vertical_distances = {}
+
+        for base_map_idx, vertex_map in enumerate(vertex_maps):
+            # 各頂点の距離（円周っぽい可能性があるため、頂点一個ずつで測る）
+            bone_horizonal_distances, bone_vertical_distances = self.get_bone_distances(model, vertex_map)
+
+            all_bone_horizonal_distances[base_map_idx] = bone_horizonal_distances
+            all_bone_vertical_distances[base_map_idx] = bone_vertical_distances
+
+        return all_bone_horizonal_distances, all_bone_vertical_distances
+
+    def create_bone(self, model: PmxModel, param_option: dict, vertex_map_orders: list, vertex_maps: dict, vertex_connecteds: dict, \
+                    all_bone_horizonal_distances: dict, all_bone_vertical_distances: dict):
         # 中心ボーン生成
 
         # 略称
@@ -2973,33 +2966,6 @@ class PmxTailorExportService():
         all_bone_indexes = {}
         all_registed_bone_indexs = {}
 
-        all_bone_horizonal_distances = {}
-        all_bone_vertical_distances = {}
-
-        for base_map_idx, vertex_map in enumerate(vertex_maps):
-            bone_horizonal_distances = np.zeros((vertex_map.shape[0], vertex_map.shape[1] + 1))
-            bone_vertical_distances = np.zeros(vertex_map.shape)
-
-            # 各頂点の距離（円周っぽい可能性があるため、頂点一個ずつで測る）
-            for v_yidx in range(vertex_map.shape[0]):
-                for v_xidx in range(vertex_map.shape[1]):
-                    if vertex_map[v_yidx, v_xidx] >= 0 and vertex_map[v_yidx, v_xidx - 1] >= 0:
-                        now_v_vec = model.vertex_dict[vertex_map[v_yidx, v_xidx]].position
-                        prev_v_vec = now_v_vec if v_xidx == 0 else model.vertex_dict[vertex_map[v_yidx, v_xidx - 1]].position
-                        bone_horizonal_distances[v_yidx, v_xidx] = now_v_vec.distanceToPoint(prev_v_vec)
-                    if vertex_map[v_yidx, v_xidx] >= 0 and vertex_map[v_yidx - 1, v_xidx] >= 0:
-                        now_v_vec = model.vertex_dict[vertex_map[v_yidx, v_xidx]].position
-                        prev_v_vec = now_v_vec if v_yidx == 0 else model.vertex_dict[vertex_map[v_yidx - 1, v_xidx]].position
-                        bone_vertical_distances[v_yidx, v_xidx] = now_v_vec.distanceToPoint(prev_v_vec)
-                if vertex_map[v_yidx, v_xidx] >= 0 and vertex_map[v_yidx, 0] >= 0:
-                    # 輪を描いたのも入れとく(ウェイト対象取得の時に範囲指定入るからここでは強制)
-                    now_v_vec = model.vertex_dict[vertex_map[v_yidx, v_xidx]].position
-                    prev_v_vec = model.vertex_dict[vertex_map[v_yidx, 0]].position
-                    bone_horizonal_distances[v_yidx, v_xidx + 1] = now_v_vec.distanceToPoint(prev_v_vec)
-
-            all_bone_horizonal_distances[base_map_idx] = bone_horizonal_distances
-            all_bone_vertical_distances[base_map_idx] = bone_vertical_distances
-
         for base_map_idx in vertex_map_orders:
             vertex_map = vertex_maps[base_map_idx]
             vertex_connected = vertex_connecteds[base_map_idx]
@@ -3057,7 +3023,11 @@ class PmxTailorExportService():
                 for xi in v_xidxs:
                     all_bone_indexes[base_map_idx][yi][xi] = xi + max_xi
             
-        for base_map_idx in vertex_map_orders:
+        self.progress.start_stage(ProgressCounter.STAGE_BONE, len(vertex_map_orders))
+
+        for oidx, base_map_idx in enumerate(vertex_map_orders):
+            self.cancel_token.check()
+            self.progress.update(oidx)
             v_yidxs = all_yidxs[base_map_idx]
             vertex_map = vertex_maps[base_map_idx]
             vertex_connected = vertex_connecteds[base_map_idx]
@@ -3143,6 +3113,30 @@ class PmxTailorExportService():
 
         return root_bone, tmp_all_bones, all_registed_bone_indexs, all_bone_horizonal_distances, all_bone_vertical_distances
 
+    def get_bone_distances(self, model: PmxModel, vertex_map: np.ndarray):
+        bone_horizonal_distances = np.zeros((vertex_map.shape[0], vertex_map.shape[1] + 1))
+        bone_vertical_distances = np.zeros(vertex_map.shape)
+
+        # 頂点マップ上の頂点位置 (H, W, 3)
+        is_valid = vertex_map >= 0
+        map_positions = np.zeros(vertex_map.shape + (3,))
+        if np.any(is_valid):
+            map_positions[is_valid] = np.array([model.vertex_dict[vidx].position.data() for vidx in vertex_map[is_valid].tolist()])
+
+        # 左隣との距離(左端は0)
+        is_horizonal = is_valid[:, 1:] & is_valid[:, :-1]
+        bone_horizonal_distances[:, 1:-1][is_horizonal] = calc_lengths(np.diff(map_positions, axis=1))[is_horizonal]
+
+        # 上との距離(上端は0)
+        is_vertical = is_valid[1:, :] & is_valid[:-1, :]
+        bone_vertical_distances[1:, :][is_vertical] = calc_lengths(np.diff(map_positions, axis=0))[is_vertical]
+
+        # 輪を描いたのも入れとく(ウェイト対象取得の時に範囲指定入るからここでは強制)
+        is_ring = is_valid[:, -1] & is_valid[:, 0]
+        bone_horizonal_distances[is_ring, -1] = calc_lengths(map_positions[is_ring, -1] - map_positions[is_ring, 0])
+
+        return bone_horizonal_distances, bone_vertical_distances
+
     def get_bone_name(self, abb_name: str, v_yno: int, v_xno: int):
         return f'{abb_name}-{(v_yno):03d}-{(v_xno):03d}'
 
@@ -3159,6 +3153,9 @@ class PmxTailorExportService():
         # 準標準ボーンまでは削除対象外
         saved_bone_names.extend(SEMI_STANDARD_BONE_NAMES)
 
+        # ボーン毎のウェイト頂点は設定に依らないので一度だけ集計する
+        weight_usage = BoneWeightUsage(model)
+
         for pidx, param_option in enumerate(self.options.param_options):
             if param_option['exist_physics_clear'] == logger.transtext('そのまま'):
                 continue
@@ -3226,20 +3223,13 @@ class PmxTailorExportService():
                 saved_bone_names.extend(list(model.bones.keys()))
             else:
                 # 他の材質で該当ボーンにウェイト割り当てられている場合、ボーンの削除だけは避ける
-                for bone_idx, vertices in model.vertices.items():
-                    is_not_delete = False
-                    if bone_idx in list(weighted_bone_indexes.values()) and len(vertices) > 0:
-                        is_not_delete = False
-                        for vertex in vertices:
-                            if vertex.index not in target_vertices:
-                                is_not_delete = True
-                                for material_name, material_vertices in model.material_vertices.items():
-                                    if vertex.index in material_vertices:
-                                        break
-                                logger.info("削除対象外ボーン: %s(%s), 対象外頂点: %s, 所属材質: %s", \
-                                            model.bone_indexes[bone_idx], bone_idx, vertex.index, material_name)
-                                break
-                    if is_not_delete:
+                outside_vertices = weight_usage.get_outside_vertices(target_vertices)
+                weighted_bone_index_set = set(weighted_bone_indexes.values())
+                for bone_idx in model.vertices.keys():
+                    if bone_idx in weighted_bone_index_set and bone_idx in outside_vertices:
+                        vertex_idx = outside_vertices[bone_idx]
+                        logger.info("削除対象外ボーン: %s(%s), 対象外頂点: %s, 所属材質: %s", \
+                                    model.bone_indexes[bone_idx], bone_idx, vertex_idx, weight_usage.get_material_name(vertex_idx))
                         saved_bone_names.append(model.bone_indexes[bone_idx])
 
             # 非表示子ボーンも削除する
@@ -3269,6 +3259,7 @@ class PmxTailorExportService():
                         weighted_bone_indexes[bone_grid[r][c]] = model.bones[bone_grid[r][c]].index
         else:
             for vertex_idx in target_vertices:
+                self.cancel_token.check()
                 vertex = model.vertex_dict[vertex_idx]
                 if type(vertex.deform) is Bdef1:
                     if vertex.deform.index0 not in list(weighted_bone_indexes.values()):
@@ -3299,7 +3290,9 @@ class PmxTailorExportService():
                     and model.bone_indexes[bone.parent_index] not in SEMI_STANDARD_BONE_NAMES:
                 weighted_bone_indexes[bone.name] = bone.index
         
+        weighted_bone_index_set = set(weighted_bone_indexes.values())
         for bone in model.bones.values():
+            self.cancel_token.check()
             is_target = True
             if bone.name in saved_bone_names and bone.name in weighted_bone_indexes:
                 # 保存済みボーン名に入ってても対象外
@@ -3309,7 +3302,7 @@ class PmxTailorExportService():
             if is_target:
                 for vertex in model.vertices.get(bone.name, []):
                     for vertex_weight_bone_index in vertex.get_idx_list():
-                        if vertex_weight_bone_index not in weighted_bone_indexes.values():
+                        if vertex_weight_bone_index not in weighted_bone_index_set:
                             # 他のボーンのウェイトが乗ってたら対象外
                             logger.warning("削除対象外ボーンにウェイトが乗っているため、ボーン「%s」を削除対象外とします。\n調査対象インデックス：%s", bone.name, vertex.index)
                             is_target = False
@@ -3317,59 +3310,59 @@ class PmxTailorExportService():
 
             if not is_target and bone.name in weighted_bone_indexes:
                 logger.debug("他ウェイト対象外: %s", bone.name)
+                weighted_bone_index_set.discard(weighted_bone_indexes[bone.name])
                 del weighted_bone_indexes[bone.name]
 
+        # 参照元を一度だけ集計しておく
+        reference_index = ModelReferenceIndex(model)
+
         for bone_name, bone_index in weighted_bone_indexes.items():
-            bone = model.bones[bone_name]
-            for morph in model.org_morphs.values():
-                if morph.morph_type == 2:
-                    for offset in morph.offsets:
-                        if type(offset) is BoneMorphData:
-                            if offset.bone_index == bone_index:
-                                logger.error("削除対象ボーンがボーンモーフとして登録されているため、削除出来ません。\n" \
-                                             + "事前にボーンモーフから外すか、再利用で物理を生成してください。\n削除対象ボーン：%s(%s), モーフ名: %s", \
-                                             bone_name, morph.name, decoration=MLogger.DECORATION_BOX)
-                                return None
-            for bidx, bone in enumerate(model.bones.values()):
-                if bone.parent_index == bone_index and bone.index not in weighted_bone_indexes.values():
+            for morph_name in reference_index.get_bone_morphs(bone_index):
+                logger.error("削除対象ボーンがボーンモーフとして登録されているため、削除出来ません。\n" \
+                             + "事前にボーンモーフから外すか、再利用で物理を生成してください。\n削除対象ボーン：%s(%s), モーフ名: %s", \
+                             bone_name, bone_index, morph_name, decoration=MLogger.DECORATION_BOX)
+                return None
+
+            for ref_bone_index in reference_index.get_referring_bones(bone_index):
+                if ref_bone_index in weighted_bone_index_set:
+                    continue
+
+                bone = model.bones[model.bone_indexes[ref_bone_index]]
+                if bone.parent_index == bone_index:
                     logger.error("削除対象ボーンが削除対象外ボーンの親ボーンとして登録されているため、削除出来ません。\n" \
                                  + "事前に親子関係を解除するか、再利用で物理を生成してください。\n削除対象ボーン：%s(%s)\n削除対象外子ボーン: %s(%s)", \
                                  bone_name, bone_index, bone.name, bone.index, decoration=MLogger.DECORATION_BOX)
                     return None
 
-                if (bone.getExternalRotationFlag() or bone.getExternalTranslationFlag()) \
-                   and bone.effect_index == bone_index and bone.index not in weighted_bone_indexes.values():
+                if (bone.getExternalRotationFlag() or bone.getExternalTranslationFlag()) and bone.effect_index == bone_index:
                     logger.error("削除対象ボーンが削除対象外ボーンの付与親ボーンとして登録されているため、削除出来ません。\n" \
                                  + "事前に付与関係を解除するか、再利用で物理を生成してください。\n削除対象ボーン：%s(%s)\n削除対象外付与子ボーン: %s(%s)", \
                                  bone_name, bone_index, bone.name, bone.index, decoration=MLogger.DECORATION_BOX)
                     return None
                     
                 if bone.getIkFlag():
-                    if bone.ik.target_index == bone_index and bone.index not in weighted_bone_indexes.values():
+                    if bone.ik.target_index == bone_index:
                         logger.error("削除対象ボーンが削除対象外ボーンのリンクターゲットボーンとして登録されているため、削除出来ません。\n" \
                                      + "事前にIK関係を解除するか、再利用で物理を生成してください。\n削除対象ボーン：%s(%s)\n削除対象外IKボーン: %s(%s)", \
                                      bone_name, bone_index, bone.name, bone.index, decoration=MLogger.DECORATION_BOX)
                         return None
 
                     for link in bone.ik.link:
-                        if link.bone_index == bone_index and bone.index not in weighted_bone_indexes.values():
+                        if link.bone_index == bone_index:
                             logger.error("削除対象ボーンが削除対象外ボーンのリンクボーンとして登録されているため、削除出来ません。\n" \
                                          + "事前にIK関係を解除するか、再利用で物理を生成してください。\n削除対象ボーン：%s(%s)\n削除対象外IKボーン: %s(%s)", \
                                          bone_name, bone_index, bone.name, bone.index, decoration=MLogger.DECORATION_BOX)
                             return None
                            
         weighted_rigidbody_indexes = {}
-        for rigidbody in model.rigidbodies.values():
-            if rigidbody.index not in list(weighted_rigidbody_indexes.values()) and rigidbody.bone_index in list(weighted_bone_indexes.values()) \
-               and model.bone_indexes[rigidbody.bone_index] not in SEMI_STANDARD_BONE_NAMES:
-                weighted_rigidbody_indexes[rigidbody.name] = rigidbody.index
+        target_rigidbody_names = reference_index.get_rigidbodies([bone_index for bone_name, bone_index in weighted_bone_indexes.items() \
+                                                                  if bone_name not in SEMI_STANDARD_BONE_NAMES])
+        for rigidbody_name in sorted(target_rigidbody_names, key=lambda rname: model.rigidbodies[rname].index):
+            weighted_rigidbody_indexes[rigidbody_name] = model.rigidbodies[rigidbody_name].index
 
         weighted_joint_indexes = {}
-        for joint in model.joints.values():
-            if joint.name not in list(weighted_joint_indexes.values()) and joint.rigidbody_index_a in list(weighted_rigidbody_indexes.values()):
-                weighted_joint_indexes[joint.name] = joint.name
-            if joint.name not in list(weighted_joint_indexes.values()) and joint.rigidbody_index_b in list(weighted_rigidbody_indexes.values()):
-                weighted_joint_indexes[joint.name] = joint.name
+        for joint_name in reference_index.get_joints(list(weighted_rigidbody_indexes.values())):
+            weighted_joint_indexes[joint_name] = joint_name
 
         logger.info("%s: 削除実行", material_name)
 
@@ -3468,6 +3461,7 @@ class PmxTailorExportService():
                         link.bone_index = -1
 
         for vidx, vertex in enumerate(model.vertex_dict.values()):
+            self.cancel_token.check()
             if type(vertex.deform) is Bdef1:
                 vertex.deform.index0 = reset_bones[vertex.deform.index0]['index'] if vertex.deform.index0 in reset_bones else -1
             elif type(vertex.deform) is Bdef2:
@@ -3485,6 +3479,67 @@ class PmxTailorExportService():
         return model
 
     # 頂点を展開した図を作成
+    def get_seed_face_scores(self, model: PmxModel, param_option: dict, target_iidxs: list):
+        if not target_iidxs:
+            return {}
+
+        # 方向に応じて判定値を変える
+        if param_option['direction'] == '上':
+            vv_axis_idx = 1
+            vv_sign = -1
+            base_vertical_axis = np.array([0, 1, 0], dtype=np.float64)
+            base_horizonal_axis = np.array([1, 0, 0], dtype=np.float64)
+        elif param_option['direction'] == '右':
+            vv_axis_idx = 0
+            vv_sign = 1
+            base_vertical_axis = np.array([-1, 0, 0], dtype=np.float64)
+            base_horizonal_axis = np.array([0, -1, 0], dtype=np.float64)
+        elif param_option['direction'] == '左':
+            vv_axis_idx = 0
+            vv_sign = -1
+            base_vertical_axis = np.array([1, 0, 0], dtype=np.float64)
+            base_horizonal_axis = np.array([0, -1, 0], dtype=np.float64)
+        else:
+            # デフォルトは下
+            vv_axis_idx = 1
+            vv_sign = 1
+            base_vertical_axis = np.array([0, -1, 0], dtype=np.float64)
+            base_horizonal_axis = np.array([1, 0, 0], dtype=np.float64)
+
+        # 面の頂点位置 (F, 3, 3)
+        face_positions = np.array([[model.vertex_dict[vidx].position.data() for vidx in model.indices[index_idx]] for index_idx in target_iidxs], dtype=np.float64)
+        v0s = face_positions[:, 0]
+        v1s = face_positions[:, 1]
+        v2s = face_positions[:, 2]
+
+        v21_axis = normalize_vectors(v2s - v1s)
+        v10_axis = normalize_vectors(v1s - v0s)
+        v10_axis_cross = normalize_vectors(np.cross(v10_axis, v21_axis))
+
+        # MQuaternion.fromDirection(base_vertical_axis, v10_axis_cross) の各軸
+        z_axis = np.tile(base_vertical_axis, (len(target_iidxs), 1))
+        x_axis = np.cross(v10_axis_cross, z_axis)
+        is_collinear = np.abs(np.sum(x_axis ** 2, axis=1)) < 1e-7
+        x_axis = normalize_vectors(x_axis)
+        y_axis = np.cross(z_axis, x_axis)
+
+        # v0を原点とした回転空間でのv1の位置
+        v10_diff = v1s - v0s
+        v1_local_positions = np.stack([np.sum(x_axis * v10_diff, axis=1), np.sum(y_axis * v10_diff, axis=1), np.sum(z_axis * v10_diff, axis=1)], axis=1)
+        if np.any(is_collinear):
+            # 法線と方向が平行な場合、最短回転
+            collinear_mat = MQuaternion.rotationTo(MVector3D(0, 0, 1), MVector3D(base_vertical_axis)).toMatrix4x4().data()[:3, :3]
+            v1_local_positions[is_collinear] = v10_diff[is_collinear] @ collinear_mat
+
+        v1_local_axis = normalize_vectors(v1_local_positions)
+        below_xs = v1_local_axis @ base_vertical_axis
+        below_ys = v1_local_axis @ base_horizonal_axis
+
+        below_sizes = np.linalg.norm(v0s - v1s, ord=2, axis=1) * np.linalg.norm(v1s - v2s, ord=2, axis=1) * np.linalg.norm(v2s - v0s, ord=2, axis=1)
+
+        return dict(zip(target_iidxs, zip((v0s[:, vv_axis_idx] * vv_sign).tolist(), (v1s[:, vv_axis_idx] * vv_sign).tolist(), \
+                                          below_xs.tolist(), below_ys.tolist(), below_sizes.tolist(), v0s[:, 1].tolist())))
+
     def create_vertex_map(self, model: PmxModel, param_option: dict, material_name: str, target_vertices: list):
         logger.info("%s: 面の抽出", material_name)
 
@@ -3494,6 +3549,7 @@ class PmxTailorExportService():
         duplicate_vertices = {}
         ybase_vertices = {}
         for vertex_idx in model.material_vertices[material_name]:
+            self.cancel_token.check()
             if vertex_idx not in target_vertices:
                 continue
             # 重複頂点の抽出
@@ -3510,12 +3566,9 @@ class PmxTailorExportService():
             if vertex.index not in ybase_vertices[key]:
                 ybase_vertices[key].append(vertex.index)
 
-            # 一旦ルートボーンにウェイトを一括置換
-            vertex.deform = Bdef1(model.bones[param_option['parent_bone_name']].index)
-
         if len(ybase_vertices.keys()) == 0:
             logger.warning("対象範囲となる頂点が取得できなかった為、処理を終了します", decoration=MLogger.DECORATION_BOX)
-            return None, None, None, None, None, None
+            return None, None, None, None, None, None, None
                 
         ymin = np.min(np.array(list(ybase_vertices.keys())))
         ymax = np.max(np.array(list(ybase_vertices.keys())))
@@ -3533,6 +3586,7 @@ class PmxTailorExportService():
         # max_below_x = -9999
         # max_below_size = -9999
         for index_idx in model.material_indices[material_name]:
+            self.cancel_token.check()
             # 頂点の組み合わせから面INDEXを引く
             indices_by_vidx[tuple(sorted(model.indices[index_idx]))] = index_idx
             v0 = model.vertex_dict[model.indices[index_idx][0]]
@@ -3571,14 +3625,22 @@ class PmxTailorExportService():
 
         logger.info("%s: 相対頂点マップの生成", material_name)
 
+        # 開始面の判定値は面毎に変わらないので、最初に全面分まとめて求めておく
+        non_target_iidx_set = set(non_target_iidxs)
+        seed_face_scores = self.get_seed_face_scores(model, param_option, \
+                                                     [index_idx for index_idx in model.material_indices[material_name] if index_idx not in non_target_iidx_set])
+
         # 頂点マップ生成(最初の頂点が(0, 0))
         vertex_axis_maps = []
         vertex_coordinate_maps = []
-        registed_iidxs = copy.deepcopy(non_target_iidxs)
+        registed_iidxs = FaceFrontier(max(model.indices.keys()) + 1, model.material_indices[material_name])
+        registed_iidxs.mark_all(non_target_iidxs)
         vertical_iidxs = []
-        prev_index_cnt = 0
+
+        self.progress.start_stage(ProgressCounter.STAGE_VERTEX_MAP, len(model.material_indices[material_name]))
 
         while len(registed_iidxs) < len(model.material_indices[material_name]):
+            self.cancel_token.check()
             if not vertical_iidxs:
                 # 切替時はとりあえず一面取り出して判定(二次元配列になる)
                 # 出来るだけ真っ直ぐの辺がある面とする
@@ -3586,68 +3648,28 @@ class PmxTailorExportService():
                 max_below_x_size = 0
                 max_below_y = 0
                 max_below_y_size = 0
-                remaining_iidxs = list(set(model.material_indices[material_name]) - set(registed_iidxs))
+                remaining_iidxs = registed_iidxs.remaining()
                 below_x_iidx = None
                 below_y_iidx = None
+                # 既に登録済みの面があるか(ループ中は変わらない)
+                is_registed = len(registed_iidxs) > len(non_target_iidx_set)
                 for index_idx in remaining_iidxs:
-                    v0 = model.vertex_dict[model.indices[index_idx][0]]
-                    v1 = model.vertex_dict[model.indices[index_idx][1]]
-                    v2 = model.vertex_dict[model.indices[index_idx][2]]
-                    if v0.index not in target_vertices or v1.index not in target_vertices or v2.index not in target_vertices:
+                    if index_idx not in seed_face_scores:
                         # 3つ揃ってない場合、スルー
                         continue
 
-                    # 方向に応じて判定値を変える
-                    if param_option['direction'] == '上':
-                        v0v = -v0.position.y()
-                        v1v = -v1.position.y()
-                        base_vertical_axis = MVector3D(0, 1, 0)
-                        base_horizonal_axis = MVector3D(1, 0, 0)
-                    elif param_option['direction'] == '右':
-                        v0v = v0.position.x()
-                        v1v = v1.position.x()
-                        base_vertical_axis = MVector3D(-1, 0, 0)
-                        base_horizonal_axis = MVector3D(0, -1, 0)
-                    elif param_option['direction'] == '左':
-                        v0v = -v0.position.x()
-                        v1v = -v1.position.x()
-                        base_vertical_axis = MVector3D(1, 0, 0)
-                        base_horizonal_axis = MVector3D(0, -1, 0)
-                    else:
-                        # デフォルトは下
-                        v0v = v0.position.y()
-                        v1v = v1.position.y()
-                        base_vertical_axis = MVector3D(0, -1, 0)
-                        base_horizonal_axis = MVector3D(1, 0, 0)
-
-                    v21_axis = (v2.position - v1.position).normalized()
-
-                    v10_axis = (v1.position - v0.position).normalized()
-                    v10_axis_cross = MVector3D.crossProduct(v10_axis, v21_axis).normalized()
-                    v10_axis_qq = MQuaternion.fromDirection(base_vertical_axis, v10_axis_cross)
+                    v0v, v1v, below_x, below_y, below_size, v0y = seed_face_scores[index_idx]
 
-                    v10_mat = MMatrix4x4()
-                    v10_mat.setToIdentity()
-                    v10_mat.translate(v0.position)
-                    v10_mat.rotate(v10_axis_qq)
-
-                    v1_local_position = v10_mat.inverted() * v1.position
-
-                    below_x = MVector3D.dotProduct(v1_local_position.normalized(), base_vertical_axis)
-                    below_y = MVector3D.dotProduct(v1_local_position.normalized(), base_horizonal_axis)
-
-                    below_size = v0.position.distanceToPoint(v1.position) * v1.position.distanceToPoint(v2.position) * v2.position.distanceToPoint(v0.position)
-
-                    if v0v > v1v and abs(below_x) > max_below_x and below_size > max_below_x_size * 0.6 and (set(registed_iidxs) - set(non_target_iidxs) or \
-                       (not set(registed_iidxs) - set(non_target_iidxs) and ymin + (ymedian - ymin) * 0.1 < v0.position.y() < ymax - (ymax - ymedian) * 0.1)):
-                        logger.debug(f'vertical iidx[{index_idx}], v1_local_position[{v1_local_position.to_log()}], below_x[{below_x}], ' \
+                    if v0v > v1v and abs(below_x) > max_below_x and below_size > max_below_x_size * 0.6 and (is_registed or \
+                       (not is_registed and ymin + (ymedian - ymin) * 0.1 < v0y < ymax - (ymax - ymedian) * 0.1)):
+                        logger.debug(f'vertical iidx[{index_idx}], below_x[{below_x}], ' \
                                      + f'below_size[{below_size}], below_x_iidx[{below_x_iidx}], max_below_x[{max_below_x}], max_below_x_size[{max_below_x_size}]')
                         below_x_iidx = index_idx
                         max_below_x = abs(below_x)
                         max_below_x_size = below_size
 
                     if v0v > v1v and abs(below_y) > max_below_y and below_size > max_below_y_size * 0.6:
-                        logger.debug(f'horizonal iidx[{index_idx}], v1_local_position[{v1_local_position.to_log()}], below_y[{below_y}], ' \
+                        logger.debug(f'horizonal iidx[{index_idx}], below_y[{below_y}], ' \
                                      + f'below_size[{below_size}], below_y_iidx[{below_y_iidx}], max_below_y[{max_below_y}], max_below_y_size[{max_below_y_size}]')
                         below_y_iidx = index_idx
                         max_below_y = abs(below_y)
@@ -3657,10 +3679,10 @@ class PmxTailorExportService():
 
                 logger.debug(f'below_iidx: {below_iidx}, max_below_x: {max_below_x}, max_below_y: {max_below_y}')
                 first_vertex_axis_map, first_vertex_coordinate_map = \
-                    self.create_vertex_map_by_index(model, param_option, duplicate_vertices, {}, {}, below_iidx)
+                    self.create_vertex_map_by_index(model, param_option, duplicate_vertices, VertexAxisMap(max(model.vertex_dict.keys()) + 1), VertexCoordinateMap(), below_iidx)
                 vertex_axis_maps.append(first_vertex_axis_map)
                 vertex_coordinate_maps.append(first_vertex_coordinate_map)
-                registed_iidxs.append(below_iidx)
+                registed_iidxs.mark(below_iidx)
                 vertical_iidxs.append(below_iidx)
                 
                 # 斜めが埋まってる場合、残りの一点を埋める
@@ -3669,7 +3691,7 @@ class PmxTailorExportService():
                                                            vertex_axis_maps[-1], vertex_coordinate_maps[-1], registed_iidxs, vertical_iidxs)
 
                 # これで四角形が求められた
-                registed_iidxs = list(set(registed_iidxs) | set(diagonal_now_iidxs))
+                registed_iidxs.mark_all(diagonal_now_iidxs)
                 vertical_iidxs = list(set(vertical_iidxs) | set(diagonal_now_iidxs))
 
             total_vertical_iidxs = []
@@ -3683,6 +3705,7 @@ class PmxTailorExportService():
                 # 縦辺がいる場合（まずは下方向）
                 n = 0
                 while n < 200:
+                    self.cancel_token.check()
                     n += 1
                     vertex_axis_maps[-1], vertex_coordinate_maps[-1], registed_iidxs, now_vertical_iidxs \
                         = self.fill_vertical_indices(model, param_option, duplicate_indices, duplicate_vertices, \
@@ -3700,6 +3723,7 @@ class PmxTailorExportService():
                     # 下方向が終わったら上方向
                     n = 0
                     while n < 200:
+                        self.cancel_token.check()
                         n += 1
                         vertex_axis_maps[-1], vertex_coordinate_maps[-1], registed_iidxs, now_vertical_iidxs \
                             = self.fill_vertical_indices(model, param_option, duplicate_indices, duplicate_vertices, \
@@ -3733,26 +3757,26 @@ class PmxTailorExportService():
                 vertical_iidxs = now_vertical_iidxs
                 
             if not vertical_iidxs:
-                remaining_iidxs = list(set(model.material_indices[material_name]) - set(registed_iidxs))
+                remaining_iidxs = registed_iidxs.remaining()
                 # 全頂点登録済みの面を潰していく
                 for index_idx in remaining_iidxs:
                     iv0, iv1, iv2 = model.indices[index_idx]
                     if iv0 in vertex_axis_maps[-1] and iv1 in vertex_axis_maps[-1] and iv2 in vertex_axis_maps[-1]:
-                        registed_iidxs.append(index_idx)
+                        registed_iidxs.mark(index_idx)
                         logger.debug(f'頂点潰し: {index_idx}')
 
-            if len(registed_iidxs) > 0 and len(registed_iidxs) // 200 > prev_index_cnt:
-                logger.info("-- 面: %s個目:終了", len(registed_iidxs))
-                prev_index_cnt = len(registed_iidxs) // 200
+            self.progress.update(len(registed_iidxs))
             
         logger.info("-- 面: %s個目:終了", len(registed_iidxs))
 
         logger.info("%s: 絶対頂点マップの生成", material_name)
         vertex_maps = []
         vertex_connecteds = []
+        vertex_display_maps = []
 
         for midx, (vertex_axis_map, vertex_coordinate_map) in enumerate(zip(vertex_axis_maps, vertex_coordinate_maps)):
-            logger.info("-- 絶対頂点マップ: %s個目: ---------", midx + 1)
+            self.cancel_token.check()
+            logger.debug("-- 絶対頂点マップ: %s個目: ---------", midx + 1)
 
             # XYの最大と最小の抽出
             xs = [k[0] for k in vertex_coordinate_map.keys()]
@@ -3781,13 +3805,15 @@ class PmxTailorExportService():
             vertex_connected = []
             logger.debug(f'vertex_map.shape: {vertex_map.shape}')
 
-            for vmap in vertex_axis_map.values():
-                if vertex_map.shape[0] > vmap['y'] - min_y and vertex_map.shape[1] > vmap['x'] - min_x:
-                    logger.debug(f"vertex_map: y[{vmap['y'] - min_y}], x[{vmap['x'] - min_x}]: vidx[{vmap['vidx']}] orgx[{vmap['x']}] orgy[{vmap['y']}] pos[{vmap['position'].to_log()}]")
+            for vidx in vertex_axis_map.keys():
+                vx = vertex_axis_map.x(vidx)
+                vy = vertex_axis_map.y(vidx)
+                if vertex_map.shape[0] > vy - min_y and vertex_map.shape[1] > vx - min_x:
+                    logger.debug(f"vertex_map: y[{vy - min_y}], x[{vx - min_x}]: vidx[{vidx}] orgx[{vx}] orgy[{vy}] pos[{model.vertex_dict[vidx].position.to_log()}]")
 
                     try:
-                        vertex_map[vmap['y'] - min_y, vmap['x'] - min_x] = vertex_coordinate_map[(vmap['x'], vmap['y'])][0]
-                        vertex_display_map[vmap['y'] - min_y, vmap['x'] - min_x] = ':'.join([str(v) for v in vertex_coordinate_map[(vmap['x'], vmap['y'])]])
+                        vertex_map[vy - min_y, vx - min_x] = vertex_coordinate_map[(vx, vy)][0]
+                        vertex_display_map[vy - min_y, vx - min_x] = ':'.join([str(v) for v in vertex_coordinate_map[(vx, vy)]])
                     except Exception:
                         # はみ出した頂点はスルーする
                         pass
@@ -3807,26 +3833,17 @@ class PmxTailorExportService():
 
             vertex_maps.append(vertex_map)
             vertex_connecteds.append(vertex_connected)
+            vertex_display_maps.append(vertex_display_map)
 
-            logger.info('\n'.join([', '.join(vertex_display_map[vx, :]) for vx in range(vertex_display_map.shape[0])]), translate=False)
-            logger.info("-- 絶対頂点マップ: %s個目:終了 ---------", midx + 1)
+            logger.debug("-- 絶対頂点マップ: %s個目:終了 ---------", midx + 1)
 
-        return vertex_maps, vertex_connecteds, duplicate_vertices, registed_iidxs, duplicate_indices, index_combs_by_vpos
+        return vertex_maps, vertex_connecteds, duplicate_vertices, registed_iidxs.indexes(), duplicate_indices, index_combs_by_vpos, vertex_display_maps
     
-    def get_axis_range(self, model: PmxModel, vertex_coordinate_map: dict, registed_iidxs: list):
-        xs = [k[0] for k in vertex_coordinate_map.keys()]
-        ys = [k[1] for k in vertex_coordinate_map.keys()]
-
-        min_x = min(xs)
-        max_x = max(xs)
-
-        min_y = min(ys)
-        max_y = max(ys)
-        
-        return min_x, min_y, max_x, max_y
+    def get_axis_range(self, model: PmxModel, vertex_coordinate_map: VertexCoordinateMap, registed_iidxs: FaceFrontier):
+        return vertex_coordinate_map.axis_range()
     
-    def fill_horizonal_now_idxs(self, model: PmxModel, param_option: dict, vertex_axis_map: dict, vertex_coordinate_map: dict, duplicate_indices: dict, \
-                                duplicate_vertices: dict, registed_iidxs: list, first_x: int, min_y: int, max_y: int, offset: int):
+    def fill_horizonal_now_idxs(self, model: PmxModel, param_option: dict, vertex_axis_map: VertexAxisMap, vertex_coordinate_map: VertexCoordinateMap, duplicate_indices: dict, \
+                                duplicate_vertices: dict, registed_iidxs: FaceFrontier, first_x: int, min_y: int, max_y: int, offset: int):
         now_iidxs = []
         first_vidxs = None
         second_vidxs = None
@@ -3847,7 +3864,7 @@ class PmxTailorExportService():
                 key = (min(iv1, iv2), max(iv1, iv2))
                 if key in duplicate_indices:
                     for index_idx in duplicate_indices[key]:
-                        if index_idx in registed_iidxs + now_iidxs:
+                        if index_idx in registed_iidxs or index_idx in now_iidxs:
                             continue
                         
                         # 登録されてない残りの頂点INDEX
@@ -3856,19 +3873,19 @@ class PmxTailorExportService():
                         remaining_vidxs = duplicate_vertices[model.vertex_dict[remaining_vidx].position.to_log()]
                         if abs(model.vertex_dict[iv1].position.y() - model.vertex_dict[remaining_vidx].position.y()) == \
                             abs(model.vertex_dict[iv2].position.y() - model.vertex_dict[remaining_vidx].position.y()):  # noqa
-                            ivy = vertex_axis_map[iv1]['y'] if model.vertex_dict[iv1].position.distanceToPoint(model.vertex_dict[remaining_vidx].position) < \
-                                model.vertex_dict[iv2].position.distanceToPoint(model.vertex_dict[remaining_vidx].position) else vertex_axis_map[iv2]['y']
+                            ivy = vertex_axis_map.y(iv1) if model.vertex_dict[iv1].position.distanceToPoint(model.vertex_dict[remaining_vidx].position) < \
+                                model.vertex_dict[iv2].position.distanceToPoint(model.vertex_dict[remaining_vidx].position) else vertex_axis_map.y(iv2)
                         else:
-                            ivy = vertex_axis_map[iv1]['y'] if abs(model.vertex_dict[iv1].position.y() - model.vertex_dict[remaining_vidx].position.y()) < \
-                                abs(model.vertex_dict[iv2].position.y() - model.vertex_dict[remaining_vidx].position.y()) else vertex_axis_map[iv2]['y']
+                            ivy = vertex_axis_map.y(iv1) if abs(model.vertex_dict[iv1].position.y() - model.vertex_dict[remaining_vidx].position.y()) < \
+                                abs(model.vertex_dict[iv2].position.y() - model.vertex_dict[remaining_vidx].position.y()) else vertex_axis_map.y(iv2)
                         
-                        iv1_map = (vertex_axis_map[iv1]['x'] + offset, ivy)
+                        iv1_map = (vertex_axis_map.x(iv1) + offset, ivy)
                         if iv1_map not in vertex_coordinate_map:
                             is_regist = False
                             for vidx in remaining_vidxs:
                                 if vidx not in vertex_axis_map:
                                     is_regist = True
-                                    vertex_axis_map[vidx] = {'vidx': vidx, 'x': iv1_map[0], 'y': iv1_map[1], 'position': model.vertex_dict[vidx].position}
+                                    vertex_axis_map.set(vidx, iv1_map[0], iv1_map[1])
                                     logger.debug(f"fill_horizonal_now_idxs: vidx[{vidx}], axis[{vertex_axis_map[vidx]}]")
                             if is_regist:
                                 vertex_coordinate_map[iv1_map] = remaining_vidxs
@@ -3880,7 +3897,7 @@ class PmxTailorExportService():
                 if len(now_iidxs) > 0:
                     break
         
-        registed_iidxs = list(set(registed_iidxs) | set(now_iidxs))
+        registed_iidxs.mark_all(now_iidxs)
         
         for index_idx in now_iidxs:
             # 斜めが埋まってる場合、残りの一点を埋める
@@ -3891,16 +3908,24 @@ class PmxTailorExportService():
         return registed_iidxs, now_iidxs
     
     def fill_diagonal_vertex_map_by_index(self, model: PmxModel, param_option: dict, duplicate_indices: dict, duplicate_vertices: dict, \
-                                          vertex_axis_map: dict, vertex_coordinate_map: dict, registed_iidxs: list, now_iidxs: list):
+                                          vertex_axis_map: VertexAxisMap, vertex_coordinate_map: VertexCoordinateMap, registed_iidxs: FaceFrontier, now_iidxs: list):
 
-        # 斜めが埋まっている場合、残りの一点を求める（四角形を求められる）
+        # 追加された面も順次走査する
+        now_iidx_set = set(now_iidxs)
         for index_idx in now_iidxs:
+            registed_iidxs.push(index_idx)
+
+        # 斜めが埋まっている場合、残りの一点を求める（四角形を求められる）
+        while registed_iidxs.has_queue():
+            self.cancel_token.check()
+            index_idx = registed_iidxs.pop()
+
             # 面の辺を抽出
             _, _, diagonal_vs = self.judge_index_edge(model, vertex_axis_map, index_idx)
 
             if diagonal_vs and diagonal_vs in duplicate_indices:
                 for iidx in duplicate_indices[diagonal_vs]:
-                    edge_size = len(set(model.indices[iidx]) & set(vertex_axis_map.keys()))
+                    edge_size = len([vidx for vidx in model.indices[iidx] if vidx in vertex_axis_map])
                     if edge_size >= 2:
                         if edge_size == 2:
                             # 重複頂点(2つの頂点)を持つ面(=連続面)
@@ -3909,21 +3934,25 @@ class PmxTailorExportService():
                                                                 vertex_axis_map, vertex_coordinate_map, iidx)
                         
                         # 登録済みでなければ保持
-                        if iidx not in now_iidxs:
+                        if iidx not in now_iidx_set:
                             now_iidxs.append(iidx)
+                            now_iidx_set.add(iidx)
+                            registed_iidxs.push(iidx)
 
-        registed_iidxs = list(set(registed_iidxs) | set(now_iidxs))
+        registed_iidxs.mark_all(now_iidxs)
 
         return vertex_axis_map, vertex_coordinate_map, registed_iidxs, now_iidxs
     
     def fill_vertical_indices(self, model: PmxModel, param_option: dict, duplicate_indices: dict, duplicate_vertices: dict, \
-                              vertex_axis_map: dict, vertex_coordinate_map: dict, indices_by_vpos: dict, indices_by_vidx: dict, \
-                              registed_iidxs: list, vertical_iidxs: list, offset: int):
+                              vertex_axis_map: VertexAxisMap, vertex_coordinate_map: VertexCoordinateMap, indices_by_vpos: dict, indices_by_vidx: dict, \
+                              registed_iidxs: FaceFrontier, vertical_iidxs: list, offset: int):
         vertical_vs_list = []
 
+        # 面の辺をまとめて抽出
+        index_edges = self.judge_index_edges(model, vertex_axis_map, vertical_iidxs)
+
         for index_idx in vertical_iidxs:
-            # 面の辺を抽出
-            vertical_vs, _, _ = self.judge_index_edge(model, vertex_axis_map, index_idx)
+            vertical_vs, _, _ = index_edges[index_idx]
             if not vertical_vs:
                 continue
 
@@ -3942,8 +3971,8 @@ class PmxTailorExportService():
         return vertex_axis_map, vertex_coordinate_map, registed_iidxs, now_iidxs
 
     def fill_vertical_vertex_map_by_index(self, model: PmxModel, param_option: dict, duplicate_indices: dict, duplicate_vertices: dict, \
-                                          vertex_axis_map: dict, vertex_coordinate_map: dict, indices_by_vpos: dict, indices_by_vidx: dict, \
-                                          vertical_vs_list: list, registed_iidxs: list, vertical_iidxs: list, offset: int):
+                                          vertex_axis_map: VertexAxisMap, vertex_coordinate_map: VertexCoordinateMap, indices_by_vpos: dict, indices_by_vidx: dict, \
+                                          vertical_vs_list: list, registed_iidxs: FaceFrontier, vertical_iidxs: list, offset: int):
         horizonaled_duplicate_indexs = []
         horizonaled_index_combs = []
         horizonaled_duplicate_dots = []
@@ -3956,6 +3985,16 @@ class PmxTailorExportService():
         not_horizonaled_vertical_below_v = []
 
         now_iidxs = []
+
+        # 走査対象となりうる面の辺をまとめて抽出
+        candidate_iidxs = set()
+        for vertical_vs in vertical_vs_list:
+            for vidx in vertical_vs:
+                vpkey = model.vertex_dict[vidx].position.to_log()
+                if vpkey in indices_by_vpos:
+                    candidate_iidxs |= set(indices_by_vpos[vpkey])
+        index_edges = self.judge_index_edges(model, vertex_axis_map, sorted(candidate_iidxs))
+
         for vertical_vs in vertical_vs_list:
             # 該当縦辺の頂点(0が上(＋大きい))
             v0 = model.vertex_dict[vertical_vs[0]]
@@ -3974,12 +4013,12 @@ class PmxTailorExportService():
 
             if vertical_below_v.position.to_log() in indices_by_vpos:
                 for duplicate_index_idx in indices_by_vpos[vertical_below_v.position.to_log()]:
-                    if duplicate_index_idx in registed_iidxs + vertical_iidxs + now_iidxs:
+                    if duplicate_index_idx in registed_iidxs or duplicate_index_idx in vertical_iidxs or duplicate_index_idx in now_iidxs:
                         # 既に登録済みの面である場合、スルー
                         continue
 
-                    # 面の辺を抽出
-                    vertical_in_vs, horizonal_in_vs, _ = self.judge_index_edge(model, vertex_axis_map, duplicate_index_idx)
+                    # 面の辺
+                    vertical_in_vs, horizonal_in_vs, _ = index_edges[duplicate_index_idx]
 
                     if vertical_in_vs and horizonal_in_vs:
                         if ((offset > 0 and vertical_in_vs[0] in duplicate_vertices[vertical_below_v.position.to_log()]) \
@@ -4020,7 +4059,7 @@ class PmxTailorExportService():
                                 horizonaled_index_combs.append((-1, -1))
 
                             if iv0 and iv1:
-                                if iv0.index in vertex_axis_map and (vertex_axis_map[iv0.index]['x'], vertex_axis_map[iv0.index]['y'] + offset) not in vertex_coordinate_map:
+                                if iv0.index in vertex_axis_map and (vertex_axis_map.x(iv0.index), vertex_axis_map.y(iv0.index) + offset) not in vertex_coordinate_map:
                                     # v1から繋がる辺のベクトル
                                     iv0 = model.vertex_dict[iv0.index]
                                     iv1 = model.vertex_dict[iv1.index]
@@ -4052,7 +4091,7 @@ class PmxTailorExportService():
                                 not_horizonaled_index_combs.append((-1, -1))
 
                             if iv0 and iv1:
-                                if iv0.index in vertex_axis_map and (vertex_axis_map[iv0.index]['x'], vertex_axis_map[iv0.index]['y'] + offset) not in vertex_coordinate_map:
+                                if iv0.index in vertex_axis_map and (vertex_axis_map.x(iv0.index), vertex_axis_map.y(iv0.index) + offset) not in vertex_coordinate_map:
                                     # v1から繋がる辺のベクトル
                                     iv0 = model.vertex_dict[iv0.index]
                                     iv1 = model.vertex_dict[iv1.index]
@@ -4079,8 +4118,8 @@ class PmxTailorExportService():
                         vertical_below_v = not_horizonaled_vertical_below_v[vidx]
                         vertical_above_v = not_horizonaled_vertical_above_v[vidx]
 
-                        remaining_x = vertex_axis_map[vertical_below_v.index]['x']
-                        remaining_y = vertex_axis_map[vertical_below_v.index]['y'] + offset
+                        remaining_x = vertex_axis_map.x(vertical_below_v.index)
+                        remaining_y = vertex_axis_map.y(vertical_below_v.index) + offset
                         remaining_vidx = tuple(set(vertical_vidxs) - {vertical_below_v.index})[0]
                         remaining_v = model.vertex_dict[remaining_vidx]
                         # ほぼ同じベクトルを向いていたら、垂直頂点として登録
@@ -4088,7 +4127,7 @@ class PmxTailorExportService():
                         for below_vidx in duplicate_vertices[remaining_v.position.to_log()]:
                             if below_vidx not in vertex_axis_map and (remaining_x, remaining_y) not in vertex_coordinate_map:
                                 is_regist = True
-                                vertex_axis_map[below_vidx] = {'vidx': below_vidx, 'x': remaining_x, 'y': remaining_y, 'position': model.vertex_dict[below_vidx].position}
+                                vertex_axis_map.set(below_vidx, remaining_x, remaining_y)
                                 logger.debug(f"fill_vertical1: vidx[{below_vidx}], axis[{vertex_axis_map[below_vidx]}]")
                         if is_regist:
                             vertex_coordinate_map[(remaining_x, remaining_y)] = duplicate_vertices[remaining_v.position.to_log()]
@@ -4103,8 +4142,8 @@ class PmxTailorExportService():
                     duplicate_index_idx = horizonaled_duplicate_indexs[vidx]
                     vertical_below_v = horizonaled_vertical_below_v[vidx]
 
-                    remaining_x = vertex_axis_map[vertical_below_v.index]['x']
-                    remaining_y = vertex_axis_map[vertical_below_v.index]['y'] + offset
+                    remaining_x = vertex_axis_map.x(vertical_below_v.index)
+                    remaining_y = vertex_axis_map.y(vertical_below_v.index) + offset
                     remaining_vidx = tuple(set(vertical_vidxs) - {vertical_below_v.index})[0]
                     remaining_v = model.vertex_dict[remaining_vidx]
                     # ほぼ同じベクトルを向いていたら、垂直頂点として登録
@@ -4112,7 +4151,7 @@ class PmxTailorExportService():
                     for below_vidx in duplicate_vertices[remaining_v.position.to_log()]:
                         if below_vidx not in vertex_axis_map and (remaining_x, remaining_y) not in vertex_coordinate_map:
                             is_regist = True
-                            vertex_axis_map[below_vidx] = {'vidx': below_vidx, 'x': remaining_x, 'y': remaining_y, 'position': model.vertex_dict[below_vidx].position}
+                            vertex_axis_map.set(below_vidx, remaining_x, remaining_y)
                             logger.debug(f"fill_vertical1: vidx[{below_vidx}], axis[{vertex_axis_map[below_vidx]}]")
                     if is_regist:
                         vertex_coordinate_map[(remaining_x, remaining_y)] = duplicate_vertices[remaining_v.position.to_log()]
@@ -4121,21 +4160,22 @@ class PmxTailorExportService():
                     now_iidxs.append(duplicate_index_idx)
 
                     if vertical_vidxs[0] in vertex_axis_map and vertical_vidxs[1] in vertex_axis_map:
-                        vertical_v0 = vertex_axis_map[vertical_vidxs[0]]
-                        vertical_v1 = vertex_axis_map[vertical_vidxs[1]]
+                        vertical_v0 = model.vertex_dict[vertical_vidxs[0]]
+                        vertical_v1 = model.vertex_dict[vertical_vidxs[1]]
                         remaining_v = model.vertex_dict[tuple(set(model.indices[duplicate_index_idx]) - set(vertical_vidxs))[0]]
 
                         if remaining_v.index not in vertex_axis_map:
                             # 残り一点のマップ位置
-                            remaining_x, remaining_y = self.get_remaining_vertex_vec(vertical_v0['vidx'], vertical_v0['x'], vertical_v0['y'], vertical_v0['position'], \
-                                                                                     vertical_v1['vidx'], vertical_v1['x'], vertical_v1['y'], vertical_v1['position'], \
+                            remaining_x, remaining_y = self.get_remaining_vertex_vec(vertical_v0.index, vertex_axis_map.x(vertical_v0.index), vertex_axis_map.y(vertical_v0.index), \
+                                                                                     vertical_v0.position, vertical_v1.index, vertex_axis_map.x(vertical_v1.index), \
+                                                                                     vertex_axis_map.y(vertical_v1.index), vertical_v1.position, \
                                                                                      remaining_v, vertex_coordinate_map)
 
                             is_regist = False
                             for vidx in duplicate_vertices[remaining_v.position.to_log()]:
                                 if vidx not in vertex_axis_map and (remaining_x, remaining_y) not in vertex_coordinate_map:
                                     is_regist = True
-                                    vertex_axis_map[vidx] = {'vidx': vidx, 'x': remaining_x, 'y': remaining_y, 'position': model.vertex_dict[vidx].position}
+                                    vertex_axis_map.set(vidx, remaining_x, remaining_y)
                                     logger.debug(f"fill_vertical2: vidx[{vidx}], axis[{vertex_axis_map[vidx]}]")
                             if is_regist:
                                 vertex_coordinate_map[(remaining_x, remaining_y)] = duplicate_vertices[remaining_v.position.to_log()]
@@ -4146,44 +4186,21 @@ class PmxTailorExportService():
                             self.fill_diagonal_vertex_map_by_index(model, param_option, duplicate_indices, duplicate_vertices, vertex_axis_map, \
                                                                    vertex_coordinate_map, registed_iidxs, now_iidxs)
         
-        registed_iidxs = list(set(registed_iidxs) | set(now_iidxs))
+        registed_iidxs.mark_all(now_iidxs)
 
         return vertex_axis_map, vertex_coordinate_map, registed_iidxs, now_iidxs
 
-    def judge_index_edge(self, model: PmxModel, vertex_axis_map: dict, index_idx: int):
-        # 該当面の頂点
-        v0 = model.vertex_dict[model.indices[index_idx][0]]
-        v1 = model.vertex_dict[model.indices[index_idx][1]]
-        v2 = model.vertex_dict[model.indices[index_idx][2]]
+    def judge_index_edge(self, model: PmxModel, vertex_axis_map: VertexAxisMap, index_idx: int):
+        return vertex_axis_map.judge_edge(model.indices[index_idx])
+
+    def judge_index_edges(self, model: PmxModel, vertex_axis_map: VertexAxisMap, index_idxs: list):
+        if not index_idxs:
+            return {}
 
-        # 縦の辺を抽出
-        vertical_vs = (v0.index, v1.index) if v0.index in vertex_axis_map and v1.index in vertex_axis_map and vertex_axis_map[v0.index]['x'] == vertex_axis_map[v1.index]['x'] \
-            else (v0.index, v2.index) if v0.index in vertex_axis_map and v2.index in vertex_axis_map and vertex_axis_map[v0.index]['x'] == vertex_axis_map[v2.index]['x'] \
-            else (v1.index, v2.index) if v1.index in vertex_axis_map and v2.index in vertex_axis_map and vertex_axis_map[v1.index]['x'] == vertex_axis_map[v2.index]['x'] else None
-        if vertical_vs:
-            vertical_vs = (vertical_vs[0], vertical_vs[1]) if vertex_axis_map[vertical_vs[0]]['y'] < vertex_axis_map[vertical_vs[1]]['y'] else (vertical_vs[1], vertical_vs[0])
-
-        # 横の辺を抽出
-        horizonal_vs = (v0.index, v1.index) if v0.index in vertex_axis_map and v1.index in vertex_axis_map and vertex_axis_map[v0.index]['y'] == vertex_axis_map[v1.index]['y'] \
-            else (v0.index, v2.index) if v0.index in vertex_axis_map and v2.index in vertex_axis_map and vertex_axis_map[v0.index]['y'] == vertex_axis_map[v2.index]['y'] \
-            else (v1.index, v2.index) if v1.index in vertex_axis_map and v2.index in vertex_axis_map and vertex_axis_map[v1.index]['y'] == vertex_axis_map[v2.index]['y'] else None
-        if horizonal_vs:
-            horizonal_vs = (horizonal_vs[0], horizonal_vs[1]) if vertex_axis_map[horizonal_vs[0]]['x'] < vertex_axis_map[horizonal_vs[1]]['x'] else (horizonal_vs[1], horizonal_vs[0])
-
-        # 斜めの辺を抽出
-        diagonal_vs = (v0.index, v1.index) if v0.index in vertex_axis_map and v1.index in vertex_axis_map \
-            and vertex_axis_map[v0.index]['x'] != vertex_axis_map[v1.index]['x'] and vertex_axis_map[v0.index]['y'] != vertex_axis_map[v1.index]['y'] \
-            else (v0.index, v2.index) if v0.index in vertex_axis_map and v2.index in vertex_axis_map \
-            and vertex_axis_map[v0.index]['x'] != vertex_axis_map[v2.index]['x'] and vertex_axis_map[v0.index]['y'] != vertex_axis_map[v2.index]['y'] \
-            else (v1.index, v2.index) if v1.index in vertex_axis_map and v2.index in vertex_axis_map \
-            and vertex_axis_map[v1.index]['x'] != vertex_axis_map[v2.index]['x'] and vertex_axis_map[v1.index]['y'] != vertex_axis_map[v2.index]['y'] else None
-        if diagonal_vs:
-            diagonal_vs = (min(diagonal_vs[0], diagonal_vs[1]), max(diagonal_vs[0], diagonal_vs[1]))
-
-        return vertical_vs, horizonal_vs, diagonal_vs
+        return dict(zip(index_idxs, vertex_axis_map.judge_edges([model.indices[index_idx] for index_idx in index_idxs])))
 
     def create_vertex_map_by_index(self, model: PmxModel, param_option: dict, duplicate_vertices: dict, \
-                                   vertex_axis_map: dict, vertex_coordinate_map: dict, index_idx: int):
+                                   vertex_axis_map: VertexAxisMap, vertex_coordinate_map: VertexCoordinateMap, index_idx: int):
         # 該当面の頂点
         v0 = model.vertex_dict[model.indices[index_idx][0]]
         v1 = model.vertex_dict[model.indices[index_idx][1]]
@@ -4199,7 +4216,7 @@ class PmxTailorExportService():
             # 空の場合、原点として0番目を設定する
             # 表向き=時計回りで当てはめていく
             for vidx in vs_duplicated[v0.index]:
-                vertex_axis_map[vidx] = {'vidx': vidx, 'x': 0, 'y': 0, 'position': model.vertex_dict[vidx].position}
+                vertex_axis_map.set(vidx, 0, 0)
             vertex_coordinate_map[(0, 0)] = vs_duplicated[v0.index]
 
             for vidx in vs_duplicated[v1.index]:
@@ -4396,11 +4413,11 @@ class PmxTailorExportService():
                         vx = int(remaining_x)
                         vy = 0
 
-                vertex_axis_map[vidx] = {'vidx': vidx, 'x': vx, 'y': vy, 'position': model.vertex_dict[vidx].position, 'duplicate': duplicate_vertices[model.vertex_dict[vidx].position.to_log()]}
+                vertex_axis_map.set(vidx, vx, vy)
             vertex_coordinate_map[(vx, vy)] = vs_duplicated[v1.index]
 
             for vidx in vs_duplicated[v2.index]:
-                vertex_axis_map[vidx] = {'vidx': vidx, 'x': remaining_x, 'y': remaining_y, 'position': model.vertex_dict[vidx].position}
+                vertex_axis_map.set(vidx, remaining_x, remaining_y)
             vertex_coordinate_map[(remaining_x, remaining_y)] = vs_duplicated[v2.index]
 
             logger.debug(f"初期iidx: iidx[{index_idx}], coodinate[{vertex_coordinate_map}]")
@@ -4409,32 +4426,32 @@ class PmxTailorExportService():
             remaining_v = None
             
             # 重複辺のマップ情報（時計回りで設定する）
-            v_duplicated_maps = []
+            v_duplicated_vs = []
             if v0.index not in vertex_axis_map:
                 remaining_v = v0
-                v_duplicated_maps.append(vertex_axis_map[v1.index])
-                v_duplicated_maps.append(vertex_axis_map[v2.index])
+                v_duplicated_vs.append(v1)
+                v_duplicated_vs.append(v2)
 
             if v1.index not in vertex_axis_map:
                 remaining_v = v1
-                v_duplicated_maps.append(vertex_axis_map[v2.index])
-                v_duplicated_maps.append(vertex_axis_map[v0.index])
+                v_duplicated_vs.append(v2)
+                v_duplicated_vs.append(v0)
 
             if v2.index not in vertex_axis_map:
                 remaining_v = v2
-                v_duplicated_maps.append(vertex_axis_map[v0.index])
-                v_duplicated_maps.append(vertex_axis_map[v1.index])
+                v_duplicated_vs.append(v0)
+                v_duplicated_vs.append(v1)
             
             # 残り一点のマップ位置
-            remaining_x, remaining_y = self.get_remaining_vertex_vec(v_duplicated_maps[0]['vidx'], v_duplicated_maps[0]['x'], v_duplicated_maps[0]['y'], v_duplicated_maps[0]['position'], \
-                                                                     v_duplicated_maps[1]['vidx'], v_duplicated_maps[1]['x'], v_duplicated_maps[1]['y'], v_duplicated_maps[1]['position'], \
-                                                                     remaining_v, vertex_coordinate_map)
+            remaining_x, remaining_y = self.get_remaining_vertex_vec(v_duplicated_vs[0].index, vertex_axis_map.x(v_duplicated_vs[0].index), vertex_axis_map.y(v_duplicated_vs[0].index), \
+                                                                     v_duplicated_vs[0].position, v_duplicated_vs[1].index, vertex_axis_map.x(v_duplicated_vs[1].index), \
+                                                                     vertex_axis_map.y(v_duplicated_vs[1].index), v_duplicated_vs[1].position, remaining_v, vertex_coordinate_map)
 
             is_regist = False
             for vidx in vs_duplicated[remaining_v.index]:
                 if vidx not in vertex_axis_map and (remaining_x, remaining_y) not in vertex_coordinate_map:
                     is_regist = True
-                    vertex_axis_map[vidx] = {'vidx': vidx, 'x': remaining_x, 'y': remaining_y, 'position': model.vertex_dict[vidx].position}
+                    vertex_axis_map.set(vidx, remaining_x, remaining_y)
                     logger.debug(f"create_vertex_map_by_index: vidx[{vidx}], axis[{vertex_axis_map[vidx]}]")
             if is_regist:
                 vertex_coordinate_map[(remaining_x, remaining_y)] = vs_duplicated[remaining_v.index]
@@ -4442,7 +4459,7 @@ class PmxTailorExportService():
         return vertex_axis_map, vertex_coordinate_map
 
     def get_remaining_vertex_vec(self, vv0_idx: int, vv0_x: int, vv0_y: int, vv0_vec: MVector3D, \
-                                 vv1_idx: int, vv1_x: int, vv1_y: int, vv1_vec: MVector3D, remaining_v: Vertex, vertex_coordinate_map: dict):
+                                 vv1_idx: int, vv1_x: int, vv1_y: int, vv1_vec: MVector3D, remaining_v: Vertex, vertex_coordinate_map: VertexCoordinateMap):
         # 時計回りと見なして位置を合わせる
         if vv0_x == vv1_x:
             # 元が縦方向に一致している場合
@@ -4504,6 +4521,39 @@ class PmxTailorExportService():
         return None
 
 
+# 並列処理用のモデル・中断要求(ワーカープロセス毎に保持)
+worker_model = None
+worker_cancel_token = None
+
+
+def init_worker(model: PmxModel, cancel_token: CancellationToken):
+    global worker_model, worker_cancel_token
+    worker_model = model
+    worker_cancel_token = cancel_token
+    # ワーカー側の途中経過は出力しない
+    MLogger.total_level = logging.WARNING
+
+
+def init_shared_worker(handle: dict, cancel_token: CancellationToken):
+    global worker_shared_model, worker_cancel_token
+    worker_shared_model = SharedModelView(handle)
+    worker_cancel_token = cancel_token
+    # ワーカー側の途中経過は出力しない
+    MLogger.total_level = logging.WARNING
+
+
+# 共有メモリから対象材質の分だけ頂点・面を参照して生成する
+def create_vertex_map_worker(param_option: dict, target_vertices: list):
+    model = worker_shared_model.get_material_model(param_option['material_name'])
+    return PmxTailorExportService(None, worker_cancel_token).create_vertex_map(model, param_option, param_option['material_name'], target_vertices)
+
+
+def calc_weight_rows_worker(param_option: dict, vertex_map: np.ndarray, vertex_connected: list, registed_bone_indexs: dict, \
+                            bone_horizonal_distances: np.ndarray, bone_vertical_distances: np.ndarray, target_vertices: list):
+    return PmxTailorExportService(None, worker_cancel_token).calc_weight_rows(worker_model, param_option, vertex_map, vertex_connected, registed_bone_indexs, \
+                                                                              bone_horizonal_distances, bone_vertical_distances, target_vertices)
+
+
 def calc_ratio(ratio: float, oldmin: float, oldmax: float, newmin: float, newmax: float):
     # https://qastack.jp/programming/929103/convert-a-number-range-to-another-range-maintaining-ratio
     # NewValue = (((OldValue - OldMin) * (NewMax - NewMin)) / (OldMax - OldMin)) + NewMin
@@ -17,6 +17,20 @@ cdef tuple convert_catmullrom_2_bezier(np.ndarray xs, np.ndarray ys)
 
 cpdef np.ndarray intersect_by_x(curve, np.ndarray xs)
 
+cdef int binomial(int n, int k)
+
+cdef np.ndarray bezier_power_coefficients(np.ndarray values)
+
+cdef np.ndarray evaluate_bezier_by_t(np.ndarray values, np.ndarray ts)
+
+cdef np.ndarray solve_bezier_ts(np.ndarray coefficients, np.ndarray xs)
+
+cdef np.ndarray solve_quadratic(double a, double b, np.ndarray cs)
+
+cdef np.ndarray solve_cubic(double a, double b, double c, np.ndarray ds)
+
+cdef np.ndarray solve_by_bisection(np.ndarray coefficients, np.ndarray xs, int division=*, int iteration=*)
+
 cdef tuple c_evaluate(int x1v, int y1v, int x2v, int y2v, int start, int now, int end)
 
 cdef tuple c_evaluate_by_t(int x1v, int y1v, int x2v, int y2v, int start, int end, double t)
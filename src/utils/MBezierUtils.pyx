@@ -4,6 +4,7 @@ from module.MMath import MRect, MVector2D, MVector3D, MVector4D, MQuaternion, MM
 from utils.MLogger import MLogger # noqa
 import numpy as np
 cimport numpy as np
+from math import factorial
 import bezier
 cimport bezier._curve
 
@@ -381,38 +382,183 @@ cdef tuple convert_catmullrom_2_bezier(np.ndarray xs, np.ndarray ys):
 
 # 指定された複数のXと交わるそれぞれのYを返す
 cpdef np.ndarray intersect_by_x(curve, np.ndarray xs):
-    cdef double x
-    cdef list ys = []
-    cdef np.ndarray[np.float_t, ndim=1] s_vals
-    cdef np.ndarray[np.float_t, ndim=2] intersections
+    # 制御点 (2, 次数+1)
+    cdef np.ndarray[np.float_t, ndim=2] nodes = np.asarray(curve.nodes, dtype=np.float64)
+    cdef np.ndarray[np.float_t, ndim=1] target_xs = np.asarray(xs, dtype=np.float64).reshape(-1)
+    cdef np.ndarray[np.float_t, ndim=2] ts
+    cdef np.ndarray is_valid, valid_ts
 
-    ys = []
+    if len(target_xs) == 0:
+        return np.zeros(0, dtype=np.float64)
 
-    for x in xs:
-        # 交点を求める為のX線上の直線
-        line1 = bezier.Curve(np.asfortranarray([[x, x], [-9999999999, 9999999999]]), degree=1)
+    # x(t) = x となる t の候補 (N, 次数) 該当なしは nan
+    ts = solve_bezier_ts(bezier_power_coefficients(nodes[0]), target_xs)
 
-        try:
-            # 交点を求める（高精度は求めない）
-            intersections = curve.intersect(line1, _verify=False)
+    # 交点がちょうど1つの場合のみ採用し、それ以外は0とする
+    is_valid = np.count_nonzero(~np.isnan(ts), axis=1) == 1
+    valid_ts = np.nanmax(np.where(is_valid[:, np.newaxis], ts, -1), axis=1)
 
-            # tからyを求め直す
-            s_vals = np.asfortranarray(intersections[0, :])
+    return np.where(is_valid, evaluate_bezier_by_t(nodes[1], np.clip(valid_ts, 0, 1)), 0)
 
-            # 評価する
-            es = curve.evaluate_multi(s_vals)
-            
-            # 値が取れている場合、その値を設定する
-            if es.shape == (2, 1):
-                ys.append(es[1][0])
-            # 取れていない場合、無視
-            else:
-                ys.append(0)
-        except:
-            # エラーが起きた場合、無視
-            ys.append(0)
-    
-    return np.array(ys, dtype=np.float)
+
+cdef int binomial(int n, int k):
+    return factorial(n) // (factorial(k) * factorial(n - k))
+
+
+# バーンスタイン基底の制御点を冪基底の係数に変換 (t^0, t^1, ...)
+cdef np.ndarray bezier_power_coefficients(np.ndarray values):
+    cdef int degree = len(values) - 1
+    cdef int i, j
+    cdef double total
+    cdef np.ndarray[np.float_t, ndim=1] coefficients = np.zeros(degree + 1, dtype=np.float64)
+
+    for j in range(degree + 1):
+        total = 0
+        for i in range(j + 1):
+            total += ((-1) ** (j - i)) * binomial(j, i) * values[i]
+        coefficients[j] = binomial(degree, j) * total
+
+    return coefficients
+
+
+# 各tでのベジェ曲線の値
+cdef np.ndarray evaluate_bezier_by_t(np.ndarray values, np.ndarray ts):
+    cdef int degree = len(values) - 1
+    cdef int k
+    cdef np.ndarray[np.float_t, ndim=1] ys = np.zeros(len(ts), dtype=np.float64)
+
+    for k in range(degree + 1):
+        ys += binomial(degree, k) * (ts ** k) * ((1 - ts) ** (degree - k)) * values[k]
+
+    return ys
+
+
+# 多項式 f(t) = Σ c_j t^j - x の [0, 1] 内の根 (N, 次数)
+cdef np.ndarray solve_bezier_ts(np.ndarray coefficients, np.ndarray xs):
+    cdef double eps = 1e-12 * max(np.max(np.abs(coefficients)), np.max(np.abs(xs)), 1e-300)
+    cdef double t_eps = 1e-9
+    cdef int degree = len(coefficients) - 1
+    cdef np.ndarray ts, fs, dfs
+
+    # 最高次の係数が0に近い場合は次数を下げる
+    while degree > 0 and abs(coefficients[degree]) <= eps:
+        degree -= 1
+
+    if degree == 0:
+        ts = np.full((len(xs), 1), np.nan)
+    elif degree == 1:
+        ts = ((xs - coefficients[0]) / coefficients[1])[:, np.newaxis]
+    elif degree == 2:
+        ts = solve_quadratic(coefficients[2], coefficients[1], coefficients[0] - xs)
+    elif degree == 3:
+        ts = solve_cubic(coefficients[3], coefficients[2], coefficients[1], coefficients[0] - xs)
+    else:
+        ts = solve_by_bisection(coefficients[:degree + 1], xs)
+
+    # ニュートン法で精度を上げる
+    for _ in range(2):
+        fs = np.polyval(coefficients[::-1], ts) - xs[:, np.newaxis]
+        dfs = np.polyval(np.polyder(coefficients[::-1]), ts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ts = np.where(np.abs(dfs) > eps, ts - fs / dfs, ts)
+
+    # 範囲外の根を除外
+    ts = np.where((ts >= -t_eps) & (ts <= 1 + t_eps), np.clip(ts, 0, 1), np.nan)
+
+    # 重根を1つにまとめる
+    ts = np.sort(ts, axis=1)
+    if ts.shape[1] > 1:
+        ts[:, 1:][np.abs(np.diff(ts, axis=1)) <= t_eps] = np.nan
+
+    return ts
+
+
+# a t^2 + b t + c = 0
+cdef np.ndarray solve_quadratic(double a, double b, np.ndarray cs):
+    cdef np.ndarray[np.float_t, ndim=2] ts = np.full((len(cs), 2), np.nan)
+    cdef np.ndarray discs = b * b - 4 * a * cs
+    cdef np.ndarray is_real = discs >= 0
+    cdef np.ndarray sqrt_discs = np.sqrt(np.where(is_real, discs, 0))
+    # 桁落ちしない解の公式
+    cdef np.ndarray qs = -0.5 * (b + (1 if b >= 0 else -1) * sqrt_discs)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ts[:, 0] = np.where(is_real, qs / a, np.nan)
+        ts[:, 1] = np.where(is_real & (qs != 0), cs / qs, np.nan)
+
+    return ts
+
+
+# a t^3 + b t^2 + c t + d = 0 (カルダノの公式)
+cdef np.ndarray solve_cubic(double a, double b, double c, np.ndarray ds):
+    cdef np.ndarray[np.float_t, ndim=2] ts = np.full((len(ds), 3), np.nan)
+    cdef double bn = b / a
+    cdef double cn = c / a
+    cdef double offset = -bn / 3
+    cdef double p, r
+    cdef int k
+    cdef np.ndarray qs, discs, is_single, sqrt_discs, phis
+
+    # t = s - bn / 3 で s^3 + p s + q = 0 に変換
+    p = cn - bn * bn / 3
+    qs = 2 * bn ** 3 / 27 - bn * cn / 3 + ds / a
+    discs = (qs / 2) ** 2 + (p / 3) ** 3
+
+    # 実根が1つ
+    is_single = discs > 0
+    sqrt_discs = np.sqrt(np.where(is_single, discs, 0))
+    ts[:, 0] = np.where(is_single, np.cbrt(-qs / 2 + sqrt_discs) + np.cbrt(-qs / 2 - sqrt_discs) + offset, np.nan)
+
+    if p < 0:
+        # 実根が3つ(重根含む)
+        r = 2 * np.sqrt(-p / 3)
+        phis = np.arccos(np.clip((3 * qs / (2 * p)) * np.sqrt(-3 / p), -1, 1)) / 3
+        for k in range(3):
+            ts[:, k] = np.where(is_single, ts[:, k], r * np.cos(phis - 2 * np.pi * k / 3) + offset)
+    else:
+        # p >= 0 かつ判別式が0以下は三重根のみ
+        ts[:, 0] = np.where(is_single, ts[:, 0], np.cbrt(-qs) + offset)
+
+    return ts
+
+
+# 4次以上は区間を分割して二分法
+cdef np.ndarray solve_by_bisection(np.ndarray coefficients, np.ndarray xs, int division=64, int iteration=60):
+    cdef np.ndarray poly = coefficients[::-1]
+    cdef np.ndarray grid = np.linspace(0, 1, division + 1)
+    cdef np.ndarray fs = np.polyval(poly, grid)[np.newaxis, :] - xs[:, np.newaxis]
+    cdef int degree = len(coefficients) - 1
+    cdef np.ndarray[np.float_t, ndim=2] ts = np.full((len(xs), degree), np.nan)
+    cdef np.ndarray is_brackets, rows, cols, nths, starts, is_target, lows, highs, f_lows, f_mids, mids, is_low, targets
+
+    # 符号が変わる区間 (N, division)
+    is_brackets = (fs[:, :-1] * fs[:, 1:] < 0) | (fs[:, :-1] == 0)
+    is_brackets[:, -1] |= fs[:, -1] == 0
+
+    rows, cols = np.nonzero(is_brackets)
+    if len(rows) == 0:
+        return ts
+
+    # 各行の何番目の根か
+    starts = np.r_[0, np.nonzero(np.diff(rows))[0] + 1]
+    nths = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+    is_target = nths < degree
+    rows, cols, nths = rows[is_target], cols[is_target], nths[is_target]
+
+    lows = grid[cols]
+    highs = grid[cols + 1]
+    f_lows = fs[rows, cols]
+    targets = xs[rows]
+    for _ in range(iteration):
+        mids = (lows + highs) / 2
+        f_mids = np.polyval(poly, mids) - targets
+        is_low = (f_lows * f_mids) <= 0
+        highs = np.where(is_low, mids, highs)
+        lows = np.where(is_low, lows, mids)
+        f_lows = np.where(is_low, f_lows, f_mids)
+    ts[rows, nths] = np.where(fs[rows, cols] == 0, grid[cols], (lows + highs) / 2)
+
+    return ts
 
 
 # 補間曲線を求める
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+import multiprocessing
+import time
+
+from utils.MException import MKilledException
+
+
+# 処理の中断要求
+# 画面・出力プロセス・プールのワーカーで同じ要求を参照できるよう、プロセス間で共有できるイベントで保持する
+# (プロセス間では、プロセス起動時の引数・initargs としてのみ受け渡せる)
+class CancellationToken:
+
+    # 中断要求を確認する間隔(秒)
+    CHECK_INTERVAL = 0.05
+
+    def __init__(self):
+        self.event = multiprocessing.Event()
+        self.checked_time = 0
+
+    def cancel(self):
+        self.event.set()
+
+    def is_cancelled(self):
+        return self.event.is_set()
+
+    # ループ内で毎回呼んでも、前回の確認から一定時間経つまでは確認しない
+    def check(self):
+        now = time.monotonic()
+        if now - self.checked_time < self.CHECK_INTERVAL:
+            return
+        self.checked_time = now
+
+        if self.event.is_set():
+            raise MKilledException()
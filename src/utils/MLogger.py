@@ -11,8 +11,6 @@ import locale
 
 import cython
 
-from utils.MException import MKilledException
-
 
 class MLogger():
 
@@ -53,6 +51,8 @@ class MLogger():
     
     messages = {}
     logger = None
+    # スレッド毎の中断要求(ログ出力時に確認する)
+    thread_local = threading.local()
 
     def __init__(self, module_name, level=logging.INFO):
         self.module_name = module_name
@@ -168,9 +168,10 @@ class MLogger():
     # 実際に出力する実態
     def print_logger(self, org_msg, *args, **kwargs):
 
-        if "is_killed" in threading.current_thread()._kwargs and threading.current_thread()._kwargs["is_killed"]:
-            # 停止命令が出ている場合、エラー
-            raise MKilledException()
+        cancel_token = getattr(self.thread_local, "cancel_token", None)
+        if cancel_token:
+            # 中断要求が出ている場合、エラー
+            cancel_token.check()
 
         target_level = kwargs.pop("level", logging.INFO)
         # if self.logger.isEnabledFor(target_level) and self.default_level <= target_level:
@@ -311,6 +312,11 @@ class MLogger():
         
         return trans_msg
 
+    # 実行中のスレッドでログを出力する時に確認する中断要求
+    @classmethod
+    def set_cancel_token(cls, cancel_token):
+        cls.thread_local.cancel_token = cancel_token
+
     @classmethod
     def initialize(cls, level=logging.INFO, is_file=False, mode=MODE_READONLY):
         # logging.basicConfig(level=level)
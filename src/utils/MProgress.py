@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__)
+
+
+# 処理段階毎の進捗(全体数・完了数)
+# 書き込みは出力処理の1スレッドのみで、画面・CLIは一定間隔で読み取るだけなのでロックは取らない
+# 共有する場合は共有メモリに置き、別プロセスにはブロック名だけを渡して参照させる
+class ProgressCounter:
+
+    # 処理段階
+    STAGE_NONE = 0
+    STAGE_VERTEX_MAP = 1
+    STAGE_BONE = 2
+    STAGE_WEIGHT = 3
+    STAGE_RIGIDBODY = 4
+    STAGE_JOINT = 5
+    STAGE_WRITE = 6
+    STAGE_NAMES = ["", "頂点マップ", "ボーン", "ウェイト", "剛体", "ジョイント", "PMX出力"]
+
+    # 値の並び (段階, 全体数, 完了数, 段階開始時刻, 設定No, 設定数)
+    STAGE, TOTAL, DONE, START, SETTING_NO, SETTING_COUNT = range(6)
+
+    def __init__(self, is_shared=False):
+        self.block = None
+        # 作成したプロセスのみ共有メモリを解放する(fork で引き継いだ子プロセスでは解放しない)
+        self.owner_pid = os.getpid()
+        if is_shared:
+            self.block = shared_memory.SharedMemory(create=True, size=8 * 6)
+            self.values = np.ndarray((6,), dtype=np.float64, buffer=self.block.buf)
+            self.values[:] = 0
+        else:
+            self.values = np.zeros(6, dtype=np.float64)
+
+    def __getstate__(self):
+        if self.block:
+            return {"block_name": self.block.name}
+        return {"values": self.values}
+
+    def __setstate__(self, state):
+        self.owner_pid = None
+        if "block_name" in state:
+            self.block = shared_memory.SharedMemory(name=state["block_name"])
+            self.values = np.ndarray((6,), dtype=np.float64, buffer=self.block.buf)
+        else:
+            self.block = None
+            self.values = state["values"]
+
+    def start_setting(self, setting_no: int, setting_count: int):
+        self.values[self.SETTING_NO] = setting_no
+        self.values[self.SETTING_COUNT] = setting_count
+
+    # total が 0 の場合、全体数不明
+    def start_stage(self, stage: int, total: int):
+        self.values[self.DONE] = 0
+        self.values[self.TOTAL] = total
+        self.values[self.START] = time.time()
+        self.values[self.STAGE] = stage
+
+    def update(self, done: int):
+        self.values[self.DONE] = done
+
+    def add(self, count=1):
+        self.values[self.DONE] += count
+
+    def update_remaining(self, remaining: int):
+        self.values[self.DONE] = self.values[self.TOTAL] - remaining
+
+    # 段階名, 完了数, 全体数, 割合(全体数不明の場合、None), 残り秒数(求められない場合、None)
+    def get(self):
+        stage, total, done, start, setting_no, setting_count = self.values.tolist()
+        ratio = min(1, done / total) if total > 0 else None
+        eta = (time.time() - start) * (1 - ratio) / ratio if ratio else None
+
+        return {"stage": self.STAGE_NAMES[int(stage)], "done": int(done), "total": int(total), "ratio": ratio, "eta": eta, \
+                "setting_no": int(setting_no), "setting_count": int(setting_count)}
+
+    def get_text(self):
+        progress = self.get()
+        if not progress["stage"]:
+            return ""
+
+        text = f"【No.{progress['setting_no']}/{progress['setting_count']}】 {logger.transtext(progress['stage'])}" if progress["setting_count"] \
+            else logger.transtext(progress["stage"])
+        if progress["ratio"] is not None:
+            text = f"{text}: {progress['ratio'] * 100:.0f}% ({progress['done']}/{progress['total']})"
+        if progress["eta"] is not None:
+            text = f"{text} {logger.transtext('残り')} {progress['eta']:.0f}s"
+
+        return text
+
+    def close(self):
+        if self.block:
+            self.values = np.zeros(6, dtype=np.float64)
+            try:
+                self.block.close()
+            except BufferError:
+                # 別スレッドで読み取り中の場合、参照がなくなった時点で閉じられる
+                pass
+            if self.owner_pid == os.getpid():
+                self.block.unlink()
+            self.block = None
+
+    # 別プロセスで参照していた共有メモリを閉じる(作成したプロセスでは、作成側が閉じるまで残す)
+    def detach(self):
+        if self.block and self.owner_pid != os.getpid():
+            self.close()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import time
+import unittest
+import sys
+import pathlib
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from batch_executor import normalize_jobs, expand_preset_jobs, finish_forked_job, get_fork_context # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+def exit_forked_job(conn):
+    os._exit(3)
+
+
+def hang_forked_job(conn):
+    time.sleep(60)
+
+
+class BatchExecutorTest(unittest.TestCase):
+
+    def test_expand_preset_jobs_01(self):
+        base_dir = os.path.abspath("jobs")
+        setting = {"material_name": "スカート", "abb_name": "sk", "parent_bone_name": "下半身", "group": 2}
+        jobs = normalize_jobs({"jobs": [{"model_path": "model.pmx", "presets": [
+            {"name": "light", "output_path": "light.pmx", "settings": [dict(setting, params="light.json", vertices_csv="skirt.csv")]},
+            {"settings": [dict(setting, params="heavy.json")]}]}]}, base_dir)
+
+        preset_jobs = expand_preset_jobs(jobs[0])
+
+        self.assertEqual(2, len(preset_jobs))
+        self.assertEqual(os.path.join(base_dir, "model.pmx"), preset_jobs[1]["model_path"])
+        self.assertEqual(os.path.join(base_dir, "light.pmx"), preset_jobs[0]["output_path"])
+        self.assertEqual(os.path.join(base_dir, "skirt.csv"), preset_jobs[0]["settings"][0]["vertices_csv"])
+        self.assertEqual("light", preset_jobs[0]["preset_name"])
+        # 出力先・名前がない場合は、出力時に元モデルの場所にINDEX付きで出力する
+        self.assertIsNone(preset_jobs[1]["output_path"])
+        self.assertEqual("2", preset_jobs[1]["preset_name"])
+        self.assertNotIn("presets", preset_jobs[1])
+
+    @unittest.skipIf(not get_fork_context(), "fork")
+    def test_finish_forked_job_01(self):
+        fork_context = get_fork_context()
+
+        # 結果を返さずに終了した場合
+        result_conn, conn = fork_context.Pipe(duplex=False)
+        process = fork_context.Process(target=exit_forked_job, args=(conn,))
+        process.start()
+        conn.close()
+        result = finish_forked_job(process, result_conn)
+        self.assertFalse(result["result"])
+        self.assertEqual("exitcode: 3", result["error"])
+
+        # 期限を過ぎても終わらない場合
+        result_conn, conn = fork_context.Pipe(duplex=False)
+        process = fork_context.Process(target=hang_forked_job, args=(conn,))
+        process.start()
+        conn.close()
+        result = finish_forked_job(process, result_conn, time.time() + 0.5)
+        self.assertFalse(result["result"])
+        self.assertEqual("timeout", result["error"])
+        self.assertFalse(process.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
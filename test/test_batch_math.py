@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+import unittest
+import sys
+import pathlib
+import numpy as np
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from module.MMath import MVector3D, MQuaternion, MMatrix4x4 # noqa
+from module.MBatchMath import normalize_vectors, calc_lengths, from_directions, multiply_quaternions, to_euler_angles, to_rotation_matrices # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+def to_array(qq: MQuaternion):
+    return np.array([qq.scalar(), qq.x(), qq.y(), qq.z()])
+
+
+class MBatchMathTest(unittest.TestCase):
+
+    def test_vectors_01(self):
+        rng = np.random.default_rng(2)
+        vectors = rng.normal(size=(4, 50, 3)) * 10
+        vectors[0, 0] = 0
+
+        # 配列の形はそのまま、MVector3D と同じ値
+        lengths = calc_lengths(vectors)
+        normalized_vectors = normalize_vectors(vectors)
+        self.assertEqual((4, 50), lengths.shape)
+        for vector, length, normalized_vector in zip(vectors.reshape(-1, 3), lengths.flatten(), normalized_vectors.reshape(-1, 3)):
+            self.assertAlmostEqual(MVector3D(vector).length(), length, places=12)
+            self.assertTrue(np.allclose(MVector3D(vector).normalized().data(), normalized_vector, atol=1e-12), f"vector: {vector}")
+
+    def test_from_directions_01(self):
+        rng = np.random.default_rng(0)
+        directions = np.round(rng.normal(size=(500, 3)), 1)
+        ups = np.round(rng.normal(size=(500, 3)), 1)
+        # 平行・真逆・ゼロ
+        directions[:4] = [[0, 0, 1], [0, 0, -1], [0, 1, 0], [0, 0, 0]]
+        ups[:4] = [[0, 0, 2], [0, 0, 1], [0, 1, 0], [1, 0, 0]]
+
+        qqs = from_directions(directions, ups)
+        for direction, up, qq in zip(directions, ups, qqs):
+            expected_qq = MQuaternion.fromDirection(MVector3D(direction), MVector3D(up))
+            self.assertTrue(np.allclose(to_array(expected_qq), qq, atol=1e-12), f"direction: {direction}, up: {up}")
+
+    def test_quaternions_01(self):
+        rng = np.random.default_rng(1)
+        eulers = rng.uniform(-180, 180, size=(500, 3))
+        # ジンバルロック
+        eulers[:2, 0] = [90, -90]
+        qqs = [MQuaternion.fromEulerAngles(*euler) for euler in eulers]
+        rotate_qq = MQuaternion.fromEulerAngles(0, -90, 0)
+
+        multiplied_qqs = multiply_quaternions(np.array([to_array(qq) for qq in qqs]), to_array(rotate_qq))
+        euler_angles = to_euler_angles(multiplied_qqs)
+        rotation_mats = to_rotation_matrices(multiplied_qqs)
+        for qq, multiplied_qq, euler_angle, rotation_mat in zip(qqs, multiplied_qqs, euler_angles, rotation_mats):
+            expected_qq = qq * rotate_qq
+            self.assertTrue(np.allclose(to_array(expected_qq), multiplied_qq, atol=1e-12))
+            self.assertTrue(np.allclose(expected_qq.toEulerAngles().data(), euler_angle, atol=1e-9))
+
+            mat = MMatrix4x4()
+            mat.setToIdentity()
+            mat.rotate(expected_qq)
+            self.assertTrue(np.allclose(mat.data()[:3, :3], rotation_mat, atol=1e-12))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+import unittest
+import sys
+import pathlib
+import time
+import numpy as np
+import bezier
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+import utils.MBezierUtils as MBezierUtils # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+# 1点ずつ交点を求める従来の方法
+def intersect_by_x_by_curve(curve, xs):
+    ys = []
+    for x in xs:
+        line1 = bezier.Curve(np.asfortranarray([[x, x], [-9999999999, 9999999999]]), degree=1)
+        try:
+            intersections = curve.intersect(line1)
+            es = curve.evaluate_multi(np.asfortranarray(intersections[0, :]))
+            ys.append(es[1][0] if es.shape == (2, 1) else 0)
+        except Exception:
+            ys.append(0)
+    return np.array(ys, dtype=np.float64)
+
+
+class MBezierUtilsTest(unittest.TestCase):
+
+    def test_intersect_by_x_01(self):
+        rng = np.random.default_rng(0)
+
+        for n in range(200):
+            degree = int(rng.integers(1, 6))
+            if n % 2 == 0:
+                # xが単調増加
+                x_nodes = np.sort(rng.uniform(0, 20, degree + 1))
+                x_nodes[0] = 0
+            else:
+                x_nodes = rng.uniform(-5, 20, degree + 1)
+            y_nodes = rng.normal(size=degree + 1) * 30
+            curve = bezier.Curve.from_nodes(np.asfortranarray([x_nodes, y_nodes]))
+            xs = np.arange(np.floor(np.min(x_nodes)) - 1, np.ceil(np.max(x_nodes)) + 2, 0.5)
+
+            expected_ys = intersect_by_x_by_curve(curve, xs)
+            ys = MBezierUtils.intersect_by_x(curve, xs)
+
+            self.assertTrue(np.allclose(expected_ys, ys, rtol=1e-6, atol=1e-6), f"degree: {degree}, nodes: {x_nodes}")
+
+    def test_intersect_by_x_02(self):
+        # ジョイント制限値で使う曲線
+        for max_vy in [1, 2, 7, 20]:
+            xs = np.arange(0, max_vy, step=1)
+            for nodes in [[[0, max_vy], [-3.5, 7]], [[0, max_vy * 0.3, max_vy], [2.5, 2.5, 10]]]:
+                curve = bezier.Curve.from_nodes(np.asfortranarray(nodes))
+                self.assertTrue(np.allclose(intersect_by_x_by_curve(curve, xs), MBezierUtils.intersect_by_x(curve, xs), rtol=1e-9, atol=1e-9))
+
+    def test_intersect_by_x_03(self):
+        # 細かい間隔で多数の点を求める場合(所要時間は環境に左右されるので、比較結果はログに出すだけ)
+        xs = np.linspace(0, 10, 10000)
+
+        for nodes in [[[0, 10], [1, 5]], [[0, 3, 10], [1, 1, 5]], [[0, 2, 8, 10], [0, 4, -2, 5]], [[0, 1, 5, 6, 10], [0, 4, -2, 5, 1]]]:
+            curve = bezier.Curve.from_nodes(np.asfortranarray(nodes))
+
+            start = time.perf_counter()
+            expected_ys = intersect_by_x_by_curve(curve, xs)
+            curve_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            ys = MBezierUtils.intersect_by_x(curve, xs)
+            vectorized_time = time.perf_counter() - start
+
+            logger.info("degree: %s, samples: %s, curve: %.4fs, vectorized: %.4fs (x%.1f)", len(nodes[0]) - 1, len(xs), curve_time, vectorized_time, \
+                        curve_time / max(vectorized_time, 1e-9))
+            self.assertTrue(np.allclose(expected_ys, ys, rtol=1e-6, atol=1e-6))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+import concurrent.futures
+import time
+import unittest
+import sys
+import pathlib
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from utils.MCancellation import CancellationToken # noqa
+from utils.MException import MKilledException # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+worker_cancel_token = None
+
+
+def init_worker(cancel_token: CancellationToken):
+    global worker_cancel_token
+    worker_cancel_token = cancel_token
+
+
+def wait_cancel_worker():
+    start = time.monotonic()
+    try:
+        while time.monotonic() - start < 10:
+            worker_cancel_token.check()
+    except MKilledException:
+        return True
+
+    return False
+
+
+class CancellationTokenTest(unittest.TestCase):
+
+    def test_check_01(self):
+        cancel_token = CancellationToken()
+        cancel_token.check()
+        cancel_token.cancel()
+
+        # 確認間隔内は中断要求を見ない
+        cancel_token.check()
+        self.assertTrue(cancel_token.is_cancelled())
+
+        time.sleep(CancellationToken.CHECK_INTERVAL)
+        with self.assertRaises(MKilledException):
+            cancel_token.check()
+
+    def test_check_worker_01(self):
+        cancel_token = CancellationToken()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(cancel_token,)) as executor:
+            future = executor.submit(wait_cancel_worker)
+            time.sleep(0.5)
+            cancel_token.cancel()
+            start = time.monotonic()
+            self.assertTrue(future.result())
+            self.assertLess(time.monotonic() - start, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
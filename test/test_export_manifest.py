@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import unittest
+import sys
+import pathlib
+import tempfile
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from mmd.PmxData import Bone, RigidBody, Joint # noqa
+from module.MMath import MVector3D # noqa
+from module.MExportManifest import get_param_hashes, encode_physics_state, decode_tmp_all_bones, decode_map_states, load_manifest, \
+    save_output_manifest, get_output_manifest, get_manifest_path # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+def create_param_option(mass=1.5, horizonal_bone_density=2):
+    return {"material_name": "スカート", "abb_name": "sk", "horizonal_bone_density": horizonal_bone_density, "mass": 0.5, "rigidbody_balancer": False,
+            "rigidbody": RigidBody("", "", 3, 1, 0, 1, MVector3D(), MVector3D(), MVector3D(), mass, 0.99, 0.99, 0, 0, 0),
+            "vertical_joint": Joint("", "", -1, -1, -1, MVector3D(), MVector3D(), MVector3D(), MVector3D(), MVector3D(-20, -5, -10), MVector3D(20, 5, 10), MVector3D(), MVector3D()),
+            "horizonal_joint": None}
+
+
+class ExportManifestTest(unittest.TestCase):
+
+    def test_get_param_hashes_01(self):
+        structure_hash, physics_hash = get_param_hashes(create_param_option(), [0, 1, 2])
+
+        # 剛体の質量のみ変更
+        changed_structure_hash, changed_physics_hash = get_param_hashes(create_param_option(mass=3), [0, 1, 2])
+        self.assertEqual(structure_hash, changed_structure_hash)
+        self.assertNotEqual(physics_hash, changed_physics_hash)
+
+        # ボーン密度・対象頂点を変更
+        self.assertNotEqual(structure_hash, get_param_hashes(create_param_option(horizonal_bone_density=3), [0, 1, 2])[0])
+        self.assertNotEqual(structure_hash, get_param_hashes(create_param_option(), [0, 1])[0])
+
+    def test_physics_state_01(self):
+        root_bone = Bone("sk中心", "sk中心", MVector3D(), 3, 0, 0x0002)
+        root_bone.index = 10
+        bone = Bone("sk-001-001", "sk-001-001", MVector3D(1, 2, 3), 10, 0, 0x0002)
+        bone.index = 11
+        tmp_all_bones = {"sk-001-001": {"bone": bone, "parent": "sk中心", "regist": True},
+                         "sk-001-002": {"bone": Bone("sk-001-002", "sk-001-002", MVector3D(4, 5, 6), 10, 0, 0x0002), "parent": "sk中心", "regist": False}}
+        registed_bone_indexs = {0: {0: 0, 2: 1}, 3: {0: 0}}
+
+        physics_state = encode_physics_state(root_bone, tmp_all_bones, [([True, False], registed_bone_indexs)], ["sk中心", "sk-001-001"], ["↓|sk-001-001|sk-002-001"])
+
+        decoded_bones = decode_tmp_all_bones(physics_state, {"sk-001-001": bone}, root_bone)
+        self.assertIs(bone, decoded_bones["sk-001-001"]["bone"])
+        self.assertEqual([4, 5, 6], decoded_bones["sk-001-002"]["bone"].position.data().tolist())
+        self.assertEqual(10, decoded_bones["sk-001-002"]["bone"].parent_index)
+        self.assertFalse(decoded_bones["sk-001-002"]["regist"])
+
+        ((vertex_connected, decoded_indexs),) = decode_map_states(physics_state)
+        self.assertEqual([True, False], vertex_connected)
+        self.assertEqual(registed_bone_indexs, decoded_indexs)
+        self.assertEqual(list(registed_bone_indexs[0].keys()), list(decoded_indexs[0].keys()))
+
+    def test_output_manifest_01(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            # 元モデルのフォルダではなく、キャッシュ保存先に保存する(保存先がない場合は保存しない)
+            model_path = os.path.join(dir_path, "model.pmx")
+            cache_dir = os.path.join(dir_path, "cache")
+            self.assertIsNone(get_manifest_path(model_path, None))
+            manifest_path = get_manifest_path(model_path, cache_dir)
+            output_paths = [os.path.join(dir_path, f"model_{n}.pmx") for n in range(3)]
+            for output_path in output_paths:
+                open(output_path, "wb").close()
+
+            # 同じ元モデルから別の出力先に出力しても、それぞれの結果が残る
+            save_output_manifest(manifest_path, {"output_path": output_paths[0], "output_digest": "a"})
+            save_output_manifest(manifest_path, {"output_path": output_paths[1], "output_digest": "b"})
+            manifest = load_manifest(manifest_path)
+
+            self.assertEqual("a", get_output_manifest(manifest, output_paths[0])["output_digest"])
+            self.assertEqual("b", get_output_manifest(manifest, output_paths[1])["output_digest"])
+            # 結果のない出力先は、最後に出力した結果
+            self.assertEqual("b", get_output_manifest(manifest, output_paths[2])["output_digest"])
+
+            # 出力ファイルが消えた結果は残さない
+            os.remove(output_paths[0])
+            save_output_manifest(manifest_path, {"output_path": output_paths[1], "output_digest": "c"})
+            self.assertEqual([output_paths[1]], list(load_manifest(manifest_path)["outputs"].keys()))
+            self.assertEqual(["cache"] + [os.path.basename(p) for p in output_paths[1:]], sorted(os.listdir(dir_path)))
+            self.assertEqual([os.path.basename(manifest_path)], os.listdir(cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+import os
+import unittest
+import sys
+import pathlib
+import tempfile
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from module.MFolderWatcher import FolderWatcher # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+class FolderWatcherTest(unittest.TestCase):
+
+    def wait_changes(self, watcher: FolderWatcher, file_path: str):
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("changed")
+
+        changed_paths = set()
+        for _ in range(10):
+            changed_paths |= watcher.wait(0.2)
+            if file_path in changed_paths:
+                break
+
+        return changed_paths
+
+    def test_wait_01(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            watcher = FolderWatcher([dir_path])
+            try:
+                file_path = os.path.join(os.path.abspath(dir_path), "skirt.json")
+                self.assertIn(file_path, self.wait_changes(watcher, file_path))
+            finally:
+                watcher.close()
+
+    def test_wait_polling_01(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(os.path.abspath(dir_path), "skirt.json")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write("original")
+            os.utime(file_path, (0, 0))
+
+            watcher = FolderWatcher([dir_path], is_polling=True)
+            self.assertTrue(watcher.is_polling())
+            # 変更がない場合は何も返さない
+            self.assertEqual(set(), watcher.wait(0))
+            self.assertIn(file_path, self.wait_changes(watcher, file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
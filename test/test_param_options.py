@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+import unittest
+import sys
+import pathlib
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from mmd.PmxData import PmxModel, Bone # noqa
+from module.MMath import MVector3D # noqa
+from module.MParamOptions import create_param_option, validate_setting # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+class ParamOptionsTest(unittest.TestCase):
+
+    def create_params(self):
+        params = {"similarity": 0.75, "fineness": 3.4, "mass": 0.5, "air_resistance": 1.8, "shape_maintenance": 1.5, "vertical_bone_density": 1, \
+                  "horizonal_bone_density": 2, "bone_thinning_out": False, "physics_type": "布", "density_type": "頂点", "rigidbody_shape_type": 1, \
+                  "rigidbody_mass": 1.5, "rigidbody_linear_damping": 0.99, "rigidbody_angular_damping": 0.99, "rigidbody_restitution": 0, \
+                  "rigidbody_friction": 0, "rigidbody_coefficient": 1.2, "rigidbody_balancer": False}
+        for joint_type in ["vertical", "horizonal", "diagonal", "reverse"]:
+            params[f"{joint_type}_joint_valid"] = joint_type == "vertical"
+            for axis in "xyz":
+                for name in ["mov_%s_min", "mov_%s_max", "rot_%s_min", "rot_%s_max", "spring_mov_%s", "spring_rot_%s"]:
+                    params[f"{joint_type}_joint_{name % axis}"] = 0
+            params[f"{joint_type}_joint_coefficient"] = 1
+        params["vertical_joint_rot_x_max"] = 20
+
+        return params
+
+    def create_model(self):
+        model = PmxModel()
+        bone = Bone("下半身", "", MVector3D(0, 10, 0), -1, 0, 0)
+        bone.index = 3
+        model.bones[bone.name] = bone
+        model.material_vertices["スカート"] = [0, 1, 2]
+
+        return model
+
+    def test_create_param_option_01(self):
+        model = self.create_model()
+        param_option = create_param_option(model, {"material_name": "スカート", "abb_name": "sk", "parent_bone_name": "下半身", "group": "2"}, self.create_params())
+
+        self.assertEqual(3, param_option["rigidbody"].bone_index)
+        self.assertEqual(1, param_option["rigidbody"].collision_group)
+        # 自身のグループのみ非衝突対象外
+        self.assertEqual(0xFFFF ^ (1 << 1), param_option["rigidbody"].no_collision_group)
+        self.assertEqual(20, param_option["vertical_joint"].rotation_limit_max.x())
+        self.assertIsNone(param_option["horizonal_joint"])
+        self.assertEqual(logger.transtext("そのまま"), param_option["exist_physics_clear"])
+
+    def test_validate_setting_01(self):
+        model = self.create_model()
+        params = self.create_params()
+
+        self.assertIsNone(validate_setting(model, {"material_name": "スカート", "abb_name": "sk", "parent_bone_name": "下半身", "group": 1}, params))
+        self.assertIsNotNone(validate_setting(model, {"material_name": "スカート", "abb_name": "sk", "parent_bone_name": "下半身"}, params))
+        self.assertIsNotNone(validate_setting(model, {"material_name": "上着", "abb_name": "sk", "parent_bone_name": "下半身", "group": 1}, params))
+        self.assertIsNotNone(validate_setting(model, {"material_name": "スカート", "abb_name": "sk", "parent_bone_name": "下半身", "group": 1, \
+                                                      "exist_physics_clear": "再利用"}, params))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+import concurrent.futures
+import unittest
+import sys
+import pathlib
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from utils.MProgress import ProgressCounter # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+def update_worker(progress: ProgressCounter):
+    progress.start_stage(ProgressCounter.STAGE_WEIGHT, 200)
+    progress.update_remaining(150)
+    progress.add(10)
+    progress.detach()
+
+
+class ProgressCounterTest(unittest.TestCase):
+
+    def test_get_01(self):
+        progress = ProgressCounter()
+        self.assertIsNone(progress.get()["ratio"])
+
+        progress.start_setting(1, 2)
+        progress.start_stage(ProgressCounter.STAGE_JOINT, 4)
+        progress.update(1)
+
+        self.assertEqual("ジョイント", progress.get()["stage"])
+        self.assertEqual(0.25, progress.get()["ratio"])
+        self.assertIsNotNone(progress.get()["eta"])
+        self.assertEqual(2, progress.get()["setting_count"])
+
+    def test_get_shared_01(self):
+        progress = ProgressCounter(is_shared=True)
+        try:
+            # 別プロセスでの更新が、作成側から見える
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+                executor.submit(update_worker, progress).result()
+
+            self.assertEqual("ウェイト", progress.get()["stage"])
+            self.assertEqual(60, progress.get()["done"])
+            self.assertEqual(0.3, progress.get()["ratio"])
+        finally:
+            progress.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,7 @@ from mmd.PmxData import PmxModel, Vertex, Material, Bone, Morph, DisplaySlot, Ri
 from mmd.VmdData import VmdMotion, VmdBoneFrame, VmdCameraFrame, VmdInfoIk, VmdLightFrame, VmdMorphFrame, VmdShadowFrame, VmdShowIkFrame # noqa
 from module.MMath import MRect, MVector2D, MVector3D, MVector4D, MQuaternion, MMatrix4x4 # noqa
 from module.MOptions import MExportOptions # noqa
+from module.MVertexMap import VertexAxisMap, VertexCoordinateMap # noqa
 from service.PmxTailorExportService import PmxTailorExportService # noqa
 from utils.MLogger import MLogger # noqa
 
@@ -50,7 +51,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -80,7 +81,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -106,7 +107,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -132,7 +133,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -158,7 +159,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -187,7 +188,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -216,7 +217,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -245,7 +246,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -268,7 +269,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -291,7 +292,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -321,7 +322,7 @@ class PmxTailorExportServiceTest(unittest.TestCase):
                     duplicate_vertices[key].append(vertex.index)
             
             vertex_axis_map, vertex_coordinate_map = \
-                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, {}, {}, index_idx)
+                service.create_vertex_map_by_index(model, service.options.param_options[0], duplicate_vertices, VertexAxisMap(len(model.vertex_dict)), VertexCoordinateMap(), index_idx)
 
             for vertex_idx, vmap in vertex_map.items():
                 print("vertex_idx: %s, vmap: [%s, %s], result: [%s, %s]" % (vertex_idx, vmap['x'], vmap['y'], vertex_axis_map[vertex_idx]['x'], vertex_axis_map[vertex_idx]['y']))
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+import math
+import unittest
+import sys
+import pathlib
+import numpy as np
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from mmd.PmxData import PmxModel, Vertex, Bone # noqa
+from module.MMath import MVector3D # noqa
+from module.MSharedModel import SharedModelArrays, SharedModelView, get_material_ranges # noqa
+from service import PmxTailorExportService as export_service # noqa
+from utils.MCancellation import CancellationToken # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+class SharedModelTest(unittest.TestCase):
+
+    def create_model(self):
+        model = PmxModel()
+        for vidx in range(6):
+            model.vertex_dict[vidx] = Vertex(vidx, MVector3D(vidx * 0.1, vidx * 1.5, -vidx / 3), MVector3D(0, 1, 0), None, [], None, 0)
+        model.indices = {0: [0, 1, 2], 1: [3, 4, 5], 2: [2, 1, 3]}
+        # 同じ名前の材質が離れている場合は、面INDEXが連続しない
+        model.material_indices = {"スカート": [0, 2], "上着": [1], 0: "スカート", 1: "上着"}
+        model.material_vertices = {"スカート": [0, 1, 2, 2, 1, 3], "上着": [3, 4, 5]}
+
+        return model
+
+    # 下半身から下に広がる 8列 x 4段 の筒状の材質
+    def create_skirt_model(self):
+        model = PmxModel()
+        for y in range(4):
+            for x in range(8):
+                angle = 2 * math.pi * x / 8
+                model.vertex_dict[y * 8 + x] = Vertex(y * 8 + x, MVector3D(math.sin(angle) * (1 + y * 0.3), 10 - y * 2, math.cos(angle) * (1 + y * 0.3)), \
+                                                      MVector3D(math.sin(angle), 0, math.cos(angle)), None, [], None, 0)
+        for y in range(3):
+            for x in range(8):
+                v0, v1, v2, v3 = y * 8 + x, y * 8 + (x + 1) % 8, (y + 1) * 8 + x, (y + 1) * 8 + (x + 1) % 8
+                model.indices[len(model.indices)] = [v0, v1, v2]
+                model.indices[len(model.indices)] = [v1, v3, v2]
+        model.material_indices = {"スカート": list(model.indices.keys()), 0: "スカート"}
+        model.material_vertices = {"スカート": [vidx for vidxs in model.indices.values() for vidx in vidxs]}
+        # 親ボーン(下半身)は材質の上にあり、頂点マップの縦方向判定に使われる
+        for bone_index, (bone_name, y) in enumerate([("センター", 8), ("下半身", 11)]):
+            model.bones[bone_name] = Bone(bone_name, "", MVector3D(0, y, 0), -1, 0, 0)
+            model.bones[bone_name].index = bone_index
+            model.bone_indexes[bone_index] = bone_name
+
+        return model
+
+    def test_get_material_ranges_01(self):
+        self.assertEqual({"スカート": [[0, 1], [2, 3]], "上着": [[1, 2]]}, get_material_ranges(self.create_model()))
+
+    def test_get_material_model_01(self):
+        model = self.create_model()
+        shared_model = SharedModelArrays(model)
+        try:
+            view = SharedModelView(shared_model.handle)
+            material_model = view.get_material_model("スカート")
+
+            self.assertEqual(model.material_indices["スカート"], material_model.material_indices["スカート"])
+            self.assertEqual(model.material_vertices["スカート"], material_model.material_vertices["スカート"])
+            self.assertEqual({0: [0, 1, 2], 2: [2, 1, 3]}, material_model.indices)
+            # 対象材質の頂点だけを持つ
+            self.assertEqual([0, 1, 2, 3], sorted(material_model.vertex_dict.keys()))
+            self.assertEqual(model.vertex_dict[3].position.to_log(), material_model.vertex_dict[3].position.to_log())
+            view.close()
+        finally:
+            shared_model.close()
+
+    def test_create_vertex_map_worker_01(self):
+        model = self.create_skirt_model()
+        param_option = {"material_name": "スカート", "parent_bone_name": "下半身", "direction": "下", "similarity": 0.75, "abb_name": "sk"}
+        target_vertices = list(model.vertex_dict.keys())
+
+        vertex_map_result = export_service.PmxTailorExportService(None).create_vertex_map(model, param_option, "スカート", target_vertices)
+
+        total_level = MLogger.total_level
+        shared_model = SharedModelArrays(model)
+        try:
+            export_service.init_shared_worker(shared_model.handle, CancellationToken())
+            worker_vertex_map_result = export_service.create_vertex_map_worker(param_option, target_vertices)
+            export_service.worker_shared_model.close()
+        finally:
+            shared_model.close()
+            MLogger.total_level = total_level
+
+        # ワーカーで生成した頂点マップが、元モデルから生成したものと同じ
+        self.assertEqual(1, len(vertex_map_result[0]))
+        self.assertEqual((4, 8), vertex_map_result[0][0].shape)
+        self.assertEqual(len(vertex_map_result[0]), len(worker_vertex_map_result[0]))
+        for vertex_map, worker_vertex_map in zip(vertex_map_result[0], worker_vertex_map_result[0]):
+            self.assertTrue(np.array_equal(vertex_map, worker_vertex_map))
+        self.assertEqual(vertex_map_result[1], worker_vertex_map_result[1])
+        self.assertEqual(vertex_map_result[3], worker_vertex_map_result[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
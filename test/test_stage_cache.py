@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+import unittest
+import sys
+import pathlib
+import tempfile
+import numpy as np
+# このソースのあるディレクトリの絶対パスを取得
+current_dir = pathlib.Path(__file__).resolve().parent
+# モジュールのあるパスを追加
+sys.path.append(str(current_dir) + '/../')
+sys.path.append(str(current_dir) + '/../src/')
+
+from mmd.PmxData import PmxModel # noqa
+from module.MStageCache import StageCache, get_stage_key # noqa
+from utils.MLogger import MLogger # noqa
+
+logger = MLogger(__name__, level=1)
+
+
+class StageCacheTest(unittest.TestCase):
+
+    def test_npz_01(self):
+        stage = {
+            "vertex_maps": [np.array([[0, 1], [2, -1]])],
+            "vertex_connecteds": [[True, False]],
+            "vertex_display_maps": [np.array([["0:5", "1"], ["2", " None "]])],
+            "bone_horizonal_distances": {0: np.array([[0, 1.5, 0], [0, 0, 0]])},
+            "bone_vertical_distances": {0: np.array([[0, 0], [2.5, 0]])},
+            "duplicate_vertices": {"[0, 1, 0]": [0, 5], "[1, 1, 0]": [1], "[0, 0, 0]": [2]},
+            "duplicate_indices": {(0, 1): [0], (1, 2): [0, 1]},
+            "index_combs_by_vpos": {"[0, 1, 0]": [(0, 1), (0, 2)], "[1, 1, 0]": []},
+            "registed_iidxs": [0, 1],
+        }
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            StageCache().put("key", stage, cache_dir)
+            # メモリ上にないので .npz から読み込む
+            loaded = StageCache().get("key", cache_dir)
+
+        self.assertTrue(np.array_equal(stage["vertex_maps"][0], loaded["vertex_maps"][0]))
+        self.assertTrue(np.array_equal(stage["vertex_display_maps"][0], loaded["vertex_display_maps"][0]))
+        self.assertTrue(np.array_equal(stage["bone_horizonal_distances"][0], loaded["bone_horizonal_distances"][0]))
+        self.assertTrue(np.array_equal(stage["bone_vertical_distances"][0], loaded["bone_vertical_distances"][0]))
+        for name in ["vertex_connecteds", "duplicate_vertices", "duplicate_indices", "index_combs_by_vpos", "registed_iidxs"]:
+            self.assertEqual(stage[name], loaded[name], name)
+
+    def test_lru_01(self):
+        cache = StageCache(max_entries=2)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+        cache.put("c", {})
+
+        self.assertEqual(["a", "c"], list(cache.entries.keys()))
+
+    def test_stage_key_01(self):
+        model = PmxModel()
+        model.digest = "digest"
+        param_option = {"material_name": "スカート", "parent_bone_name": "下半身", "direction": "下", "similarity": 0.75, \
+                        "exist_physics_clear": "そのまま", "vertices_csv": ""}
+
+        # 頂点マップ生成が参照しない設定値はキーに含めない(事前生成した結果を出力で使える)
+        self.assertEqual(get_stage_key(model, param_option, [0, 1]), get_stage_key(model, dict(param_option, abb_name="sk", mass=0.5), [0, 1]))
+        self.assertNotEqual(get_stage_key(model, param_option, [0, 1]), get_stage_key(model, dict(param_option, parent_bone_name="上半身"), [0, 1]))
+        self.assertNotEqual(get_stage_key(model, param_option, [0, 1]), get_stage_key(model, param_option, [0, 2]))
+
+
+if __name__ == "__main__":
+    unittest.main()